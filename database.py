@@ -5,8 +5,13 @@ Bu modül SQLite veritabanı işlemlerini yönetir.
 Kitap ekleme, silme, güncelleme, listeleme gibi tüm veri işlemleri burada.
 """
 
+import base64
+import hashlib
+import json
+import re
 import sqlite3
-from datetime import datetime
+import threading
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 
@@ -16,6 +21,66 @@ from pathlib import Path
 # Böylece veritabanı her zaman uygulama klasöründe oluşur
 DB_PATH = Path(__file__).parent / "kitaplik.db"
 
+# Liste/grid görünümlerinin ihtiyaç duyduğu kısa alanlar
+# (description, review, notes gibi uzun metinler okunmaz)
+LIST_COLUMNS = [
+    "id", "title", "author", "page_count", "status", "rating",
+    "cover_path", "publish_year", "series_name", "tags", "created_at",
+]
+
+# Sayfalı listelerde kullanılabilen sıralamalar (her biri için index var)
+PAGE_SORTS = [
+    "id", "title", "author", "created_at", "rating",
+    "page_count", "publish_year",
+]
+
+# Okuma listesi sıra anahtarları arasındaki boşluk: araya ekleme/taşıma
+# komşuların ortasına yazılır, boşluk bitince liste yeniden numaralanır
+RANK_GAP = 1 << 16
+
+# status='to_read' kitaplarla eşlenen varsayılan okuma listesi
+DEFAULT_READING_LIST_ID = 1
+
+# books tablosu her değiştiğinde artan sayacın settings anahtarı
+LIBRARY_VERSION_KEY = "library_version"
+
+# Okuma oturumlarının toplandığı dönemler: dönem -> anahtar ifadesi ({at}: oturum zamanı)
+ROLLUP_PERIODS = {
+    "day": "date({at})",
+    "week": "strftime('%Y-W%W', {at})",
+    "month": "strftime('%Y-%m', {at})",
+}
+
+# Ölçülen okuma hızı son bu kadar günün oturumlarından hesaplanır
+SPEED_WINDOW_DAYS = 30
+
+# Online kaynaklardan tamamlanabilecek alanlar
+METADATA_FIELDS = ["page_count", "publisher", "language", "description"]
+
+# Bu alanlardan biri boş olan kitap "eksik" sayılır
+# (idx_books_incomplete ile sorgularda birebir aynı ifade kullanılmalı,
+# yoksa SQLite kısmi index'i kullanmaz)
+INCOMPLETE_CONDITION = " OR ".join(
+    f"{field} IS NULL OR {field} = ''" for field in METADATA_FIELDS
+)
+
+
+# Alıntı aramasında eşleşen kelimeleri çevreleyen işaretler (snippet())
+# HTML yerine kontrol karakterleri: alıntı metni arayüzde güvenle kaçırılabilsin
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+
+
+def tr_fold(text):
+    """
+    Türkçe arama için metni sadeleştirir: küçük harf, ı/İ/I -> i.
+    Diğer işaretli harfleri (ç, ş, ğ, ö, ü, â) FTS5 tokenizer'ı kendisi düzleştirir.
+    Harf sayısı değişmez; snippet() orijinal metindeki yerleri doğru bulur.
+    """
+    if text is None:
+        return None
+    return str(text).replace("İ", "i").replace("I", "ı").lower().replace("ı", "i")
+
 
 def get_connection():
     """
@@ -25,12 +90,61 @@ def get_connection():
     Normalde: row[0], row[1] gibi index ile erişirsin
     Row ile: row["title"], row["author"] gibi isimle erişirsin
     Çok daha okunabilir kod yazarız.
+    
+    tr_fold() SQL fonksiyonu olarak kaydedilir (alıntı arama tetikleyicileri kullanır).
     """
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    conn.create_function("tr_fold", 1, tr_fold, deterministic=True)
     return conn
 
 
+# ==================== DEĞİŞİKLİK BİLDİRİMLERİ ====================
+# Arayüz her değişiklikte tüm listeyi yeniden yüklemesin, sadece etkilenen
+# satırları güncellesin diye yazma işlemleri commit'ten sonra bildirim gönderir.
+#
+#   def on_change(table, op, ids, columns): ...
+#   db.subscribe(on_change)
+#
+# table:   "books", "shelves", "book_shelves", "quotes", "reading_goals", "reading_sessions"
+# op:      "insert", "update" veya "delete"
+# ids:     etkilenen satırların anahtarları
+#          (book_shelves için (book_id, shelf_id), reading_goals için yıl)
+# columns: güncellenen sütunlar (bilinmiyorsa / tüm satırsa None)
+#
+# Bildirim, yazma işlemini yapan thread'de çağrılır. Arayüz tarafında
+# ui/change_bus.py ile ana thread'e aktarılır.
+
+_subscribers = []
+
+
+def subscribe(callback):
+    """Değişiklik bildirimlerine abone olur."""
+    if callback not in _subscribers:
+        _subscribers.append(callback)
+    return callback
+
+
+def unsubscribe(callback):
+    """Aboneliği bırakır."""
+    if callback in _subscribers:
+        _subscribers.remove(callback)
+
+
+def notify_change(table: str, op: str, ids, columns=None):
+    """Abonelere değişikliği bildirir (boş ids için hiçbir şey yapmaz)."""
+    ids = list(ids)
+    if not ids:
+        return
+    columns = sorted(set(columns) - {"updated_at"}) if columns else None
+    
+    for callback in list(_subscribers):
+        try:
+            callback(table, op, ids, columns)
+        except Exception as e:
+            print(f"Değişiklik bildirimi hatası: {e}")
+
+
 def init_database():
     """
     Veritabanını ve tabloları oluşturur.
@@ -42,6 +156,10 @@ def init_database():
     conn = get_connection()
     cursor = conn.cursor()
     
+    # WAL: okuyanlar yazanları beklemez; yedekleme (services/backup.py) tutarlı
+    # bir görüntüyü kopyalarken uygulama yazmaya devam edebilir (ayar dosyada kalır)
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     # Kitaplar tablosu
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS books (
@@ -129,6 +247,8 @@ def init_database():
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL UNIQUE,
             icon TEXT DEFAULT '📚',
+            book_count INTEGER DEFAULT 0,  -- Raftaki kitap sayısı (tetikleyicilerle güncel)
+            rule TEXT,                     -- Akıllı raf kuralı (JSON), normal raflarda NULL
             created_at TEXT NOT NULL
         )
     """)
@@ -170,6 +290,169 @@ def init_database():
         )
     """)
     
+    # Kapak deposu (bkz. services/cover_store.py)
+    # hash: görselin SHA-256 özeti, ref_count: bu kapağı kullanan kitap sayısı
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS covers (
+            hash TEXT PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            size INTEGER,
+            ref_count INTEGER DEFAULT 0,
+            created_at TEXT NOT NULL
+        )
+    """)
+    
+    # ref_count'u books.cover_path değişikliklerinden otomatik güncelle
+    cursor.executescript("""
+        CREATE TRIGGER IF NOT EXISTS trg_covers_book_insert
+        AFTER INSERT ON books WHEN NEW.cover_path IS NOT NULL
+        BEGIN
+            UPDATE covers SET ref_count = ref_count + 1 WHERE path = NEW.cover_path;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_covers_book_update
+        AFTER UPDATE OF cover_path ON books WHEN OLD.cover_path IS NOT NEW.cover_path
+        BEGIN
+            UPDATE covers SET ref_count = ref_count - 1 WHERE path = OLD.cover_path;
+            UPDATE covers SET ref_count = ref_count + 1 WHERE path = NEW.cover_path;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_covers_book_delete
+        AFTER DELETE ON books WHEN OLD.cover_path IS NOT NULL
+        BEGIN
+            UPDATE covers SET ref_count = ref_count - 1 WHERE path = OLD.cover_path;
+        END;
+    """)
+    
+    # Okuma listeleri ve liste öğeleri
+    # rank: seyrek sıra anahtarı (RANK_GAP aralıklı), taşıma tek satırı günceller
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS reading_lists (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            created_at TEXT NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS reading_list_items (
+            list_id INTEGER NOT NULL,
+            book_id INTEGER NOT NULL,
+            rank INTEGER NOT NULL,
+            added_at TEXT NOT NULL,
+            PRIMARY KEY (list_id, book_id),
+            FOREIGN KEY (list_id) REFERENCES reading_lists(id) ON DELETE CASCADE,
+            FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_reading_list_items_rank
+        ON reading_list_items(list_id, rank)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_reading_list_items_book
+        ON reading_list_items(book_id)
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO reading_lists (id, name, created_at)
+        VALUES (?, 'Okuma Listem', ?)
+    """, (DEFAULT_READING_LIST_ID, datetime.now().isoformat()))
+    
+    # Varsayılan liste status='to_read' ile eşlenir: durumu hangi yoldan
+    # değişirse değişsin (düzenleme, toplu işlem, içe aktarma) liste güncel kalır
+    cursor.executescript(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_reading_list_book_insert
+        AFTER INSERT ON books WHEN NEW.status = 'to_read'
+        BEGIN
+            INSERT OR IGNORE INTO reading_list_items (list_id, book_id, rank, added_at)
+            SELECT {DEFAULT_READING_LIST_ID}, NEW.id, COALESCE(MAX(rank), 0) + {RANK_GAP}, NEW.updated_at
+            FROM reading_list_items WHERE list_id = {DEFAULT_READING_LIST_ID};
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_reading_list_status_enter
+        AFTER UPDATE OF status ON books
+        WHEN NEW.status = 'to_read' AND OLD.status IS NOT 'to_read'
+        BEGIN
+            INSERT OR IGNORE INTO reading_list_items (list_id, book_id, rank, added_at)
+            SELECT {DEFAULT_READING_LIST_ID}, NEW.id, COALESCE(MAX(rank), 0) + {RANK_GAP},
+                   COALESCE(NEW.updated_at, datetime('now'))
+            FROM reading_list_items WHERE list_id = {DEFAULT_READING_LIST_ID};
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_reading_list_status_leave
+        AFTER UPDATE OF status ON books
+        WHEN OLD.status = 'to_read' AND NEW.status IS NOT 'to_read'
+        BEGIN
+            DELETE FROM reading_list_items
+            WHERE list_id = {DEFAULT_READING_LIST_ID} AND book_id = NEW.id;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_reading_list_book_delete
+        AFTER DELETE ON books
+        BEGIN
+            DELETE FROM reading_list_items WHERE book_id = OLD.id;
+        END;
+    """)
+    
+    # Kitap gömme vektörleri (bkz. services/embeddings.py)
+    # vector: int8 dizisi, gerçek değer = vector[i] * scale
+    # source_hash: vektörün üretildiği metnin özeti (metin değişince yeniden üretilir)
+    cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS book_embeddings (
+            book_id INTEGER PRIMARY KEY,
+            model TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            scale REAL NOT NULL,
+            vector BLOB NOT NULL,
+            source_hash TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        
+        CREATE TRIGGER IF NOT EXISTS trg_book_embeddings_book_delete
+        AFTER DELETE ON books
+        BEGIN
+            DELETE FROM book_embeddings WHERE book_id = OLD.id;
+        END;
+    """)
+    
+    # AI yanıt önbelleği (bkz. services/ai_service.generate_response)
+    # key: model + istem + kitaplık sürümünün özeti
+    cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS ai_cache (
+            key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            response TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            hits INTEGER DEFAULT 0
+        );
+        
+        CREATE INDEX IF NOT EXISTS idx_ai_cache_created ON ai_cache(created_at);
+    """)
+    
+    # Olası kopya kitap çiftleri (bkz. services/dedupe.py)
+    # book_a < book_b; status: 'pending' (incelenecek) veya 'dismissed' (kopya değil)
+    cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS duplicate_candidates (
+            book_a INTEGER NOT NULL,
+            book_b INTEGER NOT NULL,
+            score REAL NOT NULL,
+            reason TEXT,
+            status TEXT DEFAULT 'pending',
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (book_a, book_b),
+            CHECK (book_a < book_b)
+        );
+        
+        CREATE INDEX IF NOT EXISTS idx_duplicate_candidates_b ON duplicate_candidates(book_b);
+        
+        CREATE TRIGGER IF NOT EXISTS trg_duplicate_candidates_book_delete
+        AFTER DELETE ON books
+        BEGIN
+            DELETE FROM duplicate_candidates WHERE book_a = OLD.id OR book_b = OLD.id;
+        END;
+    """)
+    
+    _create_reading_sessions(cursor)
+    
     # Varsayılan rafları ekle (yoksa)
     now = datetime.now().isoformat()
     default_shelves = [
@@ -229,6 +512,7 @@ def _migrate_database():
         ("borrowed_date", "TEXT", None),
         ("tags", "TEXT", None),
         ("reading_list_order", "INTEGER", None),  # Okuma listesi sırası
+        ("metadata_checked_at", "TEXT", None),  # Son online bilgi tamamlama denemesi
     ]
     
     for col_name, col_type, default in new_columns:
@@ -242,8 +526,290 @@ def _migrate_database():
             except Exception as e:
                 print(f"  ! Sütun eklenemedi ({col_name}): {e}")
     
+    # Eksik bilgili kitaplar için kısmi index (arka plan yenileyicisi kullanır)
+    # Sadece eksik satırları içerir, tamamlanan kitaplar index'ten düşer
+    cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_books_incomplete
+        ON books(metadata_checked_at) WHERE {INCOMPLETE_CONDITION}
+    """)
+    
+    # Raf kitap sayısı: book_shelves tetikleyicileriyle güncel tutulur
+    cursor.execute("PRAGMA table_info(shelves)")
+    if "book_count" not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE shelves ADD COLUMN book_count INTEGER DEFAULT 0")
+        cursor.execute("""
+            UPDATE shelves SET book_count = (
+                SELECT COUNT(*) FROM book_shelves WHERE book_shelves.shelf_id = shelves.id
+            )
+        """)
+        print("  + Sütun eklendi: shelves.book_count")
+    if "rule" not in {row[1] for row in cursor.execute("PRAGMA table_info(shelves)").fetchall()}:
+        cursor.execute("ALTER TABLE shelves ADD COLUMN rule TEXT")
+        print("  + Sütun eklendi: shelves.rule")
+    
+    # Foreign key'ler kapalı olduğundan ON DELETE CASCADE çalışmıyor;
+    # kitap veya raf silinince bağlantıları tetikleyiciler siler
+    cursor.executescript("""
+        CREATE TRIGGER IF NOT EXISTS trg_book_shelves_insert
+        AFTER INSERT ON book_shelves
+        BEGIN
+            UPDATE shelves SET book_count = book_count + 1 WHERE id = NEW.shelf_id;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_book_shelves_delete
+        AFTER DELETE ON book_shelves
+        BEGIN
+            UPDATE shelves SET book_count = book_count - 1 WHERE id = OLD.shelf_id;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_book_shelves_book_delete
+        AFTER DELETE ON books
+        BEGIN
+            DELETE FROM book_shelves WHERE book_id = OLD.id;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_book_shelves_shelf_delete
+        BEFORE DELETE ON shelves
+        BEGIN
+            DELETE FROM book_shelves WHERE shelf_id = OLD.id;
+        END;
+    """)
+    
+    # Sayfalı listeler için sıralama index'leri
+    # (id, INTEGER PRIMARY KEY olduğundan her index'in sonunda zaten var;
+    # (sütun, id) sırası index'ten okunur)
+    for column in PAGE_SORTS:
+        if column != "id":
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_books_{column} ON books({column})")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_quotes_created ON quotes(created_at)")
+    
+    # Yıla göre okunan kitaplar (hedefler, yıllık özet): status = 'read' AND finish_date aralığı
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_books_status_finish ON books(status, finish_date)")
+    
+    _create_quote_search(cursor)
+    
+    # Kitaplık sürüm sayacı: books'taki her değişiklikte artar
+    # (AI bağlam özeti, AI yanıt önbelleği gibi türetilmiş veriler bu sayıya göre tutulur)
+    # Sadece metadata_checked_at yazan güncellemeler (arka plan yenileyicisi) sayılmaz;
+    # sütun listesi eklenen sütunları da kapsasın diye tetikleyici her açılışta yenilenir
+    cursor.execute(f"INSERT OR IGNORE INTO settings (key, value) VALUES ('{LIBRARY_VERSION_KEY}', '0')")
+    cursor.execute("PRAGMA table_info(books)")
+    content_columns = ", ".join(
+        row[1] for row in cursor.fetchall() if row[1] not in ("metadata_checked_at", "updated_at")
+    )
+    cursor.execute("DROP TRIGGER IF EXISTS trg_library_version_update")
+    for event in ("INSERT", f"UPDATE OF {content_columns}", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_library_version_{event.split()[0].lower()}
+            AFTER {event} ON books
+            BEGIN
+                UPDATE settings SET value = CAST(value AS INTEGER) + 1
+                WHERE key = '{LIBRARY_VERSION_KEY}';
+            END
+        """)
+    
+    # Eski okuma listesi (books.reading_list_order) bir kez varsayılan listeye taşınır
+    cursor.execute("SELECT value FROM settings WHERE key = 'reading_lists_migrated'")
+    if not cursor.fetchone():
+        cursor.execute("""
+            SELECT id FROM books WHERE status = 'to_read'
+            ORDER BY reading_list_order IS NULL, reading_list_order, id
+        """)
+        now = datetime.now().isoformat()
+        cursor.executemany("""
+            INSERT OR IGNORE INTO reading_list_items (list_id, book_id, rank, added_at)
+            VALUES (?, ?, ?, ?)
+        """, [(DEFAULT_READING_LIST_ID, row["id"], i * RANK_GAP, now)
+              for i, row in enumerate(cursor.fetchall(), start=1)])
+        cursor.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('reading_lists_migrated', '1')")
+    
+    # Eski sürümün settings'e yazdığı hedefler (reading_goal_<yıl>) reading_goals'a taşınır
+    cursor.execute(r"""
+        INSERT OR IGNORE INTO reading_goals (year, target_books, created_at)
+        SELECT CAST(substr(key, 14) AS INTEGER), CAST(value AS INTEGER), ?
+        FROM settings
+        WHERE key LIKE 'reading\_goal\_%' ESCAPE '\' AND CAST(value AS INTEGER) > 0
+    """, (datetime.now().isoformat(),))
+    cursor.execute(r"DELETE FROM settings WHERE key LIKE 'reading\_goal\_%' ESCAPE '\'")
+    
     conn.commit()
     conn.close()
+    
+    # Veritabanı değişmiş olabilir (ör. yedekten dönüş)
+    clear_goal_cache()
+
+
+def _rollup_statements(row: str, sign: str) -> str:
+    """Bir oturumu (NEW/OLD) gün, hafta ve ay toplamlarına ekleyen/çıkaran SQL."""
+    keys = ", ".join(f"('{period}', {expr.format(at=f'{row}.read_at')})"
+                     for period, expr in ROLLUP_PERIODS.items())
+    if sign == "+":
+        values = ", ".join(f"('{period}', {expr.format(at=f'{row}.read_at')}, "
+                           f"{row}.pages, COALESCE({row}.minutes, 0), 1)"
+                           for period, expr in ROLLUP_PERIODS.items())
+        return f"""
+            INSERT INTO reading_rollups (period, key, pages, minutes, sessions)
+            VALUES {values}
+            ON CONFLICT (period, key) DO UPDATE SET
+                pages = pages + excluded.pages,
+                minutes = minutes + excluded.minutes,
+                sessions = sessions + 1;
+        """
+    return f"""
+        UPDATE reading_rollups SET
+            pages = pages - {row}.pages,
+            minutes = minutes - COALESCE({row}.minutes, 0),
+            sessions = sessions - 1
+        WHERE (period, key) IN (VALUES {keys});
+        DELETE FROM reading_rollups WHERE (period, key) IN (VALUES {keys}) AND sessions <= 0;
+    """
+
+
+def _create_reading_sessions(cursor):
+    """
+    Okuma oturumları ve gün/hafta/ay toplamları.
+    
+    reading_sessions sadece eklenir (düzeltme için silinebilir);
+    reading_rollups tetikleyicilerle oturum oturum güncellenir, istatistikler
+    binlerce oturumu değil bu küçük seriyi okur.
+    """
+    cursor.executescript(f"""
+        CREATE TABLE IF NOT EXISTS reading_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_id INTEGER NOT NULL,
+            read_at TEXT NOT NULL,         -- Oturumun zamanı (ISO)
+            start_page INTEGER NOT NULL,
+            end_page INTEGER NOT NULL,
+            pages INTEGER NOT NULL,        -- end_page - start_page
+            minutes INTEGER,               -- Süre (girilmediyse NULL)
+            created_at TEXT NOT NULL,
+            CHECK (end_page >= start_page)
+        );
+        
+        CREATE INDEX IF NOT EXISTS idx_reading_sessions_book ON reading_sessions(book_id, read_at);
+        CREATE INDEX IF NOT EXISTS idx_reading_sessions_read_at ON reading_sessions(read_at);
+        
+        -- period: 'day' | 'week' | 'month', key: 2024-05-17 | 2024-W20 | 2024-05
+        CREATE TABLE IF NOT EXISTS reading_rollups (
+            period TEXT NOT NULL,
+            key TEXT NOT NULL,
+            pages INTEGER NOT NULL DEFAULT 0,
+            minutes INTEGER NOT NULL DEFAULT 0,
+            sessions INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (period, key)
+        ) WITHOUT ROWID;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_reading_rollups_insert
+        AFTER INSERT ON reading_sessions
+        BEGIN
+            {_rollup_statements("NEW", "+")}
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_reading_rollups_update
+        AFTER UPDATE OF read_at, pages, minutes ON reading_sessions
+        BEGIN
+            {_rollup_statements("OLD", "-")}
+            {_rollup_statements("NEW", "+")}
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_reading_rollups_delete
+        AFTER DELETE ON reading_sessions
+        BEGIN
+            {_rollup_statements("OLD", "-")}
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_reading_sessions_book_delete
+        AFTER DELETE ON books
+        BEGIN
+            DELETE FROM reading_sessions WHERE book_id = OLD.id;
+        END;
+    """)
+
+
+def _create_quote_search(cursor):
+    """
+    Alıntılar için FTS5 arama index'i.
+    
+    İçerik quotes_search görünümünden okunur (alıntı + kitap adı/yazarı),
+    index'e ise tr_fold()'lanmış metin yazılır. Bu yüzden index 'rebuild'
+    ile değil, tetikleyicilerle ve ilk kurulumda elle doldurulur.
+    Kitabı silinmiş (sahipsiz) alıntılar index'te tutulmaz.
+    """
+    cursor.execute("""
+        CREATE VIEW IF NOT EXISTS quotes_search AS
+        SELECT q.id, q.text, q.note, q.chapter, b.title, b.author
+        FROM quotes q JOIN books b ON b.id = q.book_id
+    """)
+    
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'quotes_fts'")
+    if not cursor.fetchone():
+        cursor.execute("""
+            CREATE VIRTUAL TABLE quotes_fts USING fts5(
+                text, note, chapter, title, author,
+                content='quotes_search', content_rowid='id',
+                tokenize="unicode61 remove_diacritics 2"
+            )
+        """)
+        # Sıralama: alıntı metni ve not, kitap adı/yazarından daha ağırlıklı
+        cursor.execute("INSERT INTO quotes_fts(quotes_fts, rank) VALUES('rank', 'bm25(10.0, 5.0, 2.0, 2.0, 2.0)')")
+        cursor.execute("""
+            INSERT INTO quotes_fts(rowid, text, note, chapter, title, author)
+            SELECT id, tr_fold(text), tr_fold(note), tr_fold(chapter), tr_fold(title), tr_fold(author)
+            FROM quotes_search
+        """)
+    
+    # Index'ten silme, eklerken yazılan (tr_fold'lanmış) değerlerle yapılmalı
+    fts_delete = """
+        INSERT INTO quotes_fts(quotes_fts, rowid, text, note, chapter, title, author)
+        SELECT 'delete', {q}.id, tr_fold({q}.text), tr_fold({q}.note), tr_fold({q}.chapter),
+               tr_fold({b}.title), tr_fold({b}.author)
+        FROM {source} WHERE {where};
+    """
+    fts_insert = """
+        INSERT INTO quotes_fts(rowid, text, note, chapter, title, author)
+        SELECT {q}.id, tr_fold({q}.text), tr_fold({q}.note), tr_fold({q}.chapter),
+               tr_fold({b}.title), tr_fold({b}.author)
+        FROM {source} WHERE {where};
+    """
+    old_quote = dict(q="OLD", b="b", source="books b", where="b.id = OLD.book_id")
+    new_quote = dict(q="NEW", b="b", source="books b", where="b.id = NEW.book_id")
+    old_book = dict(q="q", b="OLD", source="quotes q", where="q.book_id = OLD.id")
+    new_book = dict(q="q", b="NEW", source="quotes q", where="q.book_id = NEW.id")
+    
+    cursor.executescript(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_quotes_fts_insert
+        AFTER INSERT ON quotes
+        BEGIN
+            {fts_insert.format(**new_quote)}
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_quotes_fts_delete
+        AFTER DELETE ON quotes
+        BEGIN
+            {fts_delete.format(**old_quote)}
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_quotes_fts_update
+        AFTER UPDATE OF text, note, chapter, book_id ON quotes
+        BEGIN
+            {fts_delete.format(**old_quote)}
+            {fts_insert.format(**new_quote)}
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_quotes_fts_book_update
+        AFTER UPDATE OF title, author ON books
+        WHEN OLD.title IS NOT NEW.title OR OLD.author IS NOT NEW.author
+        BEGIN
+            {fts_delete.format(**old_book)}
+            {fts_insert.format(**new_book)}
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_quotes_fts_book_delete
+        AFTER DELETE ON books
+        BEGIN
+            {fts_delete.format(**old_book)}
+        END;
+    """)
 
 
 def add_book(
@@ -304,31 +870,37 @@ def add_book(
     conn.commit()
     conn.close()
     
+    notify_change("books", "insert", [book_id])
     return book_id
 
 
-def get_all_books():
+def get_all_books(columns="*"):
     """
     Tüm kitapları getirir.
     Eklenme sırasına göre (eski → yeni) sıralar.
     
+    Args:
+        columns: Okunacak sütunlar (varsayılan: hepsi; dışa aktarma ve AI için)
+    
     Returns:
         Kitap listesi (her biri dict benzeri Row objesi)
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT * FROM books ORDER BY id ASC
-    """)
-    
-    books = cursor.fetchall()
-    conn.close()
+    return BookQuery(columns).fetch()
+
+
+def get_book_rows(columns: list, ids=None):
+    """
+    Kitapların sadece istenen sütunlarını getirir.
+    Liste görünümü için description/review gibi uzun alanları okumamaya yarar.
     
-    return books
+    Args:
+        columns: Sütun adları (books tablosundaki isimler)
+        ids: Sadece bu kitaplar (None ise hepsi)
+    """
+    return BookQuery(columns).ids(ids).fetch()
 
 
-def get_filtered_books(status=None, rating=None, year=None):
+def get_filtered_books(status=None, rating=None, year=None, columns=LIST_COLUMNS):
     """
     Filtrelenmiş kitapları getirir.
     
@@ -336,35 +908,12 @@ def get_filtered_books(status=None, rating=None, year=None):
         status: 'unread', 'reading', 'read' veya None (tümü)
         rating: 1-5 arası puan veya None (tümü)
         year: Yayın yılı veya None (tümü)
+        columns: Okunacak sütunlar (varsayılan: liste görünümü alanları)
     
     Returns:
         Filtrelenmiş kitap listesi
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    query = "SELECT * FROM books WHERE 1=1"
-    params = []
-    
-    if status:
-        query += " AND status = ?"
-        params.append(status)
-    
-    if rating:
-        query += " AND rating = ?"
-        params.append(rating)
-    
-    if year:
-        query += " AND publish_year = ?"
-        params.append(year)
-    
-    query += " ORDER BY id ASC"
-    
-    cursor.execute(query, params)
-    books = cursor.fetchall()
-    conn.close()
-    
-    return books
+    return BookQuery(columns).status(status).rating(rating).year(year).fetch()
 
 
 def get_distinct_years():
@@ -436,6 +985,8 @@ def update_book(book_id, **kwargs):
     
     conn.commit()
     conn.close()
+    
+    notify_change("books", "update", [book_id], kwargs.keys())
 
 
 def delete_book(book_id):
@@ -447,34 +998,288 @@ def delete_book(book_id):
     conn = get_connection()
     cursor = conn.cursor()
     
+    # Raf bağlantılarını tetikleyici siler; bildirim için önceden okunur
+    cursor.execute("SELECT book_id, shelf_id FROM book_shelves WHERE book_id = ?", (book_id,))
+    links = [tuple(row) for row in cursor.fetchall()]
     cursor.execute("DELETE FROM books WHERE id = ?", (book_id,))
     
     conn.commit()
     conn.close()
+    
+    notify_change("book_shelves", "delete", links)
+    notify_change("books", "delete", [book_id])
 
 
-def search_books(query):
+def search_books(query, columns=LIST_COLUMNS):
     """
     Kitap arar (başlık veya yazar içinde).
     
     LIKE '%sorgu%': İçinde 'sorgu' geçen her şeyi bulur
     Büyük/küçük harf duyarsız (SQLite varsayılanı)
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    return BookQuery(columns).text(query).order_by("-created_at").fetch()
+
+
+# ==================== KİTAP SORGULARI ====================
+
+_record_types = {}
+
+
+def _encode_cursor(sort: str, descending: bool, key, last_id: int) -> str:
+    """Sayfa imleci: son kaydın (sıralama değeri, id) çifti, URL'de taşınabilir metin."""
+    payload = json.dumps([sort, descending, key, last_id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort: str, descending: bool) -> tuple:
+    """İmleci çözer; başka bir sıralamaya aitse ValueError verir."""
+    try:
+        cursor_sort, cursor_desc, key, last_id = json.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Geçersiz sayfa imleci: {cursor}") from e
     
-    search_term = f"%{query}%"
+    if cursor_sort != sort or cursor_desc != descending:
+        raise ValueError("Sayfa imleci farklı bir sıralamaya ait")
+    return key, last_id
+
+
+def _keyset_condition(column: str, id_column: str, descending: bool, key, last_id: int) -> tuple:
+    """
+    (column, id) sırasında son kayıttan sonrakileri seçen koşul.
+    SQLite'ta NULL'lar artan sırada başta, azalan sırada sonda gelir.
     
-    cursor.execute("""
-        SELECT * FROM books 
-        WHERE title LIKE ? OR author LIKE ?
-        ORDER BY created_at DESC
-    """, (search_term, search_term))
+    Returns:
+        (koşul, parametreler)
+    """
+    if column == id_column:
+        return f"{id_column} {'<' if descending else '>'} ?", [last_id]
     
-    books = cursor.fetchall()
-    conn.close()
+    if key is None:
+        if descending:
+            return f"{column} IS NULL AND {id_column} < ?", [last_id]
+        return f"({column} IS NULL AND {id_column} > ?) OR {column} IS NOT NULL", [last_id]
     
-    return books
+    condition = f"({column}, {id_column}) {'<' if descending else '>'} (?, ?)"
+    if descending:
+        condition += f" OR {column} IS NULL"
+    return condition, [key, last_id]
+
+
+def _record_type(columns: tuple):
+    """
+    Verilen sütunlar için __slots__'lu hafif kayıt sınıfı üretir (önbellekli).
+    sqlite3.Row gibi book["title"], book[0] ve dict(book) ile kullanılabilir.
+    """
+    if columns not in _record_types:
+        positions = {name: i for i, name in enumerate(columns)}
+        
+        class BookRecord:
+            __slots__ = columns
+            
+            def __init__(self, *values):
+                for name, value in zip(columns, values):
+                    setattr(self, name, value)
+            
+            def __getitem__(self, key):
+                if isinstance(key, int):
+                    key = columns[key]
+                elif key not in positions:
+                    raise IndexError(f"Sütun sorguda yok: {key}")
+                return getattr(self, key)
+            
+            def keys(self):
+                return list(columns)
+            
+            def get(self, key, default=None):
+                return getattr(self, key, default) if key in positions else default
+            
+            def __len__(self):
+                return len(columns)
+            
+            def __repr__(self):
+                return f"BookRecord({', '.join(f'{n}={getattr(self, n)!r}' for n in columns)})"
+        
+        _record_types[columns] = BookRecord
+    return _record_types[columns]
+
+
+class BookQuery:
+    """
+    books tablosu için sorgu oluşturucu.
+    
+    Koşullar zincirlenerek eklenir, sonuç sadece seçilen sütunlarla döner:
+    
+        BookQuery(LIST_COLUMNS).status("read").shelf(3).order_by("-created_at").fetch()
+        BookQuery(["id"]).text("tolkien").count()
+    
+    None verilen koşullar yok sayılır (filtre çubuğundaki "Tümü" gibi).
+    columns="*" tüm sütunları sqlite3.Row olarak döndürür.
+    """
+    
+    def __init__(self, columns=LIST_COLUMNS):
+        self._columns = columns
+        self._where = []
+        self._params = []
+        self._order = ["id ASC"]
+        self._limit = None
+        self._offset = 0
+    
+    @staticmethod
+    def _column(name: str) -> str:
+        """Sütun adını doğrular (SQL'e parametre olarak verilemez)."""
+        if not name.replace("_", "").isalnum():
+            raise ValueError(f"Geçersiz sütun adı: {name}")
+        return name
+    
+    # ---------- Koşullar ----------
+    
+    def where(self, condition: str, *params):
+        """Serbest SQL koşulu ekler (parametreler ? ile)."""
+        self._where.append(f"({condition})")
+        self._params.extend(params)
+        return self
+    
+    def status(self, status):
+        return self.where("status = ?", status) if status else self
+    
+    def rating(self, rating):
+        return self.where("rating = ?", rating) if rating else self
+    
+    def year(self, year):
+        return self.where("publish_year = ?", year) if year else self
+    
+    def series(self, series_name):
+        return self.where("series_name = ?", series_name) if series_name else self
+    
+    def ids(self, book_ids):
+        if book_ids is None:
+            return self
+        # Tek parametre: çok sayıda id SQLite'ın değişken sınırına takılmaz
+        return self.where("id IN (SELECT value FROM json_each(?))", json.dumps(list(book_ids)))
+    
+    def shelf(self, shelf_id):
+        if shelf_id is None:
+            return self
+        return self.where("id IN (SELECT book_id FROM book_shelves WHERE shelf_id = ?)", shelf_id)
+    
+    def tag(self, tag):
+        """Virgülle ayrılmış etiketlerde tam eşleşme (büyük/küçük harf duyarsız)."""
+        if not tag or not tag.strip():
+            return self
+        return self.where(
+            "',' || REPLACE(REPLACE(LOWER(tags), ', ', ','), ' ,', ',') || ',' LIKE ?",
+            f"%,{tag.strip().lower()},%"
+        )
+    
+    def text(self, query):
+        """Başlık veya yazarda geçen metin (search_books ile aynı)."""
+        if not query or not query.strip():
+            return self
+        pattern = f"%{query.strip()}%"
+        return self.where("title LIKE ? OR author LIKE ?", pattern, pattern)
+    
+    # ---------- Sıralama ve sayfalama ----------
+    
+    def order_by(self, *terms):
+        """Sıralama: "title", "-created_at" (eksi: azalan)."""
+        self._order = [
+            f"{self._column(term[1:])} DESC" if term.startswith("-") else f"{self._column(term)} ASC"
+            for term in terms
+        ]
+        return self
+    
+    def limit(self, limit: int, offset: int = 0):
+        self._limit = limit
+        self._offset = offset
+        return self
+    
+    def page(self, size: int, cursor: str = None, sort: str = "id", descending: bool = False) -> tuple:
+        """
+        Anahtar kümesi (keyset) sayfalama: (sort, id) sırasında imleçteki
+        kayıttan sonraki size kitabı getirir. OFFSET'in aksine ileri sayfalar
+        da index'ten doğrudan bulunur; araya kayıt eklenince sayfa kaymaz.
+        
+        Returns:
+            (kitaplar, sonraki sayfanın imleci veya son sayfaysa None)
+        """
+        if sort not in PAGE_SORTS:
+            raise ValueError(f"Sayfalanamayan sıralama: {sort}")
+        
+        query = BookQuery(self._columns)
+        query._where = list(self._where)
+        query._params = list(self._params)
+        
+        if cursor:
+            key, last_id = _decode_cursor(cursor, sort, descending)
+            condition, params = _keyset_condition(sort, "id", descending, key, last_id)
+            query.where(condition, *params)
+        
+        direction = "DESC" if descending else "ASC"
+        query._order = [f"{name} {direction}" for name in dict.fromkeys((sort, "id"))]
+        
+        # İmleç için sıralama sütunu ve id her zaman okunur
+        if query._columns != "*":
+            query._columns = list(query._columns) + [
+                name for name in dict.fromkeys((sort, "id")) if name not in query._columns
+            ]
+        
+        books = query.limit(size + 1).fetch()
+        if len(books) <= size:
+            return books, None
+        
+        books = books[:size]
+        return books, _encode_cursor(sort, descending, books[-1][sort], books[-1]["id"])
+    
+    # ---------- Çalıştırma ----------
+    
+    def sql(self) -> tuple:
+        """(sorgu, parametreler) döndürür."""
+        if self._columns == "*":
+            projection = "*"
+        else:
+            projection = ", ".join(self._column(name) for name in self._columns)
+        
+        query = f"SELECT {projection} FROM books"
+        if self._where:
+            query += " WHERE " + " AND ".join(self._where)
+        query += " ORDER BY " + ", ".join(self._order)
+        
+        params = list(self._params)
+        if self._limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params += [self._limit, self._offset]
+        
+        return query, params
+    
+    def fetch(self) -> list:
+        """Sorguyu çalıştırır."""
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        if self._columns != "*":
+            record = _record_type(tuple(self._columns))
+            cursor.row_factory = lambda _cursor, row: record(*row)
+        
+        query, params = self.sql()
+        cursor.execute(query, params)
+        books = cursor.fetchall()
+        conn.close()
+        
+        return books
+    
+    def count(self) -> int:
+        """Koşullara uyan kitap sayısı."""
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        query = "SELECT COUNT(*) FROM books"
+        if self._where:
+            query += " WHERE " + " AND ".join(self._where)
+        cursor.execute(query, self._params)
+        count = cursor.fetchone()[0]
+        conn.close()
+        
+        return count
 
 
 # ==================== AYARLAR ====================
@@ -526,21 +1331,40 @@ def set_setting(key: str, value: str):
 
 # ==================== RAFLAR ====================
 
-def get_all_shelves():
-    """Tüm rafları getirir."""
+def get_all_shelves(include_smart: bool = True):
+    """
+    Tüm rafları getirir.
+    include_smart=False: akıllı raflar hariç (elle kitap eklenebilen raflar)
+    """
     conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM shelves ORDER BY created_at")
+    query = "SELECT * FROM shelves"
+    if not include_smart:
+        query += " WHERE rule IS NULL"
+    cursor.execute(query + " ORDER BY created_at")
     shelves = cursor.fetchall()
     
     conn.close()
     return shelves
 
 
-def add_shelf(name: str, icon: str = "📚"):
+def get_shelf(shelf_id: int):
+    """Tek bir rafı getirir (yoksa None)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT * FROM shelves WHERE id = ?", (shelf_id,))
+    shelf = cursor.fetchone()
+    
+    conn.close()
+    return shelf
+
+
+def add_shelf(name: str, icon: str = "📚", rule: dict = None):
     """
     Yeni raf ekler.
+    rule verilirse akıllı raf olur (bkz. services/smart_shelves.py).
     
     Returns:
         Eklenen rafın id'si veya None (isim zaten varsa)
@@ -551,13 +1375,14 @@ def add_shelf(name: str, icon: str = "📚"):
     try:
         now = datetime.now().isoformat()
         cursor.execute("""
-            INSERT INTO shelves (name, icon, created_at)
-            VALUES (?, ?, ?)
-        """, (name, icon, now))
+            INSERT INTO shelves (name, icon, rule, created_at)
+            VALUES (?, ?, ?, ?)
+        """, (name, icon, json.dumps(rule, ensure_ascii=False) if rule else None, now))
         
         shelf_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        notify_change("shelves", "insert", [shelf_id])
         return shelf_id
     except sqlite3.IntegrityError:
         # İsim zaten var
@@ -570,14 +1395,17 @@ def delete_shelf(shelf_id: int):
     conn = get_connection()
     cursor = conn.cursor()
     
+    # Bağlantıları trg_book_shelves_shelf_delete siler
     cursor.execute("DELETE FROM shelves WHERE id = ?", (shelf_id,))
     
     conn.commit()
     conn.close()
+    
+    notify_change("shelves", "delete", [shelf_id])
 
 
-def update_shelf(shelf_id: int, name: str = None, icon: str = None):
-    """Raf bilgilerini günceller."""
+def update_shelf(shelf_id: int, name: str = None, icon: str = None, rule: dict = None):
+    """Raf bilgilerini günceller (rule: akıllı rafın yeni kuralı)."""
     conn = get_connection()
     cursor = conn.cursor()
     
@@ -585,9 +1413,15 @@ def update_shelf(shelf_id: int, name: str = None, icon: str = None):
         cursor.execute("UPDATE shelves SET name = ? WHERE id = ?", (name, shelf_id))
     if icon:
         cursor.execute("UPDATE shelves SET icon = ? WHERE id = ?", (icon, shelf_id))
+    if rule:
+        cursor.execute("UPDATE shelves SET rule = ? WHERE id = ?",
+                       (json.dumps(rule, ensure_ascii=False), shelf_id))
     
     conn.commit()
     conn.close()
+    
+    columns = [col for col, value in (("name", name), ("icon", icon), ("rule", rule)) if value]
+    notify_change("shelves", "update", [shelf_id] if columns else [], columns)
 
 
 def add_book_to_shelf(book_id: int, shelf_id: int):
@@ -601,6 +1435,7 @@ def add_book_to_shelf(book_id: int, shelf_id: int):
             VALUES (?, ?)
         """, (book_id, shelf_id))
         conn.commit()
+        notify_change("book_shelves", "insert", [(book_id, shelf_id)])
     except sqlite3.IntegrityError:
         # Zaten ekli
         pass
@@ -617,26 +1452,18 @@ def remove_book_from_shelf(book_id: int, shelf_id: int):
         DELETE FROM book_shelves
         WHERE book_id = ? AND shelf_id = ?
     """, (book_id, shelf_id))
+    removed = cursor.rowcount
     
     conn.commit()
     conn.close()
+    
+    if removed:
+        notify_change("book_shelves", "delete", [(book_id, shelf_id)])
 
 
-def get_books_in_shelf(shelf_id: int):
-    """Bir raftaki kitapları getirir."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT b.* FROM books b
-        INNER JOIN book_shelves bs ON b.id = bs.book_id
-        WHERE bs.shelf_id = ?
-        ORDER BY b.created_at DESC
-    """, (shelf_id,))
-    
-    books = cursor.fetchall()
-    conn.close()
-    return books
+def get_books_in_shelf(shelf_id: int, columns=LIST_COLUMNS):
+    """Bir raftaki kitapları getirir (en yeni eklenen üstte)."""
+    return BookQuery(columns).shelf(shelf_id).order_by("-created_at").fetch()
 
 
 def get_shelves_for_book(book_id: int):
@@ -661,27 +1488,86 @@ def get_shelf_book_count(shelf_id: int) -> int:
     conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute("""
-        SELECT COUNT(*) as count FROM book_shelves WHERE shelf_id = ?
-    """, (shelf_id,))
+    cursor.execute("SELECT book_count FROM shelves WHERE id = ?", (shelf_id,))
     
     result = cursor.fetchone()
     conn.close()
-    return result["count"]
+    return result["book_count"] if result else 0
 
 
-# ==================== İSTATİSTİKLER ====================
-
-def get_statistics() -> dict:
+def get_shelves_with_counts(shelf_ids=None):
     """
-    Kütüphane istatistiklerini döndürür.
+    Rafları kitap sayılarıyla tek sorguda getirir (book_count sütunu).
+    shelf_ids verilirse sadece o raflar.
     """
     conn = get_connection()
     cursor = conn.cursor()
     
-    stats = {}
+    query = "SELECT id, name, icon, book_count, rule, created_at FROM shelves"
+    params = []
+    if shelf_ids is not None:
+        query += " WHERE id IN (SELECT value FROM json_each(?))"
+        params.append(json.dumps(list(shelf_ids)))
+    cursor.execute(query + " ORDER BY created_at", params)
+    shelves = cursor.fetchall()
     
-    # Toplam kitap
+    conn.close()
+    return shelves
+
+
+def get_smart_shelves(shelf_ids=None) -> list:
+    """
+    Akıllı rafları kuralları çözülmüş olarak getirir.
+    
+    Returns:
+        [{"id", "name", "icon", "rule": dict}, ...]
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    query = "SELECT id, name, icon, rule FROM shelves WHERE rule IS NOT NULL"
+    params = []
+    if shelf_ids is not None:
+        query += " AND id IN (SELECT value FROM json_each(?))"
+        params.append(json.dumps(list(shelf_ids)))
+    cursor.execute(query + " ORDER BY created_at", params)
+    rows = cursor.fetchall()
+    conn.close()
+    
+    shelves = []
+    for row in rows:
+        try:
+            rule = json.loads(row["rule"])
+        except ValueError:
+            continue
+        shelves.append({"id": row["id"], "name": row["name"], "icon": row["icon"], "rule": rule})
+    return shelves
+
+
+def get_all_book_shelves():
+    """Tüm kitap-raf eşleşmelerini (book_id, shelf_id) olarak getirir."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT book_id, shelf_id FROM book_shelves")
+    pairs = [(row["book_id"], row["shelf_id"]) for row in cursor.fetchall()]
+    
+    conn.close()
+    return pairs
+
+
+# ==================== İSTATİSTİKLER ====================
+
+def get_statistics() -> dict:
+    """
+    Kütüphane istatistiklerini döndürür.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    stats = {}
+    
+    # Toplam kitap
     cursor.execute("SELECT COUNT(*) as count FROM books")
     stats["total_books"] = cursor.fetchone()["count"]
     
@@ -721,6 +1607,10 @@ def get_statistics() -> dict:
     cursor.execute("SELECT COUNT(*) as count FROM shelves")
     stats["total_shelves"] = cursor.fetchone()["count"]
     
+    # Yazar sayısı
+    cursor.execute("SELECT COUNT(DISTINCT author) as count FROM books WHERE author IS NOT NULL AND author != ''")
+    stats["total_authors"] = cursor.fetchone()["count"]
+    
     conn.close()
     return stats
 
@@ -744,11 +1634,10 @@ def get_monthly_reading_stats(year: int = None) -> list:
                 COALESCE(SUM(page_count), 0) as pages
             FROM books 
             WHERE status = 'read' 
-                AND finish_date IS NOT NULL
-                AND strftime('%Y', finish_date) = ?
+                AND finish_date >= ? AND finish_date < ?
             GROUP BY year, month
             ORDER BY year, month
-        """, (str(year),))
+        """, year_range(year))
     else:
         cursor.execute("""
             SELECT 
@@ -822,7 +1711,21 @@ def get_author_stats(limit: int = 10) -> list:
     return results
 
 
-def get_category_stats() -> list:
+# Virgülle ayrılmış kategorileri satırlara bölen sorgu (category, book_id, rating)
+# Sayım SQLite'ta yapılır, kategori sütunu Python'a taşınmaz
+CATEGORY_SPLIT_SQL = """
+    WITH RECURSIVE split(book_id, rating, category, rest) AS (
+        SELECT id, rating, NULL, categories || ',' FROM books
+        WHERE categories IS NOT NULL AND categories != ''
+        UNION ALL
+        SELECT book_id, rating, trim(substr(rest, 1, instr(rest, ',') - 1)),
+               substr(rest, instr(rest, ',') + 1)
+        FROM split WHERE rest != ''
+    )
+"""
+
+
+def get_category_stats(limit: int = 15) -> list:
     """
     Kategori dağılımını döndürür.
     
@@ -832,26 +1735,116 @@ def get_category_stats() -> list:
     conn = get_connection()
     cursor = conn.cursor()
     
-    # Kategoriler virgülle ayrılmış olabilir, her birini say
+    # Kategoriler virgülle ayrılmış olabilir, her biri ayrı sayılır
+    cursor.execute(CATEGORY_SPLIT_SQL + """
+        SELECT category, COUNT(*) AS count FROM split
+        WHERE category IS NOT NULL AND category != ''
+        GROUP BY category
+        ORDER BY count DESC, category
+        LIMIT ?
+    """, (limit,))
+    
+    results = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return results
+
+
+def get_library_version() -> int:
+    """books tablosu her değiştiğinde artan sayaç (tetikleyicilerle güncel)."""
+    return int(get_setting(LIBRARY_VERSION_KEY, "0"))
+
+
+def get_library_digest(top: int = 10) -> dict:
+    """
+    AI bağlamı için kitaplığın özet sayıları (tümü SQL'de hesaplanır).
+    
+    Args:
+        top: Listelerde (yazarlar, kategoriler, kitaplar) en fazla kaç kayıt
+    
+    Returns:
+        {"total", "status_counts", "pages", "avg_rating", "length_profile",
+         "top_authors", "top_categories", "top_rated", "recent_read", "reading"}
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    digest = {}
+    
+    cursor.execute("SELECT status, COUNT(*) AS count FROM books GROUP BY status")
+    digest["status_counts"] = {row["status"] or "unread": row["count"] for row in cursor.fetchall()}
+    digest["total"] = sum(digest["status_counts"].values())
+    
     cursor.execute("""
-        SELECT categories FROM books 
-        WHERE categories IS NOT NULL AND categories != ''
+        SELECT
+            COALESCE(SUM(page_count), 0) AS pages,
+            COALESCE(SUM(CASE WHEN status = 'read' THEN page_count END), 0) AS read_pages,
+            ROUND(AVG(CASE WHEN rating > 0 THEN rating END), 1) AS avg_rating,
+            ROUND(AVG(CASE WHEN status = 'read' AND page_count > 0 THEN page_count END)) AS avg_read_length,
+            SUM(status = 'read' AND page_count > 0 AND page_count < 200) AS short,
+            SUM(status = 'read' AND page_count >= 200 AND page_count < 400) AS medium,
+            SUM(status = 'read' AND page_count >= 400) AS long
+        FROM books
     """)
+    row = cursor.fetchone()
+    digest["pages"] = row["pages"]
+    digest["read_pages"] = row["read_pages"]
+    digest["avg_rating"] = row["avg_rating"]
+    digest["length_profile"] = {
+        "average": int(row["avg_read_length"] or 0),
+        "short": row["short"] or 0,
+        "medium": row["medium"] or 0,
+        "long": row["long"] or 0,
+    }
     
-    category_counts = {}
-    for row in cursor.fetchall():
-        cats = row["categories"].split(",")
-        for cat in cats:
-            cat = cat.strip()
-            if cat:
-                category_counts[cat] = category_counts.get(cat, 0) + 1
+    cursor.execute("""
+        SELECT author, COUNT(*) AS count,
+               SUM(status = 'read') AS read,
+               ROUND(AVG(CASE WHEN rating > 0 THEN rating END), 1) AS avg_rating
+        FROM books
+        WHERE author IS NOT NULL AND author != ''
+        GROUP BY author
+        ORDER BY count DESC, read DESC
+        LIMIT ?
+    """, (top,))
+    digest["top_authors"] = [dict(row) for row in cursor.fetchall()]
+    
+    cursor.execute(CATEGORY_SPLIT_SQL + """
+        SELECT category, COUNT(*) AS count,
+               ROUND(AVG(CASE WHEN rating > 0 THEN rating END), 1) AS avg_rating
+        FROM split
+        WHERE category IS NOT NULL AND category != ''
+        GROUP BY category
+        ORDER BY count DESC, category
+        LIMIT ?
+    """, (top,))
+    digest["top_categories"] = [dict(row) for row in cursor.fetchall()]
     
-    conn.close()
+    cursor.execute("""
+        SELECT title, author, rating FROM books
+        WHERE rating >= 4
+        ORDER BY rating DESC, finish_date DESC
+        LIMIT ?
+    """, (top,))
+    digest["top_rated"] = [dict(row) for row in cursor.fetchall()]
+    
+    cursor.execute("""
+        SELECT title, author, rating, finish_date FROM books
+        WHERE status = 'read' AND finish_date IS NOT NULL
+        ORDER BY finish_date DESC
+        LIMIT ?
+    """, (top,))
+    digest["recent_read"] = [dict(row) for row in cursor.fetchall()]
     
-    # Sırala ve döndür
-    results = [{"category": k, "count": v} for k, v in category_counts.items()]
-    results.sort(key=lambda x: x["count"], reverse=True)
-    return results[:15]  # En fazla 15
+    cursor.execute("""
+        SELECT title, author, current_page, page_count FROM books
+        WHERE status = 'reading'
+        ORDER BY updated_at DESC
+        LIMIT ?
+    """, (top,))
+    digest["reading"] = [dict(row) for row in cursor.fetchall()]
+    
+    conn.close()
+    return digest
 
 
 def get_reading_speed_stats() -> dict:
@@ -934,171 +1927,84 @@ def get_reading_speed_stats() -> dict:
     return stats
 
 
-def get_reading_goal(year: int = None) -> dict:
+def year_range(year: int) -> tuple:
     """
-    Okuma hedefi durumunu döndürür.
-    
-    Returns:
-        {
-            "year": 2024,
-            "goal": 24,
-            "read": 18,
-            "percentage": 75,
-            "remaining": 6,
-            "on_track": True,
-        }
+    Yılın tarih aralığı: (başlangıç, bitiş hariç).
+    strftime('%Y', ...) = ? yerine aralık karşılaştırması index'i kullanır.
     """
-    from datetime import datetime
-    
-    if year is None:
-        year = datetime.now().year
-    
+    return f"{year}-01-01", f"{year + 1}-01-01"
+
+
+def get_books_finished_in(year: int, columns: list) -> list:
+    """Yıl içinde bitirilen kitaplar (bitiş tarihine göre, idx_books_status_finish ile)."""
     conn = get_connection()
     cursor = conn.cursor()
     
-    # Hedefi al
-    goal = int(get_setting(f"reading_goal_{year}", "0") or 0)
-    
-    # Bu yıl okunan kitap sayısı
-    cursor.execute("""
-        SELECT COUNT(*) as count FROM books 
-        WHERE status = 'read' 
-            AND finish_date IS NOT NULL
-            AND strftime('%Y', finish_date) = ?
-    """, (str(year),))
+    cursor.execute(f"""
+        SELECT {", ".join(columns)} FROM books
+        WHERE status = 'read' AND finish_date >= ? AND finish_date < ?
+        ORDER BY finish_date, id
+    """, year_range(year))
     
-    read = cursor.fetchone()["count"]
+    books = cursor.fetchall()
     conn.close()
-    
-    # Hesaplamalar
-    percentage = int((read / goal * 100)) if goal > 0 else 0
-    remaining = max(0, goal - read)
-    
-    # Yılın kaçıncı gününde olduğumuzu hesapla
-    now = datetime.now()
-    if now.year == year:
-        day_of_year = now.timetuple().tm_yday
-        days_in_year = 366 if (year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)) else 365
-        expected_percentage = (day_of_year / days_in_year) * 100
-        on_track = percentage >= expected_percentage
-    else:
-        on_track = percentage >= 100
-    
-    return {
-        "year": year,
-        "goal": goal,
-        "read": read,
-        "percentage": min(percentage, 100),
-        "remaining": remaining,
-        "on_track": on_track,
-    }
-
-
-def set_reading_goal(year: int, goal: int):
-    """Yıllık okuma hedefini ayarlar."""
-    set_setting(f"reading_goal_{year}", str(goal))
+    return books
 
 
-def get_year_summary(year: int) -> dict:
+def get_year_fingerprint(year: int) -> str:
     """
-    Yıllık özet raporu döndürür.
+    Yıllık özeti etkileyen verinin özeti: o yıl bitirilen kitaplar, yılın alıntıları
+    ve okuma oturumu toplamları. Değişmediyse kayıtlı özet yeniden kullanılabilir.
     
-    Returns:
-        {
-            "year": 2024,
-            "total_books": 24,
-            "total_pages": 8500,
-            "avg_rating": 4.2,
-            "avg_pages_per_book": 354,
-            "top_authors": [...],
-            "top_rated_books": [...],
-            "monthly_breakdown": [...],
-            "categories": [...],
-            "formats": {...},
-        }
+    Alıntıların updated_at sütunu olmadığından, özette gösterilen alanları
+    (metin, sayfa, favori, kitap adı/yazarı) özetlenir; alıntı düzenlenince
+    veya alıntılanan kitabın adı değişince özet yeniden hesaplanır.
     """
+    start, end = year_range(year)
     conn = get_connection()
     cursor = conn.cursor()
     
-    summary = {"year": year}
-    
-    # Temel istatistikler
     cursor.execute("""
-        SELECT 
-            COUNT(*) as total_books,
-            COALESCE(SUM(page_count), 0) as total_pages,
-            ROUND(AVG(CASE WHEN rating > 0 THEN rating END), 1) as avg_rating,
-            ROUND(AVG(page_count), 0) as avg_pages_per_book
-        FROM books 
-        WHERE status = 'read' 
-            AND finish_date IS NOT NULL
-            AND strftime('%Y', finish_date) = ?
-    """, (str(year),))
-    
-    row = cursor.fetchone()
-    summary["total_books"] = row["total_books"]
-    summary["total_pages"] = row["total_pages"]
-    summary["avg_rating"] = row["avg_rating"] or 0
-    summary["avg_pages_per_book"] = int(row["avg_pages_per_book"] or 0)
-    
-    # En çok okunan yazarlar (bu yıl)
-    cursor.execute("""
-        SELECT author, COUNT(*) as count
-        FROM books 
-        WHERE status = 'read' 
-            AND finish_date IS NOT NULL
-            AND strftime('%Y', finish_date) = ?
-            AND author IS NOT NULL AND author != ''
-        GROUP BY author
-        ORDER BY count DESC
-        LIMIT 5
-    """, (str(year),))
-    summary["top_authors"] = [dict(row) for row in cursor.fetchall()]
+        SELECT
+            (SELECT COUNT(*) || ':' || COALESCE(MAX(updated_at), '') || ':' || COALESCE(SUM(id), 0)
+             FROM books WHERE status = 'read' AND finish_date >= :start AND finish_date < :end),
+            (SELECT COALESCE(SUM(pages), 0) || ':' || COALESCE(SUM(sessions), 0)
+             FROM reading_rollups WHERE period = 'month' AND key BETWEEN :first_month AND :last_month)
+    """, {"start": start, "end": end, "first_month": f"{year}-01", "last_month": f"{year}-12"})
+    parts = [str(value) for value in cursor.fetchone()]
     
-    # En yüksek puanlı kitaplar
-    cursor.execute("""
-        SELECT title, author, rating
-        FROM books 
-        WHERE status = 'read' 
-            AND finish_date IS NOT NULL
-            AND strftime('%Y', finish_date) = ?
-            AND rating IS NOT NULL AND rating > 0
-        ORDER BY rating DESC, title
-        LIMIT 5
-    """, (str(year),))
-    summary["top_rated_books"] = [dict(row) for row in cursor.fetchall()]
-    
-    # Aylık dağılım
     cursor.execute("""
-        SELECT 
-            CAST(strftime('%m', finish_date) AS INTEGER) as month,
-            COUNT(*) as count
-        FROM books 
-        WHERE status = 'read' 
-            AND finish_date IS NOT NULL
-            AND strftime('%Y', finish_date) = ?
-        GROUP BY month
-        ORDER BY month
-    """, (str(year),))
+        SELECT q.id, q.text, q.page_number, q.is_favorite, b.title, b.author
+        FROM quotes q JOIN books b ON b.id = q.book_id
+        WHERE q.created_at >= ? AND q.created_at < ?
+        ORDER BY q.id
+    """, (start, end))
+    quotes = hashlib.sha1()
+    for row in cursor:
+        quotes.update(json.dumps(tuple(row), ensure_ascii=False).encode("utf-8"))
+    parts.append(quotes.hexdigest()[:16])
     
-    monthly = {i: 0 for i in range(1, 13)}
-    for row in cursor.fetchall():
-        monthly[row["month"]] = row["count"]
-    summary["monthly_breakdown"] = [{"month": m, "count": c} for m, c in monthly.items()]
+    conn.close()
+    return "|".join(parts)
+
+
+def get_quotes_of_year(year: int, limit: int = 10) -> list:
+    """Yıl içinde eklenen alıntılar (önce favoriler), kitap adıyla."""
+    conn = get_connection()
+    cursor = conn.cursor()
     
-    # Format dağılımı
     cursor.execute("""
-        SELECT format, COUNT(*) as count
-        FROM books 
-        WHERE status = 'read' 
-            AND finish_date IS NOT NULL
-            AND strftime('%Y', finish_date) = ?
-        GROUP BY format
-    """, (str(year),))
-    summary["formats"] = {row["format"] or "paperback": row["count"] for row in cursor.fetchall()}
+        SELECT q.id, q.text, q.page_number, q.is_favorite, q.created_at,
+               b.title AS book_title, b.author AS book_author
+        FROM quotes q JOIN books b ON b.id = q.book_id
+        WHERE q.created_at >= ? AND q.created_at < ?
+        ORDER BY q.is_favorite DESC, q.created_at DESC
+        LIMIT ?
+    """, year_range(year) + (limit,))
     
+    quotes = cursor.fetchall()
     conn.close()
-    return summary
+    return quotes
 
 
 # ==================== ALINTILAR ====================
@@ -1119,6 +2025,7 @@ def add_quote(book_id: int, text: str, page_number: int = None, chapter: str = N
     conn.commit()
     conn.close()
     
+    notify_change("quotes", "insert", [quote_id])
     return quote_id
 
 
@@ -1155,6 +2062,119 @@ def get_all_quotes() -> list:
     return quotes
 
 
+def get_quotes_page(size: int = 50, cursor: str = None, favorites_only: bool = False,
+                    text: str = None) -> tuple:
+    """
+    Tüm alıntıları en yeniden eskiye sayfa sayfa getirir.
+    text verilirse arama index'inden, en ilgiliden başlayarak getirir
+    (bkz. search_quotes).
+    
+    Args:
+        favorites_only: Sadece favoriler
+        text: Alıntı metninde, notta, bölümde veya kitap adı/yazarında geçen kelimeler
+    
+    Returns:
+        (alıntılar, sonraki sayfanın imleci veya None)
+    """
+    if text and text.strip():
+        return search_quotes(text, size, cursor, favorites_only)
+    
+    conditions = []
+    params = []
+    
+    if favorites_only:
+        conditions.append("q.is_favorite = 1")
+    if cursor:
+        key, last_id = _decode_cursor(cursor, "created_at", True)
+        condition, cursor_params = _keyset_condition("q.created_at", "q.id", True, key, last_id)
+        conditions.append(f"({condition})")
+        params += cursor_params
+    
+    conn = get_connection()
+    db_cursor = conn.cursor()
+    
+    db_cursor.execute(f"""
+        SELECT q.*, b.title as book_title, b.author as book_author
+        FROM quotes q
+        JOIN books b ON q.book_id = b.id
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY q.created_at DESC, q.id DESC
+        LIMIT ?
+    """, params + [size + 1])
+    
+    quotes = db_cursor.fetchall()
+    conn.close()
+    
+    if len(quotes) <= size:
+        return quotes, None
+    
+    quotes = quotes[:size]
+    return quotes, _encode_cursor("created_at", True, quotes[-1]["created_at"], quotes[-1]["id"])
+
+
+def _fts_query(text: str) -> str | None:
+    """
+    Kullanıcının yazdığını güvenli bir FTS5 sorgusuna çevirir:
+    her kelime tırnaklı ön ek araması, hepsi VE ile bağlı ("ışık" -> "isik"*).
+    """
+    words = re.findall(r"\w+", tr_fold(text or ""))
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_quotes(text: str, size: int = 50, cursor: str = None, favorites_only: bool = False) -> tuple:
+    """
+    Alıntılarda tam metin arama (FTS5), en ilgili sonuçtan başlayarak sayfa sayfa.
+    Türkçe harfler düzleştirilir: "isik" ile "Işık" bulunur.
+    
+    Sonuçlarda get_quotes_page alanlarına ek olarak snippet bulunur:
+    alıntı metninden eşleşen kelimelerin çevresi, kelimeler
+    SNIPPET_START/SNIPPET_END ile işaretli.
+    
+    Returns:
+        (alıntılar, sonraki sayfanın imleci veya None)
+    """
+    query = _fts_query(text)
+    if not query:
+        return [], None
+    
+    conditions = ["quotes_fts MATCH ?"]
+    params = [query]
+    
+    if favorites_only:
+        conditions.append("q.is_favorite = 1")
+    if cursor:
+        key, last_id = _decode_cursor(cursor, "rank", False)
+        condition, cursor_params = _keyset_condition("quotes_fts.rank", "quotes_fts.rowid", False, key, last_id)
+        conditions.append(f"({condition})")
+        params += cursor_params
+    
+    conn = get_connection()
+    db_cursor = conn.cursor()
+    
+    db_cursor.execute(f"""
+        SELECT q.*, b.title as book_title, b.author as book_author,
+               snippet(quotes_fts, 0, ?, ?, '…', 24) as snippet,
+               quotes_fts.rank as rank
+        FROM quotes_fts
+        JOIN quotes q ON q.id = quotes_fts.rowid
+        JOIN books b ON b.id = q.book_id
+        WHERE {" AND ".join(conditions)}
+        ORDER BY quotes_fts.rank, quotes_fts.rowid
+        LIMIT ?
+    """, [SNIPPET_START, SNIPPET_END] + params + [size + 1])
+    
+    quotes = db_cursor.fetchall()
+    conn.close()
+    
+    if len(quotes) <= size:
+        return quotes, None
+    
+    quotes = quotes[:size]
+    return quotes, _encode_cursor("rank", False, quotes[-1]["rank"], quotes[-1]["id"])
+
+
 def update_quote(quote_id: int, **kwargs) -> bool:
     """Alıntıyı günceller."""
     conn = get_connection()
@@ -1181,6 +2201,8 @@ def update_quote(quote_id: int, **kwargs) -> bool:
     conn.commit()
     conn.close()
     
+    if cursor.rowcount > 0:
+        notify_change("quotes", "update", [quote_id], [f for f in kwargs if f in allowed_fields])
     return cursor.rowcount > 0
 
 
@@ -1194,6 +2216,8 @@ def delete_quote(quote_id: int) -> bool:
     conn.commit()
     conn.close()
     
+    if cursor.rowcount > 0:
+        notify_change("quotes", "delete", [quote_id])
     return cursor.rowcount > 0
 
 
@@ -1210,10 +2234,210 @@ def toggle_quote_favorite(quote_id: int) -> bool:
     conn.commit()
     conn.close()
     
+    if cursor.rowcount > 0:
+        notify_change("quotes", "update", [quote_id], ["is_favorite"])
     return cursor.rowcount > 0
 
 
 # ==================== OKUMA HEDEFLERİ ====================
+# Hedef durumu ve tahminler yıl yıl önbellekte tutulur. Bir yıl sadece o yılda
+# bitirilmiş bir kitabın durumu/bitiş tarihi değişince (veya hedefi değişince)
+# yeniden hesaplanır; bunun için okunan kitapların yılı (kitap -> yıl) bellekte izlenir.
+# Okuma oturumları sadece bu yılın tahminini etkiler.
+
+_goal_cache = {}        # yıl -> hedef sözlüğü (hedef yoksa None)
+_goal_years = None      # hedefi olan yıllar
+_goal_day = None        # önbelleğin hesaplandığı gün
+_goal_book_years = None  # okunmuş kitap id -> bitiş yılı (ilk kullanımda yüklenir)
+_goal_lock = threading.RLock()
+
+# Bu sütunlar değişince kitabın sayıldığı yıl değişebilir
+GOAL_COLUMNS = {"status", "finish_date"}
+
+
+def _read_years(cursor, book_ids=None) -> dict:
+    """Okunmuş kitapların bitiş yılı (book_ids verilirse sadece onlar)."""
+    condition = "AND id IN (SELECT value FROM json_each(?))" if book_ids is not None else ""
+    params = [json.dumps(list(book_ids))] if book_ids is not None else []
+    cursor.execute(f"""
+        SELECT id, CAST(strftime('%Y', finish_date) AS INTEGER) AS year FROM books
+        WHERE status = 'read' AND finish_date IS NOT NULL AND finish_date != '' {condition}
+    """, params)
+    return {row["id"]: row["year"] for row in cursor.fetchall() if row["year"]}
+
+
+def _on_goal_change(table: str, op: str, ids: list, columns):
+    """Değişiklikten etkilenen yılların önbelleğini düşürür."""
+    global _goal_years
+    
+    if table == "reading_goals":
+        with _goal_lock:
+            _goal_years = None
+            for year in ids:
+                _goal_cache.pop(year, None)
+        return
+    if table == "reading_sessions":
+        with _goal_lock:
+            _goal_cache.pop(datetime.now().year, None)
+        return
+    if table != "books" or (op == "update" and columns and not GOAL_COLUMNS & set(columns)):
+        return
+    
+    with _goal_lock:
+        if _goal_book_years is None:
+            _goal_cache.clear()
+            return
+        
+        old_years = {_goal_book_years.pop(book_id) for book_id in ids if book_id in _goal_book_years}
+        new_years = {}
+        if op != "delete":
+            conn = get_connection()
+            new_years = _read_years(conn.cursor(), ids)
+            conn.close()
+            _goal_book_years.update(new_years)
+        
+        for year in old_years | set(new_years.values()):
+            _goal_cache.pop(year, None)
+
+
+subscribe(_on_goal_change)
+
+
+def clear_goal_cache():
+    """Hedef önbelleğini tamamen boşaltır (veritabanı dışarıdan değiştiyse)."""
+    global _goal_book_years, _goal_years
+    with _goal_lock:
+        _goal_cache.clear()
+        _goal_book_years = None
+        _goal_years = None
+
+
+def _goal_forecast(goal: dict, pace: dict, avg_pages: float, today) -> dict:
+    """
+    Hedefin beklenen/tahmini durumunu hesaplar.
+    
+    Bu yıl için: bugüne kadar beklenen kitap, yıl sonu tahmini ve hedef için gereken hız.
+    Tahmin, okuma oturumları varsa ölçülen sayfa hızından (kalan günlerde okunacak
+    sayfa / ortalama kitap kalınlığı), yoksa bu yılki kitap bitirme hızından yapılır.
+    Geçmiş yıllar kesinleşmiştir, gelecek yıllar için tahmin yapılmaz.
+    """
+    year, target, completed = goal["year"], goal["target_books"], goal["completed"]
+    days_in_year = (date(year + 1, 1, 1) - date(year, 1, 1)).days
+    
+    if year < today.year:
+        elapsed = days_in_year
+    elif year > today.year:
+        elapsed = 0
+    else:
+        elapsed = today.timetuple().tm_yday
+    days_left = days_in_year - elapsed
+    
+    expected = target * elapsed / days_in_year
+    forecast = {
+        "remaining": max(0, target - completed),
+        "days_left": days_left,
+        "expected": round(expected, 1),
+        "on_track": completed >= expected if elapsed else True,
+        "projected": completed,
+        "pace_source": None,
+        "needed_per_month": 0,
+        "needed_pages_per_day": 0,
+    }
+    if year != today.year:
+        forecast["on_track"] = completed >= target if year < today.year else True
+        return forecast
+    
+    if pace["source"] == "sessions" and avg_pages:
+        projected = completed + pace["pages_per_day"] * days_left / avg_pages
+        forecast["pace_source"] = "sessions"
+    elif completed:
+        projected = completed * days_in_year / elapsed
+        forecast["pace_source"] = "books"
+    else:
+        projected = completed
+    forecast["projected"] = int(projected)
+    
+    if forecast["remaining"] and days_left:
+        forecast["needed_per_month"] = round(forecast["remaining"] / (days_left / 30.44), 1)
+        if avg_pages:
+            forecast["needed_pages_per_day"] = round(forecast["remaining"] * avg_pages / days_left, 1)
+    return forecast
+
+
+def get_reading_goals(years=None) -> dict:
+    """
+    Hedefleri tamamlanma ve tahminleriyle döndürür.
+    
+    Önbellekte olmayan yıllar tek gruplu sorguyla hesaplanır.
+    
+    Returns:
+        {yıl: {"id", "year", "target_books", "created_at", "completed", "progress",
+               "remaining", "days_left", "expected", "on_track", "projected",
+               "pace_source", "needed_per_month", "needed_pages_per_day"}}
+        Hedefi olmayan yıllar sonuçta yer almaz.
+    """
+    global _goal_book_years, _goal_years, _goal_day
+    
+    with _goal_lock:
+        # "Bu yıl" ve beklenen ilerleme güne bağlı: gün dönünce önbellek yenilenir
+        today = datetime.now().date()
+        if _goal_day != today:
+            _goal_cache.clear()
+            _goal_day = today
+        
+        if years is None:
+            if _goal_years is None:
+                conn = get_connection()
+                _goal_years = [row["year"] for row in conn.execute("SELECT year FROM reading_goals")]
+                conn.close()
+            years = _goal_years
+        missing = [year for year in years if year not in _goal_cache]
+        
+        if missing:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            if _goal_book_years is None:
+                _goal_book_years = _read_years(cursor)
+            
+            # Eksik yılların hedefleri ve okunan kitap sayıları tek gruplu sorguda
+            cursor.execute("""
+                SELECT g.id, g.year, g.target_books, g.created_at, COUNT(b.id) AS completed
+                FROM reading_goals g
+                LEFT JOIN books b
+                    ON b.status = 'read'
+                   AND b.finish_date >= g.year || '-01-01' AND b.finish_date < (g.year + 1) || '-01-01'
+                WHERE g.year IN (SELECT value FROM json_each(?))
+                GROUP BY g.year
+            """, (json.dumps(missing),))
+            goals = [dict(row) for row in cursor.fetchall()]
+            
+            pace, avg_pages = {"source": None}, 0
+            if today.year in missing:
+                # Tahmin için bu yıl okunan kitapların ortalama kalınlığı (yoksa okunacakların)
+                cursor.execute("""
+                    SELECT COALESCE(
+                        (SELECT AVG(page_count) FROM books
+                         WHERE status = 'read' AND page_count > 0 AND finish_date >= :start AND finish_date < :end),
+                        (SELECT AVG(page_count) FROM books
+                         WHERE status IN ('reading', 'to_read', 'unread') AND page_count > 0)
+                    ) AS avg_pages
+                """, dict(zip(("start", "end"), year_range(today.year))))
+                avg_pages = cursor.fetchone()["avg_pages"] or 0
+            conn.close()
+            if today.year in missing:
+                pace = get_reading_pace()
+            
+            for year in missing:
+                _goal_cache[year] = None
+            for goal in goals:
+                target = goal["target_books"]
+                goal["progress"] = round(goal["completed"] / target * 100, 1) if target > 0 else 0
+                goal.update(_goal_forecast(goal, pace, avg_pages, today))
+                _goal_cache[goal["year"]] = goal
+        
+        return {year: _goal_cache[year] for year in years if _goal_cache[year]}
+
 
 def set_reading_goal(year: int, target_books: int) -> int:
     """Okuma hedefi belirler veya günceller."""
@@ -1223,68 +2447,29 @@ def set_reading_goal(year: int, target_books: int) -> int:
     now = datetime.now().isoformat()
     
     cursor.execute("""
-        INSERT OR REPLACE INTO reading_goals (year, target_books, created_at)
+        INSERT INTO reading_goals (year, target_books, created_at)
         VALUES (?, ?, ?)
+        ON CONFLICT (year) DO UPDATE SET target_books = excluded.target_books
+        RETURNING id
     """, (year, target_books, now))
     
-    goal_id = cursor.lastrowid
+    goal_id = cursor.fetchone()["id"]
     conn.commit()
     conn.close()
     
+    notify_change("reading_goals", "update", [year], ["target_books"])
     return goal_id
 
 
-def get_reading_goal(year: int) -> dict:
-    """Belirli yılın okuma hedefini getirir."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM reading_goals WHERE year = ?", (year,))
-    row = cursor.fetchone()
-    
-    if row:
-        goal = dict(row)
-        
-        # Okunan kitap sayısını hesapla
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM books 
-            WHERE status = 'read' 
-                AND finish_date IS NOT NULL
-                AND strftime('%Y', finish_date) = ?
-        """, (str(year),))
-        goal["completed"] = cursor.fetchone()["count"]
-        goal["progress"] = round((goal["completed"] / goal["target_books"]) * 100, 1) if goal["target_books"] > 0 else 0
-    else:
-        goal = None
-    
-    conn.close()
-    return goal
+def get_reading_goal(year: int = None) -> dict | None:
+    """Yılın (varsayılan: bu yıl) okuma hedefini tamamlanma ve tahminiyle getirir."""
+    year = year or datetime.now().year
+    return get_reading_goals([year]).get(year)
 
 
 def get_all_reading_goals() -> list:
-    """Tüm okuma hedeflerini getirir."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM reading_goals ORDER BY year DESC")
-    goals = []
-    
-    for row in cursor.fetchall():
-        goal = dict(row)
-        
-        # Okunan kitap sayısını hesapla
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM books 
-            WHERE status = 'read' 
-                AND finish_date IS NOT NULL
-                AND strftime('%Y', finish_date) = ?
-        """, (str(goal["year"]),))
-        goal["completed"] = cursor.fetchone()["count"]
-        goal["progress"] = round((goal["completed"] / goal["target_books"]) * 100, 1) if goal["target_books"] > 0 else 0
-        goals.append(goal)
-    
-    conn.close()
-    return goals
+    """Tüm okuma hedefleri (yeniden eskiye)."""
+    return sorted(get_reading_goals().values(), key=lambda goal: goal["year"], reverse=True)
 
 
 def delete_reading_goal(year: int) -> bool:
@@ -1297,97 +2482,523 @@ def delete_reading_goal(year: int) -> bool:
     conn.commit()
     conn.close()
     
+    if cursor.rowcount > 0:
+        notify_change("reading_goals", "delete", [year])
     return cursor.rowcount > 0
 
 
-# ==================== TOPLU İŞLEMLER ====================
+# ==================== OKUMA OTURUMLARI ====================
 
-def bulk_update_books(book_ids: list, **kwargs) -> int:
-    """Birden fazla kitabı aynı anda günceller."""
-    if not book_ids:
-        return 0
+def add_reading_session(book_id: int, end_page: int, start_page: int = None,
+                        minutes: int = None, read_at: str = None) -> int | None:
+    """
+    Okuma oturumu kaydeder ve kitabın sayfasını ilerletir.
+    
+    start_page verilmezse kitabın şu anki sayfasından başlanır.
+    Okunmadı/Okuyacağım durumundaki kitap "Okunuyor"a geçer (başlama tarihi boşsa yazılır).
     
+    Returns:
+        Oturum ID'si (kitap yoksa veya sayfalar geçersizse None)
+    """
     conn = get_connection()
     cursor = conn.cursor()
     
-    now = datetime.now().isoformat()
-    kwargs["updated_at"] = now
-    
-    # Güvenli alan listesi
-    allowed_fields = [
-        "status", "rating", "shelf", "location", "format",
-        "start_date", "finish_date", "tags", "categories",
-        "language", "publisher", "updated_at"
-    ]
+    cursor.execute("SELECT current_page, status FROM books WHERE id = ?", (book_id,))
+    book = cursor.fetchone()
+    if start_page is None and book:
+        start_page = book["current_page"] or 0
+    if not book or end_page is None or end_page < start_page:
+        conn.close()
+        return None
     
-    updates = []
-    values = []
+    now = datetime.now()
+    read_at = read_at or now.isoformat(timespec="seconds")
     
-    for field, value in kwargs.items():
-        if field in allowed_fields:
-            updates.append(f"{field} = ?")
-            values.append(value)
+    columns = ["current_page"]
+    assignments = ["current_page = MAX(COALESCE(current_page, 0), :end_page)", "updated_at = :now"]
+    if book["status"] in (None, "unread", "to_read"):
+        assignments += ["status = 'reading'", "start_date = COALESCE(NULLIF(start_date, ''), :day)"]
+        columns += ["status", "start_date"]
     
-    if not updates:
-        return 0
+    with conn:
+        cursor.execute("""
+            INSERT INTO reading_sessions (book_id, read_at, start_page, end_page, pages, minutes, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (book_id, read_at, start_page, end_page, end_page - start_page,
+              minutes or None, now.isoformat()))
+        session_id = cursor.lastrowid
+        cursor.execute(f"UPDATE books SET {', '.join(assignments)} WHERE id = :id", {
+            "end_page": end_page, "now": now.isoformat(), "day": read_at[:10], "id": book_id,
+        })
+    conn.close()
     
-    # IN clause için placeholders
-    placeholders = ",".join("?" * len(book_ids))
-    values.extend(book_ids)
+    notify_change("reading_sessions", "insert", [session_id])
+    notify_change("books", "update", [book_id], columns)
+    return session_id
+
+
+def delete_reading_session(session_id: int) -> bool:
+    """Oturumu siler (toplamlardan tetikleyici düşer; kitabın sayfası değişmez)."""
+    conn = get_connection()
+    cursor = conn.cursor()
     
-    cursor.execute(f"""
-        UPDATE books SET {", ".join(updates)} WHERE id IN ({placeholders})
-    """, values)
+    cursor.execute("DELETE FROM reading_sessions WHERE id = ?", (session_id,))
     
-    updated = cursor.rowcount
     conn.commit()
     conn.close()
     
+    if cursor.rowcount > 0:
+        notify_change("reading_sessions", "delete", [session_id])
+    return cursor.rowcount > 0
+
+
+def get_reading_sessions(book_id: int = None, limit: int = 50) -> list:
+    """Son oturumlar (yeniden eskiye), kitap adıyla."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    condition = "WHERE s.book_id = ?" if book_id is not None else ""
+    params = [book_id] if book_id is not None else []
+    cursor.execute(f"""
+        SELECT s.*, b.title, b.author
+        FROM reading_sessions s JOIN books b ON b.id = s.book_id
+        {condition}
+        ORDER BY s.read_at DESC, s.id DESC
+        LIMIT ?
+    """, params + [limit])
+    
+    sessions = cursor.fetchall()
+    conn.close()
+    return sessions
+
+
+def get_reading_series(period: str = "day", start: str = None, end: str = None) -> list:
+    """
+    Dönem toplamları (eskiden yeniye): key, pages, minutes, sessions.
+    start/end dönem anahtarıyla karşılaştırılır (ör. "2024-05-01", "2024-W20", "2024-05").
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT key, pages, minutes, sessions FROM reading_rollups
+        WHERE period = ? AND key >= COALESCE(?, '') AND key <= COALESCE(?, '9999')
+        ORDER BY key
+    """, (period, start, end))
+    
+    series = cursor.fetchall()
+    conn.close()
+    return series
+
+
+def get_reading_activity(days: int = SPEED_WINDOW_DAYS) -> dict:
+    """
+    Oturumlardan okuma etkinliği (günlük toplamlar üzerinden pencere fonksiyonlarıyla).
+    
+    Returns:
+        {
+            "daily": [{"day", "pages", "avg_7"}, ...],   # son `days` gün, boş günler 0
+            "pages_per_day": float | None,               # pencerede (ilk oturumdan beri) günlük ortalama
+            "minutes_per_page": float | None,            # süresi girilmiş oturumlardan
+            "current_streak": int,                       # bugün veya dün biten seri
+            "longest_streak": int,
+            "active_days": int,                          # pencerede okunan gün sayısı
+        }
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    # Takvim günleri (7 günlük ortalama için 6 gün öncesinden başlar)
+    cursor.execute("""
+        WITH RECURSIVE calendar(day) AS (
+            SELECT date('now', 'localtime', :back)
+            UNION ALL
+            SELECT date(day, '+1 day') FROM calendar WHERE day < date('now', 'localtime')
+        ),
+        filled AS (
+            SELECT c.day, COALESCE(r.pages, 0) AS pages
+            FROM calendar c
+            LEFT JOIN reading_rollups r ON r.period = 'day' AND r.key = c.day
+        ),
+        averaged AS (
+            SELECT day, pages,
+                   AVG(pages) OVER (ORDER BY day ROWS BETWEEN 6 PRECEDING AND CURRENT ROW) AS avg_7
+            FROM filled
+        )
+        SELECT day, pages, ROUND(avg_7, 1) AS avg_7 FROM averaged
+        WHERE day > date('now', 'localtime', :window)
+        ORDER BY day
+    """, {"back": f"-{days + 5} days", "window": f"-{days} days"})
+    daily = [dict(row) for row in cursor.fetchall()]
+    
+    # Okunan gün adaları: ardışık günlerde julianday - sıra numarası sabit kalır
+    cursor.execute("""
+        WITH islands AS (
+            SELECT key, julianday(key) - ROW_NUMBER() OVER (ORDER BY key) AS island
+            FROM reading_rollups WHERE period = 'day' AND pages > 0
+        )
+        SELECT MAX(key) AS last_day, COUNT(*) AS length
+        FROM islands GROUP BY island
+    """)
+    streaks = cursor.fetchall()
+    
+    # Pencere, ilk oturum daha yeniyse ondan başlar (yeni başlayanın hızı düşük çıkmasın)
+    cursor.execute("""
+        SELECT SUM(pages) AS pages,
+               julianday('now', 'localtime', 'start of day') - julianday(MIN(key)) + 1 AS span
+        FROM reading_rollups
+        WHERE period = 'day' AND key > date('now', 'localtime', ?)
+    """, (f"-{days} days",))
+    window = cursor.fetchone()
+    
+    cursor.execute("""
+        SELECT SUM(minutes) AS minutes, SUM(pages) AS pages
+        FROM reading_sessions WHERE minutes > 0 AND pages > 0
+    """)
+    timed = cursor.fetchone()
+    conn.close()
+    
+    today = datetime.now().date()
+    recent = {str(today), str(today - timedelta(days=1))}
+    
+    return {
+        "daily": daily,
+        "pages_per_day": round(window["pages"] / window["span"], 1) if window["pages"] else None,
+        "minutes_per_page": round(timed["minutes"] / timed["pages"], 2) if timed["pages"] else None,
+        "current_streak": next((row["length"] for row in streaks if row["last_day"] in recent), 0),
+        "longest_streak": max((row["length"] for row in streaks), default=0),
+        "active_days": sum(1 for row in daily if row["pages"] > 0),
+    }
+
+
+def get_book_velocity(limit: int = 10, book_id: int = None) -> list:
+    """
+    Kitap başına okuma hızı (oturumu olan kitaplar, son okunan önce;
+    book_id verilirse sadece o kitap).
+    
+    Returns:
+        [{"id", "title", "author", "pages", "minutes", "active_days",
+          "pages_per_day", "pages_per_hour", "first_day", "last_day"}, ...]
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    condition = "WHERE s.book_id = ?" if book_id is not None else ""
+    params = [book_id] if book_id is not None else []
+    cursor.execute(f"""
+        SELECT b.id, b.title, b.author,
+               SUM(s.pages) AS pages,
+               SUM(s.minutes) AS minutes,
+               COUNT(DISTINCT date(s.read_at)) AS active_days,
+               date(MIN(s.read_at)) AS first_day,
+               date(MAX(s.read_at)) AS last_day,
+               ROUND(SUM(s.pages) / (julianday(date(MAX(s.read_at))) - julianday(date(MIN(s.read_at))) + 1), 1)
+                   AS pages_per_day,
+               ROUND(SUM(CASE WHEN s.minutes > 0 THEN s.pages END) * 60.0
+                     / SUM(CASE WHEN s.minutes > 0 THEN s.minutes END), 1) AS pages_per_hour
+        FROM reading_sessions s JOIN books b ON b.id = s.book_id
+        {condition}
+        GROUP BY s.book_id
+        ORDER BY MAX(s.read_at) DESC
+        LIMIT ?
+    """, params + [limit])
+    
+    velocity = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return velocity
+
+
+def get_reading_pace() -> dict:
+    """
+    Tahminlerde kullanılacak okuma hızı.
+    
+    Önce son SPEED_WINDOW_DAYS günün oturumlarına, oturum yoksa başlama/bitiş
+    tarihi olan kitaplara bakılır; ikisi de yoksa değerler None döner.
+    
+    Returns:
+        {"pages_per_day": float | None, "minutes_per_page": float | None,
+         "source": "sessions" | "books" | None}
+    """
+    activity = get_reading_activity()
+    if activity["pages_per_day"]:
+        return {
+            "pages_per_day": activity["pages_per_day"],
+            "minutes_per_page": activity["minutes_per_page"],
+            "source": "sessions",
+        }
+    
+    speed = get_reading_speed_stats()
+    if speed["avg_pages_per_day"]:
+        return {
+            "pages_per_day": speed["avg_pages_per_day"],
+            "minutes_per_page": activity["minutes_per_page"],
+            "source": "books",
+        }
+    return {"pages_per_day": None, "minutes_per_page": activity["minutes_per_page"], "source": None}
+
+
+# ==================== TOPLU İŞLEMLER ====================
+
+# Toplu işlemlerde tek SQL ifadesine verilen en fazla kitap sayısı
+# (id'ler json_each ile tek parametre olarak gider, SQLite'ın
+# değişken sınırına takılmaz; parçalama ifadeleri küçük tutar)
+BULK_CHUNK_SIZE = 500
+
+# Toplu güncellemede değiştirilebilecek alanlar
+BULK_UPDATE_FIELDS = [
+    "status", "rating", "shelf", "location", "format",
+    "start_date", "finish_date", "tags", "categories",
+    "language", "publisher", "updated_at"
+]
+
+
+def _chunks(items: list, size: int = BULK_CHUNK_SIZE):
+    """Listeyi size'lık parçalara böler; her parça JSON dizi metni olarak döner."""
+    for start in range(0, len(items), size):
+        yield json.dumps(items[start:start + size])
+
+
+def _unique_ids(book_ids) -> list:
+    """Tekrarları atar, sırayı korur."""
+    return list(dict.fromkeys(int(book_id) for book_id in book_ids))
+
+
+def _split_tag_list(tags) -> list:
+    """Virgülle ayrılmış etiketleri listeye çevirir (boşlar atılır)."""
+    return [tag.strip() for tag in (tags or "").split(",") if tag.strip()]
+
+
+def bulk_update_books(book_ids: list, **kwargs) -> int:
+    """Birden fazla kitabı aynı anda günceller (tek transaction)."""
+    book_ids = _unique_ids(book_ids)
+    fields = [field for field in kwargs if field in BULK_UPDATE_FIELDS and field != "updated_at"]
+    if not book_ids or not fields:
+        return 0
+    
+    now = datetime.now().isoformat()
+    assignments = ", ".join(f"{field} = ?" for field in fields)
+    values = [kwargs[field] for field in fields] + [now]
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    updated = 0
+    with conn:
+        for chunk in _chunks(book_ids):
+            cursor.execute(f"""
+                UPDATE books SET {assignments}, updated_at = ?
+                WHERE id IN (SELECT value FROM json_each(?))
+            """, values + [chunk])
+            updated += cursor.rowcount
+    conn.close()
+    
+    notify_change("books", "update", book_ids, fields)
     return updated
 
 
 def bulk_delete_books(book_ids: list) -> int:
-    """Birden fazla kitabı siler."""
+    """Birden fazla kitabı siler (tek transaction)."""
+    book_ids = _unique_ids(book_ids)
     if not book_ids:
         return 0
     
     conn = get_connection()
     cursor = conn.cursor()
     
-    placeholders = ",".join("?" * len(book_ids))
-    
-    cursor.execute(f"DELETE FROM books WHERE id IN ({placeholders})", book_ids)
-    
-    deleted = cursor.rowcount
-    conn.commit()
+    links = []
+    deleted = 0
+    with conn:
+        for chunk in _chunks(book_ids):
+            # Raf bağlantılarını tetikleyici siler (bkz. delete_book)
+            cursor.execute("""
+                SELECT book_id, shelf_id FROM book_shelves
+                WHERE book_id IN (SELECT value FROM json_each(?))
+            """, (chunk,))
+            links += [tuple(row) for row in cursor.fetchall()]
+            
+            cursor.execute("DELETE FROM books WHERE id IN (SELECT value FROM json_each(?))", (chunk,))
+            deleted += cursor.rowcount
     conn.close()
     
+    notify_change("book_shelves", "delete", links)
+    notify_change("books", "delete", book_ids)
     return deleted
 
 
 def bulk_add_to_shelf(book_ids: list, shelf_id: int) -> int:
-    """Birden fazla kitabı rafa ekler."""
+    """
+    Birden fazla kitabı rafa ekler.
+    Zaten rafta olanlar ve olmayan kitaplar atlanır.
+    
+    Returns:
+        Rafa yeni eklenen kitap sayısı
+    """
+    book_ids = _unique_ids(book_ids)
     if not book_ids:
         return 0
     
     conn = get_connection()
     cursor = conn.cursor()
     
-    added = 0
-    for book_id in book_ids:
-        try:
+    added = []
+    with conn:
+        for chunk in _chunks(book_ids):
+            # Eklenecekler tek sorguda bulunur, sonra hepsi birden eklenir
             cursor.execute("""
-                INSERT OR IGNORE INTO book_shelves (book_id, shelf_id)
-                VALUES (?, ?)
-            """, (book_id, shelf_id))
-            added += cursor.rowcount
-        except:
-            pass
+                SELECT id FROM books
+                WHERE id IN (SELECT value FROM json_each(?))
+                  AND id NOT IN (SELECT book_id FROM book_shelves WHERE shelf_id = ?)
+            """, (chunk, shelf_id))
+            pairs = [(row["id"], shelf_id) for row in cursor.fetchall()]
+            cursor.executemany("INSERT OR IGNORE INTO book_shelves (book_id, shelf_id) VALUES (?, ?)", pairs)
+            added += pairs
+    conn.close()
     
-    conn.commit()
+    notify_change("book_shelves", "insert", added)
+    return len(added)
+
+
+def bulk_remove_from_shelf(book_ids: list, shelf_id: int) -> int:
+    """
+    Birden fazla kitabı raftan çıkarır.
+    
+    Returns:
+        Raftan çıkarılan kitap sayısı
+    """
+    book_ids = _unique_ids(book_ids)
+    if not book_ids:
+        return 0
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    removed = []
+    with conn:
+        for chunk in _chunks(book_ids):
+            cursor.execute("""
+                DELETE FROM book_shelves
+                WHERE shelf_id = ? AND book_id IN (SELECT value FROM json_each(?))
+                RETURNING book_id
+            """, (shelf_id, chunk))
+            removed += [(row["book_id"], shelf_id) for row in cursor.fetchall()]
     conn.close()
     
-    return added
+    notify_change("book_shelves", "delete", removed)
+    return len(removed)
+
+
+def _bulk_edit_tags(book_ids: list, edit) -> int:
+    """
+    Kitapların etiket listesini edit(list) -> list ile değiştirir.
+    Sadece etiketi gerçekten değişen kitaplar yazılır.
+    """
+    book_ids = _unique_ids(book_ids)
+    if not book_ids:
+        return 0
+    
+    now = datetime.now().isoformat()
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    changed = []
+    with conn:
+        for chunk in _chunks(book_ids):
+            cursor.execute("SELECT id, tags FROM books WHERE id IN (SELECT value FROM json_each(?))", (chunk,))
+            
+            updates = []
+            for row in cursor.fetchall():
+                old_tags = _split_tag_list(row["tags"])
+                new_tags = edit(old_tags)
+                if new_tags != old_tags:
+                    updates.append((", ".join(new_tags) or None, now, row["id"]))
+            
+            cursor.executemany("UPDATE books SET tags = ?, updated_at = ? WHERE id = ?", updates)
+            changed += [book_id for _, _, book_id in updates]
+    conn.close()
+    
+    notify_change("books", "update", changed, ["tags"])
+    return len(changed)
+
+
+def bulk_add_tag(book_ids: list, tag: str) -> int:
+    """
+    Kitaplara etiket ekler (zaten olanlarda tekrar eklenmez, büyük/küçük harf duyarsız).
+    
+    Returns:
+        Etiketi değişen kitap sayısı
+    """
+    tag = tag.strip().strip(",").strip()
+    if not tag:
+        return 0
+    
+    def add(tags):
+        if tag.casefold() in (t.casefold() for t in tags):
+            return tags
+        return tags + [tag]
+    
+    return _bulk_edit_tags(book_ids, add)
+
+
+def bulk_remove_tag(book_ids: list, tag: str) -> int:
+    """
+    Kitaplardan etiketi çıkarır (büyük/küçük harf duyarsız).
+    
+    Returns:
+        Etiketi değişen kitap sayısı
+    """
+    tag = tag.strip().casefold()
+    if not tag:
+        return 0
+    return _bulk_edit_tags(book_ids, lambda tags: [t for t in tags if t.casefold() != tag])
+
+
+def bulk_set_status(book_ids: list, status: str, stamp_dates: bool = True) -> int:
+    """
+    Kitapların okuma durumunu değiştirir.
+    
+    stamp_dates=True ise tarihler de işlenir (boşsa bugün yazılır):
+        reading → start_date
+        read    → finish_date (start_date boşsa o da)
+    to_read'e geçenler varsayılan okuma listesinin sonuna eklenir,
+    to_read'den çıkanlar listeden çıkar (ikisini de tetikleyiciler yapar).
+    
+    Returns:
+        Durumu değişen kitap sayısı
+    """
+    book_ids = _unique_ids(book_ids)
+    if not book_ids:
+        return 0
+    
+    now = datetime.now()
+    today = now.strftime("%Y-%m-%d")
+    
+    assignments = ["status = :status", "updated_at = :now"]
+    columns = ["status"]
+    if stamp_dates and status == "reading":
+        assignments.append("start_date = COALESCE(NULLIF(start_date, ''), :today)")
+        columns.append("start_date")
+    if stamp_dates and status == "read":
+        assignments.append("start_date = COALESCE(NULLIF(start_date, ''), :today)")
+        assignments.append("finish_date = COALESCE(NULLIF(finish_date, ''), :today)")
+        columns += ["start_date", "finish_date"]
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    changed = []
+    with conn:
+        for chunk in _chunks(book_ids):
+            cursor.execute(f"""
+                UPDATE books SET {", ".join(assignments)}
+                WHERE id IN (SELECT value FROM json_each(:ids))
+                  AND (status IS NULL OR status != :status)
+                RETURNING id
+            """, {"status": status, "now": now.isoformat(), "today": today, "ids": chunk})
+            changed += [row["id"] for row in cursor.fetchall()]
+    conn.close()
+    
+    notify_change("books", "update", changed, columns)
+    return len(changed)
 
 
 def copy_book(book_id: int) -> int:
@@ -1433,6 +3044,7 @@ def copy_book(book_id: int) -> int:
     conn.commit()
     conn.close()
     
+    notify_change("books", "insert", [new_id])
     return new_id
 
 
@@ -1473,21 +3085,9 @@ def get_all_series() -> list:
     return series_list
 
 
-def get_books_in_series(series_name: str) -> list:
+def get_books_in_series(series_name: str, columns=LIST_COLUMNS + ["series_order"]) -> list:
     """Bir serideki tüm kitapları sıralı olarak getirir."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT * FROM books 
-        WHERE series_name = ?
-        ORDER BY series_order, title
-    """, (series_name,))
-    
-    books = cursor.fetchall()
-    conn.close()
-    
-    return books
+    return BookQuery(columns).series(series_name).order_by("series_order", "title").fetch()
 
 
 def get_series_stats(series_name: str) -> dict:
@@ -1552,138 +3152,784 @@ def get_series_names() -> list:
 
 
 # ==================== OKUMA LİSTESİ ====================
-
-def get_reading_list() -> list:
-    """Okuma listesindeki kitapları sıralı getirir (status='to_read')."""
+#
+# Her listenin öğeleri reading_list_items'ta seyrek sıra anahtarıyla (rank)
+# tutulur. Sona ekleme MAX(rank) + RANK_GAP, taşıma yeni komşuların ortası:
+# ikisi de (list_id, rank) index'inden bulunur ve tek satır yazar.
+# Komşular arasında boşluk kalmazsa liste bir kez yeniden numaralanır.
+#
+# Varsayılan liste (DEFAULT_READING_LIST_ID) status='to_read' ile eşlenir;
+# ekleme/çıkarma durumu değiştirir, öğeyi tetikleyiciler ekler/siler.
+
+def get_reading_lists() -> list:
+    """Okuma listelerini kitap sayılarıyla getirir (varsayılan liste ilk)."""
     conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute("""
-        SELECT * FROM books 
-        WHERE status = 'to_read'
-        ORDER BY reading_list_order ASC, id ASC
-    """)
+        SELECT l.id, l.name, l.created_at, COUNT(i.book_id) AS book_count
+        FROM reading_lists l
+        LEFT JOIN reading_list_items i ON i.list_id = l.id
+        GROUP BY l.id
+        ORDER BY l.id != ?, l.name
+    """, (DEFAULT_READING_LIST_ID,))
+    lists = cursor.fetchall()
+    conn.close()
+    
+    return lists
+
+
+def add_reading_list(name: str) -> int | None:
+    """
+    Yeni okuma listesi oluşturur.
+    
+    Returns:
+        Liste id'si veya aynı isimde liste varsa None
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("""
+            INSERT INTO reading_lists (name, created_at) VALUES (?, ?)
+        """, (name.strip(), datetime.now().isoformat()))
+        conn.commit()
+        list_id = cursor.lastrowid
+    except sqlite3.IntegrityError:
+        list_id = None
+    conn.close()
+    
+    if list_id:
+        notify_change("reading_lists", "insert", [list_id])
+    return list_id
+
+
+def rename_reading_list(list_id: int, name: str) -> bool:
+    """Okuma listesinin adını değiştirir."""
+    conn = get_connection()
+    cursor = conn.cursor()
     
+    try:
+        cursor.execute("UPDATE reading_lists SET name = ? WHERE id = ?", (name.strip(), list_id))
+        conn.commit()
+        success = cursor.rowcount > 0
+    except sqlite3.IntegrityError:
+        success = False
+    conn.close()
+    
+    if success:
+        notify_change("reading_lists", "update", [list_id], ["name"])
+    return success
+
+
+def delete_reading_list(list_id: int) -> bool:
+    """Okuma listesini siler (varsayılan liste silinemez)."""
+    if list_id == DEFAULT_READING_LIST_ID:
+        return False
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    with conn:
+        cursor.execute("DELETE FROM reading_list_items WHERE list_id = ?", (list_id,))
+        cursor.execute("DELETE FROM reading_lists WHERE id = ?", (list_id,))
+        success = cursor.rowcount > 0
+    conn.close()
+    
+    if success:
+        notify_change("reading_lists", "delete", [list_id])
+    return success
+
+
+def get_reading_list(list_id: int = DEFAULT_READING_LIST_ID, columns=LIST_COLUMNS, limit: int = None) -> list:
+    """Listedeki kitapları sıralı getirir (kayıtlarda rank alanı da bulunur)."""
+    columns = tuple(columns) + ("rank",)
+    projection = ", ".join(
+        "i.rank" if name == "rank" else f"b.{BookQuery._column(name)}" for name in columns
+    )
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    record = _record_type(columns)
+    cursor.row_factory = lambda _cursor, row: record(*row)
+    
+    cursor.execute(f"""
+        SELECT {projection}
+        FROM reading_list_items i JOIN books b ON b.id = i.book_id
+        WHERE i.list_id = ?
+        ORDER BY i.rank
+        LIMIT ?
+    """, (list_id, -1 if limit is None else limit))
     books = cursor.fetchall()
     conn.close()
     
     return books
 
 
-def add_to_reading_list(book_id: int) -> bool:
-    """Kitabı okuma listesine ekler."""
+def add_to_reading_list(book_id: int, list_id: int = DEFAULT_READING_LIST_ID) -> bool:
+    """Kitabı listenin sonuna ekler (varsayılan listede durumu 'to_read' olur)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    with conn:
+        status_changed = False
+        if list_id == DEFAULT_READING_LIST_ID:
+            cursor.execute("""
+                UPDATE books SET status = 'to_read'
+                WHERE id = ? AND status IS NOT 'to_read'
+            """, (book_id,))
+            status_changed = cursor.rowcount > 0
+        
+        # Varsayılan listede tetikleyici eklemiş olur, bu durumda bir şey yapmaz
+        cursor.execute("""
+            INSERT OR IGNORE INTO reading_list_items (list_id, book_id, rank, added_at)
+            SELECT ?, ?, COALESCE(MAX(rank), 0) + ?, ?
+            FROM reading_list_items WHERE list_id = ?
+        """, (list_id, book_id, RANK_GAP, datetime.now().isoformat(), list_id))
+        added = status_changed or cursor.rowcount > 0
+    conn.close()
+    
+    if status_changed:
+        notify_change("books", "update", [book_id], ["status"])
+    if added:
+        notify_change("reading_list_items", "insert", [(list_id, book_id)])
+    return added
+
+
+def remove_from_reading_list(book_id: int, list_id: int = DEFAULT_READING_LIST_ID) -> bool:
+    """Kitabı listeden çıkarır (varsayılan listede okunmadı yapar)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    with conn:
+        status_changed = False
+        if list_id == DEFAULT_READING_LIST_ID:
+            cursor.execute("""
+                UPDATE books SET status = 'unread' WHERE id = ? AND status = 'to_read'
+            """, (book_id,))
+            status_changed = cursor.rowcount > 0
+        
+        cursor.execute("""
+            DELETE FROM reading_list_items WHERE list_id = ? AND book_id = ?
+        """, (list_id, book_id))
+        removed = status_changed or cursor.rowcount > 0
+    conn.close()
+    
+    if status_changed:
+        notify_change("books", "update", [book_id], ["status"])
+    if removed:
+        notify_change("reading_list_items", "delete", [(list_id, book_id)])
+    return removed
+
+
+def _rebalance_reading_list(cursor, list_id: int, book_ids: list = None):
+    """
+    Listeyi RANK_GAP aralıklarla yeniden numaralar (boşluk bitince, nadiren).
+    book_ids verilirse önce onlar bu sırayla, kalanlar mevcut sırasıyla dizilir.
+    """
+    cursor.execute("""
+        SELECT book_id, added_at FROM reading_list_items WHERE list_id = ? ORDER BY rank
+    """, (list_id,))
+    items = {row["book_id"]: row["added_at"] for row in cursor.fetchall()}
+    
+    order = [book_id for book_id in dict.fromkeys(book_ids or []) if book_id in items]
+    placed = set(order)
+    order += [book_id for book_id in items if book_id not in placed]
+    
+    # (list_id, rank) benzersiz: satırlar tek tek güncellenirken çakışmasın diye
+    # liste silinip yeni sıralarla tekrar yazılır
+    cursor.execute("DELETE FROM reading_list_items WHERE list_id = ?", (list_id,))
+    cursor.executemany("""
+        INSERT INTO reading_list_items (list_id, book_id, rank, added_at) VALUES (?, ?, ?, ?)
+    """, [(list_id, book_id, i * RANK_GAP, items[book_id])
+          for i, book_id in enumerate(order, start=1)])
+
+
+def _free_rank(cursor, list_id: int, book_id: int, before_id: int = None):
+    """
+    before_id'nin hemen önüne (None ise veya listede yoksa sona) yerleşecek sıra
+    anahtarı. Taşınan kitabın kendi yeri komşu sayılmaz. Boşluk yoksa None.
+    """
+    row = None
+    if before_id is not None:
+        cursor.execute("""
+            SELECT rank FROM reading_list_items WHERE list_id = ? AND book_id = ?
+        """, (list_id, before_id))
+        row = cursor.fetchone()
+    
+    # Sona ekleme her zaman yer bulur (yeniden numaralama gerekmez)
+    if not row:
+        cursor.execute("""
+            SELECT MAX(rank) FROM reading_list_items WHERE list_id = ? AND book_id != ?
+        """, (list_id, book_id))
+        last = cursor.fetchone()[0]
+        return (last or 0) + RANK_GAP
+    upper = row["rank"]
+    
+    cursor.execute("""
+        SELECT rank FROM reading_list_items
+        WHERE list_id = ? AND rank < ? AND book_id != ?
+        ORDER BY rank DESC LIMIT 1
+    """, (list_id, upper, book_id))
+    row = cursor.fetchone()
+    if not row:
+        return upper - RANK_GAP
+    
+    lower = row["rank"]
+    if upper - lower < 2:
+        return None
+    return (lower + upper) // 2
+
+
+def move_reading_list_item(book_id: int, before_id: int = None,
+                           list_id: int = DEFAULT_READING_LIST_ID) -> bool:
+    """
+    Kitabı before_id'nin önüne (None ise veya listede yoksa listenin sonuna) taşır.
+    Normalde sadece taşınan satırın rank'ı değişir.
+    """
+    if before_id == book_id:
+        return False
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    rank = None
+    with conn:
+        cursor.execute("""
+            SELECT 1 FROM reading_list_items WHERE list_id = ? AND book_id = ?
+        """, (list_id, book_id))
+        if cursor.fetchone():
+            rank = _free_rank(cursor, list_id, book_id, before_id)
+            if rank is None:
+                _rebalance_reading_list(cursor, list_id)
+                rank = _free_rank(cursor, list_id, book_id, before_id)
+        
+        if rank is not None:
+            cursor.execute("""
+                UPDATE reading_list_items SET rank = ? WHERE list_id = ? AND book_id = ?
+            """, (rank, list_id, book_id))
+    conn.close()
+    
+    if rank is None:
+        return False
+    
+    notify_change("reading_list_items", "update", [(list_id, book_id)], ["rank"])
+    return True
+
+
+def move_in_reading_list(book_id: int, direction: str,
+                         list_id: int = DEFAULT_READING_LIST_ID) -> bool:
+    """Kitabı listede bir yukarı/aşağı taşır."""
     conn = get_connection()
     cursor = conn.cursor()
     
-    # En yüksek sırayı bul
     cursor.execute("""
-        SELECT MAX(reading_list_order) as max_order 
-        FROM books WHERE status = 'to_read'
+        SELECT rank FROM reading_list_items WHERE list_id = ? AND book_id = ?
+    """, (list_id, book_id))
+    row = cursor.fetchone()
+    if not row:
+        conn.close()
+        return False
+    
+    # up: üstteki komşunun önüne, down: alttaki komşunun altındakinin önüne
+    if direction == "up":
+        cursor.execute("""
+            SELECT book_id FROM reading_list_items WHERE list_id = ? AND rank < ?
+            ORDER BY rank DESC LIMIT 1
+        """, (list_id, row["rank"]))
+        neighbors = cursor.fetchall()
+    else:
+        cursor.execute("""
+            SELECT book_id FROM reading_list_items WHERE list_id = ? AND rank > ?
+            ORDER BY rank LIMIT 2
+        """, (list_id, row["rank"]))
+        neighbors = cursor.fetchall()
+    conn.close()
+    
+    if not neighbors:
+        return False
+    
+    if direction == "up":
+        before_id = neighbors[0]["book_id"]
+    else:
+        before_id = neighbors[1]["book_id"] if len(neighbors) > 1 else None
+    return move_reading_list_item(book_id, before_id, list_id)
+
+
+def reorder_reading_list(book_ids: list, list_id: int = DEFAULT_READING_LIST_ID) -> bool:
+    """Listeyi verilen sırayla baştan numaralar (tüm liste yeniden yazılır)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    with conn:
+        _rebalance_reading_list(cursor, list_id, book_ids)
+    conn.close()
+    
+    notify_change("reading_list_items", "update", [(list_id, book_id) for book_id in book_ids], ["rank"])
+    return True
+
+
+def get_books_to_read_candidates(columns=("id", "title", "author")) -> list:
+    """Okuma listesine eklenebilecek kitapları getirir (unread olanlar)."""
+    return BookQuery(columns).status("unread").order_by("title").fetch()
+
+
+def get_candidates_page(size: int = 50, cursor: str = None, columns=("id", "title", "author"),
+                        list_id: int = DEFAULT_READING_LIST_ID) -> tuple:
+    """
+    Okuma listesi adaylarını başlığa göre sayfa sayfa getirir.
+    Varsayılan liste için okunmamış kitaplar, diğer listeler için
+    listede olmayan ve henüz okunmamış kitaplar.
+    """
+    query = BookQuery(columns)
+    if list_id == DEFAULT_READING_LIST_ID:
+        query.status("unread")
+    else:
+        query.where("status IS NOT 'read'").where(
+            "id NOT IN (SELECT book_id FROM reading_list_items WHERE list_id = ?)", list_id
+        )
+    return query.page(size, cursor, sort="title")
+
+
+# ==================== META VERİ YENİLEME ====================
+
+def get_incomplete_books(limit: int = 20, retry_after_days: int = 30) -> list:
+    """
+    Bilgisi eksik kitapları getirir (önce hiç denenmemişler, sonra en eski deneme).
+    
+    Args:
+        limit: En fazla kaç kitap
+        retry_after_days: Daha önce denenmiş kitap kaç gün sonra tekrar denensin
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cutoff = (datetime.now() - timedelta(days=retry_after_days)).isoformat()
+    
+    cursor.execute(f"""
+        SELECT id, title, author, isbn, {", ".join(METADATA_FIELDS)}
+        FROM books INDEXED BY idx_books_incomplete
+        WHERE ({INCOMPLETE_CONDITION})
+          AND (metadata_checked_at IS NULL OR metadata_checked_at < ?)
+        ORDER BY metadata_checked_at
+        LIMIT ?
+    """, (cutoff, limit))
+    
+    books = cursor.fetchall()
+    conn.close()
+    
+    return books
+
+
+def count_incomplete_books() -> int:
+    """Bilgisi eksik kitap sayısını döndürür."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute(f"""
+        SELECT COUNT(*) FROM books INDEXED BY idx_books_incomplete
+        WHERE {INCOMPLETE_CONDITION}
     """)
-    result = cursor.fetchone()
-    max_order = result["max_order"] or 0
+    count = cursor.fetchone()[0]
+    
+    conn.close()
+    return count
+
+
+def apply_metadata_updates(updates: dict) -> list:
+    """
+    Online kaynaklardan bulunan bilgileri tek transaction'da yazar.
+    
+    Sadece boş alanlar doldurulur; kullanıcının bu arada girdiği değerler
+    ezilmez. Bilgi bulunamayan kitaplar da "denendi" olarak işaretlenir.
+    
+    Args:
+        updates: {book_id: {"page_count": 320, "publisher": "...", ...}}
+                 Bulunamayan kitaplar için boş sözlük
+    
+    Returns:
+        En az bir alanı güncellenen kitapların id'leri
+    """
+    if not updates:
+        return []
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    now = datetime.now().isoformat()
+    
+    # Bulunan alanlar: boşsa doldur, doluysa dokunma
+    fill_clause = ", ".join(
+        f"{field} = COALESCE(NULLIF({field}, ''), ?)" for field in METADATA_FIELDS
+    )
+    found = {
+        book_id: values for book_id, values in updates.items()
+        if any(values.get(field) for field in METADATA_FIELDS)
+    }
+    
+    # Hangi kitapların gerçekten değiştiğini bilmek için önceki halleri
+    changed = []
+    if found:
+        placeholders = ",".join("?" * len(found))
+        cursor.execute(f"""
+            SELECT id, {", ".join(METADATA_FIELDS)} FROM books WHERE id IN ({placeholders})
+        """, list(found))
+        for row in cursor.fetchall():
+            values = found[row["id"]]
+            if any(not row[field] and values.get(field) for field in METADATA_FIELDS):
+                changed.append(row["id"])
+    
+    try:
+        cursor.executemany(f"""
+            UPDATE books SET {fill_clause}, metadata_checked_at = ?, updated_at = ?
+            WHERE id = ?
+        """, [
+            [values.get(field) or None for field in METADATA_FIELDS] + [now, now, book_id]
+            for book_id, values in found.items() if book_id in changed
+        ])
+        
+        cursor.executemany("""
+            UPDATE books SET metadata_checked_at = ? WHERE id = ?
+        """, [(now, book_id) for book_id in updates if book_id not in changed])
+        
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    
+    notify_change("books", "update", changed, METADATA_FIELDS)
+    return changed
+
+
+# ==================== GÖMME VEKTÖRLERİ ====================
+
+def get_embeddings(model: str) -> list:
+    """
+    Bir modelin kayıtlı gömme vektörlerini getirir.
+    
+    Returns:
+        (book_id, dim, scale, vector, source_hash) satırları
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
     
-    # Kitabı güncelle
     cursor.execute("""
-        UPDATE books 
-        SET status = 'to_read', reading_list_order = ?
-        WHERE id = ?
-    """, (max_order + 1, book_id))
+        SELECT book_id, dim, scale, vector, source_hash
+        FROM book_embeddings WHERE model = ?
+    """, (model,))
+    rows = cursor.fetchall()
     
-    conn.commit()
     conn.close()
+    return rows
+
+
+def save_embeddings(model: str, rows: list):
+    """
+    Gömme vektörlerini kaydeder (kitap başına tek vektör, eskisinin yerine).
+    Türetilmiş veri olduğundan değişiklik bildirimi yapılmaz.
     
-    return cursor.rowcount > 0
+    Args:
+        rows: (book_id, dim, scale, vector, source_hash) listesi
+    """
+    if not rows:
+        return
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    now = datetime.now().isoformat()
+    cursor.executemany("""
+        INSERT OR REPLACE INTO book_embeddings
+            (book_id, model, dim, scale, vector, source_hash, updated_at)
+        SELECT ?, ?, ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM books WHERE id = ?)
+    """, [(book_id, model, dim, scale, vector, source_hash, now, book_id)
+          for book_id, dim, scale, vector, source_hash in rows])
+    
+    conn.commit()
+    conn.close()
+
 
+# ==================== AI ÖNBELLEĞİ ====================
 
-def remove_from_reading_list(book_id: int) -> bool:
-    """Kitabı okuma listesinden çıkarır (okunmadı yapar)."""
+def get_ai_cache(key: str, max_age_hours: float) -> str | None:
+    """
+    Önbellekteki AI yanıtını getirir (max_age_hours'tan eskiyse None).
+    """
     conn = get_connection()
     cursor = conn.cursor()
     
+    cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
     cursor.execute("""
-        UPDATE books 
-        SET status = 'unread', reading_list_order = NULL
-        WHERE id = ?
-    """, (book_id,))
+        UPDATE ai_cache SET hits = hits + 1
+        WHERE key = ? AND created_at >= ?
+        RETURNING response
+    """, (key, cutoff))
+    row = cursor.fetchone()
     
     conn.commit()
     conn.close()
+    return row["response"] if row else None
+
+
+def set_ai_cache(key: str, model: str, response: str, max_age_hours: float):
+    """AI yanıtını önbelleğe yazar; süresi geçmiş kayıtları da temizler."""
+    conn = get_connection()
+    cursor = conn.cursor()
     
-    return cursor.rowcount > 0
+    now = datetime.now()
+    cursor.execute("""
+        INSERT OR REPLACE INTO ai_cache (key, model, response, created_at, hits)
+        VALUES (?, ?, ?, ?, 0)
+    """, (key, model, response, now.isoformat()))
+    cursor.execute("DELETE FROM ai_cache WHERE created_at < ?",
+                   ((now - timedelta(hours=max_age_hours)).isoformat(),))
+    
+    conn.commit()
+    conn.close()
 
 
-def reorder_reading_list(book_ids: list) -> bool:
-    """Okuma listesini yeniden sıralar."""
+def clear_ai_cache(key: str = None) -> int:
+    """
+    AI önbelleğini temizler.
+    
+    Args:
+        key: Sadece bu kayıt (None ise hepsi)
+    
+    Returns:
+        Silinen kayıt sayısı
+    """
     conn = get_connection()
     cursor = conn.cursor()
     
-    for i, book_id in enumerate(book_ids, start=1):
-        cursor.execute("""
-            UPDATE books SET reading_list_order = ? WHERE id = ?
-        """, (i, book_id))
+    if key is None:
+        cursor.execute("DELETE FROM ai_cache")
+    else:
+        cursor.execute("DELETE FROM ai_cache WHERE key = ?", (key,))
+    count = cursor.rowcount
     
     conn.commit()
     conn.close()
+    return count
+
+
+# ==================== KOPYA KİTAPLAR ====================
+
+# Birleştirmede kalan kitapta boşsa kopyadan alınan alanlar
+MERGE_FILL_FIELDS = [
+    "author", "isbn", "page_count", "publish_year", "publisher", "cover_path",
+    "subtitle", "description", "language", "categories",
+    "translator", "original_title", "original_language",
+    "series_name", "series_order", "location",
+    "purchase_date", "purchase_place", "purchase_price", "gifted_by",
+    "borrowed_to", "borrowed_date",
+]
+
+# Okuma durumu ilerlemesi: birleştirmede en ileri durum kalır
+STATUS_PROGRESS = {"wont_read": 0, "unread": 1, "to_read": 2, "reading": 3, "read": 4}
+
+
+def get_duplicate_candidates(status: str = "pending") -> list:
+    """
+    Olası kopya çiftleri (en benzer önce).
     
-    return True
+    Returns:
+        Row listesi: book_a, book_b, score, reason
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT book_a, book_b, score, reason FROM duplicate_candidates
+        WHERE status = ? ORDER BY score DESC, book_a, book_b
+    """, (status,))
+    rows = cursor.fetchall()
+    
+    conn.close()
+    return rows
 
 
-def move_in_reading_list(book_id: int, direction: str) -> bool:
-    """Kitabı listede yukarı/aşağı taşır."""
+def count_duplicate_candidates() -> int:
+    """İncelenmeyi bekleyen olası kopya çifti sayısı."""
     conn = get_connection()
     cursor = conn.cursor()
     
-    # Mevcut sırayı al
-    cursor.execute("SELECT reading_list_order FROM books WHERE id = ?", (book_id,))
-    result = cursor.fetchone()
-    if not result or not result["reading_list_order"]:
-        conn.close()
-        return False
+    cursor.execute("SELECT COUNT(*) FROM duplicate_candidates WHERE status = 'pending'")
+    count = cursor.fetchone()[0]
     
-    current_order = result["reading_list_order"]
+    conn.close()
+    return count
+
+
+def save_duplicate_candidates(pairs: list, book_ids=None):
+    """
+    Olası kopya çiftlerini yazar; "kopya değil" denmiş çiftler korunur.
     
-    if direction == "up" and current_order > 1:
-        # Üstteki kitabı bul ve yer değiştir
-        cursor.execute("""
-            UPDATE books SET reading_list_order = ? 
-            WHERE status = 'to_read' AND reading_list_order = ?
-        """, (current_order, current_order - 1))
-        cursor.execute("""
-            UPDATE books SET reading_list_order = ? WHERE id = ?
-        """, (current_order - 1, book_id))
+    Args:
+        pairs: [(book_a, book_b, skor, neden), ...] (book_a < book_b)
+        book_ids: Sadece bu kitapların bekleyen çiftleri yenilenir (None ise hepsi)
+    """
+    now = datetime.now().isoformat()
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    with conn:
+        if book_ids is None:
+            cursor.execute("DELETE FROM duplicate_candidates WHERE status = 'pending'")
+        else:
+            for chunk in _chunks(_unique_ids(book_ids)):
+                cursor.execute("""
+                    DELETE FROM duplicate_candidates
+                    WHERE status = 'pending'
+                      AND (book_a IN (SELECT value FROM json_each(?1))
+                           OR book_b IN (SELECT value FROM json_each(?1)))
+                """, (chunk,))
         
-    elif direction == "down":
-        # Alttaki kitabı bul ve yer değiştir
-        cursor.execute("""
-            UPDATE books SET reading_list_order = ? 
-            WHERE status = 'to_read' AND reading_list_order = ?
-        """, (current_order, current_order + 1))
-        cursor.execute("""
-            UPDATE books SET reading_list_order = ? WHERE id = ?
-        """, (current_order + 1, book_id))
+        # Bu arada silinmiş kitaplar için çift yazılmaz
+        cursor.executemany("""
+            INSERT OR IGNORE INTO duplicate_candidates (book_a, book_b, score, reason, created_at)
+            SELECT ?1, ?2, ?3, ?4, ?5
+            WHERE EXISTS (SELECT 1 FROM books WHERE id = ?1)
+              AND EXISTS (SELECT 1 FROM books WHERE id = ?2)
+        """, [(a, b, score, reason, now) for a, b, score, reason in pairs])
+    conn.close()
+
+
+def dismiss_duplicate(book_a: int, book_b: int) -> bool:
+    """Çifti "kopya değil" olarak işaretler (tekrar önerilmez)."""
+    book_a, book_b = sorted((book_a, book_b))
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        UPDATE duplicate_candidates SET status = 'dismissed'
+        WHERE book_a = ? AND book_b = ?
+    """, (book_a, book_b))
+    success = cursor.rowcount > 0
     
     conn.commit()
     conn.close()
+    return success
+
+
+def _merged_values(survivor, duplicates: list) -> dict:
+    """Kalan kitapta değişecek alanlar (kopyalardaki bilgi ve okuma verisiyle)."""
+    updates = {}
     
-    return True
+    def current(field):
+        return updates.get(field, survivor[field])
+    
+    for dup in duplicates:
+        for field in MERGE_FILL_FIELDS:
+            if current(field) in (None, "") and dup[field] not in (None, ""):
+                updates[field] = dup[field]
+        
+        # Okuma verisi: en ileri durum, en yüksek puan/sayfa, en erken başlangıç, en geç bitiş
+        if STATUS_PROGRESS.get(dup["status"], 0) > STATUS_PROGRESS.get(current("status"), 0):
+            updates["status"] = dup["status"]
+        for field in ("rating", "current_page", "times_read", "finish_date"):
+            if dup[field] is not None and (current(field) is None or dup[field] > current(field)):
+                updates[field] = dup[field]
+        if dup["start_date"] and (not current("start_date") or dup["start_date"] < current("start_date")):
+            updates["start_date"] = dup["start_date"]
+        
+        # Notlar ve incelemeler kaybolmasın: farklıysa alt alta eklenir
+        for field in ("notes", "review"):
+            text = (dup[field] or "").strip()
+            if text and text not in (current(field) or ""):
+                updates[field] = f"{current(field)}\n\n{text}" if current(field) else text
+        
+        tags = _split_tag_list(current("tags"))
+        folded = {tag.casefold() for tag in tags}
+        extra = [tag for tag in _split_tag_list(dup["tags"]) if tag.casefold() not in folded]
+        if extra:
+            updates["tags"] = ", ".join(tags + extra)
+    
+    return updates
 
 
-def get_books_to_read_candidates() -> list:
-    """Okuma listesine eklenebilecek kitapları getirir (unread olanlar)."""
+def merge_books(survivor_id: int, duplicate_ids: list) -> bool:
+    """
+    Kopya kitapları tek kitapta birleştirir (tek transaction).
+    
+    Raflar, okuma listesi sıraları, alıntılar ve okuma oturumları kalan kitaba taşınır;
+    okuma verisi ve boş alanlar kopyalardan tamamlanır, kopyalar silinir.
+    
+    Returns:
+        Başarılı mı (kitaplardan biri yoksa False)
+    """
+    duplicate_ids = [book_id for book_id in _unique_ids(duplicate_ids) if book_id != survivor_id]
+    if not duplicate_ids:
+        return False
+    dup_json = json.dumps(duplicate_ids)
+    
     conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute("""
-        SELECT * FROM books 
-        WHERE status = 'unread'
-        ORDER BY title ASC
-    """)
+    cursor.execute("SELECT * FROM books WHERE id = ?", (survivor_id,))
+    survivor = cursor.fetchone()
+    cursor.execute("SELECT * FROM books WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id", (dup_json,))
+    duplicates = cursor.fetchall()
+    if not survivor or len(duplicates) != len(duplicate_ids):
+        conn.close()
+        return False
     
-    books = cursor.fetchall()
+    updates = _merged_values(survivor, duplicates)
+    
+    with conn:
+        # Raflar (kalan kitap zaten raftaysa atlanır)
+        cursor.execute("""
+            SELECT book_id, shelf_id FROM book_shelves
+            WHERE book_id IN (SELECT value FROM json_each(?))
+        """, (dup_json,))
+        removed_links = [tuple(row) for row in cursor.fetchall()]
+        cursor.execute("""
+            INSERT OR IGNORE INTO book_shelves (book_id, shelf_id)
+            SELECT ?, shelf_id FROM book_shelves WHERE book_id IN (SELECT value FROM json_each(?))
+            RETURNING book_id, shelf_id
+        """, (survivor_id, dup_json))
+        added_links = [tuple(row) for row in cursor.fetchall()]
+        
+        # Okuma listeleri: kopyanın sırası korunur (durum güncellemesinden önce,
+        # tetikleyici kalan kitabı listenin sonuna eklemesin diye)
+        cursor.execute("""
+            UPDATE OR IGNORE reading_list_items SET book_id = ?
+            WHERE book_id IN (SELECT value FROM json_each(?))
+        """, (survivor_id, dup_json))
+        
+        cursor.execute("""
+            UPDATE quotes SET book_id = ?
+            WHERE book_id IN (SELECT value FROM json_each(?))
+            RETURNING id
+        """, (survivor_id, dup_json))
+        quote_ids = [row["id"] for row in cursor.fetchall()]
+        
+        # Okuma oturumları (gün toplamları değişmez)
+        cursor.execute("""
+            UPDATE reading_sessions SET book_id = ?
+            WHERE book_id IN (SELECT value FROM json_each(?))
+            RETURNING id
+        """, (survivor_id, dup_json))
+        session_ids = [row["id"] for row in cursor.fetchall()]
+        
+        if updates:
+            updates["updated_at"] = datetime.now().isoformat()
+            set_clause = ", ".join(f"{field} = ?" for field in updates)
+            cursor.execute(f"UPDATE books SET {set_clause} WHERE id = ?",
+                           list(updates.values()) + [survivor_id])
+        
+        # Kalan bağlantıları, gömme vektörlerini ve kopya çiftlerini tetikleyiciler siler
+        cursor.execute("DELETE FROM books WHERE id IN (SELECT value FROM json_each(?))", (dup_json,))
     conn.close()
     
-    return books
+    notify_change("book_shelves", "delete", removed_links)
+    notify_change("book_shelves", "insert", added_links)
+    notify_change("quotes", "update", quote_ids, ["book_id"])
+    notify_change("reading_sessions", "update", session_ids, ["book_id"])
+    notify_change("books", "update", [survivor_id], updates.keys())
+    notify_change("books", "delete", duplicate_ids)
+    return True
 
 
 # Bu dosya doğrudan çalıştırılırsa test et
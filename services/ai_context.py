@@ -0,0 +1,239 @@
+"""
+Kitaplık Uygulaması - AI Bağlam Oluşturucu
+==========================================
+AI isteklerine eklenen kitaplık özetini hazırlar.
+
+- Sayılar ve listeler doğrudan SQL'de hesaplanır (db.get_library_digest);
+  tüm kitaplar Python'a okunmaz
+- Özet, kitaplık sürüm sayacına (db.get_library_version, books tetikleyicileri)
+  göre önbelleklenir: kitaplık değişmedikçe sorgu tekrar çalışmaz
+- Metin bir token bütçesine sığdırılır: en ayrıntılı seviyeden başlanır,
+  sığmazsa listeler kısaltılarak daha sade seviyeye inilir
+- Soru sorulurken kitaplığın rastgele bir dilimi yerine soruya en yakın
+  kitaplar (gömme index'i) eklenir
+
+Kullanım:
+    context = library_context(budget=800)
+    context = question_context("Dostoyevski gibi başka yazarlar öner")
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+
+
+# Varsayılan bağlam bütçesi (token)
+TOKEN_BUDGET = 1200
+
+# Token tahmini: Türkçe metinde token başına ortalama karakter
+CHARS_PER_TOKEN = 3.5
+
+# Ayrıntı seviyeleri: her listede gösterilecek kayıt sayısı (en ayrıntılıdan sadeye)
+DETAIL_LEVELS = [10, 5, 3, 0]
+
+# Soru bağlamında eklenebilecek en fazla ilgili kitap
+RELEVANT_BOOKS = 15
+
+# Okuma planında listelenecek en fazla kitap
+PLAN_BOOKS = 15
+
+STATUS_LABELS = {
+    "unread": "okunmadı",
+    "to_read": "okunacak",
+    "reading": "okunuyor",
+    "read": "okundu",
+    "wont_read": "okunmayacak",
+}
+
+_cache = {}  # (library_version, anahtar) -> değer
+_cache_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Metnin yaklaşık token sayısı."""
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def _cached(key, build):
+    """Kitaplık sürümüne bağlı önbellek (sürüm değişince eski kayıtlar atılır)."""
+    version = db.get_library_version()
+    with _cache_lock:
+        if (version, key) in _cache:
+            return _cache[(version, key)]
+
+    value = build()
+
+    with _cache_lock:
+        for stale in [k for k in _cache if k[0] != version]:
+            del _cache[stale]
+        _cache[(version, key)] = value
+    return value
+
+
+def library_digest() -> dict:
+    """Kitaplığın SQL'de hesaplanmış özeti (önbellekli)."""
+    return _cached("digest", lambda: db.get_library_digest(max(DETAIL_LEVELS)))
+
+
+# ---------- Metin ----------
+
+def _render(digest: dict, items: int) -> str:
+    """Özeti verilen liste uzunluğuyla metne çevirir (items=0: sadece sayılar)."""
+    counts = digest["status_counts"]
+    lines = [
+        f"Toplam: {digest['total']} kitap ("
+        + ", ".join(f"{count} {STATUS_LABELS.get(status, status)}"
+                    for status, count in sorted(counts.items(), key=lambda x: -x[1]))
+        + ")"
+    ]
+    if digest["avg_rating"]:
+        lines.append(f"Ortalama puan: {digest['avg_rating']}/5")
+
+    length = digest["length_profile"]
+    if length["average"]:
+        lines.append(
+            f"Okunan kitaplar ortalama {length['average']} sayfa "
+            f"(kısa: {length['short']}, orta: {length['medium']}, uzun: {length['long']})"
+        )
+
+    if not items:
+        return "\n".join(lines)
+
+    def section(title, rows, fmt):
+        if rows:
+            lines.append("")
+            lines.append(f"{title}:")
+            lines.extend(f"- {fmt(row)}" for row in rows[:items])
+
+    section("En Çok Kitabı Olan Yazarlar", digest["top_authors"],
+            lambda r: f"{r['author']}: {r['count']} kitap ({r['read'] or 0} okundu)")
+    section("Kategoriler", digest["top_categories"],
+            lambda r: f"{r['category']}: {r['count']} kitap")
+    section("En Beğenilen Kitaplar", digest["top_rated"],
+            lambda r: f"{r['title']} ({r['author']}) - {'⭐' * int(r['rating'])}")
+    section("Son Okunanlar", digest["recent_read"],
+            lambda r: f"{r['title']} ({r['author']})")
+    section("Şu An Okunanlar", digest["reading"],
+            lambda r: f"{r['title']} (sayfa {r['current_page'] or 0}/{r['page_count'] or '?'})")
+
+    return "\n".join(lines)
+
+
+def fit_lines(lines: list, budget: int) -> list:
+    """Satırları sırayla, bütçe dolana kadar alır."""
+    fitted, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        fitted.append(line)
+        used += cost
+    return fitted
+
+
+def library_context(budget: int = TOKEN_BUDGET) -> str:
+    """
+    Kitaplık özeti; bütçeye sığan en ayrıntılı seviye seçilir.
+    Kitaplık boşsa "Kitaplık boş." döner.
+    """
+    def build():
+        digest = library_digest()
+        if not digest["total"]:
+            return "Kitaplık boş."
+
+        for items in DETAIL_LEVELS:
+            text = _render(digest, items)
+            if estimate_tokens(text) <= budget:
+                return text
+        return "\n".join(fit_lines(_render(digest, 0).splitlines(), budget))
+
+    return _cached(("library", budget), build)
+
+
+# ---------- Soruya göre ilgili kitaplar ----------
+
+def relevant_books(question: str, limit: int = RELEVANT_BOOKS) -> list:
+    """
+    Soruya en yakın kitaplar (gömme index'i; hazır değilse boş liste).
+
+    Returns:
+        Kitap kayıtları (title, author, status, rating, categories), yakınlık sırasıyla
+    """
+    from services.embeddings import get_index
+
+    index = get_index()
+    if not index.ready:
+        return []
+    try:
+        results = index.search(question, k=limit)
+    except Exception as e:
+        print(f"İlgili kitaplar bulunamadı: {e}")
+        return []
+
+    book_ids = [book_id for book_id, _ in results]
+    books = {
+        book["id"]: book
+        for book in db.get_book_rows(["id", "title", "author", "status", "rating", "categories"], book_ids)
+    }
+    return [books[book_id] for book_id in book_ids if book_id in books]
+
+
+def _book_line(book) -> str:
+    parts = [f"{book['title']} ({book['author'] or '?'})", STATUS_LABELS.get(book["status"], book["status"])]
+    if book["rating"]:
+        parts.append("⭐" * int(book["rating"]))
+    if book["categories"]:
+        parts.append(book["categories"].split(",")[0].strip())
+    return "- " + ", ".join(parts)
+
+
+def question_context(question: str, budget: int = TOKEN_BUDGET) -> str:
+    """
+    Soru için bağlam: bütçenin yarısı kitaplık özetine, kalanı soruya
+    en yakın kitaplara ayrılır (özet kısa kalırsa artanı da kitaplara).
+    """
+    summary = library_context(budget // 2)
+    remaining = budget - estimate_tokens(summary)
+
+    books = relevant_books(question)
+    if not books:
+        return summary
+
+    lines = fit_lines([_book_line(book) for book in books], remaining)
+    if not lines:
+        return summary
+    return f"{summary}\n\nSoruyla ilgili olabilecek kitaplar:\n" + "\n".join(lines)
+
+
+def reading_plan_context(budget: int = TOKEN_BUDGET) -> tuple:
+    """
+    Okuma planı için okunanlar ve sıradaki adaylar.
+
+    Adaylar önce okuma listesindeki sırayla, sonra okunmamış kitaplardan kısadan
+    uzuna seçilir (her biri LIMIT'li sorgu).
+
+    Returns:
+        (şu an okunanlar metni, adaylar metni)
+    """
+    reading = db.BookQuery(["title", "current_page", "page_count"]).status("reading") \
+        .order_by("-updated_at").limit(PLAN_BOOKS).fetch()
+    queued = db.get_reading_list(columns=["id", "title", "page_count"], limit=PLAN_BOOKS)
+    unread = db.BookQuery(["id", "title", "page_count"]).status("unread").where("page_count > 0") \
+        .order_by("page_count").limit(PLAN_BOOKS).fetch()
+
+    reading_lines = [
+        f"- {b['title']} (sayfa {b['current_page'] or 0}/{b['page_count'] or '?'})" for b in reading
+    ]
+    seen = set()
+    candidate_lines = []
+    for book in list(queued) + list(unread):
+        if book["id"] in seen or len(candidate_lines) >= PLAN_BOOKS:
+            continue
+        seen.add(book["id"])
+        candidate_lines.append(f"- {book['title']} ({book['page_count'] or '?'} sayfa)")
+
+    half = budget // 2
+    return "\n".join(fit_lines(reading_lines, half)), "\n".join(fit_lines(candidate_lines, half))
@@ -0,0 +1,228 @@
+"""
+Kitaplık Uygulaması - AI İstek Kuyruğu
+======================================
+Tek bir yerel Ollama'ya giden istekleri sıraya koyar.
+
+- Tek tüketici thread: aynı anda tek üretim çalışır, istekler çakışmaz
+- Öncelik: kullanıcının yazdığı soru (PRIORITY_INTERACTIVE) hazır eylemlerin
+  (öneri, analiz, plan) önüne geçer; aynı öncelikte geliş sırası korunur
+- Aynı fonksiyon ve parametrelerle bekleyen/çalışan bir istek varsa yenisi
+  açılmaz, dinleyici mevcut işe eklenir (o ana kadar gelen metin hemen iletilir)
+- Dinleyicilere sıradaki yerleri bildirilir (0: çalışıyor)
+- Bir dinleyici ayrılınca iş sürer; hiç dinleyici kalmazsa iptal edilir
+
+Kullanım:
+    class Listener:
+        def on_position(self, position): ...
+        def on_token(self, text): ...
+        def on_finished(self, result): ...
+        def on_error(self, message): ...
+
+    job = get_queue().submit(ai_service.get_book_recommendation, listener=Listener())
+    job.detach(listener)   # durdur
+"""
+
+import heapq
+import itertools
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from services.ai_service import response_cache
+
+
+# Öncelikler (küçük olan önce çalışır)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+
+
+class AIJob:
+    """Kuyruktaki tek istek; aynı isteği bekleyen dinleyicileri taşır."""
+
+    def __init__(self, key, func, args, kwargs, priority: int, use_cache: bool):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.use_cache = use_cache
+        self.cancel_event = threading.Event()
+        self.listeners = []
+        self.parts = []  # Şimdiye kadar gelen metin (sonradan katılanlar için)
+        self.on_cancel = None  # Kuyruğun iptal bildirimi (iş kuyruktan çıkarılır)
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def attach(self, listener):
+        """Dinleyici ekler; gelmiş olan metni hemen iletir."""
+        with self._lock:
+            self.listeners.append(listener)
+            text = "".join(self.parts)
+        if text:
+            listener.on_token(text)
+
+    def detach(self, listener):
+        """Dinleyiciyi çıkarır; kimse kalmadıysa işi iptal eder."""
+        with self._lock:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+            cancelled = not self.listeners and not self.cancel_event.is_set()
+            if cancelled:
+                self.cancel_event.set()
+        # Kilit dışında: kuyruk kendi kilidini alır (submit ters sırayla alıyor)
+        if cancelled and self.on_cancel is not None:
+            self.on_cancel(self)
+
+    def _emit(self, method: str, *args):
+        with self._lock:
+            listeners = list(self.listeners)
+        for listener in listeners:
+            getattr(listener, method)(*args)
+
+    def _token(self, text: str):
+        with self._lock:
+            self.parts.append(text)
+        self._emit("on_token", text)
+
+
+class AIRequestQueue:
+    """Öncelikli, tekilleştiren, tek tüketicili AI istek kuyruğu."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._heap = []      # (öncelik, sıra no, iş)
+        self._jobs = {}      # anahtar -> bekleyen veya çalışan iş
+        self._current = None
+        self._counter = itertools.count()
+        self._thread = None
+
+    @staticmethod
+    def _key(func, args, kwargs, use_cache: bool):
+        return (func.__module__, func.__qualname__, repr(args),
+                repr(sorted(kwargs.items())), use_cache)
+
+    def submit(self, func, *args, listener=None, priority: int = PRIORITY_NORMAL,
+               use_cache: bool = True, **kwargs) -> AIJob:
+        """
+        İsteği kuyruğa ekler (aynısı bekliyorsa ona katılır).
+
+        func(*args, on_token=..., cancel=..., **kwargs) şeklinde çağrılır.
+        use_cache=False ise önbellekteki yanıt kullanılmaz, yenisi üretilir.
+        """
+        key = self._key(func, args, kwargs, use_cache)
+
+        with self._condition:
+            job = self._jobs.get(key)
+            if job is None or job.cancelled:
+                job = AIJob(key, func, args, kwargs, priority, use_cache)
+                job.on_cancel = self._discard
+                self._jobs[key] = job
+                heapq.heappush(self._heap, (priority, next(self._counter), job))
+            elif priority < job.priority and job is not self._current:
+                # Bekleyen iş daha öncelikli bir istekle tekrar gelirse öne alınır
+                job.priority = priority
+                heapq.heappush(self._heap, (priority, next(self._counter), job))
+
+            if listener is not None:
+                job.attach(listener)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+        self._report_positions()
+        return job
+
+    def _discard(self, job: AIJob):
+        """İptal edilen bekleyen işi kuyruktan çıkarır (çalışan iş bitince _run çıkarır)."""
+        with self._condition:
+            if job is self._current:
+                return
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            self._heap = [item for item in self._heap if item[2] is not job]
+            heapq.heapify(self._heap)
+        self._report_positions()
+
+    def position(self, job: AIJob) -> int:
+        """İşin sırası: 0 çalışıyor, 1 sıradaki, ...; kuyrukta yoksa -1."""
+        with self._condition:
+            if job is self._current:
+                return 0
+            pending = self._pending()
+            return pending.index(job) + 1 if job in pending else -1
+
+    def _pending(self) -> list:
+        """Bekleyen işler çalışma sırasıyla (iptal edilenler ve eski kayıtlar hariç)."""
+        seen = set()
+        pending = []
+        for priority, _, job in sorted(self._heap, key=lambda item: item[:2]):
+            if job.cancelled or id(job) in seen or priority != job.priority:
+                continue
+            seen.add(id(job))
+            pending.append(job)
+        return pending
+
+    def _report_positions(self):
+        with self._condition:
+            current = self._current
+            pending = self._pending()
+        if current is not None:
+            current._emit("on_position", 0)
+        for position, job in enumerate(pending, start=1):
+            job._emit("on_position", position)
+
+    def _next_job(self) -> AIJob:
+        with self._condition:
+            while True:
+                while self._heap:
+                    priority, _, job = heapq.heappop(self._heap)
+                    # İptal edilen, çalışmış veya öne alınıp tekrar eklenmiş işin eski kaydı
+                    if job.cancelled or priority != job.priority or self._jobs.get(job.key) is not job:
+                        continue
+                    self._current = job
+                    return job
+                self._condition.wait()
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            self._report_positions()
+
+            result, error = None, None
+            try:
+                with response_cache(job.use_cache):
+                    result = job.func(*job.args, on_token=job._token, cancel=job.cancel_event, **job.kwargs)
+            except Exception as e:
+                error = str(e)
+
+            with self._condition:
+                self._current = None
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+
+            if not job.cancelled:
+                if error:
+                    job._emit("on_error", error)
+                elif result:
+                    job._emit("on_finished", result)
+                else:
+                    job._emit("on_error", "Yanıt alınamadı. Ollama çalışıyor mu?")
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> AIRequestQueue:
+    """Uygulama genelindeki tek kuyruk."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = AIRequestQueue()
+        return _queue
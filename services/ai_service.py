@@ -2,45 +2,298 @@
 Kitaplık Uygulaması - AI Öneri Servisi (Ollama)
 ================================================
 Yerel Ollama modeli ile kitap önerileri ve analiz.
+
+- Tek OllamaClient örneği bağlantıları (requests.Session) yeniden kullanır
+- Model listesi MODELS_TTL süresince önbellekte tutulur, her istekte sorulmaz
+- keep_alive ile model istekler arasında bellekte kalır
+- Yanıt parça parça (stream) gelir: on_token her parçayla çağrılır
+- cancel (threading.Event) set edilince üretim yarıda kesilir; yanıt ayrı bir
+  thread'de okunduğundan ilk parça beklenirken (model yüklenirken) de hemen döner
+
+Kullanım:
+    text = generate_response("Merhaba", on_token=print, cancel=threading.Event())
 """
 
+import hashlib
 import json
+import os
+import queue
+import sys
+import threading
+import time
 import requests
-from typing import Optional
+from contextlib import contextmanager
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from typing import Callable, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+from services.ai_context import library_context, question_context, reading_plan_context
 
 # Ollama API endpoint
-OLLAMA_URL = "http://localhost:11434/api/generate"
-OLLAMA_CHAT_URL = "http://localhost:11434/api/chat"
-OLLAMA_TAGS_URL = "http://localhost:11434/api/tags"
+OLLAMA_BASE_URL = "http://localhost:11434"
+OLLAMA_URL = f"{OLLAMA_BASE_URL}/api/generate"
+OLLAMA_CHAT_URL = f"{OLLAMA_BASE_URL}/api/chat"
+OLLAMA_TAGS_URL = f"{OLLAMA_BASE_URL}/api/tags"
 
 # Varsayılan model
 DEFAULT_MODEL = "mistral"
 
+# Gömme (embedding) modeli (bkz. services/embeddings.py)
+EMBED_MODEL = "nomic-embed-text"
 
-def check_ollama_status() -> dict:
-    """Ollama'nın çalışıp çalışmadığını kontrol eder."""
-    try:
-        response = requests.get(OLLAMA_TAGS_URL, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            models = [m["name"] for m in data.get("models", [])]
+# Model listesi önbellek süresi (saniye)
+MODELS_TTL = 60
+
+# Ollama kapalıyken tekrar deneme aralığı (saniye)
+UNAVAILABLE_TTL = 5
+
+# Model son istekten sonra ne kadar bellekte kalsın (Ollama süre biçimi)
+KEEP_ALIVE = "30m"
+
+# (bağlantı, okuma) zaman aşımı; akışta okuma süresi iki parça arası beklemedir
+# (model ilk kez yüklenirken ilk parça gecikebilir)
+REQUEST_TIMEOUT = (5, 120)
+
+# Akış beklenirken iptalin kontrol aralığı (saniye)
+CANCEL_POLL = 0.1
+
+# Yanıt önbelleğinde kayıtların ömrü (saat)
+CACHE_TTL_HOURS = 24 * 7
+
+
+class OllamaClient:
+    """
+    Ollama ile kalıcı bağlantı kuran istemci.
+    
+    Thread-safe: arayüz ve arka plan işçileri aynı örneği kullanabilir.
+    """
+    
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, models_ttl: float = MODELS_TTL,
+                 keep_alive: str = KEEP_ALIVE):
+        self.base_url = base_url.rstrip("/")
+        self.models_ttl = models_ttl
+        self.keep_alive = keep_alive
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        self._lock = threading.Lock()
+        self._status = None
+        self._status_time = 0.0
+    
+    # ---------- Durum ve modeller ----------
+    
+    def status(self, force: bool = False) -> dict:
+        """
+        Ollama durumu ve model listesi (önbellekli).
+        
+        Returns:
+            {"available": True, "models": [...], "recommended": "..."} veya
+            {"available": False, "error": "..."}
+        """
+        with self._lock:
+            ttl = self.models_ttl if (self._status or {}).get("available") else UNAVAILABLE_TTL
+            if not force and self._status and time.monotonic() - self._status_time < ttl:
+                return self._status
+        
+        status = self._fetch_status()
+        
+        with self._lock:
+            self._status = status
+            self._status_time = time.monotonic()
+        return status
+    
+    def _fetch_status(self) -> dict:
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+            if response.status_code == 200:
+                data = response.json()
+                models = [m["name"] for m in data.get("models", [])]
+                return {
+                    "available": True,
+                    "models": models,
+                    "recommended": get_best_model(models)
+                }
+        except requests.exceptions.ConnectionError:
             return {
-                "available": True,
-                "models": models,
-                "recommended": get_best_model(models)
+                "available": False,
+                "error": "Ollama çalışmıyor. 'ollama serve' komutu ile başlatın."
             }
-    except requests.exceptions.ConnectionError:
-        return {
-            "available": False,
-            "error": "Ollama çalışmıyor. 'ollama serve' komutu ile başlatın."
-        }
-    except Exception as e:
-        return {
-            "available": False,
-            "error": str(e)
+        except Exception as e:
+            return {
+                "available": False,
+                "error": str(e)
+            }
+        
+        return {"available": False, "error": "Bilinmeyen hata"}
+    
+    def invalidate(self):
+        """Model önbelleğini boşaltır (yeni model indirildiğinde vb.)."""
+        with self._lock:
+            self._status = None
+    
+    # ---------- Üretim ----------
+    
+    def generate(self, prompt: str, model: str = None, options: dict = None,
+                 on_token: Callable[[str], None] = None,
+                 cancel: threading.Event = None) -> Optional[str]:
+        """
+        Yanıtı akış halinde üretir.
+        
+        Args:
+            on_token: Her gelen metin parçasıyla çağrılır
+            cancel: Set edilirse bağlantı kapatılır, Ollama üretimi bırakır
+        
+        Returns:
+            Tam yanıt; hata, iptal veya Ollama yoksa None
+        """
+        if model is None:
+            status = self.status()
+            if not status["available"]:
+                return None
+            model = status.get("recommended", DEFAULT_MODEL)
+        
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+            "options": options or {"temperature": 0.7, "num_predict": 1024},
         }
+        
+        # Yanıt ayrı thread'de okunur: iptal, ilk parça gelmeden (model yüklenirken)
+        # de beklenmeden döner; okuyucu yanıtı görünce bağlantıyı kapatır ve Ollama üretimi bırakır
+        lines = queue.Queue()
+        stop = threading.Event()
+        live = {}
+        
+        def read():
+            try:
+                with self.session.post(f"{self.base_url}/api/generate", json=payload,
+                                       stream=True, timeout=REQUEST_TIMEOUT) as response:
+                    live["response"] = response
+                    if response.status_code != 200:
+                        lines.put(("status", response.status_code))
+                        return
+                    for line in response.iter_lines():
+                        if stop.is_set():
+                            return
+                        if line:
+                            lines.put(("line", line))
+            except Exception as e:
+                if not stop.is_set():
+                    lines.put(("error", e))
+            finally:
+                lines.put(("end", None))
+        
+        threading.Thread(target=read, daemon=True).start()
+        
+        parts = []
+        try:
+            while True:
+                try:
+                    kind, value = lines.get(timeout=CANCEL_POLL)
+                except queue.Empty:
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    continue
+                
+                if cancel is not None and cancel.is_set():
+                    return None
+                if kind == "end":
+                    break
+                if kind == "status":
+                    if value == 404:
+                        self.invalidate()  # Model silinmiş olabilir
+                    return None
+                if kind == "error":
+                    print(f"Ollama hatası: {value}")
+                    return None
+                
+                data = json.loads(value)
+                if data.get("error"):
+                    print(f"Ollama hatası: {data['error']}")
+                    return None
+                
+                token = data.get("response", "")
+                if token:
+                    parts.append(token)
+                    if on_token:
+                        on_token(token)
+                if data.get("done"):
+                    break
+        except Exception as e:
+            print(f"Ollama hatası: {e}")
+            return None
+        finally:
+            stop.set()
+            response = live.get("response")
+            if response is not None:
+                try:
+                    response.close()
+                except Exception:
+                    pass
+        
+        if cancel is not None and cancel.is_set():
+            return None
+        return "".join(parts).strip()
     
-    return {"available": False, "error": "Bilinmeyen hata"}
+    def embed(self, texts: list, model: str = EMBED_MODEL) -> list:
+        """
+        Metinlerin gömme vektörlerini tek istekte alır (/api/embed).
+        
+        Raises:
+            requests.RequestException: Ollama'ya ulaşılamazsa veya model yoksa
+        """
+        response = self.session.post(f"{self.base_url}/api/embed", json={
+            "model": model,
+            "input": list(texts),
+            "keep_alive": self.keep_alive,
+        }, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+_base_url = OLLAMA_BASE_URL
+
+
+def get_client() -> OllamaClient:
+    """Uygulama genelindeki tek istemci."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OllamaClient(_base_url)
+        return _client
+
+
+def set_base_url(base_url: str = None):
+    """
+    Ollama adresini değiştirir (None: varsayılan adres).
+    Sahte sunucu ile test için: set_base_url(f"{server.base_url}/ollama")
+    """
+    global _client, _base_url
+    with _client_lock:
+        _base_url = (base_url or OLLAMA_BASE_URL).rstrip("/")
+        _client = None
+
+
+# Ortam değişkeniyle farklı Ollama adresi
+# örn: KITAPLIK_OLLAMA_URL=http://127.0.0.1:8765/ollama python main.py
+if os.environ.get("KITAPLIK_OLLAMA_URL"):
+    set_base_url(os.environ["KITAPLIK_OLLAMA_URL"])
+
+
+def check_ollama_status(force: bool = False) -> dict:
+    """Ollama'nın çalışıp çalışmadığını kontrol eder (MODELS_TTL süresince önbellekli)."""
+    return get_client().status(force)
 
 
 def get_best_model(models: list) -> str:
@@ -53,53 +306,80 @@ def get_best_model(models: list) -> str:
             if pref in model.lower():
                 return model
     
-    # Hiçbiri yoksa ilk modeli döndür
+    # Hiçbiri yoksa ilk modeli döndür (gömme modelleri metin üretemez)
+    models = [model for model in models if "embed" not in model.lower()] or models
     return models[0] if models else DEFAULT_MODEL
 
 
-def generate_response(prompt: str, model: str = None, context: str = None) -> Optional[str]:
-    """Ollama'dan yanıt alır."""
-    if model is None:
-        status = check_ollama_status()
-        if not status["available"]:
-            return None
-        model = status.get("recommended", DEFAULT_MODEL)
+_options = threading.local()
+
+
+@contextmanager
+def response_cache(enabled: bool):
+    """
+    Bu thread'deki generate_response çağrılarında önbellek okumasını açar/kapatır.
+    Kapalıyken yanıt yine üretilip önbelleğe yazılır ("yeniden üret").
+    """
+    previous = getattr(_options, "use_cache", True)
+    _options.use_cache = enabled
+    try:
+        yield
+    finally:
+        _options.use_cache = previous
+
+
+def cache_key(model: str, prompt: str, library_version: int = 0) -> str:
+    """Önbellek anahtarı: (model, istem, kitaplık sürümü) özeti."""
+    return hashlib.sha256(f"{model}\0{library_version}\0{prompt}".encode()).hexdigest()
+
+
+def clear_cache() -> int:
+    """Tüm önbelleğe alınmış AI yanıtlarını siler."""
+    return db.clear_ai_cache()
+
+
+def generate_response(prompt: str, model: str = None, context: str = None,
+                      on_token: Callable[[str], None] = None,
+                      cancel: threading.Event = None,
+                      library_bound: bool = True) -> Optional[str]:
+    """
+    Ollama'dan yanıt alır (on_token verilirse parça parça bildirir).
     
+    Aynı model ve istem için CACHE_TTL_HOURS içinde üretilmiş yanıt varsa
+    önbellekten döner. library_bound ise anahtara kitaplık sürümü de girer:
+    kitaplık değişince yanıt yeniden üretilir.
+    """
     full_prompt = prompt
     if context:
         full_prompt = f"{context}\n\n{prompt}"
     
-    try:
-        response = requests.post(
-            OLLAMA_URL,
-            json={
-                "model": model,
-                "prompt": full_prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "num_predict": 1024,
-                }
-            },
-            timeout=120
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("response", "").strip()
-        else:
+    client = get_client()
+    if model is None:
+        status = client.status()
+        if not status["available"]:
             return None
-            
-    except Exception as e:
-        print(f"Ollama hatası: {e}")
-        return None
+        model = status.get("recommended", DEFAULT_MODEL)
+    
+    key = cache_key(model, full_prompt, db.get_library_version() if library_bound else 0)
+    if getattr(_options, "use_cache", True):
+        cached = db.get_ai_cache(key, CACHE_TTL_HOURS)
+        if cached:
+            if on_token:
+                on_token(cached)
+            return cached
+    
+    response = client.generate(full_prompt, model, on_token=on_token, cancel=cancel)
+    if response:
+        db.set_ai_cache(key, model, response, CACHE_TTL_HOURS)
+    return response
 
 
-def get_book_recommendation(books: list, preferences: dict = None, model: str = None) -> Optional[str]:
-    """Kitaplığa göre öneri yapar."""
+def get_book_recommendation(books: list = None, preferences: dict = None, model: str = None,
+                            on_token=None, cancel=None) -> Optional[str]:
+    """Kitaplığa göre öneri yapar (books verilmezse önbellekli SQL özeti kullanılır)."""
     
     # Kitap özetini oluştur
-    book_summary = create_book_summary(books)
+    book_summary = create_book_summary(books) if books is not None else library_context()
     
     # Tercihler
     pref_text = ""
@@ -125,13 +405,13 @@ Lütfen kullanıcıya 3-5 kitap öner. Önerilerini şu formatta ver:
 Önerilerin kullanıcının zevkine uygun olmalı. Kitaplığındaki kitaplara benzer ama farklı kitaplar öner.
 Türkçe yanıt ver."""
 
-    return generate_response(prompt, model)
+    return generate_response(prompt, model, on_token=on_token, cancel=cancel)
 
 
-def analyze_reading_habits(books: list, model: str = None) -> Optional[str]:
-    """Okuma alışkanlıklarını analiz eder."""
+def analyze_reading_habits(books: list = None, model: str = None, on_token=None, cancel=None) -> Optional[str]:
+    """Okuma alışkanlıklarını analiz eder (books verilmezse önbellekli SQL özeti kullanılır)."""
     
-    book_summary = create_book_summary(books)
+    book_summary = create_book_summary(books) if books is not None else library_context()
     
     prompt = f"""Sen bir kitap uzmanısın. Kullanıcının okuma alışkanlıklarını analiz et.
 
@@ -147,16 +427,25 @@ Lütfen şunları analiz et:
 
 Kısa ve öz bir analiz yap. Türkçe yanıt ver."""
 
-    return generate_response(prompt, model)
+    return generate_response(prompt, model, on_token=on_token, cancel=cancel)
 
 
-def get_similar_books(book_title: str, book_author: str, books: list = None, model: str = None) -> Optional[str]:
+def get_similar_books(book_title: str, book_author: str, books: list = None, model: str = None,
+                      on_token=None, cancel=None) -> Optional[str]:
     """Benzer kitap önerileri yapar."""
     
     context = ""
     if books:
-        owned_titles = [b.get("title", "") for b in books]
-        context = f"Kullanıcının kitaplığında şu kitaplar var: {', '.join(owned_titles[:20])}"
+        # Kitaplığın tamamı yerine bu kitaba en yakın 20 kitap (gömme index'i)
+        owned_titles = [b.get("title", "") for b in books[:20]]
+        try:
+            from services.embeddings import get_index
+            titles = {b.get("id"): b.get("title", "") for b in books}
+            related = get_index().search(f"{book_title}\n{book_author}", k=20)
+            owned_titles = [titles[book_id] for book_id, _ in related if book_id in titles] or owned_titles
+        except Exception as e:
+            print(f"Benzer kitaplar index'ten alınamadı: {e}")
+        context = f"Kullanıcının kitaplığında şu kitaplar var: {', '.join(owned_titles)}"
     
     prompt = f""""{book_title}" - {book_author} kitabını okuyan birine benzer kitaplar öner.
 
@@ -170,18 +459,22 @@ Format:
 
 Türkçe yanıt ver."""
 
-    return generate_response(prompt, model)
+    return generate_response(prompt, model, on_token=on_token, cancel=cancel)
 
 
-def get_reading_plan(books: list, goal: int = None, model: str = None) -> Optional[str]:
-    """Okuma planı oluşturur."""
-    
-    # Okunmamış kitapları bul
-    unread = [b for b in books if b.get("status") == "unread"]
-    reading = [b for b in books if b.get("status") == "reading"]
+def get_reading_plan(books: list = None, goal: int = None, model: str = None,
+                     on_token=None, cancel=None) -> Optional[str]:
+    """Okuma planı oluşturur (books verilmezse adaylar LIMIT'li sorgularla seçilir)."""
     
-    unread_list = "\n".join([f"- {b.get('title', '')} ({b.get('page_count', '?')} sayfa)" for b in unread[:15]])
-    reading_list = "\n".join([f"- {b.get('title', '')} (sayfa {b.get('current_page', 0)}/{b.get('page_count', '?')})" for b in reading])
+    if books is None:
+        reading_list, unread_list = reading_plan_context()
+    else:
+        # Okunmamış kitapları bul
+        unread = [b for b in books if b.get("status") == "unread"]
+        reading = [b for b in books if b.get("status") == "reading"]
+        
+        unread_list = "\n".join([f"- {b.get('title', '')} ({b.get('page_count', '?')} sayfa)" for b in unread[:15]])
+        reading_list = "\n".join([f"- {b.get('title', '')} (sayfa {b.get('current_page', 0)}/{b.get('page_count', '?')})" for b in reading])
     
     goal_text = f"Yıllık hedef: {goal} kitap" if goal else ""
     
@@ -199,10 +492,11 @@ Lütfen önümüzdeki 1-2 ay için bir okuma planı öner.
 Kitapları hangi sırayla okuması gerektiğini ve nedenini açıkla.
 Türkçe yanıt ver."""
 
-    return generate_response(prompt, model)
+    return generate_response(prompt, model, on_token=on_token, cancel=cancel)
 
 
-def ask_about_book(book: dict, question: str, model: str = None) -> Optional[str]:
+def ask_about_book(book: dict, question: str, model: str = None,
+                   on_token=None, cancel=None) -> Optional[str]:
     """Belirli bir kitap hakkında soru yanıtlar."""
     
     book_info = f"""
@@ -222,10 +516,11 @@ Soru: {question}
 
 Kısa ve bilgilendirici bir yanıt ver. Türkçe yanıt ver."""
 
-    return generate_response(prompt, model)
+    return generate_response(prompt, model, on_token=on_token, cancel=cancel, library_bound=False)
 
 
-def get_series_reading_order(series_name: str, books: list = None, model: str = None) -> Optional[str]:
+def get_series_reading_order(series_name: str, books: list = None, model: str = None,
+                             on_token=None, cancel=None) -> Optional[str]:
     """Seri okuma sırasını önerir."""
     
     owned = ""
@@ -247,7 +542,42 @@ def get_series_reading_order(series_name: str, books: list = None, model: str =
 
 Türkçe yanıt ver."""
 
-    return generate_response(prompt, model)
+    return generate_response(prompt, model, on_token=on_token, cancel=cancel, library_bound=False)
+
+
+def ask_library(question: str, model: str = None, on_token=None, cancel=None) -> Optional[str]:
+    """Kitaplık hakkında serbest soru (bağlama soruyla ilgili kitaplar eklenir)."""
+    
+    context = question_context(question)
+    
+    prompt = f"""Sen bir kitap uzmanısın. Kullanıcının kitaplığı hakkında bilgin var.
+
+{context}
+
+Kullanıcının sorusu: {question}
+
+Türkçe ve yardımcı bir şekilde yanıtla."""
+
+    return generate_response(prompt, model, on_token=on_token, cancel=cancel)
+
+
+def find_books_by_theme(theme: str, limit: int = 10, on_token=None, cancel=None) -> Optional[str]:
+    """
+    Kitaplıkta temaya/konuya en yakın kitapları listeler (gömme index'i, model gerekmez).
+    on_token/cancel AIWorkerThread ile uyum için vardır.
+    """
+    from services.embeddings import get_index
+    
+    results = get_index().search(theme, k=limit)
+    books = {b["id"]: b for b in db.get_book_rows(["id", "title", "author"], [i for i, _ in results])}
+    matches = [(book_id, score) for book_id, score in results if book_id in books]
+    lines = [
+        f"{n}. {books[book_id]['title']} - {books[book_id]['author'] or '?'} (%{max(score, 0) * 100:.0f})"
+        for n, (book_id, score) in enumerate(matches, start=1)
+    ]
+    if not lines:
+        return f"\"{theme}\" ile ilgili kitap bulunamadı."
+    return f"🔎 \"{theme}\" temasına en yakın kitaplar:\n\n" + "\n".join(lines)
 
 
 def create_book_summary(books: list) -> str:
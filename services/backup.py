@@ -0,0 +1,484 @@
+"""
+Kitaplık Uygulaması - Yedekleme ve Geri Yükleme
+===============================================
+Veritabanının anlık görüntülerini (snapshot) alır ve geri yükler.
+
+- Kopya SQLite'ın backup API'siyle (sqlite3.Connection.backup) sayfa sayfa
+  alınır; ilerleme bildirilir ve iptal edilebilir. Veritabanı WAL kipinde
+  olduğundan kopya tek bir okuma görüntüsünden alınır: uygulama bu sırada
+  yazmaya devam eder, kopya baştan başlamaz ve tutarlı kalır
+- Yedek önce geçici dosyaya yazılır, bütünlüğü (PRAGMA quick_check) doğrulanır,
+  sonra yerine taşınır; manifest (JSON: özet, boyut, kitap sayısı, kapaklar)
+  en son yazılır, manifesti olmayan yedek yarım sayılır
+- Kapaklar isteğe bağlı olarak içerik özetine göre (SHA-256) tek kopya saklanır:
+  değişmeyen kapak sonraki yedeklerde tekrar kopyalanmaz
+- Eski yedekler KEEP_SNAPSHOTS sınırına göre silinir (hiçbir yedeğin
+  kullanmadığı kapaklar da)
+- Geri yükleme: manifest ve özet doğrulanır, mevcut veritabanının yedeği
+  alınır, sonra yedek backup API'siyle tek adımda (atomik) yerine yazılır
+
+Kullanım:
+    manifest = create_snapshot(include_covers=True, on_progress=print)
+    restore_snapshot(list_snapshots()[0])
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+
+
+# Yedeklerin klasörü
+BACKUP_DIR = Path(__file__).parent.parent / "backups"
+
+# Saklanacak en fazla yedek (eskiler silinir)
+KEEP_SNAPSHOTS = 10
+
+# Backup API'nin bir adımda kopyaladığı sayfa sayısı (4 KB sayfada 1 MB)
+BACKUP_PAGES_PER_STEP = 256
+
+# Veritabanı o an kilitliyse (başka bağlantı yazıyorsa) tekrar denemeden önce bekleme (saniye)
+BACKUP_STEP_SLEEP = 0.05
+
+# Özet hesaplanırken okunan parça boyutu
+HASH_CHUNK = 1024 * 1024
+
+# Otomatik yedekleme ayarları (settings tablosu)
+INTERVAL_KEY = "backup_interval_hours"    # 0: kapalı
+COVERS_KEY = "backup_include_covers"      # "1" / "0"
+LAST_BACKUP_KEY = "last_backup_at"
+DEFAULT_INTERVAL_HOURS = 24
+
+# Kapak özetleri önbelleği: yol -> (boyut, değişme zamanı, özet)
+_COVER_INDEX = "covers_index.json"
+
+# Aynı anda tek yedekleme/geri yükleme
+_lock = threading.Lock()
+
+
+class BackupError(Exception):
+    """Yedek alınamadı veya yedek geçersiz."""
+
+
+class BackupCancelled(BackupError):
+    """Yedekleme kullanıcı tarafından durduruldu."""
+
+
+def _snapshots_dir() -> Path:
+    return BACKUP_DIR / "snapshots"
+
+
+def _covers_dir() -> Path:
+    return BACKUP_DIR / "covers"
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json(path: Path, data):
+    """JSON'u geçici dosya üzerinden yazar (yarım dosya kalmaz)."""
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def _report(on_progress, percent: float, message: str):
+    if on_progress:
+        on_progress(int(percent), message)
+
+
+# ---------- Yedekler ----------
+
+def list_snapshots() -> list:
+    """
+    Tamamlanmış yedekler (yeniden eskiye).
+
+    Returns:
+        Manifest sözlükleri; "path" anahtarı veritabanı dosyasının yolu
+    """
+    snapshots = []
+    if not _snapshots_dir().exists():
+        return snapshots
+
+    for manifest_path in _snapshots_dir().glob("*.json"):
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        manifest["path"] = str(manifest_path.with_suffix(".db"))
+        manifest["manifest_path"] = str(manifest_path)
+        snapshots.append(manifest)
+
+    snapshots.sort(key=lambda manifest: manifest.get("created_at", ""), reverse=True)
+    return snapshots
+
+
+def last_backup_time() -> datetime | None:
+    value = db.get_setting(LAST_BACKUP_KEY)
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def backup_due() -> bool:
+    """Otomatik yedekleme zamanı geldi mi (INTERVAL_KEY saatte bir)."""
+    hours = float(db.get_setting(INTERVAL_KEY, str(DEFAULT_INTERVAL_HOURS)) or 0)
+    if hours <= 0:
+        return False
+    last = last_backup_time()
+    return last is None or datetime.now() - last >= timedelta(hours=hours)
+
+
+def _copy_database(target: Path, on_progress, cancel, start: float, span: float):
+    """Canlı veritabanını backup API'siyle sayfa sayfa target'a kopyalar."""
+    def progress(status, remaining, total):
+        if cancel is not None and cancel.is_set():
+            raise BackupCancelled("Yedekleme durduruldu")
+        if total:
+            _report(on_progress, start + span * (total - remaining) / total,
+                    f"Veritabanı kopyalanıyor ({total - remaining}/{total} sayfa)")
+
+    source = db.get_connection()
+    destination = sqlite3.connect(target)
+    try:
+        # Okuma işlemi kopya boyunca açık kalır: her adım aynı görüntüyü okur,
+        # araya giren yazmalar (WAL'a gider) kopyayı yeniden başlatmaz
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        source.backup(destination, pages=BACKUP_PAGES_PER_STEP, progress=progress,
+                      sleep=BACKUP_STEP_SLEEP)
+        source.rollback()
+
+        # Yedek tek dosya olarak kalsın (-wal/-shm olmadan açılabilsin)
+        destination.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        destination.close()
+        source.close()
+
+
+def _inspect(path: Path) -> dict:
+    """
+    Veritabanı dosyasını salt okunur açıp doğrular.
+
+    Returns:
+        {"books": kitap sayısı, "version": kitaplık sürümü}
+
+    Raises:
+        BackupError: Dosya bozuksa veya kitaplık veritabanı değilse
+    """
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            result = conn.execute("PRAGMA quick_check").fetchone()[0]
+            if result != "ok":
+                raise BackupError(f"Veritabanı bütünlük kontrolünden geçemedi: {result}")
+            books = conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+            row = conn.execute("SELECT value FROM settings WHERE key = ?",
+                               (db.LIBRARY_VERSION_KEY,)).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        raise BackupError(f"Geçerli bir kitaplık veritabanı değil: {e}")
+
+    return {"books": books, "version": int(row[0]) if row else 0}
+
+
+def _backup_covers(snapshot: Path, on_progress, cancel, start: float, span: float) -> dict:
+    """
+    Yedekteki kitapların kapaklarını özet deposuna kopyalar (olanlar atlanır).
+
+    Returns:
+        {kapak yolu: depodaki dosya adı}
+    """
+    conn = sqlite3.connect(f"file:{snapshot}?mode=ro", uri=True)
+    try:
+        paths = [row[0] for row in conn.execute(
+            "SELECT DISTINCT cover_path FROM books WHERE cover_path IS NOT NULL AND cover_path != ''"
+        )]
+    finally:
+        conn.close()
+
+    index_path = BACKUP_DIR / _COVER_INDEX
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        index = {}
+
+    _covers_dir().mkdir(parents=True, exist_ok=True)
+    covers = {}
+    copied = 0
+    for i, cover_path in enumerate(paths):
+        if cancel is not None and cancel.is_set():
+            raise BackupCancelled("Yedekleme durduruldu")
+        if i % 50 == 0:
+            _report(on_progress, start + span * i / len(paths), f"Kapaklar ({i}/{len(paths)})")
+
+        source = Path(cover_path)
+        try:
+            stat = source.stat()
+        except OSError:
+            continue  # Kapak dosyası yok
+
+        # Boyutu ve değişme zamanı aynıysa özet yeniden hesaplanmaz
+        cached = index.get(cover_path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            digest = cached[2]
+        else:
+            digest = _file_hash(source)
+            index[cover_path] = [stat.st_size, stat.st_mtime_ns, digest]
+
+        name = digest + source.suffix.lower()
+        stored = _covers_dir() / name
+        if not stored.exists():
+            temp_path = stored.with_suffix(".tmp")
+            shutil.copyfile(source, temp_path)
+            os.replace(temp_path, stored)
+            copied += 1
+        covers[cover_path] = name
+
+    # Artık kullanılmayan yolların özetleri atılır
+    _write_json(index_path, {path: index[path] for path in covers})
+    if copied:
+        print(f"Yedek: {copied} yeni kapak kopyalandı")
+    return covers
+
+
+def create_snapshot(include_covers: bool = True, on_progress=None, cancel=None,
+                    reason: str = "manual") -> dict:
+    """
+    Veritabanının (ve isteğe bağlı kapakların) yedeğini alır.
+
+    Args:
+        include_covers: Kapaklar da yedeklensin mi
+        on_progress: on_progress(yüzde, mesaj), çağıran thread'de çağrılır
+        cancel: threading.Event; set edilirse BackupCancelled
+        reason: "manual", "auto" veya "pre-restore" (manifestte saklanır)
+
+    Returns:
+        Manifest sözlüğü ("path" ile)
+
+    Raises:
+        BackupError: Yedek alınamazsa (BackupCancelled: iptal edildiyse)
+    """
+    if not _lock.acquire(blocking=False):
+        raise BackupError("Başka bir yedekleme/geri yükleme sürüyor")
+    try:
+        return _create_snapshot(include_covers, on_progress, cancel, reason)
+    finally:
+        _lock.release()
+
+
+def _create_snapshot(include_covers, on_progress, cancel, reason) -> dict:
+    _snapshots_dir().mkdir(parents=True, exist_ok=True)
+    now = datetime.now()
+    name = f"kitaplik-{now.strftime('%Y%m%d-%H%M%S')}"
+    if reason != "manual":
+        name += f"-{reason}"
+    target = _snapshots_dir() / f"{name}.db"
+    suffix = 1
+    while target.exists():
+        suffix += 1
+        target = _snapshots_dir() / f"{name}-{suffix}.db"
+    temp_target = target.with_suffix(".part")
+
+    db_span = 70 if include_covers else 90
+    try:
+        _copy_database(temp_target, on_progress, cancel, 0, db_span)
+
+        _report(on_progress, db_span, "Yedek doğrulanıyor...")
+        info = _inspect(temp_target)
+        digest = _file_hash(temp_target)
+        os.replace(temp_target, target)
+
+        covers = {}
+        if include_covers:
+            covers = _backup_covers(target, on_progress, cancel, db_span + 5, 90 - db_span)
+    except BaseException:
+        temp_target.unlink(missing_ok=True)
+        if target.exists() and not target.with_suffix(".json").exists():
+            target.unlink()
+        raise
+
+    manifest = {
+        "created_at": now.isoformat(),
+        "reason": reason,
+        "db_file": target.name,
+        "db_sha256": digest,
+        "size": target.stat().st_size,
+        "books": info["books"],
+        "library_version": info["version"],
+        "covers": covers,
+    }
+    _write_json(target.with_suffix(".json"), manifest)
+    db.set_setting(LAST_BACKUP_KEY, now.isoformat())
+
+    # Geri yükleme öncesi yedekte döndürme, geri yükleme bittikten sonra yapılır
+    # (yoksa geri yüklenecek en eski yedek önce silinebilir)
+    if reason != "pre-restore":
+        _report(on_progress, 95, "Eski yedekler temizleniyor...")
+        rotate()
+    _report(on_progress, 100, "Yedek alındı")
+
+    manifest["path"] = str(target)
+    manifest["manifest_path"] = str(target.with_suffix(".json"))
+    return manifest
+
+
+def rotate(keep: int = KEEP_SNAPSHOTS) -> int:
+    """
+    En yeni keep yedek dışındakileri ve hiçbir yedeğin kullanmadığı kapakları siler.
+    Geri yükleme öncesi alınan yedekler sayıya dahildir.
+
+    Returns:
+        Silinen yedek sayısı
+    """
+    snapshots = list_snapshots()
+    removed = 0
+    for manifest in snapshots[keep:]:
+        Path(manifest["manifest_path"]).unlink(missing_ok=True)
+        Path(manifest["path"]).unlink(missing_ok=True)
+        removed += 1
+
+    # Yarım kalmış yedekler
+    if _snapshots_dir().exists():
+        for leftover in _snapshots_dir().glob("*.part"):
+            leftover.unlink(missing_ok=True)
+
+    if _covers_dir().exists():
+        used = {name for manifest in snapshots[:keep] for name in manifest.get("covers", {}).values()}
+        for stored in _covers_dir().iterdir():
+            if stored.name not in used:
+                stored.unlink(missing_ok=True)
+    return removed
+
+
+def delete_snapshot(manifest: dict):
+    """Yedeği siler (kapakları bir sonraki rotate temizler)."""
+    Path(manifest["manifest_path"]).unlink(missing_ok=True)
+    Path(manifest["path"]).unlink(missing_ok=True)
+
+
+# ---------- Geri yükleme ----------
+
+def validate_snapshot(manifest: dict) -> list:
+    """
+    Yedeği doğrular: dosya, boyut, özet, bütünlük ve kapak deposu.
+
+    Returns:
+        Sorunların listesi (boşsa yedek sağlam); eksik kapaklar sorun sayılmaz
+    """
+    path = Path(manifest["path"])
+    if not path.exists():
+        return ["Veritabanı dosyası bulunamadı"]
+    if path.stat().st_size != manifest.get("size"):
+        return ["Dosya boyutu manifestle uyuşmuyor"]
+    if _file_hash(path) != manifest.get("db_sha256"):
+        return ["Dosya özeti manifestle uyuşmuyor (dosya değişmiş veya bozuk)"]
+    try:
+        _inspect(path)
+    except BackupError as e:
+        return [str(e)]
+    return []
+
+
+def restore_snapshot(manifest: dict, restore_covers: bool = True, on_progress=None) -> dict:
+    """
+    Yedeği geri yükler.
+
+    Önce yedek doğrulanır ve mevcut veritabanının yedeği alınır; sonra yedek
+    canlı veritabanına backup API'siyle tek adımda yazılır (yarıda kalırsa
+    veritabanı eski haliyle kalır). Eski sürümden yedekler init_database ile
+    güncellenir. Bellekteki görüntüler ve index'ler çağıran tarafından yenilenmelidir.
+
+    Returns:
+        {"books": geri yüklenen kitap sayısı, "covers": geri konan kapak sayısı,
+         "safety_backup": geri yükleme öncesi alınan yedeğin yolu}
+
+    Raises:
+        BackupError: Yedek geçersizse veya yazılamazsa
+    """
+    if not _lock.acquire(blocking=False):
+        raise BackupError("Başka bir yedekleme/geri yükleme sürüyor")
+    try:
+        _report(on_progress, 0, "Yedek doğrulanıyor...")
+        problems = validate_snapshot(manifest)
+        if problems:
+            raise BackupError("; ".join(problems))
+
+        # Mevcut hali kaybolmasın (geri yükleme de geri alınabilsin)
+        safety = _create_snapshot(
+            False,
+            lambda percent, message: _report(on_progress, 10 + percent * 0.4, message),
+            None,
+            "pre-restore",
+        )
+
+        _report(on_progress, 55, "Yedek geri yükleniyor...")
+        version_before = db.get_library_version()
+
+        source = destination = None
+        try:
+            source = sqlite3.connect(f"file:{manifest['path']}?mode=ro", uri=True)
+            destination = db.get_connection()
+            source.backup(destination)  # Tek adım: atomik
+        except sqlite3.Error as e:
+            raise BackupError(f"Yedek yazılamadı: {e}")
+        finally:
+            if destination is not None:
+                destination.close()
+            if source is not None:
+                source.close()
+
+        restored_covers = 0
+        if restore_covers:
+            covers = manifest.get("covers", {})
+            for i, (cover_path, name) in enumerate(covers.items()):
+                if i % 50 == 0:
+                    _report(on_progress, 70 + 20 * i / len(covers), f"Kapaklar ({i}/{len(covers)})")
+                target = Path(cover_path)
+                stored = _covers_dir() / name
+                if target.exists() or not stored.exists():
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(stored, target)
+                restored_covers += 1
+
+        _report(on_progress, 90, "Eski yedekler temizleniyor...")
+        rotate()
+    finally:
+        _lock.release()
+
+    _report(on_progress, 92, "Veritabanı güncelleniyor...")
+    db.init_database()
+
+    # Sürüm sayacı geri gitmesin: sürüme bağlı önbellekler (AI bağlamı/yanıtları)
+    # eski kitaplığın verisini geri yüklenmiş kitaplıkta kullanmasın
+    db.set_setting(db.LIBRARY_VERSION_KEY, str(max(version_before, db.get_library_version()) + 1))
+    db.set_setting(LAST_BACKUP_KEY, safety["created_at"])
+
+    _report(on_progress, 100, "Geri yüklendi")
+    return {"books": manifest.get("books"), "covers": restored_covers, "safety_backup": safety["path"]}
+
+
+if __name__ == "__main__":
+    import time
+
+    db.init_database()
+    start = time.perf_counter()
+    manifest = create_snapshot(on_progress=lambda percent, message: print(f"%{percent} {message}"))
+    print(f"{manifest['path']}: {manifest['books']} kitap, {manifest['size'] / 1024 / 1024:.1f} MB, "
+          f"{len(manifest['covers'])} kapak, {time.perf_counter() - start:.1f} sn")
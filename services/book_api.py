@@ -11,17 +11,31 @@ Birden fazla kaynaktan kitap arama:
 import requests
 from pathlib import Path
 from typing import Optional
-import hashlib
+import os
 import re
+import sys
 import urllib.parse
 
-
-# Kapak görselleri klasörü
-COVERS_DIR = Path(__file__).parent.parent / "assets" / "covers"
+sys.path.append(str(Path(__file__).parent.parent))
+from services import cover_store
+from services.html_extract import extract_1000kitap, extract_bkmkitap, extract_kitapyurdu
 
 # API timeout (saniye)
 TIMEOUT = 10
 
+# Kaynakların kök adresleri
+# Testlerde ve ölçümlerde tüm kaynaklar yerel sahte sunucuya yönlendirilebilir
+# (bkz. set_base_url ve services/mock_server.py)
+DEFAULT_BASE_URLS = {
+    "google": "https://www.googleapis.com",
+    "openlibrary": "https://openlibrary.org",
+    "openlibrary_covers": "https://covers.openlibrary.org",
+    "kitapyurdu": "https://www.kitapyurdu.com",
+    "bkmkitap": "https://www.bkmkitap.com",
+    "1000kitap": "https://1000kitap.com",
+}
+BASE_URLS = dict(DEFAULT_BASE_URLS)
+
 # User agent for scraping
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -79,6 +93,81 @@ class BookSearchResult:
         return f"<BookSearchResult: {self.title} - {self.author}>"
 
 
+def set_base_url(base_url: str = None):
+    """
+    Tüm kaynakların kök adresini değiştirir.
+    
+    base_url verilirse her kaynak "{base_url}/{kaynak}" altına yönlendirilir,
+    örn: http://127.0.0.1:8765/google/books/v1/volumes
+    None verilirse gerçek adreslere dönülür.
+    """
+    BASE_URLS.clear()
+    if base_url:
+        base_url = base_url.rstrip("/")
+        BASE_URLS.update({name: f"{base_url}/{name}" for name in DEFAULT_BASE_URLS})
+    else:
+        BASE_URLS.update(DEFAULT_BASE_URLS)
+
+
+def _url(source: str, path: str) -> str:
+    """Kaynağın kök adresine yol ekler."""
+    return f"{BASE_URLS[source]}{path}"
+
+
+# Ortam değişkeni ile uygulamanın tamamı çevrimdışı çalıştırılabilir
+# örn: KITAPLIK_API_BASE=http://127.0.0.1:8765 python main.py
+if os.environ.get("KITAPLIK_API_BASE"):
+    set_base_url(os.environ["KITAPLIK_API_BASE"])
+
+
+# ==================== ISBN ====================
+
+def isbn10_to_13(isbn10: str) -> str:
+    """ISBN-10'u 978 önekli ISBN-13'e çevirir."""
+    core = "978" + isbn10[:9]
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(core))
+    return core + str((10 - total % 10) % 10)
+
+
+def isbn13_to_10(isbn13: str) -> Optional[str]:
+    """978 önekli ISBN-13'ü ISBN-10'a çevirir (979 önekinin karşılığı yoktur)."""
+    if not isbn13.startswith("978"):
+        return None
+    core = isbn13[3:12]
+    check = (11 - sum(int(d) * (10 - i) for i, d in enumerate(core)) % 11) % 11
+    return core + ("X" if check == 10 else str(check))
+
+
+def is_valid_isbn(isbn: str) -> bool:
+    """ISBN-10 veya ISBN-13'ün kontrol basamağını doğrular."""
+    isbn = re.sub(r'[\s\-]', '', isbn or "").upper()
+    
+    if re.fullmatch(r'\d{9}[\dX]', isbn):
+        total = sum((10 - i) * (10 if d == "X" else int(d)) for i, d in enumerate(isbn))
+        return total % 11 == 0
+    
+    if re.fullmatch(r'97[89]\d{10}', isbn):
+        total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(isbn))
+        return total % 10 == 0
+    
+    return False
+
+
+def normalize_isbn(isbn: str) -> Optional[str]:
+    """
+    ISBN'i karşılaştırılabilir tek biçime (tiresiz ISBN-13) getirir.
+    Kontrol basamağı tutmayan değerler için None döner.
+    """
+    if not isbn:
+        return None
+    
+    isbn = re.sub(r'[\s\-]', '', str(isbn)).upper()
+    if not is_valid_isbn(isbn):
+        return None
+    
+    return isbn10_to_13(isbn) if len(isbn) == 10 else isbn
+
+
 # ==================== 1000KİTAP (TÜRKÇE) ====================
 
 def search_1000kitap(query: str) -> list[BookSearchResult]:
@@ -89,54 +178,14 @@ def search_1000kitap(query: str) -> list[BookSearchResult]:
     
     try:
         encoded_query = urllib.parse.quote(query)
-        url = f"https://1000kitap.com/ara?q={encoded_query}"
+        url = _url("1000kitap", f"/ara?q={encoded_query}")
         
         response = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
         if response.status_code != 200:
             return results
         
-        html = response.text
-        
-        # Kitap kartlarını bul - farklı pattern'ler dene
-        # Pattern 1: Kitap listesi
-        pattern1 = r'<a[^>]*href="(/kitap/[^"]+)"[^>]*class="[^"]*"[^>]*>.*?<img[^>]*(?:data-src|src)="([^"]*)"[^>]*>.*?</a>'
-        
-        # Pattern 2: Başlık ve yazar
-        pattern2 = r'<div[^>]*class="[^"]*book-title[^"]*"[^>]*>\s*<a[^>]*>([^<]+)</a>.*?<div[^>]*class="[^"]*book-author[^"]*"[^>]*>\s*<a[^>]*>([^<]+)</a>'
-        
-        # Tüm img tag'larından kapak URL'lerini çıkar
-        img_pattern = r'<img[^>]*(?:data-src|src)="(https://[^"]*(?:covers|images|img)[^"]*\.(?:jpg|jpeg|png|webp))"'
-        covers = re.findall(img_pattern, html, re.IGNORECASE)
-        
-        # Başlık ve yazarları bul
-        title_author_pattern = r'<a[^>]*href="/kitap/[^"]*"[^>]*title="([^"]+)"[^>]*>.*?</a>.*?<a[^>]*href="/yazar/[^"]*"[^>]*>([^<]+)</a>'
-        matches = re.findall(title_author_pattern, html, re.DOTALL)
-        
-        for i, match in enumerate(matches[:10]):
-            title, author = match
-            cover_url = covers[i] if i < len(covers) else ""
-            
-            book = BookSearchResult(
-                title=title.strip(),
-                author=author.strip(),
-                cover_url=cover_url,
-                source="1000kitap"
-            )
-            results.append(book)
-        
-        # Alternatif: JSON verisi ara
-        if not results:
-            json_pattern = r'\{"@type":"Book"[^}]*"name":"([^"]+)"[^}]*"author"[^}]*"name":"([^"]+)"[^}]*"image":"([^"]+)"'
-            json_matches = re.findall(json_pattern, html)
-            for match in json_matches[:10]:
-                title, author, cover = match
-                book = BookSearchResult(
-                    title=title,
-                    author=author,
-                    cover_url=cover,
-                    source="1000kitap"
-                )
-                results.append(book)
+        for item in extract_1000kitap(response.text):
+            results.append(BookSearchResult(source="1000kitap", **item))
     
     except Exception as e:
         print(f"1000Kitap arama hatası: {e}")
@@ -154,49 +203,14 @@ def search_kitapyurdu(query: str) -> list[BookSearchResult]:
     
     try:
         encoded_query = urllib.parse.quote(query)
-        url = f"https://www.kitapyurdu.com/index.php?route=product/search&filter_name={encoded_query}"
+        url = _url("kitapyurdu", f"/index.php?route=product/search&filter_name={encoded_query}")
         
         response = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
         if response.status_code != 200:
             return results
         
-        html = response.text
-        
-        # Ürün bloklarını bul
-        # Her ürün product-cr class'ı içinde
-        product_pattern = r'<div[^>]*class="[^"]*product-cr[^"]*"[^>]*>(.*?)<div[^>]*class="[^"]*product-cr[^"]*"'
-        products = re.split(r'<div[^>]*class="[^"]*product-cr[^"]*"[^>]*>', html)
-        
-        for block in products[1:11]:  # İlk 10 ürün
-            # Başlık
-            title_match = re.search(r'<a[^>]*class="[^"]*pr-img-link[^"]*"[^>]*title="([^"]+)"', block)
-            if not title_match:
-                title_match = re.search(r'<div[^>]*class="[^"]*name[^"]*"[^>]*>.*?<a[^>]*>([^<]+)</a>', block, re.DOTALL)
-            title = title_match.group(1).strip() if title_match else ""
-            
-            # Yazar
-            author_match = re.search(r'<div[^>]*class="[^"]*author[^"]*"[^>]*>\s*<a[^>]*>([^<]+)</a>', block, re.DOTALL)
-            author = author_match.group(1).strip() if author_match else ""
-            
-            # Kapak - data-src veya src
-            img_match = re.search(r'<img[^>]*(?:data-src|src)="([^"]+)"[^>]*class="[^"]*lazy', block)
-            if not img_match:
-                img_match = re.search(r'<img[^>]*src="(https://[^"]+\.(?:jpg|jpeg|png|webp))"', block, re.IGNORECASE)
-            cover_url = img_match.group(1) if img_match else ""
-            
-            # Yayınevi
-            publisher_match = re.search(r'<div[^>]*class="[^"]*publisher[^"]*"[^>]*>.*?<span>([^<]+)</span>', block, re.DOTALL)
-            publisher = publisher_match.group(1).strip() if publisher_match else ""
-            
-            if title:
-                book = BookSearchResult(
-                    title=title,
-                    author=author,
-                    publisher=publisher,
-                    cover_url=cover_url,
-                    source="kitapyurdu"
-                )
-                results.append(book)
+        for item in extract_kitapyurdu(response.text):
+            results.append(BookSearchResult(source="kitapyurdu", **item))
     
     except Exception as e:
         print(f"Kitapyurdu arama hatası: {e}")
@@ -214,43 +228,14 @@ def search_bkmkitap(query: str) -> list[BookSearchResult]:
     
     try:
         encoded_query = urllib.parse.quote(query)
-        url = f"https://www.bkmkitap.com/arama?q={encoded_query}"
+        url = _url("bkmkitap", f"/arama?q={encoded_query}")
         
         response = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
         if response.status_code != 200:
             return results
         
-        html = response.text
-        
-        # Ürün kartlarını bul
-        # productItem class'ı ile işaretli
-        blocks = re.split(r'<div[^>]*class="[^"]*productItem[^"]*"', html)
-        
-        for block in blocks[1:11]:
-            # Başlık
-            title_match = re.search(r'<a[^>]*class="[^"]*productName[^"]*"[^>]*title="([^"]+)"', block)
-            if not title_match:
-                title_match = re.search(r'<div[^>]*class="[^"]*productName[^"]*"[^>]*>.*?<a[^>]*>([^<]+)</a>', block, re.DOTALL)
-            title = title_match.group(1).strip() if title_match else ""
-            
-            # Yazar
-            author_match = re.search(r'<a[^>]*class="[^"]*productAuthor[^"]*"[^>]*>([^<]+)</a>', block)
-            author = author_match.group(1).strip() if author_match else ""
-            
-            # Kapak
-            img_match = re.search(r'<img[^>]*data-src="([^"]+)"', block)
-            if not img_match:
-                img_match = re.search(r'<img[^>]*src="(https://[^"]+\.(?:jpg|jpeg|png))"', block, re.IGNORECASE)
-            cover_url = img_match.group(1) if img_match else ""
-            
-            if title:
-                book = BookSearchResult(
-                    title=title,
-                    author=author,
-                    cover_url=cover_url,
-                    source="bkmkitap"
-                )
-                results.append(book)
+        for item in extract_bkmkitap(response.text):
+            results.append(BookSearchResult(source="bkmkitap", **item))
     
     except Exception as e:
         print(f"BKM Kitap arama hatası: {e}")
@@ -272,7 +257,7 @@ def search_openlibrary(query: str, search_type: str = "title") -> list[BookSearc
         else:
             field = "title" if search_type == "title" else "author"
             encoded_query = urllib.parse.quote(query)
-            url = f"https://openlibrary.org/search.json?{field}={encoded_query}&limit=10"
+            url = _url("openlibrary", f"/search.json?{field}={encoded_query}&limit=10")
             
             response = requests.get(url, timeout=TIMEOUT)
             if response.status_code == 200:
@@ -286,7 +271,7 @@ def search_openlibrary(query: str, search_type: str = "title") -> list[BookSearc
                         publish_year=doc.get("first_publish_year"),
                         publisher=doc.get("publisher", [""])[0] if doc.get("publisher") else "",
                         page_count=doc.get("number_of_pages_median"),
-                        cover_url=f"https://covers.openlibrary.org/b/id/{doc.get('cover_i')}-L.jpg" if doc.get("cover_i") else "",
+                        cover_url=_url("openlibrary_covers", f"/b/id/{doc.get('cover_i')}-L.jpg") if doc.get("cover_i") else "",
                         source="openlibrary"
                     )
                     results.append(book)
@@ -302,7 +287,7 @@ def _fetch_openlibrary_by_isbn(isbn: str) -> Optional[BookSearchResult]:
     isbn = isbn.replace("-", "").replace(" ", "").strip()
     
     try:
-        url = f"https://openlibrary.org/isbn/{isbn}.json"
+        url = _url("openlibrary", f"/isbn/{isbn}.json")
         response = requests.get(url, timeout=TIMEOUT)
         
         if response.status_code != 200:
@@ -327,7 +312,7 @@ def _fetch_openlibrary_by_isbn(isbn: str) -> Optional[BookSearchResult]:
         cover_url = ""
         covers = data.get("covers", [])
         if covers:
-            cover_url = f"https://covers.openlibrary.org/b/id/{covers[0]}-L.jpg"
+            cover_url = _url("openlibrary_covers", f"/b/id/{covers[0]}-L.jpg")
         
         return BookSearchResult(
             title=data.get("title", ""),
@@ -345,13 +330,23 @@ def _fetch_openlibrary_by_isbn(isbn: str) -> Optional[BookSearchResult]:
         return None
 
 
+# Yazar anahtarı -> ad (aynı yazar için tekrar istek atılmaz)
+_author_cache = {}
+
+
 def _fetch_openlibrary_author(author_key: str) -> Optional[str]:
     """Yazar adını çeker."""
+    if author_key in _author_cache:
+        return _author_cache[author_key]
+    
     try:
-        url = f"https://openlibrary.org{author_key}.json"
+        url = _url("openlibrary", f"{author_key}.json")
         response = requests.get(url, timeout=5)
         if response.status_code == 200:
-            return response.json().get("name")
+            name = response.json().get("name")
+            if name:
+                _author_cache[author_key] = name
+            return name
     except:
         pass
     return None
@@ -359,6 +354,48 @@ def _fetch_openlibrary_author(author_key: str) -> Optional[str]:
 
 # ==================== GOOGLE BOOKS ====================
 
+def _google_volume_to_result(vol: dict) -> BookSearchResult:
+    """Google Books volumeInfo kaydını BookSearchResult'a çevirir."""
+    isbn = ""
+    for identifier in vol.get("industryIdentifiers", []):
+        if identifier.get("type") in ["ISBN_13", "ISBN_10"]:
+            isbn = identifier.get("identifier", "")
+            break
+    
+    cover_url = ""
+    if vol.get("imageLinks"):
+        cover_url = vol["imageLinks"].get("large") or \
+                   vol["imageLinks"].get("medium") or \
+                   vol["imageLinks"].get("thumbnail", "")
+        # Google http adres döndürüyor; yerel sunucuda http kalmalı
+        if BASE_URLS["google"].startswith("https://"):
+            cover_url = cover_url.replace("http://", "https://")
+        cover_url = re.sub(r'&zoom=\d', '', cover_url)
+        cover_url = cover_url.replace("&edge=curl", "")
+    
+    publish_year = None
+    published_date = vol.get("publishedDate", "")
+    if published_date:
+        year_str = published_date[:4]
+        if year_str.isdigit():
+            publish_year = int(year_str)
+    
+    return BookSearchResult(
+        title=vol.get("title", ""),
+        author=", ".join(vol.get("authors", [])[:2]),
+        isbn=isbn,
+        publish_year=publish_year,
+        publisher=vol.get("publisher", ""),
+        page_count=vol.get("pageCount"),
+        cover_url=cover_url,
+        description=vol.get("description", "")[:1000] if vol.get("description") else "",
+        source="google",
+        subtitle=vol.get("subtitle", ""),
+        language=vol.get("language", ""),
+        categories=", ".join(vol.get("categories", [])[:3]),
+    )
+
+
 def search_google_books(query: str, search_type: str = "title") -> list[BookSearchResult]:
     """Google Books API'de arama yapar."""
     results = []
@@ -372,7 +409,7 @@ def search_google_books(query: str, search_type: str = "title") -> list[BookSear
             q = f"intitle:{query}"
         
         encoded_q = urllib.parse.quote(q)
-        url = f"https://www.googleapis.com/books/v1/volumes?q={encoded_q}&maxResults=10&langRestrict=tr"
+        url = _url("google", f"/books/v1/volumes?q={encoded_q}&maxResults=10&langRestrict=tr")
         
         response = requests.get(url, timeout=TIMEOUT)
         if response.status_code != 200:
@@ -381,45 +418,7 @@ def search_google_books(query: str, search_type: str = "title") -> list[BookSear
         data = response.json()
         
         for item in data.get("items", [])[:10]:
-            vol = item.get("volumeInfo", {})
-            
-            isbn = ""
-            for identifier in vol.get("industryIdentifiers", []):
-                if identifier.get("type") in ["ISBN_13", "ISBN_10"]:
-                    isbn = identifier.get("identifier", "")
-                    break
-            
-            cover_url = ""
-            if vol.get("imageLinks"):
-                cover_url = vol["imageLinks"].get("large") or \
-                           vol["imageLinks"].get("medium") or \
-                           vol["imageLinks"].get("thumbnail", "")
-                cover_url = cover_url.replace("http://", "https://")
-                cover_url = re.sub(r'&zoom=\d', '', cover_url)
-                cover_url = cover_url.replace("&edge=curl", "")
-            
-            publish_year = None
-            published_date = vol.get("publishedDate", "")
-            if published_date:
-                year_str = published_date[:4]
-                if year_str.isdigit():
-                    publish_year = int(year_str)
-            
-            book = BookSearchResult(
-                title=vol.get("title", ""),
-                author=", ".join(vol.get("authors", [])[:2]),
-                isbn=isbn,
-                publish_year=publish_year,
-                publisher=vol.get("publisher", ""),
-                page_count=vol.get("pageCount"),
-                cover_url=cover_url,
-                description=vol.get("description", "")[:1000] if vol.get("description") else "",
-                source="google",
-                subtitle=vol.get("subtitle", ""),
-                language=vol.get("language", ""),
-                categories=", ".join(vol.get("categories", [])[:3]),
-            )
-            results.append(book)
+            results.append(_google_volume_to_result(item.get("volumeInfo", {})))
     
     except Exception as e:
         print(f"Google Books arama hatası: {e}")
@@ -499,10 +498,148 @@ def fetch_book_by_isbn(isbn: str) -> Optional[dict]:
     return None
 
 
+# ==================== TOPLU ISBN SORGUSU ====================
+
+# Tek istekte sorgulanacak ISBN sayısı
+GOOGLE_ISBN_BATCH = 10
+OPENLIBRARY_ISBN_BATCH = 50
+
+
+def fetch_books_by_isbns(isbns: list[str]) -> dict[str, BookSearchResult]:
+    """
+    Birden fazla ISBN'i toplu olarak sorgular (içe aktarma ve toplu yenileme için).
+    
+    ISBN'ler önce normalize edilir; kontrol basamağı tutmayanlar hiç
+    sorgulanmaz. Google Books'ta "isbn:A OR isbn:B" sorgularıyla, bulunamayanlar
+    Open Library'nin api/books toplu uç noktasıyla aranır.
+    
+    Returns:
+        {ISBN-13: BookSearchResult} - bulunamayan ISBN'ler sözlükte yer almaz
+    """
+    # Sırayı koruyarak tekrarları at (dict.fromkeys: her ISBN için O(1))
+    wanted = list(dict.fromkeys(filter(None, map(normalize_isbn, isbns))))
+    
+    found = {}
+    
+    # 1. Google Books
+    for i in range(0, len(wanted), GOOGLE_ISBN_BATCH):
+        chunk = [isbn for isbn in wanted[i:i + GOOGLE_ISBN_BATCH] if isbn not in found]
+        if chunk:
+            found.update(_fetch_google_by_isbns(chunk))
+    
+    # 2. Open Library (Google'da olmayanlar)
+    missing = [isbn for isbn in wanted if isbn not in found]
+    for i in range(0, len(missing), OPENLIBRARY_ISBN_BATCH):
+        found.update(_fetch_openlibrary_by_isbns(missing[i:i + OPENLIBRARY_ISBN_BATCH]))
+    
+    return found
+
+
+def _fetch_google_by_isbns(isbns: list[str]) -> dict[str, BookSearchResult]:
+    """Tek Google Books isteğiyle birden fazla ISBN sorgular."""
+    found = {}
+    
+    try:
+        q = " OR ".join(f"isbn:{isbn}" for isbn in isbns)
+        encoded_q = urllib.parse.quote(q)
+        url = _url("google", f"/books/v1/volumes?q={encoded_q}&maxResults=40")
+        
+        response = requests.get(url, timeout=TIMEOUT)
+        if response.status_code != 200:
+            return found
+        
+        for item in response.json().get("items", []):
+            vol = item.get("volumeInfo", {})
+            
+            # Sonucu sorulan ISBN'le eşleştir (yanıt sırası garanti değil)
+            for identifier in vol.get("industryIdentifiers", []):
+                isbn = normalize_isbn(identifier.get("identifier", ""))
+                if isbn in isbns and isbn not in found:
+                    book = _google_volume_to_result(vol)
+                    book.isbn = isbn
+                    found[isbn] = book
+                    break
+    
+    except Exception as e:
+        print(f"Google Books toplu ISBN hatası: {e}")
+    
+    return found
+
+
+def _fetch_openlibrary_by_isbns(isbns: list[str]) -> dict[str, BookSearchResult]:
+    """Open Library api/books uç noktasıyla birden fazla ISBN sorgular."""
+    found = {}
+    
+    # Open Library bazı kitapları yalnızca ISBN-10 ile tanıyor; ikisini de sor
+    bibkeys = {}
+    for isbn in isbns:
+        bibkeys[f"ISBN:{isbn}"] = isbn
+        isbn10 = isbn13_to_10(isbn)
+        if isbn10:
+            bibkeys[f"ISBN:{isbn10}"] = isbn
+    
+    try:
+        keys = ",".join(bibkeys)
+        url = _url("openlibrary", f"/api/books?bibkeys={urllib.parse.quote(keys, safe=':,')}&format=json&jscmd=data")
+        
+        response = requests.get(url, timeout=TIMEOUT)
+        if response.status_code != 200:
+            return found
+        
+        data = response.json()
+        
+        for bibkey, isbn in bibkeys.items():
+            entry = data.get(bibkey)
+            if not entry or isbn in found:
+                continue
+            
+            # jscmd=data çoğunlukla yazar adını da döndürür; dönmezse
+            # yazar anahtarı önbellekli _fetch_openlibrary_author ile çözülür
+            authors = []
+            for author in entry.get("authors", [])[:2]:
+                name = author.get("name")
+                if not name and author.get("url"):
+                    key = "/authors/" + author["url"].rstrip("/").split("/authors/")[-1].split("/")[0]
+                    name = _fetch_openlibrary_author(key)
+                if name:
+                    authors.append(name)
+            
+            publish_year = None
+            match = re.search(r'\d{4}', entry.get("publish_date", ""))
+            if match:
+                publish_year = int(match.group())
+            
+            cover = entry.get("cover", {})
+            publishers = entry.get("publishers", [])
+            
+            found[isbn] = BookSearchResult(
+                title=entry.get("title", ""),
+                author=", ".join(authors),
+                isbn=isbn,
+                publish_year=publish_year,
+                publisher=publishers[0].get("name", "") if publishers else "",
+                page_count=entry.get("number_of_pages"),
+                cover_url=cover.get("large") or cover.get("medium", ""),
+                source="openlibrary",
+                subtitle=entry.get("subtitle", ""),
+            )
+    
+    except Exception as e:
+        print(f"Open Library toplu ISBN hatası: {e}")
+    
+    return found
+
+
 # ==================== KAPAK İNDİRME ====================
 
 def download_cover(cover_url: str, identifier: str = None) -> Optional[str]:
-    """Kapak görselini indirir ve kaydeder."""
+    """
+    Kapak görselini indirir ve kapak deposuna kaydeder.
+    
+    Dosya adı içerikten üretilir (bkz. services/cover_store.py); aynı görsel
+    farklı adreslerden inse de tek kopya tutulur. identifier eski çağrılarla
+    uyumluluk için duruyor, artık kullanılmıyor.
+    """
     if not cover_url:
         return None
     
@@ -512,25 +649,7 @@ def download_cover(cover_url: str, identifier: str = None) -> Optional[str]:
         if response.status_code != 200:
             return None
         
-        # Geçerli görsel mi kontrol et (en az 1KB)
-        if len(response.content) < 1000:
-            return None
-        
-        # Dosya adı
-        if not identifier:
-            identifier = hashlib.md5(cover_url.encode()).hexdigest()[:12]
-        
-        # Güvenli dosya adı
-        identifier = re.sub(r'[^\w\-]', '_', str(identifier))[:50]
-        
-        # Klasör yoksa oluştur
-        COVERS_DIR.mkdir(parents=True, exist_ok=True)
-        
-        # Dosyayı kaydet
-        file_path = COVERS_DIR / f"{identifier}.jpg"
-        file_path.write_bytes(response.content)
-        
-        return str(file_path)
+        return cover_store.store_cover(response.content)
         
     except Exception as e:
         print(f"Kapak indirme hatası: {e}")
@@ -0,0 +1,352 @@
+"""
+Kitaplık Uygulaması - Kapak Deposu
+==================================
+Kapak görsellerini içeriklerinin özetine (SHA-256) göre saklar:
+
+- Aynı görsel farklı adreslerden inse de diskte tek kopya tutulur
+- covers tablosundaki ref_count, books.cover_path üzerindeki tetikleyicilerle
+  güncel tutulur (bkz. database.init_database)
+- collect_garbage() hiçbir kitabın kullanmadığı kapakları siler
+- PyQt6 varsa büyük görseller COVER_MAX_SIZE sınırına küçültülüp yeniden
+  kodlanır (Qt WebP destekliyorsa WebP, yoksa JPEG)
+- migrate_existing_covers() eski {isbn}.jpg / {md5}.jpg dosyalarını bir kez
+  depoya taşır ve kapak klasöründeki eski kopyaları siler
+
+Kullanım:
+    path = store_cover(response.content)
+    db.update_book(book_id, cover_path=path)
+"""
+
+import hashlib
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+
+
+# Kapak görselleri klasörü
+COVERS_DIR = Path(__file__).parent.parent / "assets" / "covers"
+
+# Bundan küçük içerik geçerli görsel sayılmaz (hata sayfaları, 1x1 pikseller)
+MIN_COVER_BYTES = 1000
+
+# Yeniden kodlama: en büyük boyut (genişlik, yükseklik) ve kalite
+# Uygulamada kapaklar en fazla 140x200 gösteriliyor; 2 katı netlik için yeterli
+REENCODE = True
+COVER_MAX_SIZE = (400, 600)
+COVER_QUALITY = 82
+
+# Kimsenin kullanmadığı kapak ne kadar süre sonra silinsin
+# (dialogda indirilip henüz kaydedilmemiş kapaklar silinmesin diye)
+GC_GRACE_HOURS = 24
+
+# Tanınan görsel formatları: dosya başı -> uzantı
+_SIGNATURES = [
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG", "png"),
+    (b"GIF8", "gif"),
+]
+
+
+# Deponun kendi dosya adları: <sha256'nın ilk 32 hanesi>.<uzantı>
+# Klasör taramasında sadece bunlar silinir (.gitkeep, kullanıcı dosyaları korunur)
+_STORE_NAME = re.compile(r"[0-9a-f]{32}\.(?:jpg|png|gif|webp)")
+
+
+def _sniff_extension(data: bytes) -> Optional[str]:
+    """Görselin formatını ilk baytlarından bulur."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    for signature, ext in _SIGNATURES:
+        if data.startswith(signature):
+            return ext
+    return None
+
+
+def _target_format() -> str:
+    """Yeniden kodlamada kullanılacak format (Qt WebP destekliyorsa webp)."""
+    try:
+        from PyQt6.QtGui import QImageWriter
+    except ImportError:
+        return "jpg"
+
+    supported = {bytes(fmt).decode() for fmt in QImageWriter.supportedImageFormats()}
+    return "webp" if "webp" in supported else "jpg"
+
+
+def _reencode(data: bytes) -> tuple[bytes, str] | None:
+    """
+    Görseli COVER_MAX_SIZE'a sığacak şekilde küçültüp yeniden kodlar.
+    PyQt6 yoksa, görsel okunamazsa veya sonuç daha büyük çıkarsa None döner.
+    """
+    try:
+        from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+        from PyQt6.QtGui import QImage
+    except ImportError:
+        return None
+
+    image = QImage.fromData(data)
+    if image.isNull():
+        return None
+
+    max_width, max_height = COVER_MAX_SIZE
+    if image.width() > max_width or image.height() > max_height:
+        image = image.scaled(
+            max_width, max_height,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+
+    fmt = _target_format()
+    if fmt == "jpg" and image.hasAlphaChannel():
+        image = image.convertToFormat(QImage.Format.Format_RGB32)
+
+    buffer_data = QByteArray()
+    buffer = QBuffer(buffer_data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    if not image.save(buffer, "WEBP" if fmt == "webp" else "JPEG", COVER_QUALITY):
+        return None
+    buffer.close()
+
+    encoded = bytes(buffer_data)
+    if len(encoded) >= len(data) and _sniff_extension(data) in ("jpg", "webp"):
+        return None  # Küçültmek işe yaramadı, orijinali sakla
+
+    return encoded, fmt
+
+
+def store_cover(data: bytes) -> Optional[str]:
+    """
+    Görseli depoya kaydeder ve kitaba yazılacak dosya yolunu döndürür.
+    Aynı içerik daha önce kaydedildiyse dosya tekrar yazılmaz.
+
+    Returns:
+        Dosya yolu veya geçerli bir görsel değilse None
+    """
+    if not data or len(data) < MIN_COVER_BYTES:
+        return None
+
+    ext = _sniff_extension(data)
+    if not ext:
+        return None
+
+    # Özet orijinal içerikten alınır: aynı görsel tekrar inerse
+    # yeniden kodlamaya gerek kalmadan bulunur
+    digest = hashlib.sha256(data).hexdigest()
+
+    conn = db.get_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT path FROM covers WHERE hash = ?", (digest,))
+        row = cursor.fetchone()
+        if row and Path(row["path"]).exists():
+            return row["path"]
+
+        encoded = _reencode(data) if REENCODE else None
+        if encoded:
+            data, ext = encoded
+
+        COVERS_DIR.mkdir(parents=True, exist_ok=True)
+        file_path = COVERS_DIR / f"{digest[:32]}.{ext}"
+
+        # Yarım dosya kalmasın diye önce geçici dosyaya yaz
+        temp_path = file_path.with_suffix(".tmp")
+        temp_path.write_bytes(data)
+        temp_path.replace(file_path)
+
+        path = str(file_path)
+        cursor.execute("""
+            INSERT OR REPLACE INTO covers (hash, path, size, ref_count, created_at)
+            VALUES (?, ?, ?, (SELECT COUNT(*) FROM books WHERE cover_path = ?), ?)
+        """, (digest, path, len(data), path, datetime.now().isoformat()))
+        conn.commit()
+
+        return path
+    finally:
+        conn.close()
+
+
+def store_cover_file(file_path: str) -> Optional[str]:
+    """Diskteki bir görseli depoya kaydeder (dosyadan kapak seçme)."""
+    try:
+        return store_cover(Path(file_path).read_bytes())
+    except OSError as e:
+        print(f"Kapak okunamadı: {e}")
+        return None
+
+
+def collect_garbage(grace_hours: int = GC_GRACE_HOURS, dry_run: bool = False) -> dict:
+    """
+    Hiçbir kitabın kullanmadığı kapak dosyalarını siler.
+
+    - covers tablosunda ref_count = 0 olan ve grace_hours'tan eski kayıtlar
+    - Kapak klasöründe olup ne depoda ne de bir kitapta geçen eski depo dosyaları
+      (sadece <özet>.<görsel uzantısı> adlılar; migrate_existing_covers tamamlandıktan sonra)
+
+    Returns:
+        {"files": silinen dosya sayısı, "bytes": açılan alan}
+    """
+    removed = {"files": 0, "bytes": 0}
+
+    def remove(path: Path):
+        try:
+            size = path.stat().st_size
+            if not dry_run:
+                path.unlink()
+            removed["files"] += 1
+            removed["bytes"] += size
+        except OSError:
+            pass
+
+    conn = db.get_connection()
+    cursor = conn.cursor()
+
+    # Tetikleyici dışı değişikliklere karşı sayıları tazele
+    cursor.execute("""
+        UPDATE covers SET ref_count = (
+            SELECT COUNT(*) FROM books WHERE books.cover_path = covers.path
+        )
+    """)
+
+    cutoff = (datetime.now() - timedelta(hours=grace_hours)).isoformat()
+    cursor.execute("""
+        SELECT hash, path FROM covers WHERE ref_count = 0 AND created_at < ?
+    """, (cutoff,))
+    orphans = cursor.fetchall()
+
+    for row in orphans:
+        remove(Path(row["path"]))
+    if not dry_run and orphans:
+        cursor.executemany("DELETE FROM covers WHERE hash = ?", [(row["hash"],) for row in orphans])
+
+    if db.get_setting("cover_store_migrated") == "1" and COVERS_DIR.exists():
+        cursor.execute("SELECT path FROM covers")
+        known = {Path(row["path"]).name for row in cursor.fetchall()}
+        cursor.execute("SELECT DISTINCT cover_path FROM books WHERE cover_path IS NOT NULL")
+        known.update(Path(row["cover_path"]).name for row in cursor.fetchall())
+
+        old_cutoff = (datetime.now() - timedelta(hours=grace_hours)).timestamp()
+        for file_path in COVERS_DIR.iterdir():
+            if (file_path.is_file() and _STORE_NAME.fullmatch(file_path.name)
+                    and file_path.name not in known
+                    and file_path.stat().st_mtime < old_cutoff):
+                remove(file_path)
+
+    conn.commit()
+    conn.close()
+
+    return removed
+
+
+def _resolve_legacy_path(cover_path: str) -> Optional[Path]:
+    """
+    Eski kayıtlardaki kapak yolunu bulur.
+    Veritabanı başka bilgisayardan taşındıysa mutlak yol tutmaz;
+    o durumda aynı isimli dosya kapak klasöründe aranır.
+    """
+    path = Path(cover_path)
+    if path.exists():
+        return path
+
+    candidate = COVERS_DIR / path.name
+    if candidate.exists():
+        return candidate
+    return None
+
+
+def migrate_existing_covers(force: bool = False) -> int:
+    """
+    Mevcut kitapların kapaklarını bir kez depoya taşır.
+    Kitaplar yeni yollara geçince kapak klasöründeki eski dosyalar silinir;
+    klasör dışındaki dosyalara (elle seçilmiş görseller) dokunulmaz.
+
+    Returns:
+        Yeni yola taşınan farklı kapak sayısı
+    """
+    if db.get_setting("cover_store_migrated") == "1" and not force:
+        return 0
+
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT DISTINCT cover_path FROM books
+        WHERE cover_path IS NOT NULL AND cover_path != ''
+          AND cover_path NOT LIKE 'http://%' AND cover_path NOT LIKE 'https://%'
+    """)
+    cover_paths = [row["cover_path"] for row in cursor.fetchall()]
+    conn.close()
+
+    moves = []
+    legacy_files = set()
+    for old_path in cover_paths:
+        source = _resolve_legacy_path(old_path)
+        if not source:
+            continue
+        new_path = store_cover_file(str(source))
+        if new_path and new_path != old_path:
+            moves.append((new_path, old_path))
+            source = source.resolve()
+            if source.parent == COVERS_DIR.resolve() and source != Path(new_path).resolve():
+                legacy_files.add(source)
+
+    # Tüm kitaplar tek transaction'da yeni yollara geçer
+    # (tetikleyiciler ref_count'ları günceller)
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.executemany("UPDATE books SET cover_path = ? WHERE cover_path = ?", moves)
+    conn.commit()
+
+    if moves:
+        placeholders = ",".join("?" * len(moves))
+        cursor.execute(f"SELECT id FROM books WHERE cover_path IN ({placeholders})",
+                       [new_path for new_path, _ in moves])
+        db.notify_change("books", "update", [row["id"] for row in cursor.fetchall()], ["cover_path"])
+    conn.close()
+
+    # Yollar kaydedildi: eski kopyalar artık kullanılmıyor
+    for path in legacy_files:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    db.set_setting("cover_store_migrated", "1")
+    return len(moves)
+
+
+def maintain():
+    """Açılışta arka planda çağrılır: gerekirse taşıma, sonra çöp toplama."""
+    try:
+        moved = migrate_existing_covers()
+        if moved:
+            print(f"Kapak deposu: {moved} kapak taşındı")
+        removed = collect_garbage()
+        if removed["files"]:
+            print(f"Kapak deposu: {removed['files']} dosya silindi "
+                  f"({removed['bytes'] // 1024} KB)")
+    except Exception as e:
+        print(f"Kapak deposu bakım hatası: {e}")
+
+
+def _folder_bytes() -> int:
+    """Kapak klasörünün diskteki toplam boyutu."""
+    if not COVERS_DIR.exists():
+        return 0
+    return sum(path.stat().st_size for path in COVERS_DIR.iterdir() if path.is_file())
+
+
+if __name__ == "__main__":
+    db.init_database()
+    before = _folder_bytes()
+    print(f"Taşınan: {migrate_existing_covers()}")
+    print(f"Çöp toplama: {collect_garbage()}")
+    after = _folder_bytes()
+    print(f"Kapak klasörü: {before // 1024} KB -> {after // 1024} KB")
+    if after > before:
+        print("UYARI: taşıma ve çöp toplama sonrası kapak klasörü büyüdü")
+        sys.exit(1)
@@ -0,0 +1,500 @@
+"""
+Kitaplık Uygulaması - Kopya Kitap Bulma
+=======================================
+Aynı CSV'nin iki kez içe aktarılması veya kopyalama ile oluşan kopyaları bulur.
+
+Tüm kitapları ikişer ikişer karşılaştırmak (50 bin kitapta ~1,25 milyar çift)
+yerine kitaplar "blok anahtarlarına" göre gruplanır; sadece aynı bloğa düşen
+kitaplar karşılaştırılır:
+
+- ISBN: tiresiz ISBN-13'e çevrilmiş ISBN (ISBN-10 ile yazılmışlar da eşleşir)
+- Başlık: Türkçe sadeleştirilmiş (ı/i, ç/c...) başlık kelimelerinin sıralı hali
+  ("Ceza ve Suç" = "Suç ve Ceza"); parantez içi ("(Kopya)", "(Ciltli)") atılır
+- Yazar soyadı + başlığın ilk harf üçlüsü: başlıkta yazım farkı olanlar için
+
+Blok içinde skor: başlık harf üçlülerinin Jaccard benzerliği ve yazar benzerliği.
+Aynı ISBN doğrudan kopya sayılır; farklı geçerli ISBN'ler (başka baskı) skoru düşürür.
+Başlıklardaki cilt numaraları ("Cilt 1" - "Cilt 2", "Vol. II", "İkinci Kitap", "#3")
+farklıysa kitaplar ayrı cilt sayılır, kopya önerilmez; yıl ve baskı sayıları sayılmaz.
+
+- Blok index'i bellekte tutulur; kitap eklenince/değişince sadece o kitap,
+  kendi bloklarındaki kitaplarla karşılaştırılır (database.subscribe)
+- Bulunan çiftler duplicate_candidates tablosuna yazılır (kitap başına en
+  iyi MAX_MATCHES eşleşme); "kopya değil" denen çiftler tekrar önerilmez
+- Çiftler birbirine bağlanarak kümelenir (groups()): inceleme ve birleştirme
+  küme küme yapılır
+- İlk açılışta (veya algoritma sürümü değişince) tüm kitaplık bir kez taranır
+
+Kullanım:
+    finder = get_finder()
+    finder.load()
+    finder.find({"title": "Suç ve Ceza", "author": "Dostoyevski"})  # [(book_id, skor, neden)]
+    db.get_duplicate_candidates()
+"""
+
+import re
+import sys
+import threading
+import unicodedata
+from collections import namedtuple
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+from services.book_api import normalize_isbn
+
+
+# Algoritma değişince artırılır: kayıtlı çiftler baştan hesaplanır
+DEDUPE_VERSION = "3"
+DEDUPE_VERSION_KEY = "dedupe_version"
+
+# Kopya sayılması için gereken en düşük skor (0-1)
+DUPLICATE_THRESHOLD = 0.8
+
+# Skor ağırlıkları
+TITLE_WEIGHT = 0.75
+AUTHOR_WEIGHT = 0.25
+
+# Yazarı bilinmeyen kitaplarda başlık skoru bu oranla çarpılır
+NO_AUTHOR_FACTOR = 0.9
+
+# İkisinin de geçerli ama farklı ISBN'i varsa (başka baskı) skor bu oranla çarpılır
+OTHER_EDITION_FACTOR = 0.85
+
+# Bundan büyük bloklar karşılaştırılmaz (çok yaygın anahtarlar, ör. tek kelimelik başlıklar)
+MAX_BLOCK_SIZE = 200
+
+# Cilt numaraları: sayılar, Romen rakamları ve sıra sayı sıfatları (sadeleştirilmiş);
+# sadece bir cilt kelimesinin yanında ya da "#" ile yazılınca sayılır
+ROMAN_NUMERALS = {
+    "ii": 2, "iii": 3, "iv": 4, "v": 5, "vi": 6, "vii": 7, "viii": 8, "ix": 9, "x": 10,
+    "xi": 11, "xii": 12, "xiii": 13, "xiv": 14, "xv": 15, "xvi": 16, "xvii": 17, "xviii": 18,
+    "xix": 19, "xx": 20,
+}
+ORDINALS = {
+    "birinci": 1, "ikinci": 2, "ucuncu": 3, "dorduncu": 4, "besinci": 5,
+    "altinci": 6, "yedinci": 7, "sekizinci": 8, "dokuzuncu": 9, "onuncu": 10,
+}
+# Bu kelimelerden sonra gelen tek "I" de cilt numarası sayılır ("Cilt I")
+VOLUME_WORDS = {"cilt", "kitap", "bolum", "kisim", "sayi", "vol", "volume", "part", "book", "tome", "band"}
+
+# Kitap başına saklanan en fazla eşleşme: aynı kitabın 50 kopyası 1225 çift
+# yerine birbirine bağlı bir küme olarak kaydedilir (inceleme kümeyi gösterir)
+MAX_MATCHES = 5
+
+# Değişikliklerden sonra çiftlerin yazılması için bekleme (saniye)
+SAVE_DELAY = 1.0
+
+# Kopya tespitinde kullanılan alanlar (değişince kitap yeniden değerlendirilir)
+DEDUPE_FIELDS = ["title", "author", "isbn"]
+
+# Başlık anahtarına girmeyen kelimeler
+STOPWORDS = {"ve", "ile", "bir", "the", "and", "of", "a", "an", "le", "la", "der", "die", "das"}
+
+
+# Bir kitabın karşılaştırma için hazırlanmış hali
+_Entry = namedtuple("_Entry", "keys grams author author_grams surname isbn volumes")
+
+
+def fold(text) -> str:
+    """Türkçe sadeleştirme: küçük harf, ı/i birleştirme, işaretsiz harfler (ç -> c)."""
+    text = unicodedata.normalize("NFKD", db.tr_fold(text) or "")
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def _words(text) -> list:
+    """Parantez içi atılmış, sadeleştirilmiş kelimeler."""
+    text = re.sub(r"[(\[].*?[)\]]", " ", fold(text))
+    return re.findall(r"\w+", text)
+
+
+def _volume_number(word: str) -> int | None:
+    """Cilt numarası olabilecek kelimenin değeri: "2", "ii", "i", "ikinci" (yıllar sayılmaz)."""
+    if word.isdigit() and len(word) <= 3:
+        return int(word)
+    if word == "i":
+        return 1
+    return ROMAN_NUMERALS.get(word) or ORDINALS.get(word)
+
+
+def _volumes(title) -> frozenset:
+    """
+    Başlıktaki cilt numaraları (parantez içi dahil): "Cilt 2", "Vol. II", "2. Kitap",
+    "İkinci Kitap", "#3". Cilt kelimesi olmadan geçen yıl, baskı ve diğer sayılar sayılmaz.
+    """
+    text = fold(title)
+    numbers = {int(number) for number in re.findall(r"#\s*(\d{1,3})\b", text)}
+
+    words = re.findall(r"\w+", text)
+    for i, word in enumerate(words):
+        if word not in VOLUME_WORDS:
+            continue
+        number = _volume_number(words[i + 1]) if i + 1 < len(words) else None
+        if number is None and i:
+            number = _volume_number(words[i - 1])
+        if number is not None:
+            numbers.add(number)
+    return frozenset(numbers)
+
+
+def _trigrams(words: list) -> frozenset:
+    text = f"  {' '.join(words)} "
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _surname(author) -> str:
+    """İlk yazarın soyadı ("Soyad, Ad" yazımı da tanınır)."""
+    first = re.split(r"[;&/]| ve | and ", author or "")[0]
+    parts = first.split(",")
+    if len(parts) > 1 and len(_words(parts[0])) == 1:
+        return _words(parts[0])[0]
+    words = _words(first)
+    return words[-1] if words else ""
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def make_entry(book) -> _Entry:
+    """Kitabı (Row veya dict: title, author, isbn) karşılaştırmaya hazırlar."""
+    title_words = _words(book["title"])
+    significant = [word for word in title_words if word not in STOPWORDS] or title_words
+    surname = _surname(book["author"])
+    isbn = normalize_isbn(book["isbn"])
+
+    keys = []
+    if isbn:
+        keys.append(("isbn", isbn))
+    if significant:
+        keys.append(("title", " ".join(sorted(set(significant)))))
+        if surname:
+            keys.append(("author", surname, "".join(significant)[:3]))
+
+    author_words = _words(book["author"])
+    return _Entry(
+        keys=keys,
+        grams=_trigrams(title_words),
+        author=" ".join(author_words),
+        author_grams=_trigrams(author_words) if author_words else frozenset(),
+        surname=surname,
+        isbn=isbn,
+        volumes=_volumes(book["title"]),
+    )
+
+
+def score(a: _Entry, b: _Entry) -> tuple:
+    """
+    İki kitabın kopya olma skoru.
+
+    Returns:
+        (skor 0-1, neden): neden "isbn", "title+author", "title" veya "volume" (farklı cilt, skor 0)
+    """
+    if a.isbn and a.isbn == b.isbn:
+        return 1.0, "isbn"
+
+    # Farklı ciltler (ör. "Cilt 1" - "Cilt 2") başlıkları ne kadar benzese de kopya değildir
+    if a.volumes != b.volumes:
+        return 0.0, "volume"
+
+    title = _jaccard(a.grams, b.grams)
+    if a.author and b.author:
+        author = 1.0 if a.author == b.author else _jaccard(a.author_grams, b.author_grams)
+        if a.surname and a.surname == b.surname:
+            author = max(author, 0.8)
+        value, reason = TITLE_WEIGHT * title + AUTHOR_WEIGHT * author, "title+author"
+    else:
+        value, reason = title * NO_AUTHOR_FACTOR, "title"
+
+    if a.isbn and b.isbn:
+        value *= OTHER_EDITION_FACTOR
+    return round(value, 3), reason
+
+
+class DuplicateFinder:
+    """
+    Kopya kitapların blok index'i.
+
+    Thread-safe: yükleme arka planda, içe aktarma kontrolü arayüzden yapılabilir.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._entries = {}   # book_id -> _Entry
+        self._blocks = {}    # blok anahtarı -> kitap id'leri
+        self._dirty = set()
+        self._timer = None
+        self._subscribed = False
+        self.ready = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ---------- Yükleme ----------
+
+    def load(self, force: bool = False):
+        """
+        Blok index'ini kurar ve değişikliklere abone olur.
+        İlk seferde (veya DEDUPE_VERSION değişince) tüm kitaplığı tarar.
+        Birden fazla thread çağırırsa yükleme bir kez yapılır
+        (force=True: veritabanı değiştiyse, ör. yedekten dönünce, yeniden kurulur).
+        """
+        with self._load_lock:
+            if self.ready and not force:
+                return
+
+            books = db.get_book_rows(["id"] + DEDUPE_FIELDS)
+            with self._lock:
+                self._entries = {}
+                self._blocks = {}
+                for book in books:
+                    self._add(book["id"], make_entry(book))
+
+            if not self._subscribed:
+                db.subscribe(self.apply_change)
+                self._subscribed = True
+
+            if db.get_setting(DEDUPE_VERSION_KEY) != DEDUPE_VERSION:
+                pairs = self.scan()
+                db.save_duplicate_candidates(pairs)
+                db.set_setting(DEDUPE_VERSION_KEY, DEDUPE_VERSION)
+                print(f"Kopya taraması: {len(pairs)} olası kopya çifti")
+            self.ready = True
+
+    def close(self):
+        """Değişiklik aboneliğini bırakır; bekleyen çiftleri yazar."""
+        if self._subscribed:
+            db.unsubscribe(self.apply_change)
+            self._subscribed = False
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer:
+            timer.cancel()
+            self._save_dirty()
+
+    def _add(self, book_id: int, entry: _Entry):
+        self._entries[book_id] = entry
+        for key in entry.keys:
+            self._blocks.setdefault(key, set()).add(book_id)
+
+    def _remove(self, book_id: int):
+        entry = self._entries.pop(book_id, None)
+        if entry is None:
+            return
+        for key in entry.keys:
+            block = self._blocks.get(key)
+            if block is not None:
+                block.discard(book_id)
+                if not block:
+                    del self._blocks[key]
+
+    # ---------- Karşılaştırma ----------
+
+    def _neighbours(self, entry: _Entry) -> set:
+        """entry ile aynı bloklara düşen kitaplar (çok büyük bloklar hariç)."""
+        found = set()
+        for key in entry.keys:
+            block = self._blocks.get(key, ())
+            if len(block) <= MAX_BLOCK_SIZE:
+                found.update(block)
+        return found
+
+    def _matches(self, entry: _Entry, exclude: int = None) -> list:
+        matches = []
+        for other_id in self._neighbours(entry):
+            if other_id == exclude:
+                continue
+            value, reason = score(entry, self._entries[other_id])
+            if value >= DUPLICATE_THRESHOLD:
+                matches.append((other_id, value, reason))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+    def find(self, book) -> list:
+        """
+        Henüz eklenmemiş bir kitabın (dict: title, author, isbn) olası kopyaları.
+
+        Returns:
+            [(book_id, skor, neden), ...] en benzer önce
+        """
+        self.load()
+        entry = make_entry({field: book.get(field) for field in DEDUPE_FIELDS})
+        with self._lock:
+            return self._matches(entry)
+
+    def duplicates_of(self, book_id: int) -> list:
+        """Kitaplıktaki bir kitabın olası kopyaları: [(book_id, skor, neden), ...]."""
+        with self._lock:
+            entry = self._entries.get(book_id)
+            return self._matches(entry, exclude=book_id) if entry else []
+
+    def scan(self, book_ids=None) -> list:
+        """
+        Blok içi karşılaştırmayla olası kopya çiftlerini bulur.
+
+        Args:
+            book_ids: Sadece bu kitapları içeren çiftler (None ise tüm kitaplık)
+
+        Returns:
+            [(book_a, book_b, skor, neden), ...] (book_a < book_b)
+        """
+        pairs = {}
+        with self._lock:
+            if book_ids is None:
+                matches = {}  # book_id -> [(skor, diğer id, neden)]
+                compared = set()
+                for block in self._blocks.values():
+                    if len(block) < 2 or len(block) > MAX_BLOCK_SIZE:
+                        continue
+                    members = sorted(block)
+                    for i, a in enumerate(members):
+                        for b in members[i + 1:]:
+                            if (a, b) in compared:
+                                continue
+                            compared.add((a, b))
+                            value, reason = score(self._entries[a], self._entries[b])
+                            if value >= DUPLICATE_THRESHOLD:
+                                matches.setdefault(a, []).append((-value, b, reason))
+                                matches.setdefault(b, []).append((-value, a, reason))
+                for book_id, found in matches.items():
+                    for value, other_id, reason in sorted(found)[:MAX_MATCHES]:
+                        pairs[tuple(sorted((book_id, other_id)))] = (-value, reason)
+            else:
+                for book_id in book_ids:
+                    for other_id, value, reason in self.duplicates_of(book_id)[:MAX_MATCHES]:
+                        pairs[tuple(sorted((book_id, other_id)))] = (value, reason)
+
+        return [(a, b, value, reason) for (a, b), (value, reason) in sorted(pairs.items())]
+
+    # ---------- Değişiklikler ----------
+
+    def apply_change(self, table: str, op: str, ids: list, columns):
+        """
+        database.notify_change aboneliği.
+        Index hemen güncellenir (aynı içe aktarmadaki sonraki satırlar görsün diye),
+        çiftler SAVE_DELAY sonra toplu yazılır.
+        """
+        if table != "books":
+            return
+        if op == "update" and columns and not set(columns) & set(DEDUPE_FIELDS):
+            return
+
+        with self._lock:
+            for book_id in ids:
+                self._remove(book_id)
+            if op == "delete":
+                # Çiftleri tetikleyici siler
+                self._dirty.difference_update(ids)
+                return
+
+        books = db.get_book_rows(["id"] + DEDUPE_FIELDS, ids)
+        with self._lock:
+            for book in books:
+                self._add(book["id"], make_entry(book))
+            self._dirty.update(ids)
+            if self._timer is None:
+                self._timer = threading.Timer(SAVE_DELAY, self._save_dirty)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _save_dirty(self):
+        with self._lock:
+            book_ids, self._dirty = sorted(self._dirty), set()
+            self._timer = None
+        if not book_ids:
+            return
+
+        try:
+            db.save_duplicate_candidates(self.scan(book_ids), book_ids)
+        except Exception as e:
+            print(f"Kopya çiftleri kaydedilemedi: {e}")
+
+
+def groups(pairs) -> list:
+    """
+    Çiftleri birbirine bağlı kümelere ayırır.
+
+    Args:
+        pairs: (book_a, book_b, skor, neden) veya Row listesi
+
+    Returns:
+        [(kitap id'leri, en yüksek skor), ...] en yüksek skorlu küme önce
+    """
+    parent = {}
+
+    def root(book_id):
+        parent.setdefault(book_id, book_id)
+        while parent[book_id] != book_id:
+            parent[book_id] = parent[parent[book_id]]
+            book_id = parent[book_id]
+        return book_id
+
+    best = {}
+    for a, b, value, _ in pairs:
+        ra, rb = root(a), root(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+        best[(a, b)] = value
+
+    clusters = {}
+    for book_id in parent:
+        clusters.setdefault(root(book_id), []).append(book_id)
+    top = {}
+    for (a, _), value in best.items():
+        top[root(a)] = max(top.get(root(a), 0), value)
+
+    return sorted(
+        ((sorted(members), top[cluster]) for cluster, members in clusters.items()),
+        key=lambda group: (-group[1], group[0][0])
+    )
+
+
+_finder = None
+_finder_lock = threading.Lock()
+
+
+def get_finder() -> DuplicateFinder:
+    """Uygulama genelindeki tek index (load() çağıran yükler)."""
+    global _finder
+    with _finder_lock:
+        if _finder is None:
+            _finder = DuplicateFinder()
+        return _finder
+
+
+def check_rules():
+    """Cilt kuralının örnekleri: farklı ciltler eşleşmez, yıl/baskı farkı eşleşmeyi bozmaz."""
+    def pair(title_a, title_b, author="Orhan Pamuk"):
+        return score(make_entry({"title": title_a, "author": author, "isbn": None}),
+                     make_entry({"title": title_b, "author": author, "isbn": None}))
+
+    cases = [
+        ("Osmanlı Tarihi Cilt 1", "Osmanlı Tarihi Cilt 2", False),
+        ("Dune Vol. II", "Dune Vol. III", False),
+        ("Birinci Kitap: Yüzük Kardeşliği", "İkinci Kitap: Yüzük Kardeşliği", False),
+        ("Seri #3", "Seri #4", False),
+        ("Kara Kitap", "Kara Kitap (2019)", True),
+        ("Benim Adım Kırmızı 1998", "Benim Adım Kırmızı", True),
+        ("Masumiyet Müzesi (12. Baskı)", "Masumiyet Müzesi", True),
+        ("Masumiyet Müzesi Cilt 2", "Masumiyet Müzesi 2. Cilt", True),
+    ]
+    for title_a, title_b, expected in cases:
+        value, reason = pair(title_a, title_b)
+        assert (value >= DUPLICATE_THRESHOLD) == expected, (title_a, title_b, value, reason)
+
+
+if __name__ == "__main__":
+    import time
+
+    check_rules()
+    db.init_database()
+    finder = DuplicateFinder()
+    start = time.perf_counter()
+    finder.load()
+    pairs = finder.scan()
+    print(f"{len(finder)} kitap, {len(finder._blocks)} blok, {len(pairs)} olası kopya, "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
@@ -0,0 +1,468 @@
+"""
+Kitaplık Uygulaması - Gömme (Embedding) Index'i
+===============================================
+Kitapları anlam yakınlığına göre bulmak için yerel vektör index'i:
+"benzer kitaplar" ve temaya göre arama.
+
+- Metin: başlık + kategoriler + açıklama (EMBED_QUOTES ile alıntılar da)
+- Vektörler Ollama'nın /api/embed ucundan (EMBED_MODEL) gelir; Ollama yoksa
+  veya model kurulu değilse yerel, deterministik hashing vektörleyici kullanılır
+- Vektörler int8'e sıkıştırılıp book_embeddings tablosunda BLOB olarak saklanır
+  (float32'nin dörtte biri; kosinüs sıralaması pratikte değişmez)
+- NumPy kuruluysa skorlar blok blok matris çarpımıyla, en iyi k tanesi
+  argpartition ile bulunur; yoksa saf Python (birkaç bin kitap için yeterli)
+- Kitabın metni değişince sadece o kitabın vektörü yeniden üretilir
+  (database.subscribe ile işaretlenir, REFRESH_DELAY sonra toplu işlenir);
+  açılışta metin özetleri karşılaştırılıp eksik/eski vektörler tamamlanır
+
+Kullanım:
+    index = get_index()
+    index.load()
+    index.similar(book_id, k=10)          # [(book_id, skor), ...]
+    index.search("savaş ve yalnızlık")    # [(book_id, skor), ...]
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import operator
+import re
+import sys
+import threading
+import unicodedata
+from array import array
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+from services.ai_service import EMBED_MODEL, check_ollama_status, get_client
+
+try:
+    import numpy as np
+except ImportError:  # NumPy isteğe bağlı
+    np = None
+
+
+# Gömme metnine giren alanlar (değişince vektör yenilenir)
+EMBED_FIELDS = ["title", "categories", "description"]
+
+# Alıntılar da metne eklensin mi; eklenirse kitap başına en çok bu kadar karakter
+EMBED_QUOTES = False
+QUOTES_MAX_CHARS = 2000
+
+# Bir Ollama isteğinde gönderilecek metin sayısı
+EMBED_BATCH_SIZE = 32
+
+# Hashing vektörleyici boyutu
+HASH_DIM = 512
+
+# Değişikliklerden sonra bekleme (saniye): art arda düzenlemeler tek seferde işlenir
+REFRESH_DELAY = 2.0
+
+# NumPy ile skorlanırken tek seferde float'a çevrilen satır sayısı
+# (bellekte int8 matris tutulur, float kopyası sadece blok kadar)
+SCORE_BLOCK = 4096
+
+# Hashing vektörleyicinin atladığı sık kelimeler
+STOPWORDS = {
+    "ve", "ile", "bir", "bu", "da", "de", "ki", "icin", "gibi", "ama", "cok",
+    "daha", "en", "olan", "olarak", "o", "su", "ne", "her", "mi", "ya",
+    "the", "and", "of", "to", "in", "a", "an", "is", "for", "on", "with",
+}
+
+
+def _normalize_text(text: str) -> str:
+    """Küçük harf, Türkçe ı/i birleştirme ve işaretlerin atılması (ç -> c, ş -> s)."""
+    text = unicodedata.normalize("NFKD", db.tr_fold(text) or "")
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def _unit(vector) -> list:
+    """Vektörü birim uzunluğa getirir (kosinüs = iç çarpım olsun diye)."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+def quantize(vector) -> tuple:
+    """
+    Vektörü int8'e sıkıştırır.
+
+    Returns:
+        (scale, bytes): gerçek değer = int8 değer * scale
+    """
+    peak = max((abs(x) for x in vector), default=0.0)
+    scale = peak / 127 if peak else 1.0
+    return scale, array("b", (round(x / scale) for x in vector)).tobytes()
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def _source_text(book, quotes: str = "") -> str:
+    """Kitabın gömme vektörü üretilecek metni."""
+    parts = [book[field] for field in EMBED_FIELDS] + [quotes]
+    return "\n".join(str(part).strip() for part in parts if part and str(part).strip())
+
+
+def _quote_texts(book_ids=None) -> dict:
+    """Kitapların alıntıları (EMBED_QUOTES açıksa): book_id -> metin."""
+    conn = db.get_connection()
+    cursor = conn.cursor()
+
+    condition, params = "", []
+    if book_ids is not None:
+        condition = "WHERE book_id IN (SELECT value FROM json_each(?))"
+        params = [json.dumps(list(book_ids))]
+    cursor.execute(f"""
+        SELECT book_id, substr(group_concat(text, '\n'), 1, {QUOTES_MAX_CHARS}) AS text
+        FROM quotes {condition} GROUP BY book_id
+    """, params)
+    texts = {row["book_id"]: row["text"] for row in cursor.fetchall()}
+
+    conn.close()
+    return texts
+
+
+# ==================== VEKTÖRLEYİCİLER ====================
+
+class HashingEmbedder:
+    """
+    Ollama yokken kullanılan yerel vektörleyici (feature hashing).
+
+    Kelimeler ve kabaca kökleri (ilk 5 harf; Türkçe ekleri atar) işaretli
+    olarak HASH_DIM boyutlu vektöre dağıtılır. Anlamı değil kelime örtüşmesini
+    yakalar; aynı metin her zaman aynı vektörü verir.
+    """
+
+    def __init__(self, dim: int = HASH_DIM):
+        self.dim = dim
+        self.name = f"hash-{dim}"
+
+    def _features(self, text: str):
+        for word in re.findall(r"\w+", _normalize_text(text)):
+            if len(word) < 2 or word.isdigit() or word in STOPWORDS:
+                continue
+            yield word
+            if len(word) > 5:
+                yield word[:5] + "*"
+
+    def embed_one(self, text: str) -> list:
+        counts = {}
+        for feature in self._features(text):
+            counts[feature] = counts.get(feature, 0) + 1
+
+        vector = [0.0] * self.dim
+        for feature, count in counts.items():
+            value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+            sign = 1.0 if value >> 63 else -1.0
+            vector[value % self.dim] += sign * (1.0 + math.log(count))
+        return _unit(vector)
+
+    def embed(self, texts: list) -> list:
+        return [self.embed_one(text) for text in texts]
+
+
+class OllamaEmbedder:
+    """Ollama'nın gömme modeliyle vektörleyici."""
+
+    def __init__(self, model: str = EMBED_MODEL):
+        self.model = model
+        self.name = f"ollama:{model}"
+
+    def embed(self, texts: list) -> list:
+        return [_unit(vector) for vector in get_client().embed(texts, self.model)]
+
+
+def select_embedder():
+    """Ollama'da gömme modeli kuruluysa onu, değilse hashing vektörleyiciyi seçer."""
+    status = check_ollama_status()
+    if status["available"]:
+        for model in status["models"]:
+            if model.split(":")[0] == EMBED_MODEL:
+                return OllamaEmbedder(model)
+    return HashingEmbedder()
+
+
+# ==================== INDEX ====================
+
+class EmbeddingIndex:
+    """
+    Kitap vektörlerinin bellek içi index'i.
+
+    Vektörler bellekte de int8 tutulur (kitap başına dim bayt).
+    Thread-safe: yükleme ve yenileme arka planda, sorgular arayüzden yapılabilir.
+    """
+
+    def __init__(self, embedder=None):
+        self._lock = threading.RLock()
+        self.embedder = embedder
+        self.ready = False
+        self._reset()
+        self._dirty = set()
+        self._dirty_all = False
+        self._timer = None
+        self._subscribed = False
+
+    def _reset(self):
+        self._ids = []       # sıra -> book_id
+        self._pos = {}       # book_id -> sıra
+        self._vectors = []   # sıra -> array("b")
+        self._scales = []    # sıra -> float
+        self._hashes = {}    # book_id -> kaynak metin özeti
+        self._matrix = None  # NumPy: (n, dim) int8, değişince yeniden kurulur
+
+    def __len__(self):
+        return len(self._ids)
+
+    # ---------- Yükleme ----------
+
+    def load(self):
+        """Kayıtlı vektörleri okur, eksik/eski olanları üretir ve değişikliklere abone olur."""
+        if self.embedder is None:
+            self.embedder = select_embedder()
+
+        rows = db.get_embeddings(self.embedder.name)
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._set(row["book_id"], row["scale"], row["vector"], row["source_hash"])
+
+        if not self._subscribed:
+            db.subscribe(self.apply_change)
+            self._subscribed = True
+
+        try:
+            created = self.refresh()
+            if created:
+                print(f"Gömme index'i: {created} kitabın vektörü üretildi ({self.embedder.name})")
+        except Exception as e:
+            print(f"Gömme vektörleri üretilemedi: {e}")
+        self.ready = True
+
+    def close(self):
+        """Değişiklik aboneliğini bırakır."""
+        if self._subscribed:
+            db.unsubscribe(self.apply_change)
+            self._subscribed = False
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def refresh(self, book_ids=None) -> int:
+        """
+        Metni değişmiş veya vektörü olmayan kitapların vektörünü üretir.
+
+        Args:
+            book_ids: Sadece bu kitaplar (None ise hepsi, metin özetleriyle)
+
+        Returns:
+            Üretilen vektör sayısı
+        """
+        books = db.get_book_rows(["id"] + EMBED_FIELDS, book_ids)
+        quotes = _quote_texts(book_ids) if EMBED_QUOTES else {}
+
+        pending = []
+        with self._lock:
+            for book in books:
+                text = _source_text(book, quotes.get(book["id"], ""))
+                digest = _digest(text)
+                if self._hashes.get(book["id"]) != digest:
+                    pending.append((book["id"], text, digest))
+
+        # Vektör üretimi (Ollama isteği) kilit dışında, parça parça
+        for start in range(0, len(pending), EMBED_BATCH_SIZE):
+            chunk = pending[start:start + EMBED_BATCH_SIZE]
+            vectors = self.embedder.embed([text for _, text, _ in chunk])
+
+            rows = []
+            for (book_id, _, digest), vector in zip(chunk, vectors):
+                scale, blob = quantize(vector)
+                rows.append((book_id, len(vector), scale, blob, digest))
+            db.save_embeddings(self.embedder.name, rows)
+
+            with self._lock:
+                for book_id, _, scale, blob, digest in rows:
+                    self._set(book_id, scale, blob, digest)
+
+        return len(pending)
+
+    # ---------- Satır işlemleri ----------
+
+    def _set(self, book_id: int, scale: float, blob: bytes, digest: str):
+        vector = array("b")
+        vector.frombytes(blob)
+
+        pos = self._pos.get(book_id)
+        if pos is None:
+            self._pos[book_id] = len(self._ids)
+            self._ids.append(book_id)
+            self._vectors.append(vector)
+            self._scales.append(scale)
+        else:
+            self._vectors[pos] = vector
+            self._scales[pos] = scale
+        self._hashes[book_id] = digest
+        self._matrix = None
+
+    def _remove(self, book_id: int):
+        pos = self._pos.pop(book_id, None)
+        if pos is None:
+            return
+
+        # Son satır boşalan yere taşınır (listeler sıkışık kalır)
+        last = len(self._ids) - 1
+        if pos != last:
+            self._ids[pos] = self._ids[last]
+            self._vectors[pos] = self._vectors[last]
+            self._scales[pos] = self._scales[last]
+            self._pos[self._ids[pos]] = pos
+        self._ids.pop()
+        self._vectors.pop()
+        self._scales.pop()
+        self._hashes.pop(book_id, None)
+        self._matrix = None
+
+    # ---------- Değişiklikler ----------
+
+    def apply_change(self, table: str, op: str, ids: list, columns):
+        """database.notify_change aboneliği: değişen kitapları yenilemeye işaretler."""
+        if table == "books":
+            if op == "delete":
+                # Satırları tetikleyici siler, burada sadece bellek güncellenir
+                with self._lock:
+                    for book_id in ids:
+                        self._remove(book_id)
+                return
+            if op == "update" and columns and not set(columns) & set(EMBED_FIELDS):
+                return
+            self._schedule(ids)
+
+        elif table == "quotes" and EMBED_QUOTES:
+            # Alıntının kitabı bildirimde yok: tüm kitaplar özetleriyle kontrol edilir
+            self._schedule(None)
+
+    def _schedule(self, book_ids):
+        """Yenilemeyi REFRESH_DELAY sonrasına kurar (yazan thread'i bekletmemek için)."""
+        with self._lock:
+            if book_ids is None:
+                self._dirty_all = True
+            else:
+                self._dirty.update(book_ids)
+
+            if self._timer is None and self.embedder is not None:
+                self._timer = threading.Timer(REFRESH_DELAY, self._process_dirty)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _process_dirty(self):
+        with self._lock:
+            book_ids, self._dirty = sorted(self._dirty), set()
+            refresh_all, self._dirty_all = self._dirty_all, False
+            self._timer = None
+
+        try:
+            self.refresh(None if refresh_all else book_ids)
+        except Exception as e:
+            # Sonraki açılışta metin özetleri karşılaştırılıp tamamlanır
+            print(f"Gömme vektörleri güncellenemedi: {e}")
+
+    # ---------- Sorgular ----------
+
+    def _top(self, query: list, k: int, exclude=()) -> list:
+        """query'ye en yakın k kitap: [(book_id, kosinüs skoru), ...] (azalan)."""
+        with self._lock:
+            if not self._ids or k <= 0 or len(query) != len(self._vectors[0]):
+                return []
+
+            if np is None:
+                scores = (
+                    (scale * sum(map(operator.mul, vector, query)), book_id)
+                    for book_id, vector, scale in zip(self._ids, self._vectors, self._scales)
+                    if book_id not in exclude
+                )
+                return [(book_id, score) for score, book_id in heapq.nlargest(k, scores)]
+
+            if self._matrix is None:
+                self._matrix = np.frombuffer(
+                    b"".join(vector.tobytes() for vector in self._vectors), dtype=np.int8
+                ).reshape(len(self._ids), -1)
+                self._scale_array = np.array(self._scales, dtype=np.float32)
+
+            query = np.asarray(query, dtype=np.float32)
+            scores = np.empty(len(self._ids), dtype=np.float32)
+            for start in range(0, len(self._ids), SCORE_BLOCK):
+                block = self._matrix[start:start + SCORE_BLOCK]
+                scores[start:start + len(block)] = block.astype(np.float32) @ query
+            scores *= self._scale_array
+            for book_id in exclude:
+                if book_id in self._pos:
+                    scores[self._pos[book_id]] = -np.inf
+
+            k = min(k, len(scores))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [(self._ids[i], float(scores[i])) for i in best if scores[i] > -np.inf]
+
+    def similar(self, book_id: int, k: int = 10) -> list:
+        """
+        Kitaba en çok benzeyen kitaplar.
+
+        Returns:
+            [(book_id, skor), ...]; kitabın vektörü yoksa boş liste
+        """
+        with self._lock:
+            pos = self._pos.get(book_id)
+            if pos is None:
+                return []
+            scale = self._scales[pos]
+            query = [value * scale for value in self._vectors[pos]]
+        return self._top(query, k, exclude={book_id})
+
+    def search(self, text: str, k: int = 10, exclude=()) -> list:
+        """
+        Serbest metne (tema, konu) en yakın kitaplar.
+
+        Returns:
+            [(book_id, skor), ...]
+        """
+        if not text or not text.strip():
+            return []
+        if self.embedder is None:
+            self.embedder = select_embedder()
+        query = self.embedder.embed([text.strip()])[0]
+        return self._top(query, k, exclude=set(exclude))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> EmbeddingIndex:
+    """Uygulama genelindeki tek index (load() çağıran yükler)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = EmbeddingIndex()
+        return _index
+
+
+if __name__ == "__main__":
+    import time
+
+    db.init_database()
+    index = EmbeddingIndex()
+    start = time.perf_counter()
+    index.load()
+    print(f"{len(index)} vektör ({index.embedder.name}), "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms, NumPy: {'var' if np else 'yok'}")
+
+    query = " ".join(sys.argv[1:]) or "savaş"
+    start = time.perf_counter()
+    results = index.search(query)
+    print(f"'{query}' ({(time.perf_counter() - start) * 1000:.1f} ms):")
+    titles = {book["id"]: book["title"] for book in db.get_book_rows(["id", "title"], [i for i, _ in results])}
+    for book_id, score in results:
+        print(f"  {score:.3f}  {titles.get(book_id)}")
@@ -0,0 +1,395 @@
+"""
+Kitaplık Uygulaması - HTML Ayıklama Katmanı
+===========================================
+Türkçe kitapçı sitelerinin arama sayfalarından ürün bilgisi çıkarır.
+
+Eskiden her sayfa re.split ile bölünüp her ürün bloğunda birden fazla
+DOTALL `.*?` regex'i çalıştırılıyordu; büyük sayfalarda bu ciddi geri izleme
+(backtracking) demekti. Burada her sayfa html.parser ile tek geçişte okunur,
+yeterli ürün toplanınca okuma erken bırakılır.
+
+Her ayıklayıcı şu anahtarlara sahip sözlük listesi döndürür:
+    title, author, publisher, cover_url
+"""
+
+import json
+import re
+import sys
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+
+
+# Sayfa başına en fazla kaç ürün alınacak
+MAX_RESULTS = 10
+
+# Bir sayfanın ayıklanması için süre bütçesi (milisaniye)
+# profile_extractors() büyütülmüş kayıtlı sayfalarla bunu kontrol eder
+EXTRACT_BUDGET_MS = 25
+
+# Kapak olarak kabul edilen görsel adresleri
+_IMAGE_URL = re.compile(r"https?://[^\"]+\.(?:jpg|jpeg|png|webp)", re.IGNORECASE)
+_1000KITAP_COVER_URL = re.compile(
+    r"https?://[^\"]*(?:covers|images|img)[^\"]*\.(?:jpg|jpeg|png|webp)", re.IGNORECASE
+)
+
+
+class _Done(Exception):
+    """Yeterli sonuç toplandı, sayfanın geri kalanı okunmaz."""
+
+
+class _CardParser(HTMLParser):
+    """
+    Ürün kartlarını tek geçişte toplayan temel ayrıştırıcı.
+
+    Alt sınıflar is_card_start() ile kartın başladığı etiketi,
+    handle_card_tag() ile kart içindeki alanları tanımlar.
+    Bir kart, bir sonraki kart başlayana kadar sürer (re.split ile aynı mantık).
+    """
+
+    def __init__(self, limit: int = MAX_RESULTS):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.cards = []
+        self.card = None
+
+        # Metni toplanan alan: (alan, etiket, iç içe derinlik, parçalar)
+        self._capture = None
+        # Sınıfı işaretli kapsayıcı görüldü, metin bir sonraki etiketten gelecek
+        # etiket -> alan
+        self._expected = {}
+
+    # === Alt sınıfların dolduracağı kısımlar ===
+
+    def is_card_start(self, tag: str, cls: str) -> bool:
+        """Varsayılan: kart yok (alt sınıf tanımlamazsa sonuç boş döner)."""
+        return False
+
+    def handle_card_tag(self, tag: str, attrs: dict, cls: str):
+        pass
+
+    # === Yardımcılar ===
+
+    def set_field(self, field: str, value: str):
+        """Alanı (henüz boşsa) doldurur."""
+        if value and not self.card.get(field):
+            self.card[field] = value.strip()
+
+    def capture_text(self, field: str, tag: str):
+        """Bu etiketin içindeki metni alana yazar."""
+        if self._capture is None and not self.card.get(field):
+            self._capture = [field, tag, 1, []]
+
+    def expect_text(self, field: str, tag: str):
+        """Kart içindeki bir sonraki `tag` etiketinin metnini alana yazar."""
+        if not self.card.get(field):
+            self._expected.setdefault(tag, field)
+
+    # === HTMLParser olayları ===
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        cls = attrs.get("class") or ""
+
+        if self.is_card_start(tag, cls):
+            self._close_card()
+            if len(self.cards) >= self.limit:
+                raise _Done()
+            self.card = {}
+            return
+
+        if self.card is None:
+            return
+
+        if self._capture is not None:
+            if tag == self._capture[1]:
+                self._capture[2] += 1
+        else:
+            field = self._expected.pop(tag, None)
+            if field:
+                self.capture_text(field, tag)
+
+        self.handle_card_tag(tag, attrs, cls)
+
+    def handle_endtag(self, tag):
+        capture = self._capture
+        if capture is None or tag != capture[1]:
+            return
+
+        capture[2] -= 1
+        if capture[2] == 0:
+            self._capture = None
+            self.set_field(capture[0], "".join(capture[3]))
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._capture[3].append(data)
+
+    def _close_card(self):
+        if self.card is not None and self.card.get("title"):
+            self.cards.append(self.card)
+        self.card = None
+        self._capture = None
+        self._expected = {}
+
+    def extract(self, html: str) -> list:
+        try:
+            self.feed(html)
+            self.close()
+        except _Done:
+            pass
+        self._close_card()
+
+        return [
+            {
+                "title": card.get("title", ""),
+                "author": card.get("author", ""),
+                "publisher": card.get("publisher", ""),
+                "cover_url": card.get("cover_url") or card.get("fallback_cover", ""),
+            }
+            for card in self.cards[:self.limit]
+        ]
+
+
+# ==================== KİTAPYURDU ====================
+
+class _KitapyurduParser(_CardParser):
+    """Kart: div.product-cr"""
+
+    def is_card_start(self, tag, cls):
+        return tag == "div" and "product-cr" in cls
+
+    def handle_card_tag(self, tag, attrs, cls):
+        if tag == "a" and "pr-img-link" in cls:
+            self.set_field("title", attrs.get("title"))
+        elif tag == "div":
+            if "name" in cls:
+                self.expect_text("title", "a")
+            elif "author" in cls:
+                self.expect_text("author", "a")
+            elif "publisher" in cls:
+                self.expect_text("publisher", "span")
+        elif tag == "img":
+            if "lazy" in cls:
+                self.set_field("cover_url", attrs.get("data-src") or attrs.get("src"))
+            elif _IMAGE_URL.fullmatch(attrs.get("src") or ""):
+                self.set_field("fallback_cover", attrs["src"])
+
+
+def extract_kitapyurdu(html: str, limit: int = MAX_RESULTS) -> list:
+    """Kitapyurdu arama sayfasından ürünleri çıkarır."""
+    return _KitapyurduParser(limit).extract(html)
+
+
+# ==================== BKM KİTAP ====================
+
+class _BkmParser(_CardParser):
+    """Kart: div.productItem"""
+
+    def is_card_start(self, tag, cls):
+        return tag == "div" and "productItem" in cls
+
+    def handle_card_tag(self, tag, attrs, cls):
+        if tag == "a":
+            if "productName" in cls:
+                if attrs.get("title"):
+                    self.set_field("title", attrs["title"])
+                else:
+                    self.capture_text("title", "a")
+            elif "productAuthor" in cls:
+                self.capture_text("author", "a")
+        elif tag == "div" and "productName" in cls:
+            self.expect_text("title", "a")
+        elif tag == "img":
+            if attrs.get("data-src"):
+                self.set_field("cover_url", attrs["data-src"])
+            elif _IMAGE_URL.fullmatch(attrs.get("src") or ""):
+                self.set_field("fallback_cover", attrs["src"])
+
+
+def extract_bkmkitap(html: str, limit: int = MAX_RESULTS) -> list:
+    """BKM Kitap arama sayfasından ürünleri çıkarır."""
+    return _BkmParser(limit).extract(html)
+
+
+# ==================== 1000KİTAP ====================
+
+class _1000KitapParser(HTMLParser):
+    """
+    1000Kitap sayfasında kart yapısı yok:
+    - /kitap/ bağlantısının title'ı başlık, ardından gelen ilk /yazar/ bağlantısı yazar
+    - Kapaklar sayfadaki sırasıyla eşleştirilir
+    - Hiç sonuç yoksa JSON-LD (@type: Book) verisine bakılır
+    """
+
+    def __init__(self, limit: int = MAX_RESULTS):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.pairs = []
+        self.covers = []
+        self.json_ld = []
+
+        self._title = None
+        self._author_parts = None
+        self._script_parts = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+
+        if tag == "a":
+            href = attrs.get("href") or ""
+            if href.startswith("/kitap/") and attrs.get("title") and self._title is None:
+                self._title = attrs["title"]
+            elif href.startswith("/yazar/") and self._title is not None:
+                self._author_parts = []
+        elif tag == "img":
+            url = attrs.get("data-src") or attrs.get("src") or ""
+            if _1000KITAP_COVER_URL.fullmatch(url):
+                self.covers.append(url)
+        elif tag == "script" and attrs.get("type") == "application/ld+json":
+            self._script_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._author_parts is not None:
+            author = "".join(self._author_parts).strip()
+            self._author_parts = None
+            if author:
+                self.pairs.append((self._title.strip(), author))
+                self._title = None
+                if len(self.pairs) >= self.limit and len(self.covers) >= self.limit:
+                    raise _Done()
+        elif tag == "script" and self._script_parts is not None:
+            self.json_ld.append("".join(self._script_parts))
+            self._script_parts = None
+
+    def handle_data(self, data):
+        if self._author_parts is not None:
+            self._author_parts.append(data)
+        elif self._script_parts is not None:
+            self._script_parts.append(data)
+
+    def extract(self, html: str) -> list:
+        try:
+            self.feed(html)
+            self.close()
+        except _Done:
+            pass
+
+        results = []
+        for i, (title, author) in enumerate(self.pairs[:self.limit]):
+            results.append({
+                "title": title,
+                "author": author,
+                "publisher": "",
+                "cover_url": self.covers[i] if i < len(self.covers) else "",
+            })
+
+        if not results:
+            results = _books_from_json_ld(self.json_ld)[:self.limit]
+
+        return results
+
+
+def _books_from_json_ld(scripts: list) -> list:
+    """JSON-LD bloklarındaki Book nesnelerini çıkarır."""
+    books = []
+
+    def walk(node):
+        if isinstance(node, list):
+            for child in node:
+                walk(child)
+        elif isinstance(node, dict):
+            if node.get("@type") == "Book" and node.get("name"):
+                author = node.get("author") or ""
+                if isinstance(author, list):
+                    author = author[0] if author else ""
+                if isinstance(author, dict):
+                    author = author.get("name", "")
+                image = node.get("image") or ""
+                if isinstance(image, list):
+                    image = image[0] if image else ""
+                books.append({
+                    "title": node["name"],
+                    "author": author,
+                    "publisher": "",
+                    "cover_url": image,
+                })
+            for key in ("@graph", "itemListElement", "item"):
+                if key in node:
+                    walk(node[key])
+
+    for script in scripts:
+        try:
+            walk(json.loads(script))
+        except ValueError:
+            continue
+
+    return books
+
+
+def extract_1000kitap(html: str, limit: int = MAX_RESULTS) -> list:
+    """1000Kitap arama sayfasından kitapları çıkarır."""
+    return _1000KitapParser(limit).extract(html)
+
+
+# ==================== PROFİL ====================
+
+EXTRACTORS = {
+    "kitapyurdu": (extract_kitapyurdu, "kitapyurdu_search.html"),
+    "bkmkitap": (extract_bkmkitap, "bkmkitap_search.html"),
+    "1000kitap": (extract_1000kitap, "1000kitap_search.html"),
+}
+
+# Büyük sayfaları taklit etmek için ürünlerden önce eklenen gürültü
+_FILLER = (
+    '<div class="banner"><a href="/kampanya" class="promo"><img src="/img/b.png" alt=""></a>'
+    '<ul class="menu"><li><a href="/kategori/roman">Roman</a></li>'
+    '<li><a href="/kategori/tarih">Tarih</a></li></ul>'
+    '<script>var dataLayer = dataLayer || []; dataLayer.push({"page": "search"});</script>'
+    '<p class="info">Kargo bedava &amp; hızlı teslimat</p></div>\n'
+)
+
+
+def profile_extractors(scale: int = 200, repeat: int = 5, budget_ms: float = EXTRACT_BUDGET_MS) -> dict:
+    """
+    Her ayıklayıcıyı kayıtlı sayfalarla ölçer.
+
+    Sayfalar, ürünlerden önce `scale` adet gürültü bloğu eklenerek büyütülür
+    (en kötü durum: ürünler sayfanın sonunda).
+
+    Returns:
+        {"kitapyurdu": {"ms": 3.2, "results": 5, "bytes": 81234, "ok": True}, ...}
+    """
+    from services.mock_server import load_fixture
+
+    report = {}
+    for name, (extract, fixture) in EXTRACTORS.items():
+        html = load_fixture(fixture, "https://example.com").decode("utf-8")
+        body_at = html.find("<body>") + len("<body>")
+        page = html[:body_at] + _FILLER * scale + html[body_at:]
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results = extract(page)
+        ms = (time.perf_counter() - start) / repeat * 1000
+
+        report[name] = {
+            "ms": round(ms, 2),
+            "results": len(results),
+            "bytes": len(page.encode("utf-8")),
+            "ok": ms <= budget_ms and len(results) > 0,
+        }
+
+    return report
+
+
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).parent.parent))
+
+    report = profile_extractors()
+    print(f"Ayıklama süreleri (bütçe: {EXTRACT_BUDGET_MS} ms/sayfa)")
+    for name, row in report.items():
+        status = "✅" if row["ok"] else "❌"
+        print(f"  {status} {name:<12} {row['ms']:7.2f} ms  {row['results']} sonuç  {row['bytes'] // 1024} KB")
+
+    sys.exit(0 if all(row["ok"] for row in report.values()) else 1)
@@ -0,0 +1,347 @@
+"""
+Kitaplık Uygulaması - Bellek İçi Kitaplık Görüntüsü
+===================================================
+Liste/grid görünümünün ihtiyaç duyduğu kısa alanları bellekte sütunlar halinde
+tutar. Raf değiştirmek, filtre seçmek veya aramayı temizlemek SQLite'a gitmeden
+bu görüntü üzerinden yapılır.
+
+- Her sütun bir liste, kitabın yeri id -> sıra sözlüğünden bulunur
+- Durum, puan, yıl, raf ve etiket için bit kümeleri (Python int) önceden
+  hesaplanır; filtreler bu kümelerin AND'i ile bulunur
+- Metin araması sadece kalan adaylar üzerinde yapılır
+- Silinen kitabın yeri boşaltılır (alive kümesinden çıkar); boş yer çoğalınca
+  görüntü yeniden sıkıştırılır
+- database.subscribe ile yazma anında, yazan thread'de güncellenir
+- description/review gibi uzun alanlar burada tutulmaz; kitap açılınca
+  get_details() ile veritabanından okunur
+
+Kullanım:
+    snapshot = LibrarySnapshot()
+    snapshot.load()
+    books = snapshot.query(status="read", shelf_id=3, sort="title")
+    counts = snapshot.group("status")
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+
+
+# Bellekte tutulan alanlar (liste/grid ve filtreler için yeterli)
+SNAPSHOT_COLUMNS = db.LIST_COLUMNS
+
+# Bit kümesi tutulan alanlar
+INDEXED_FIELDS = ("status", "rating", "publish_year")
+
+# Sıralanabilen alanlar
+SORT_FIELDS = ("id", "title", "author", "page_count", "rating", "publish_year", "created_at")
+
+# Boş yer oranı bunu geçerse görüntü yeniden sıkıştırılır
+COMPACT_RATIO = 0.25
+
+
+def _split_tags(tags) -> set:
+    """Virgülle ayrılmış etiketleri küçük harfli kümeye çevirir."""
+    return {tag.strip().casefold() for tag in (tags or "").split(",") if tag.strip()}
+
+
+def _positions(mask: int):
+    """Bit kümesindeki 1 olan bitlerin sıralarını (küçükten büyüğe) verir."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class LibrarySnapshot:
+    """
+    Kitaplığın sütun tabanlı bellek görüntüsü.
+
+    Sorgular dict döndürür; anahtarlar SNAPSHOT_COLUMNS ile aynıdır
+    (sqlite3.Row gibi book["title"] şeklinde kullanılabilir).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+        self._subscribed = False
+
+    def _reset(self):
+        self.columns = {name: [] for name in SNAPSHOT_COLUMNS}
+        self.index = {}        # book_id -> sıra
+        self._alive = 0        # silinmemiş kitapların kümesi
+        self._bits = {field: {} for field in INDEXED_FIELDS}
+        self._tag_bits = {}    # etiket -> küme
+        self._shelf_bits = {}  # shelf_id -> küme
+        self._shelves = {}     # book_id -> raf id'leri (sıkıştırma için)
+        self._search_text = [] # sıra -> "başlık yazar" (küçük harf)
+
+    # ---------- Yükleme ----------
+
+    def load(self):
+        """Görüntüyü veritabanından baştan kurar ve değişikliklere abone olur."""
+        rows = db.get_book_rows(SNAPSHOT_COLUMNS)
+        pairs = db.get_all_book_shelves()
+
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._append(row)
+            for book_id, shelf_id in pairs:
+                self._add_to_shelf(book_id, shelf_id)
+
+        if not self._subscribed:
+            db.subscribe(self.apply_change)
+            self._subscribed = True
+
+    def close(self):
+        """Değişiklik aboneliğini bırakır."""
+        if self._subscribed:
+            db.unsubscribe(self.apply_change)
+            self._subscribed = False
+
+    def __len__(self):
+        return self._alive.bit_count()
+
+    # ---------- Satır işlemleri ----------
+
+    def _append(self, row):
+        pos = len(self.columns["id"])
+        for name in SNAPSHOT_COLUMNS:
+            self.columns[name].append(row[name])
+        self._search_text.append(f"{row['title'] or ''}\n{row['author'] or ''}".casefold())
+        self.index[row["id"]] = pos
+        self._set_bits(pos, row, True)
+        self._alive |= 1 << pos
+
+    def _set_bits(self, pos: int, row, on: bool):
+        """Satırın alan ve etiket kümelerindeki bitini açar/kapatır."""
+        bit = 1 << pos
+        groups = [(self._bits[field], row[field]) for field in INDEXED_FIELDS]
+        groups += [(self._tag_bits, tag) for tag in _split_tags(row["tags"])]
+
+        for bits, value in groups:
+            if on:
+                bits[value] = bits.get(value, 0) | bit
+            elif value in bits:
+                bits[value] &= ~bit
+                if not bits[value]:
+                    del bits[value]
+
+    def _update(self, row):
+        pos = self.index.get(row["id"])
+        if pos is None:
+            self._append(row)
+            return
+
+        self._set_bits(pos, self._row_at(pos), False)
+        for name in SNAPSHOT_COLUMNS:
+            self.columns[name][pos] = row[name]
+        self._search_text[pos] = f"{row['title'] or ''}\n{row['author'] or ''}".casefold()
+        self._set_bits(pos, row, True)
+
+    def _remove(self, book_id: int):
+        pos = self.index.pop(book_id, None)
+        if pos is None:
+            return
+
+        self._set_bits(pos, self._row_at(pos), False)
+        for shelf_id in self._shelves.pop(book_id, set()):
+            self._shelf_bits[shelf_id] &= ~(1 << pos)
+        self._alive &= ~(1 << pos)
+
+    def _add_to_shelf(self, book_id: int, shelf_id: int):
+        pos = self.index.get(book_id)
+        if pos is None:
+            return
+        self._shelf_bits[shelf_id] = self._shelf_bits.get(shelf_id, 0) | (1 << pos)
+        self._shelves.setdefault(book_id, set()).add(shelf_id)
+
+    def _remove_from_shelf(self, book_id: int, shelf_id: int):
+        pos = self.index.get(book_id)
+        if pos is None or shelf_id not in self._shelf_bits:
+            return
+        self._shelf_bits[shelf_id] &= ~(1 << pos)
+        self._shelves.get(book_id, set()).discard(shelf_id)
+
+    def _compact(self):
+        """Silinmiş satırların yerini kapatarak görüntüyü yeniden kurar."""
+        rows = [self._row_at(pos) for pos in _positions(self._alive)]
+        shelves = self._shelves
+
+        self._reset()
+        for row in rows:
+            self._append(row)
+        for book_id, shelf_ids in shelves.items():
+            for shelf_id in shelf_ids:
+                self._add_to_shelf(book_id, shelf_id)
+
+    def _row_at(self, pos: int) -> dict:
+        return {name: self.columns[name][pos] for name in SNAPSHOT_COLUMNS}
+
+    # ---------- Değişiklikler ----------
+
+    def apply_change(self, table: str, op: str, ids: list, columns):
+        """database.notify_change aboneliği: görüntüyü günceller."""
+        if table == "books":
+            if op == "update" and columns and not set(columns) & set(SNAPSHOT_COLUMNS):
+                return  # Uzun alanlar burada tutulmuyor
+
+            rows = [] if op == "delete" else db.get_book_rows(SNAPSHOT_COLUMNS, ids)
+            with self._lock:
+                if op == "delete":
+                    for book_id in ids:
+                        self._remove(book_id)
+                else:
+                    for row in rows:
+                        self._update(row)
+
+                total = len(self.columns["id"])
+                if total and (total - len(self)) / total > COMPACT_RATIO:
+                    self._compact()
+
+        elif table == "book_shelves":
+            with self._lock:
+                for book_id, shelf_id in ids:
+                    if op == "insert":
+                        self._add_to_shelf(book_id, shelf_id)
+                    else:
+                        self._remove_from_shelf(book_id, shelf_id)
+
+        elif table == "shelves" and op == "delete":
+            with self._lock:
+                for shelf_id in ids:
+                    mask = self._shelf_bits.pop(shelf_id, 0)
+                    for pos in _positions(mask):
+                        self._shelves.get(self.columns["id"][pos], set()).discard(shelf_id)
+
+    # ---------- Sorgular ----------
+
+    def mask(self, status=None, rating=None, year=None, shelf_id=None,
+             tag=None, text=None, series=None) -> int:
+        """
+        Verilen koşullara uyan kitapların bit kümesini döndürür.
+        None olan koşullar uygulanmaz.
+        """
+        with self._lock:
+            result = self._alive
+            if status:
+                result &= self._bits["status"].get(status, 0)
+            if rating:
+                result &= self._bits["rating"].get(rating, 0)
+            if year:
+                result &= self._bits["publish_year"].get(year, 0)
+            if shelf_id is not None:
+                result &= self._shelf_bits.get(shelf_id, 0)
+            if tag:
+                result &= self._tag_bits.get(tag.strip().casefold(), 0)
+
+            # Metin koşulları kümeyle ifade edilemez, kalan adaylarda bakılır
+            if text and text.strip():
+                needle = text.strip().casefold()
+                for pos in _positions(result):
+                    if needle not in self._search_text[pos]:
+                        result &= ~(1 << pos)
+            if series:
+                series_column = self.columns["series_name"]
+                for pos in _positions(result):
+                    if series_column[pos] != series:
+                        result &= ~(1 << pos)
+
+            return result
+
+    def query(self, sort: str = "id", descending: bool = False, **conditions) -> list:
+        """
+        Koşullara uyan kitapları sıralı olarak döndürür.
+
+        Args:
+            sort: SORT_FIELDS'tan biri (boş değerler her zaman sonda)
+            descending: Azalan sıralama
+            **conditions: mask() parametreleri
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Sıralanamayan alan: {sort}")
+
+        with self._lock:
+            positions = list(_positions(self.mask(**conditions)))
+            values = self.columns[sort]
+
+            def key(pos):
+                value = values[pos]
+                if isinstance(value, str):
+                    value = value.casefold()
+                return value
+
+            present = [pos for pos in positions if values[pos] is not None]
+            missing = [pos for pos in positions if values[pos] is None]
+            present.sort(key=key, reverse=descending)
+
+            return [self._row_at(pos) for pos in present + missing]
+
+    def group(self, field: str, **conditions) -> dict:
+        """
+        Koşullara uyan kitapları bir alana göre sayar.
+        status/rating/publish_year ve "tag"/"shelf" için sayım bit kümelerinden yapılır.
+
+        Returns:
+            {değer: kitap sayısı}
+        """
+        with self._lock:
+            selected = self.mask(**conditions)
+
+            if field in INDEXED_FIELDS:
+                groups = self._bits[field]
+            elif field == "tag":
+                groups = self._tag_bits
+            elif field == "shelf":
+                groups = self._shelf_bits
+            else:
+                counts = {}
+                column = self.columns[field]
+                for pos in _positions(selected):
+                    counts[column[pos]] = counts.get(column[pos], 0) + 1
+                return counts
+
+            counts = {value: (bits & selected).bit_count() for value, bits in groups.items()}
+            return {value: count for value, count in counts.items() if count}
+
+    def get(self, book_id: int):
+        """Kitabın bellekteki kısa kaydı (yoksa None)."""
+        with self._lock:
+            pos = self.index.get(book_id)
+            return self._row_at(pos) if pos is not None else None
+
+    def matches(self, book_id: int, status=None, rating=None, year=None, shelf_id=None,
+                tag=None, text=None, series=None) -> bool:
+        """
+        Kitap verilen koşullara uyuyor mu? (mask() ile aynı koşullar)
+        Kümeler kurulmaz, sadece kitabın kendi satırına bakılır.
+        """
+        with self._lock:
+            pos = self.index.get(book_id)
+            if pos is None:
+                return False
+
+            if status and self.columns["status"][pos] != status:
+                return False
+            if rating and self.columns["rating"][pos] != rating:
+                return False
+            if year and self.columns["publish_year"][pos] != year:
+                return False
+            if shelf_id is not None and shelf_id not in self._shelves.get(book_id, ()):
+                return False
+            if tag and tag.strip().casefold() not in _split_tags(self.columns["tags"][pos]):
+                return False
+            if text and text.strip() and text.strip().casefold() not in self._search_text[pos]:
+                return False
+            if series and self.columns["series_name"][pos] != series:
+                return False
+            return True
+
+    @staticmethod
+    def get_details(book_id: int):
+        """Kitabın tüm alanları (açıklama, inceleme vb.) - veritabanından okunur."""
+        return db.get_book_by_id(book_id)
@@ -0,0 +1,137 @@
+"""
+Kitaplık Uygulaması - İstatistik Verileri
+=========================================
+İstatistik penceresinin sekme verilerini hazırlar.
+
+- Her sekmenin verisi tek fonksiyonda hesaplanır (sadece veritabanı, Qt yok);
+  arayüz bunları arka plan thread'inde çağırır
+- Sonuçlar kitaplık değişene kadar saklanır: anahtar, kitaplık sürüm sayacı
+  (db.get_library_version, books tetikleyicileri) ile sekmenin okuduğu diğer
+  tabloların değişiklik sayaçlarıdır (db.subscribe); bugüne bağlı sekmelerde tarih de eklenir
+- peek() hesaplamadan sadece önbelleğe bakar; pencere hazır veriyi beklemeden gösterir
+
+Kullanım:
+    data = get_tab("overview")
+    data = peek("charts", (2024,))   # önbellekte yoksa None
+"""
+
+import sys
+import threading
+from datetime import date
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+
+
+# Yazar/kategori listelerindeki en fazla satır (liste tek widget'ta çizilir)
+AUTHOR_LIST_LIMIT = 500
+CATEGORY_LIST_LIMIT = 500
+
+# Sekmelerin books dışında okuduğu tablolar (değişince o sekmenin verisi yeniden hesaplanır)
+TAB_TABLES = {
+    "overview": ["shelves"],
+    "charts": ["reading_sessions"],
+    "authors": [],
+    "categories": [],
+    "speed": ["reading_sessions"],
+    "goal": ["reading_goals", "reading_sessions"],
+}
+
+# Bugüne göre hesaplanan sekmeler (seriler, aktiflik, hedef temposu); gün değişince yenilenir
+DATED_TABS = ("charts", "speed", "goal")
+
+_cache = {}           # (sekme, argümanlar) -> (sürüm, veri)
+_table_versions = {}  # tablo -> değişiklik sayacı
+_lock = threading.Lock()
+
+
+def _on_change(table: str, op: str, ids: list, columns: list):
+    with _lock:
+        _table_versions[table] = _table_versions.get(table, 0) + 1
+
+
+db.subscribe(_on_change)
+
+
+# ---------- Sekme verileri ----------
+
+def load_overview() -> dict:
+    return db.get_statistics()
+
+
+def load_charts(year: int) -> dict:
+    days = db.get_reading_series("day", f"{year}-01-01", f"{year}-12-31")
+    return {
+        "monthly": db.get_monthly_reading_stats(year),
+        "daily": {row["key"]: row["pages"] for row in days},
+        "yearly": db.get_yearly_reading_stats(),
+    }
+
+
+def load_authors() -> list:
+    return db.get_author_stats(AUTHOR_LIST_LIMIT)
+
+
+def load_categories() -> list:
+    return db.get_category_stats(CATEGORY_LIST_LIMIT)
+
+
+def load_speed() -> dict:
+    return {
+        "speed": db.get_reading_speed_stats(),
+        "activity": db.get_reading_activity(),
+        "velocity": db.get_book_velocity(limit=5),
+    }
+
+
+def load_goal(year: int) -> dict | None:
+    return db.get_reading_goal(year)
+
+
+LOADERS = {
+    "overview": load_overview,
+    "charts": load_charts,
+    "authors": load_authors,
+    "categories": load_categories,
+    "speed": load_speed,
+    "goal": load_goal,
+}
+
+
+# ---------- Önbellek ----------
+
+def _version(tab: str) -> tuple:
+    library_version = db.get_library_version()
+    with _lock:
+        version = (library_version, *(_table_versions.get(table, 0) for table in TAB_TABLES[tab]))
+    if tab in DATED_TABS:
+        version += (date.today(),)
+    return version
+
+
+def peek(tab: str, args: tuple = ()):
+    """Sekmenin güncel verisi önbellekteyse döndürür, yoksa None (hesaplamaz)."""
+    version = _version(tab)
+    with _lock:
+        entry = _cache.get((tab, args))
+    return entry[1] if entry and entry[0] == version else None
+
+
+def get_tab(tab: str, args: tuple = (), force: bool = False):
+    """
+    Sekmenin verisini döndürür: güncelse önbellekten, değilse hesaplayıp saklar.
+    Sürüm hesaplamadan önce okunur; bu arada kitaplık değişirse sonuç bir
+    sonraki istekte yeniden hesaplanır.
+    """
+    version = _version(tab)
+    if not force:
+        with _lock:
+            entry = _cache.get((tab, args))
+        if entry and entry[0] == version:
+            return entry[1]
+
+    data = LOADERS[tab](*args)
+    with _lock:
+        _cache[(tab, args)] = (version, data)
+    return data
@@ -0,0 +1,263 @@
+"""
+Kitaplık Uygulaması - Arka Plan Bilgi Tamamlama
+===============================================
+Sayfa sayısı, yayınevi, dil veya açıklaması eksik kalmış kitapları
+(içe aktarma online arama olmadan yapıldıysa, kaynak o an cevap vermediyse)
+arka planda, düşük öncelikle online kaynaklardan tamamlar.
+
+- Eksik kitaplar idx_books_incomplete kısmi index'i ile bulunur
+- İstekler arasında REQUEST_INTERVAL kadar beklenir (kaynakları yormamak için)
+- Günde en fazla DAILY_BUDGET kitap denenir; sayaç ayarlarda tutulur
+- Her denemenin zamanı kitabın metadata_checked_at alanına yazılır,
+  uygulama kapanıp açılınca kalınan yerden devam edilir
+- Kullanıcı klavye/fare kullanırken iş yapılmaz (notify_activity)
+- Sonuçlar her tur sonunda tek transaction ile yazılır
+
+Kullanım:
+    refresher = MetadataRefresher(on_updated=lambda ids: print(ids))
+    refresher.start()
+    ...
+    refresher.notify_activity()   # kullanıcı bir şey yaptığında
+    refresher.stop()
+"""
+
+import re
+import sys
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import requests
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+from services import book_api
+
+
+# Uygulama açıldıktan sonra ilk tura kadar bekleme (saniye)
+START_DELAY = 30
+
+# Bir turda denenecek kitap sayısı
+BATCH_SIZE = 10
+
+# İki online istek arasındaki en kısa süre (saniye)
+REQUEST_INTERVAL = 2.0
+
+# İki tur arası bekleme (saniye)
+BATCH_INTERVAL = 15
+
+# Günlük en fazla denenecek kitap sayısı
+DAILY_BUDGET = 200
+
+# Kullanıcı son etkileşimden bu kadar saniye sonra "boşta" sayılır
+IDLE_SECONDS = 60
+
+# Eksik kitap kalmadığında tekrar bakma aralığı (saniye)
+RECHECK_INTERVAL = 30 * 60
+
+# İnternet yoksa bekleme: 1 dk'dan başlayıp 1 saate kadar ikiye katlanır
+MIN_BACKOFF = 60
+MAX_BACKOFF = 60 * 60
+
+# Denenmiş ama tamamlanamamış kitap kaç gün sonra tekrar denensin
+RETRY_AFTER_DAYS = 30
+
+
+def _normalize(text: str) -> str:
+    """Başlık/yazar karşılaştırması için sadeleştirir."""
+    return re.sub(r'[^\w\s]', '', (text or "").lower()).strip()
+
+
+def _matches(book, result) -> bool:
+    """
+    Başlık aramasından gelen sonucun gerçekten bu kitap olup olmadığını kontrol eder.
+    Yanlış kitabın bilgilerini yazmaktansa boş bırakmak daha iyi.
+    """
+    if _normalize(book["title"]) != _normalize(result.title):
+        return False
+
+    if book["author"] and result.author:
+        book_words = set(_normalize(book["author"]).split())
+        result_words = set(_normalize(result.author).split())
+        return bool(book_words & result_words)
+
+    return True
+
+
+class MetadataRefresher(threading.Thread):
+    """
+    Eksik kitap bilgilerini arka planda tamamlayan iş parçacığı.
+
+    Args:
+        on_updated: Her tur sonunda güncellenen kitap id'leriyle çağrılır
+                    (arka plan thread'inden; arayüzde sinyal ile kullanılmalı)
+    """
+
+    def __init__(self, on_updated=None, batch_size: int = BATCH_SIZE,
+                 request_interval: float = REQUEST_INTERVAL,
+                 daily_budget: int = DAILY_BUDGET, idle_seconds: float = IDLE_SECONDS):
+        super().__init__(daemon=True, name="MetadataRefresher")
+
+        self.on_updated = on_updated
+        self.batch_size = batch_size
+        self.request_interval = request_interval
+        self.daily_budget = daily_budget
+        self.idle_seconds = idle_seconds
+
+        self._stop_event = threading.Event()
+        self._last_activity = time.monotonic()
+        self._last_request = 0.0
+        self._backoff = MIN_BACKOFF
+
+    # ---------- Dışarıdan çağrılanlar ----------
+
+    def notify_activity(self):
+        """Kullanıcı etkileşimini bildirir (ucuz, her olayda çağrılabilir)."""
+        self._last_activity = time.monotonic()
+
+    def stop(self):
+        """Thread'i durdurur (yarım kalan istek bitince çıkar)."""
+        self._stop_event.set()
+
+    # ---------- Durum ----------
+
+    def is_user_active(self) -> bool:
+        return time.monotonic() - self._last_activity < self.idle_seconds
+
+    def remaining_budget(self) -> int:
+        """Bugün için kalan deneme hakkı."""
+        if db.get_setting("metadata_refresh_date") != date.today().isoformat():
+            return self.daily_budget
+        used = int(db.get_setting("metadata_refresh_used", "0") or 0)
+        return max(0, self.daily_budget - used)
+
+    def _use_budget(self, count: int):
+        today = date.today().isoformat()
+        used = 0
+        if db.get_setting("metadata_refresh_date") == today:
+            used = int(db.get_setting("metadata_refresh_used", "0") or 0)
+        db.set_setting("metadata_refresh_date", today)
+        db.set_setting("metadata_refresh_used", str(used + count))
+
+    # ---------- Ana döngü ----------
+
+    def _wait(self, seconds: float) -> bool:
+        """Bekler; durdurulduysa True döner."""
+        return self._stop_event.wait(seconds)
+
+    def run(self):
+        if self._wait(START_DELAY):
+            return
+
+        while not self._stop_event.is_set():
+            try:
+                delay = self.run_once()
+            except Exception as e:
+                print(f"Bilgi tamamlama hatası: {e}")
+                delay = MAX_BACKOFF
+
+            if self._wait(delay):
+                return
+
+    def run_once(self) -> float:
+        """
+        Bir tur çalıştırır.
+
+        Returns:
+            Bir sonraki tura kadar beklenecek süre (saniye)
+        """
+        # Kullanıcı aktifse boşta kalmasını bekle
+        if self.is_user_active():
+            return max(1.0, self.idle_seconds - (time.monotonic() - self._last_activity))
+
+        budget = self.remaining_budget()
+        if budget <= 0:
+            return RECHECK_INTERVAL
+
+        books = db.get_incomplete_books(min(self.batch_size, budget), RETRY_AFTER_DAYS)
+        if not books:
+            return RECHECK_INTERVAL
+
+        # İnternet yoksa kitapları "denendi" diye işaretleme, bekle
+        if not self._is_online():
+            delay = self._backoff
+            self._backoff = min(self._backoff * 2, MAX_BACKOFF)
+            return delay
+        self._backoff = MIN_BACKOFF
+
+        updates = self.refresh_batch(books)
+        if not updates:
+            return BATCH_INTERVAL
+
+        changed = db.apply_metadata_updates(updates)
+        self._use_budget(len(updates))
+
+        if changed and self.on_updated:
+            self.on_updated(changed)
+
+        return BATCH_INTERVAL
+
+    def refresh_batch(self, books: list) -> dict:
+        """
+        Kitaplar için online bilgi arar.
+        Kullanıcı aktif olursa yarıda keser; sadece denenen kitaplar döner.
+
+        Returns:
+            {book_id: {alan: değer}} - bulunamayanlar için boş sözlük
+        """
+        updates = {}
+
+        # ISBN'i olanlar tek seferde toplu sorgulanır
+        with_isbn = {}
+        for book in books:
+            isbn = book_api.normalize_isbn(book["isbn"])
+            if isbn:
+                with_isbn[book["id"]] = isbn
+
+        if with_isbn:
+            self._throttle()
+            found = book_api.fetch_books_by_isbns(list(with_isbn.values()))
+            for book_id, isbn in with_isbn.items():
+                result = found.get(isbn)
+                updates[book_id] = self._fields_from(result) if result else {}
+
+        # Diğerleri başlıkla, tek tek
+        for book in books:
+            if book["id"] in updates:
+                continue
+            if self._stop_event.is_set() or self.is_user_active():
+                break
+
+            self._throttle()
+            results = book_api.search_google_books(book["title"], "title")
+            match = next((r for r in results if _matches(book, r)), None)
+            updates[book["id"]] = self._fields_from(match) if match else {}
+
+        return updates
+
+    # ---------- Yardımcılar ----------
+
+    def _throttle(self):
+        """İstekler arasında en az request_interval kadar bekler."""
+        wait = self._last_request + self.request_interval - time.monotonic()
+        if wait > 0:
+            self._wait(wait)
+        self._last_request = time.monotonic()
+
+    def _is_online(self) -> bool:
+        """Kaynağa ulaşılabiliyor mu? (hafif HEAD isteği)"""
+        try:
+            requests.head(book_api.BASE_URLS["google"], timeout=5)
+            return True
+        except requests.RequestException:
+            return False
+
+    @staticmethod
+    def _fields_from(result) -> dict:
+        return {
+            "page_count": result.page_count,
+            "publisher": result.publisher,
+            "language": result.language,
+            "description": result.description,
+        }
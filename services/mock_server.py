@@ -0,0 +1,320 @@
+"""
+Kitaplık Uygulaması - Sahte Kitap Kaynakları Sunucusu
+=====================================================
+book_api.py'deki tüm kaynakları (Google Books, Open Library, Kitapyurdu,
+BKM Kitap, 1000Kitap) ve Ollama'yı (/ollama altında: model listesi, akışlı
+yanıt, gömme vektörleri) kayıtlı örnek yanıtlarla taklit eden yerel HTTP sunucusu.
+
+Testler ve ölçümler internete çıkmadan, tekrarlanabilir şekilde çalışır:
+
+    with MockBookServer(latency=0.05, error_rate=0.1) as server:
+        results = book_api.search_books("Suç ve Ceza")
+
+Kayıtlı yanıtlar services/fixtures/ klasöründedir. Yanıtlardaki "{base}"
+ifadesi sunucunun adresiyle değiştirilir (kapak adresleri de yerele düşer).
+
+Komut satırından:
+    python -m services.mock_server              # sunucuyu çalıştır
+    python -m services.mock_server --bench      # çevrimdışı ölçüm yap
+"""
+
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+# Kayıtlı yanıtların klasörü
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Sahte gömme vektörlerinin boyutu (nomic-embed-text ile aynı)
+MOCK_EMBED_DIM = 768
+
+
+def _ollama_embed(body: bytes) -> bytes:
+    """
+    /api/embed taklidi: vektörler hashing vektörleyiciyle üretilir,
+    aynı metin her zaman aynı vektörü alır.
+    """
+    from services.embeddings import HashingEmbedder
+
+    request = json.loads(body or b"{}")
+    texts = request.get("input", [])
+    if isinstance(texts, str):
+        texts = [texts]
+    return json.dumps({
+        "model": request.get("model", ""),
+        "embeddings": HashingEmbedder(MOCK_EMBED_DIM).embed(texts),
+    }).encode()
+
+
+# Yol eşleştirme tablosu: (kaynak, yol regex'i, dosya, içerik tipi)
+# Kaynak adları book_api.DEFAULT_BASE_URLS ile aynıdır ("ollama" hariç).
+# Dosya yerine fonksiyon verilirse yanıt istek gövdesinden üretilir.
+ROUTES = [
+    ("google", r"/books/v1/volumes", "google_volumes.json", "application/json"),
+    ("openlibrary", r"/search\.json", "openlibrary_search.json", "application/json"),
+    ("openlibrary", r"/isbn/[\w\-]+\.json", "openlibrary_isbn.json", "application/json"),
+    ("openlibrary", r"/authors/\w+\.json", "openlibrary_author.json", "application/json"),
+    ("openlibrary", r"/api/books", "openlibrary_books.json", "application/json"),
+    ("openlibrary_covers", r"/b/id/[\w\-]+\.jpg", "cover.jpg", "image/jpeg"),
+    ("kitapyurdu", r"/index\.php", "kitapyurdu_search.html", "text/html; charset=utf-8"),
+    ("bkmkitap", r"/arama", "bkmkitap_search.html", "text/html; charset=utf-8"),
+    ("1000kitap", r"/ara", "1000kitap_search.html", "text/html; charset=utf-8"),
+    ("covers", r"/[\w\-.]+\.jpg", "cover.jpg", "image/jpeg"),
+    ("ollama", r"/api/tags", "ollama_tags.json", "application/json"),
+    ("ollama", r"/api/generate", "ollama_generate.ndjson", "application/x-ndjson"),
+    ("ollama", r"/api/embed", _ollama_embed, "application/json"),
+]
+
+
+def load_fixture(name: str, base_url: str = "") -> bytes:
+    """Kayıtlı yanıtı okur, metin dosyalarında {base} yerine adresi koyar."""
+    data = (FIXTURES_DIR / name).read_bytes()
+    if name.endswith((".json", ".html")):
+        data = data.replace(b"{base}", base_url.encode())
+    return data
+
+
+class _RateLimiter:
+    """Kaynak başına saniyelik istek sınırı (kayan pencere)."""
+
+    def __init__(self, per_second: float):
+        self.per_second = per_second
+        self.hits = {}  # kaynak -> son isteklerin zamanları
+        self.lock = threading.Lock()
+
+    def allow(self, source: str) -> bool:
+        if not self.per_second:
+            return True
+
+        now = time.monotonic()
+        with self.lock:
+            hits = [t for t in self.hits.get(source, []) if now - t < 1.0]
+            if len(hits) >= self.per_second:
+                self.hits[source] = hits
+                return False
+            hits.append(now)
+            self.hits[source] = hits
+            return True
+
+
+class MockBookServer:
+    """
+    Kitap kaynaklarını taklit eden yerel sunucu.
+
+    Args:
+        port: Dinlenecek port (0 = boş bir port seç)
+        latency: Her yanıttan önce beklenecek süre (saniye)
+                 veya (en az, en çok) aralığı
+        error_rate: 500 hatası döndürülecek isteklerin oranı (0-1)
+        rate_limit: Kaynak başına saniyede izin verilen istek (0 = sınırsız),
+                    aşılırsa 429 döner
+        seed: Gecikme ve hata üretimi için rastgele tohum (tekrarlanabilirlik)
+    """
+
+    def __init__(self, port: int = 0, latency=0.0, error_rate: float = 0.0,
+                 rate_limit: float = 0, seed: int = 42):
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limiter = _RateLimiter(rate_limit)
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+
+        # İstatistikler: kaynak -> {"requests": n, "errors": n, "limited": n}
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+
+        self._httpd = None
+        self._thread = None
+        self._previous_base_urls = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        """Sunucuyu arka planda başlatır."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def do_POST(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass  # Konsolu kirletme
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Sunucuyu durdurur."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        """Sunucuyu başlatır, book_api'yi ve Ollama istemcisini ona yönlendirir."""
+        from services import ai_service, book_api
+
+        self.start()
+        self._previous_base_urls = dict(book_api.BASE_URLS)
+        self._previous_ollama_url = ai_service.get_client().base_url
+        book_api.set_base_url(self.base_url)
+        ai_service.set_base_url(f"{self.base_url}/ollama")
+        return self
+
+    def __exit__(self, *exc):
+        from services import ai_service, book_api
+
+        book_api.BASE_URLS.clear()
+        book_api.BASE_URLS.update(self._previous_base_urls)
+        ai_service.set_base_url(self._previous_ollama_url)
+        self.stop()
+
+    def _count(self, source: str, key: str):
+        with self.stats_lock:
+            counts = self.stats.setdefault(source, {"requests": 0, "errors": 0, "limited": 0})
+            counts[key] += 1
+
+    def _delay(self) -> float:
+        if isinstance(self.latency, (tuple, list)):
+            with self.random_lock:
+                return self.random.uniform(*self.latency)
+        return self.latency or 0
+
+    def _should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self.random_lock:
+            return self.random.random() < self.error_rate
+
+    def _route(self, path: str):
+        """Yolu (kaynak, dosya, içerik tipi) üçlüsüne çevirir."""
+        # /kaynak/geri/kalan?sorgu
+        path = path.split("?", 1)[0]
+        source, _, rest = path.lstrip("/").partition("/")
+        rest = "/" + rest
+
+        for route_source, pattern, fixture, content_type in ROUTES:
+            if route_source == source and re.fullmatch(pattern, rest):
+                return source, fixture, content_type
+        return source, None, None
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        source, fixture, content_type = self._route(request.path)
+        self._count(source, "requests")
+
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+
+        if fixture is None:
+            self._send(request, 404, b"not found", "text/plain")
+            return
+
+        if not self.rate_limiter.allow(source):
+            self._count(source, "limited")
+            self._send(request, 429, b"too many requests", "text/plain", {"Retry-After": "1"})
+            return
+
+        if self._should_fail():
+            self._count(source, "errors")
+            self._send(request, 500, b"internal error", "text/plain")
+            return
+
+        if callable(fixture):
+            length = int(request.headers.get("Content-Length") or 0)
+            body = fixture(request.rfile.read(length))
+        else:
+            body = load_fixture(fixture, self.base_url)
+        self._send(request, 200, body, content_type)
+
+    def _send(self, request, status: int, body: bytes, content_type: str, headers: dict = None):
+        try:
+            request.send_response(status)
+            request.send_header("Content-Type", content_type)
+            request.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                request.send_header(key, value)
+            request.end_headers()
+            request.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # İstemci zaman aşımıyla bağlantıyı kapatmış
+
+
+def run_benchmark(rounds: int = 5, latency=0.0):
+    """search_books, ISBN sorgusu ve kapak indirmeyi çevrimdışı ölçer."""
+    import tempfile
+    import database as db
+    from services import book_api, cover_store
+
+    with MockBookServer(latency=latency) as server:
+        # Kapaklar ve kapak deposu kaydı geçici klasöre yazılsın
+        original_covers_dir, original_db_path = cover_store.COVERS_DIR, db.DB_PATH
+        temp_dir = Path(tempfile.mkdtemp(prefix="kitaplik_bench_"))
+        cover_store.COVERS_DIR = temp_dir / "covers"
+        db.DB_PATH = temp_dir / "bench.db"
+        db.init_database()
+
+        try:
+            timings = {}
+
+            def measure(name, func):
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    func()
+                timings[name] = (time.perf_counter() - start) / rounds * 1000
+
+            measure("search_books", lambda: book_api.search_books("Suç ve Ceza"))
+            measure("fetch_book_by_isbn", lambda: book_api.fetch_book_by_isbn("9789753638029"))
+            measure("download_cover", lambda: book_api.download_cover(f"{server.base_url}/covers/x.jpg", "bench"))
+        finally:
+            cover_store.COVERS_DIR, db.DB_PATH = original_covers_dir, original_db_path
+
+        print(f"Sunucu: {server.base_url} (gecikme: {latency}s, {rounds} tur)")
+        for name, ms in timings.items():
+            print(f"  {name:<22} {ms:8.2f} ms")
+        print(f"İstekler: {server.stats}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sahte kitap kaynakları sunucusu")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Yanıt gecikmesi (saniye)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Hata oranı (0-1)")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Kaynak başına saniyelik istek sınırı")
+    parser.add_argument("--bench", action="store_true", help="Çevrimdışı ölçüm yap ve çık")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark(latency=args.latency)
+        sys.exit(0)
+
+    server = MockBookServer(args.port, args.latency, args.error_rate, args.rate_limit).start()
+    print(f"Sahte kaynak sunucusu: {server.base_url}")
+    print(f"Uygulamayı çevrimdışı çalıştırmak için: KITAPLIK_API_BASE={server.base_url} "
+          f"KITAPLIK_OLLAMA_URL={server.base_url}/ollama python main.py")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
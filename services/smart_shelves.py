@@ -0,0 +1,289 @@
+"""
+Kitaplık Uygulaması - Akıllı Raflar
+===================================
+Akıllı raf, üyeleri elle değil kayıtlı bir kurala göre belirlenen raftır:
+
+    {"match": "all", "conditions": [
+        {"field": "status", "op": "=", "value": "read"},
+        {"field": "rating", "op": ">=", "value": 4},
+        {"field": "categories", "op": "contains", "value": "bilim"}
+    ]}
+
+- Kural shelves.rule sütununda JSON olarak saklanır
+- compile_rule() kuralı bir kez Python fonksiyonuna çevirir
+- Üyelik book_shelves'e yazılır: akıllı raf açmak, sayısını göstermek
+  normal raftan farksızdır (aynı index, aynı book_count)
+- Kitap değiştikçe sadece o kitaplar, sadece kuralda geçen alanlar
+  değiştiyse yeniden değerlendirilir; tüm sorgu tekrar çalıştırılmaz
+- Kural değişince (veya açılışta) raf bir kez baştan hesaplanır
+
+Kullanım:
+    evaluator = SmartShelfEvaluator()
+    evaluator.load()
+    db.add_shelf("Sevdiklerim", "🧠", rule={"match": "all", "conditions": [...]})
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+
+
+# Kurallarda kullanılabilen alanlar: alan -> (etiket, tür)
+SMART_FIELDS = {
+    "status": ("Durum", "text"),
+    "rating": ("Puan", "number"),
+    "publish_year": ("Yayın yılı", "number"),
+    "page_count": ("Sayfa sayısı", "number"),
+    "title": ("Başlık", "text"),
+    "author": ("Yazar", "text"),
+    "publisher": ("Yayınevi", "text"),
+    "categories": ("Kategoriler", "text"),
+    "tags": ("Etiketler", "text"),
+    "language": ("Dil", "text"),
+    "format": ("Format", "text"),
+    "series_name": ("Seri", "text"),
+    "translator": ("Çevirmen", "text"),
+    "location": ("Konum", "text"),
+    "is_borrowed": ("Ödünç verildi", "number"),
+    "is_gift": ("Hediye", "number"),
+}
+
+# Operatörler: op -> etiket
+OPERATORS = {
+    "=": "eşittir",
+    "!=": "eşit değil",
+    ">": "büyüktür",
+    ">=": "büyük veya eşit",
+    "<": "küçüktür",
+    "<=": "küçük veya eşit",
+    "contains": "içerir",
+    "not_contains": "içermez",
+    "empty": "boş",
+    "not_empty": "boş değil",
+}
+
+# Değer almayan operatörler
+UNARY_OPERATORS = ("empty", "not_empty")
+
+
+def _fold(value) -> str:
+    """Türkçe büyük/küçük harf duyarsız karşılaştırma (alıntı aramasıyla aynı: İ/I -> i)."""
+    return db.tr_fold(value) or ""
+
+
+def _compile_condition(condition: dict):
+    """Tek koşulu (field, op, value) book -> bool fonksiyonuna çevirir."""
+    field = condition.get("field")
+    op = condition.get("op")
+    value = condition.get("value")
+
+    if field not in SMART_FIELDS:
+        raise ValueError(f"Akıllı rafta kullanılamayan alan: {field}")
+    if op not in OPERATORS:
+        raise ValueError(f"Bilinmeyen operatör: {op}")
+
+    if op == "empty":
+        return lambda book: book[field] in (None, "")
+    if op == "not_empty":
+        return lambda book: book[field] not in (None, "")
+
+    if op in ("contains", "not_contains"):
+        needle = _fold(value)
+        if op == "contains":
+            return lambda book: needle in _fold(book[field])
+        return lambda book: needle not in _fold(book[field])
+
+    # Karşılaştırmalar: sayısal alanlarda sayı, metinlerde büyük/küçük harf duyarsız
+    if SMART_FIELDS[field][1] == "number":
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{SMART_FIELDS[field][0]} için sayı gerekli: {value!r}")
+        convert = float
+    else:
+        value = _fold(value)
+        convert = _fold
+
+    def compare(book):
+        current = book[field]
+        if current in (None, ""):
+            return op == "!="
+        try:
+            current = convert(current)
+        except (TypeError, ValueError):
+            return False
+        if op == "=":
+            return current == value
+        if op == "!=":
+            return current != value
+        if op == ">":
+            return current > value
+        if op == ">=":
+            return current >= value
+        if op == "<":
+            return current < value
+        return current <= value
+
+    return compare
+
+
+def compile_rule(rule: dict) -> tuple:
+    """
+    Kuralı derler.
+
+    Returns:
+        (predicate, fields): predicate(book) -> bool, fields kuralda geçen alanlar
+
+    Raises:
+        ValueError: Kural geçersizse
+    """
+    conditions = rule.get("conditions") or []
+    if not conditions:
+        raise ValueError("Akıllı rafın en az bir koşulu olmalı")
+
+    checks = [_compile_condition(condition) for condition in conditions]
+    fields = sorted({condition["field"] for condition in conditions})
+
+    if rule.get("match", "all") == "any":
+        return (lambda book: any(check(book) for check in checks)), fields
+    return (lambda book: all(check(book) for check in checks)), fields
+
+
+def describe_rule(rule: dict) -> str:
+    """Kuralın okunur özeti (araç ipucu için)."""
+    parts = []
+    for condition in rule.get("conditions") or []:
+        label = SMART_FIELDS.get(condition.get("field"), (condition.get("field"),))[0]
+        text = f"{label} {OPERATORS.get(condition.get('op'), condition.get('op'))}"
+        if condition.get("op") not in UNARY_OPERATORS:
+            text += f" {condition.get('value')}"
+        parts.append(text)
+    joiner = " veya " if rule.get("match") == "any" else " ve "
+    return joiner.join(parts)
+
+
+class SmartShelfEvaluator:
+    """
+    Akıllı rafların üyeliğini güncel tutar.
+
+    database.subscribe ile kitap değişikliklerini dinler; değişen kitapları
+    derlenmiş kurallarla değerlendirip book_shelves'e sadece farkı yazar.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rules = {}     # shelf_id -> (predicate, fields)
+        self._members = {}   # shelf_id -> üye kitap id'leri
+        self._subscribed = False
+
+    # ---------- Yükleme ----------
+
+    def load(self):
+        """Akıllı rafları okur, üyeliklerini doğrular ve değişikliklere abone olur."""
+        with self._lock:
+            self._rules = {}
+            self._members = {}
+            for shelf in db.get_smart_shelves():
+                self._load_shelf(shelf)
+
+        if not self._subscribed:
+            db.subscribe(self.apply_change)
+            self._subscribed = True
+
+    def close(self):
+        """Değişiklik aboneliğini bırakır."""
+        if self._subscribed:
+            db.unsubscribe(self.apply_change)
+            self._subscribed = False
+
+    def _load_shelf(self, shelf):
+        """Rafın kuralını derler ve üyeliği baştan hesaplar."""
+        try:
+            self._rules[shelf["id"]] = compile_rule(shelf["rule"])
+        except ValueError as e:
+            print(f"Akıllı raf kuralı geçersiz ({shelf['name']}): {e}")
+            self._rules.pop(shelf["id"], None)
+            self._members.pop(shelf["id"], None)
+            return
+
+        current = db.BookQuery(["id"]).shelf(shelf["id"]).fetch()
+        self._members[shelf["id"]] = {book["id"] for book in current}
+        self.rebuild(shelf["id"])
+
+    # ---------- Değerlendirme ----------
+
+    def rebuild(self, shelf_id: int):
+        """Rafı tüm kitaplar üzerinden baştan hesaplar (kural değişince)."""
+        with self._lock:
+            if shelf_id not in self._rules:
+                return
+            predicate, fields = self._rules[shelf_id]
+            books = db.get_book_rows(["id"] + fields)
+            wanted = {book["id"] for book in books if predicate(book)}
+            self._apply(shelf_id, wanted - self._members[shelf_id],
+                        self._members[shelf_id] - wanted)
+
+    def _evaluate(self, book_ids: list, columns=None):
+        """Değişen kitapları, kuralı o alanlara bağlı raflar için değerlendirir."""
+        with self._lock:
+            shelves = [
+                shelf_id for shelf_id, (_, fields) in self._rules.items()
+                if not columns or set(columns) & set(fields)
+            ]
+            if not shelves:
+                return
+
+            fields = sorted({field for shelf_id in shelves for field in self._rules[shelf_id][1]})
+            books = db.get_book_rows(["id"] + fields, book_ids)
+
+            for shelf_id in shelves:
+                predicate = self._rules[shelf_id][0]
+                members = self._members[shelf_id]
+                added, removed = set(), set()
+                for book in books:
+                    matches = predicate(book)
+                    if matches and book["id"] not in members:
+                        added.add(book["id"])
+                    elif not matches and book["id"] in members:
+                        removed.add(book["id"])
+                self._apply(shelf_id, added, removed)
+
+    def _apply(self, shelf_id: int, added: set, removed: set):
+        """Üyelik farkını veritabanına yazar (bildirimleri bulk_* fonksiyonları yapar)."""
+        members = self._members[shelf_id]
+        if added:
+            db.bulk_add_to_shelf(sorted(added), shelf_id)
+            members |= added
+        if removed:
+            db.bulk_remove_from_shelf(sorted(removed), shelf_id)
+            members -= removed
+
+    # ---------- Değişiklikler ----------
+
+    def apply_change(self, table: str, op: str, ids: list, columns):
+        """database.notify_change aboneliği."""
+        if table == "books":
+            if op == "delete":
+                # Bağlantıları tetikleyici siler, burada sadece bellek güncellenir
+                with self._lock:
+                    for members in self._members.values():
+                        members.difference_update(ids)
+            else:
+                self._evaluate(ids, columns if op == "update" else None)
+
+        elif table == "shelves":
+            with self._lock:
+                for shelf_id in ids:
+                    if op == "delete":
+                        self._rules.pop(shelf_id, None)
+                        self._members.pop(shelf_id, None)
+                    elif op == "insert" or not columns or "rule" in columns:
+                        shelves = db.get_smart_shelves([shelf_id])
+                        if shelves:
+                            self._load_shelf(shelves[0])
+                        else:
+                            self._rules.pop(shelf_id, None)
+                            self._members.pop(shelf_id, None)
@@ -0,0 +1,286 @@
+"""
+Kitaplık Uygulaması - Yıllık Özet
+=================================
+Bir yılın okuma özetini hazırlar.
+
+- O yıl bitirilen kitaplar tek sorguda okunur (status + finish_date aralığı,
+  idx_books_status_finish); aylık/haftalık dağılım, yazar/kategori/format
+  sıralamaları, en uzun/kısa okumalar ve kapak kolajı tek geçişte hesaplanır
+- Sonuç yıl başına JSON olarak saklanır (assets/reviews/<yıl>.json); o yılın
+  verisi (db.get_year_fingerprint) değişmedikçe yeniden hesaplanmaz
+- HTML olarak dışa aktarılır (tek dosya, kapaklar dosya adresiyle)
+
+Arayüz bu fonksiyonları arka plan thread'inde çağırır.
+
+Kullanım:
+    review = get_review(2024)
+    export_html(review, Path("2024-ozet.html"))
+"""
+
+import html
+import json
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+
+
+# Hesaplama biçimi değişince artırılır (kayıtlı özetler geçersiz olur)
+REVIEW_VERSION = "1"
+
+REVIEW_DIR = Path(__file__).parent.parent / "assets" / "reviews"
+
+# Sıralamalarda gösterilen kayıt sayısı
+TOP_LIMIT = 5
+
+# Yılın alıntıları ve kapak kolajındaki en fazla kayıt
+QUOTES_LIMIT = 5
+COLLAGE_LIMIT = 36
+
+REVIEW_COLUMNS = [
+    "id", "title", "author", "page_count", "rating", "format",
+    "categories", "cover_path", "start_date", "finish_date",
+]
+
+MONTH_NAMES = ["Oca", "Şub", "Mar", "Nis", "May", "Haz",
+               "Tem", "Ağu", "Eyl", "Eki", "Kas", "Ara"]
+
+FORMAT_LABELS = {
+    "paperback": "Karton Kapak",
+    "hardcover": "Ciltli",
+    "ebook": "E-Kitap",
+    "audiobook": "Sesli Kitap",
+}
+
+_lock = threading.Lock()
+
+
+def _parse_date(value: str):
+    try:
+        return date.fromisoformat((value or "")[:10])
+    except ValueError:
+        return None
+
+
+def build_review(year: int) -> dict:
+    """Yılın özetini hesaplar (önbelleğe bakmadan)."""
+    months = [{"month": m, "books": 0, "pages": 0} for m in range(1, 13)]
+    weeks = {}
+    authors = Counter()
+    categories = Counter()
+    formats = Counter()
+    reads = []  # (gün, kitap) başlama tarihi olanlar
+    rated = []
+    collage = []
+    total_pages = 0
+    ratings = []
+
+    books = db.get_books_finished_in(year, REVIEW_COLUMNS)
+    for book in books:
+        finished = _parse_date(book["finish_date"])
+        pages = book["page_count"] or 0
+        total_pages += pages
+
+        if finished:
+            months[finished.month - 1]["books"] += 1
+            months[finished.month - 1]["pages"] += pages
+            week = int(finished.strftime("%W"))
+            weeks[week] = weeks.get(week, 0) + 1
+
+        if book["author"]:
+            authors[book["author"]] += 1
+        for category in (book["categories"] or "").split(","):
+            if category.strip():
+                categories[category.strip()] += 1
+        formats[FORMAT_LABELS.get(book["format"] or "paperback", book["format"])] += 1
+
+        if book["rating"]:
+            ratings.append(book["rating"])
+            rated.append(book)
+
+        started = _parse_date(book["start_date"])
+        if started and finished and finished >= started:
+            reads.append(((finished - started).days + 1, book))
+
+        if book["cover_path"] and len(collage) < COLLAGE_LIMIT and os.path.exists(book["cover_path"]):
+            collage.append({"id": book["id"], "title": book["title"], "cover_path": book["cover_path"]})
+
+    def summary(book, **extra) -> dict:
+        return {"id": book["id"], "title": book["title"], "author": book["author"],
+                "pages": book["page_count"], **extra}
+
+    reads.sort(key=lambda item: (item[0], item[1]["title"]))
+    rated.sort(key=lambda book: (-book["rating"], book["title"]))
+
+    # Okuma oturumları (tetikleyicilerle tutulan hafta/ay toplamlarından)
+    week_pages = {int(row["key"][-2:]): row["pages"]
+                  for row in db.get_reading_series("week", f"{year}-W00", f"{year}-W53")}
+    session_months = db.get_reading_series("month", f"{year}-01", f"{year}-12")
+
+    return {
+        "version": REVIEW_VERSION,
+        "year": year,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "total_books": len(books),
+        "total_pages": total_pages,
+        "avg_pages_per_book": round(total_pages / len(books)) if books else 0,
+        "avg_rating": round(sum(ratings) / len(ratings), 1) if ratings else 0,
+        "monthly": months,
+        "weekly": [
+            {"week": week, "books": weeks.get(week, 0), "pages": week_pages.get(week, 0)}
+            for week in range(54)
+        ],
+        "session_pages": sum(row["pages"] for row in session_months),
+        "session_minutes": sum(row["minutes"] for row in session_months),
+        "top_authors": [{"author": name, "count": count} for name, count in authors.most_common(TOP_LIMIT)],
+        "top_categories": [{"category": name, "count": count} for name, count in categories.most_common(TOP_LIMIT)],
+        "formats": [{"format": name, "count": count} for name, count in formats.most_common()],
+        "top_rated": [summary(book, rating=book["rating"]) for book in rated[:TOP_LIMIT]],
+        "longest_reads": [summary(book, days=days) for days, book in reversed(reads[-TOP_LIMIT:])],
+        "shortest_reads": [summary(book, days=days) for days, book in reads[:TOP_LIMIT]],
+        "quotes": [
+            {"text": quote["text"], "page": quote["page_number"], "favorite": bool(quote["is_favorite"]),
+             "title": quote["book_title"], "author": quote["book_author"]}
+            for quote in db.get_quotes_of_year(year, QUOTES_LIMIT)
+        ],
+        "collage": collage,
+    }
+
+
+def _review_path(year: int) -> Path:
+    return REVIEW_DIR / f"{year}.json"
+
+
+def get_review(year: int, force: bool = False) -> dict:
+    """
+    Yılın özetini döndürür: kayıtlı özet güncelse dosyadan, değilse hesaplayıp kaydeder.
+    force=True: her durumda yeniden hesaplanır.
+    """
+    fingerprint = f"{REVIEW_VERSION}|{db.get_year_fingerprint(year)}"
+    path = _review_path(year)
+
+    with _lock:
+        if not force and path.exists():
+            try:
+                cached = json.loads(path.read_text(encoding="utf-8"))
+                if cached.get("fingerprint") == fingerprint:
+                    return cached
+            except (OSError, ValueError):
+                pass
+
+        review = build_review(year)
+        review["fingerprint"] = fingerprint
+
+        # Yarım yazılmış dosya okunmasın: önce geçici dosyaya
+        REVIEW_DIR.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".json.part")
+        temp_path.write_text(json.dumps(review, ensure_ascii=False, indent=1), encoding="utf-8")
+        temp_path.replace(path)
+        return review
+
+
+def _bars(rows: list, label, value: str) -> str:
+    """Yatay çubuklar (en büyük değer tam genişlik)."""
+    top = max((row[value] for row in rows), default=0) or 1
+    return "".join(
+        f'<div class="bar"><span class="label">{html.escape(str(label(row)))}</span>'
+        f'<span class="fill" style="width:{row[value] * 100 / top:.0f}%"></span>'
+        f'<span class="value">{row[value]}</span></div>'
+        for row in rows
+    )
+
+
+def _book_list(books: list, extra) -> str:
+    return "<ol>" + "".join(
+        f"<li><b>{html.escape(book['title'])}</b> – {html.escape(book['author'] or '?')} "
+        f"<small>{html.escape(extra(book))}</small></li>"
+        for book in books
+    ) + "</ol>"
+
+
+def render_html(review: dict) -> str:
+    """Özeti tek dosyalık HTML sayfasına çevirir."""
+    year = review["year"]
+    total_pages = f"{review['total_pages']:,}".replace(",", ".")
+    sections = [
+        f"<h1>📚 {year} Yılı Okuma Özeti</h1>",
+        '<div class="cards">'
+        f"<div><b>{review['total_books']}</b>kitap</div>"
+        f"<div><b>{total_pages}</b>sayfa</div>"
+        f"<div><b>{review['avg_pages_per_book']}</b>sayfa/kitap</div>"
+        f"<div><b>{review['avg_rating'] or '-'}</b>ort. puan</div>"
+        "</div>",
+        "<h2>📅 Aylık</h2>",
+        _bars(review["monthly"], lambda row: MONTH_NAMES[row["month"] - 1], "books"),
+    ]
+
+    if review["session_pages"]:
+        active_weeks = [row for row in review["weekly"] if row["pages"]]
+        sections += [
+            f"<h2>⏱️ Haftalık Okuma ({review['session_pages']} sayfa, "
+            f"{round(review['session_minutes'] / 60, 1)} saat)</h2>",
+            _bars(active_weeks, lambda row: f"{row['week']}. hafta", "pages"),
+        ]
+    if review["top_authors"]:
+        sections += ["<h2>✍️ Yazarlar</h2>", _bars(review["top_authors"], lambda row: row["author"], "count")]
+    if review["top_categories"]:
+        sections += ["<h2>🏷️ Kategoriler</h2>",
+                     _bars(review["top_categories"], lambda row: row["category"], "count")]
+    if review["formats"]:
+        sections += ["<h2>📦 Formatlar</h2>", _bars(review["formats"], lambda row: row["format"], "count")]
+    if review["top_rated"]:
+        sections += ["<h2>⭐ En Yüksek Puanlılar</h2>",
+                     _book_list(review["top_rated"], lambda book: "⭐" * book["rating"])]
+    if review["longest_reads"]:
+        sections += [
+            "<h2>🐢 En Uzun Okumalar</h2>",
+            _book_list(review["longest_reads"], lambda book: f"{book['days']} gün, {book['pages'] or '?'} sayfa"),
+            "<h2>⚡ En Kısa Okumalar</h2>",
+            _book_list(review["shortest_reads"], lambda book: f"{book['days']} gün, {book['pages'] or '?'} sayfa"),
+        ]
+    if review["quotes"]:
+        sections.append("<h2>💬 Yılın Alıntıları</h2>")
+        sections += [
+            f"<blockquote>{'⭐ ' if quote['favorite'] else ''}{html.escape(quote['text'])}"
+            f"<cite>{html.escape(quote['title'])}"
+            f"{' – ' + html.escape(quote['author']) if quote['author'] else ''}"
+            f"{', s. ' + str(quote['page']) if quote['page'] else ''}</cite></blockquote>"
+            for quote in review["quotes"]
+        ]
+    if review["collage"]:
+        sections.append("<h2>🖼️ Kapaklar</h2><div class=\"collage\">" + "".join(
+            f'<img src="{Path(item["cover_path"]).resolve().as_uri()}" title="{html.escape(item["title"])}">'
+            for item in review["collage"]
+        ) + "</div>")
+
+    return f"""<!DOCTYPE html>
+<html lang="tr"><head><meta charset="utf-8"><title>{year} Okuma Özeti</title>
+<style>
+body {{ font-family: sans-serif; max-width: 860px; margin: 2em auto; color: #222; }}
+.cards {{ display: flex; gap: 1em; }}
+.cards div {{ flex: 1; background: #f2f2f2; border-radius: 8px; padding: 1em; text-align: center; }}
+.cards b {{ display: block; font-size: 2em; }}
+.bar {{ display: flex; align-items: center; gap: .5em; margin: .2em 0; }}
+.bar .label {{ width: 12em; overflow: hidden; white-space: nowrap; text-overflow: ellipsis; }}
+.bar .fill {{ height: 1em; background: #0078D4; border-radius: 3px; min-width: 2px; }}
+blockquote {{ border-left: 4px solid #0078D4; margin: 1em 0; padding: .5em 1em; background: #f7f7f7; }}
+cite {{ display: block; margin-top: .5em; color: #666; }}
+.collage img {{ width: 80px; height: 120px; object-fit: cover; margin: 2px; border-radius: 3px; }}
+</style></head>
+<body>
+{"".join(sections)}
+<p><small>Oluşturulma: {review["generated_at"]}</small></p>
+</body></html>
+"""
+
+
+def export_html(review: dict, path) -> Path:
+    """Özeti HTML dosyasına yazar."""
+    path = Path(path)
+    path.write_text(render_html(review), encoding="utf-8")
+    return path
@@ -0,0 +1,298 @@
+"""
+Kitaplık Uygulaması - Yedekleme Dialog
+======================================
+Yedekleri listeler; yeni yedek alır, seçileni geri yükler veya siler.
+Yedekleme ve geri yükleme arka planda çalışır (services/backup.py),
+ilerleme çubukta gösterilir.
+"""
+
+import threading
+from datetime import datetime
+
+from PyQt6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QPushButton,
+    QCheckBox,
+    QComboBox,
+    QProgressBar,
+    QHeaderView,
+    QAbstractItemView,
+    QMessageBox,
+)
+from PyQt6.QtCore import QThread, pyqtSignal
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+from services import backup
+
+
+# Otomatik yedekleme sıklığı seçenekleri: (saat, etiket)
+INTERVAL_CHOICES = [
+    (0, "Kapalı"),
+    (6, "6 saatte bir"),
+    (24, "Günde bir"),
+    (24 * 7, "Haftada bir"),
+]
+
+REASON_LABELS = {
+    "manual": "Elle",
+    "auto": "Otomatik",
+    "pre-restore": "Geri yükleme öncesi",
+}
+
+
+class BackupThread(QThread):
+    """Yedekleme veya geri yüklemeyi arka planda çalıştırır."""
+    
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(dict)
+    error = pyqtSignal(str)
+    
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+    
+    def run(self):
+        try:
+            result = self.func(*self.args, on_progress=self.progress.emit, **self.kwargs)
+            self.finished.emit(result)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class BackupDialog(QDialog):
+    """
+    Yedekleme dialog'u.
+    
+    Geri yükleme başarılı olursa restored sinyali gönderilir
+    (ana pencere bellekteki görüntüleri yeniden yükler).
+    """
+    
+    restored = pyqtSignal()
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker = None
+        self.cancel_event = None
+        self.snapshots = []
+        
+        self.setWindowTitle("💾 Yedekleme")
+        self.setMinimumSize(720, 460)
+        self.setModal(True)
+        
+        self.setup_ui()
+        self.load_snapshots()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        self.info_label = QLabel("")
+        self.info_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(self.info_label)
+        
+        self.table = QTableWidget()
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["Tarih", "Tür", "Kitap", "Boyut", "Kapak"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.itemSelectionChanged.connect(self.update_buttons)
+        layout.addWidget(self.table)
+        
+        # Ayarlar
+        settings_layout = QHBoxLayout()
+        
+        self.covers_check = QCheckBox("🖼️ Kapakları da yedekle")
+        self.covers_check.setChecked(db.get_setting(backup.COVERS_KEY, "1") == "1")
+        self.covers_check.toggled.connect(
+            lambda checked: db.set_setting(backup.COVERS_KEY, "1" if checked else "0")
+        )
+        settings_layout.addWidget(self.covers_check)
+        
+        settings_layout.addStretch()
+        settings_layout.addWidget(QLabel("Otomatik yedek:"))
+        self.interval_combo = QComboBox()
+        current = float(db.get_setting(backup.INTERVAL_KEY, str(backup.DEFAULT_INTERVAL_HOURS)) or 0)
+        for hours, label in INTERVAL_CHOICES:
+            self.interval_combo.addItem(label, hours)
+            if hours == current:
+                self.interval_combo.setCurrentIndex(self.interval_combo.count() - 1)
+        self.interval_combo.currentIndexChanged.connect(
+            lambda: db.set_setting(backup.INTERVAL_KEY, str(self.interval_combo.currentData()))
+        )
+        settings_layout.addWidget(self.interval_combo)
+        
+        layout.addLayout(settings_layout)
+        
+        # İlerleme
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #808080;")
+        layout.addWidget(self.status_label)
+        
+        # Butonlar
+        btn_layout = QHBoxLayout()
+        
+        self.backup_btn = QPushButton("💾 Şimdi Yedekle")
+        self.backup_btn.clicked.connect(self.start_backup)
+        btn_layout.addWidget(self.backup_btn)
+        
+        self.cancel_btn = QPushButton("⏹ Durdur")
+        self.cancel_btn.clicked.connect(self.cancel_backup)
+        self.cancel_btn.setVisible(False)
+        btn_layout.addWidget(self.cancel_btn)
+        
+        self.restore_btn = QPushButton("♻️ Geri Yükle")
+        self.restore_btn.clicked.connect(self.start_restore)
+        btn_layout.addWidget(self.restore_btn)
+        
+        self.delete_btn = QPushButton("🗑️ Sil")
+        self.delete_btn.clicked.connect(self.delete_snapshot)
+        btn_layout.addWidget(self.delete_btn)
+        
+        btn_layout.addStretch()
+        
+        close_btn = QPushButton("Kapat")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        
+        layout.addLayout(btn_layout)
+    
+    def load_snapshots(self):
+        self.snapshots = backup.list_snapshots()
+        
+        self.table.setRowCount(len(self.snapshots))
+        for i, manifest in enumerate(self.snapshots):
+            created = datetime.fromisoformat(manifest["created_at"]).strftime("%d.%m.%Y %H:%M")
+            cells = [
+                created,
+                REASON_LABELS.get(manifest.get("reason"), manifest.get("reason", "")),
+                str(manifest.get("books", "")),
+                f"{manifest.get('size', 0) / 1024 / 1024:.1f} MB",
+                str(len(manifest.get("covers", {}))),
+            ]
+            for j, text in enumerate(cells):
+                self.table.setItem(i, j, QTableWidgetItem(text))
+        
+        last = backup.last_backup_time()
+        self.info_label.setText(
+            f"💾 {len(self.snapshots)} yedek · son yedek: "
+            + (last.strftime("%d.%m.%Y %H:%M") if last else "hiç alınmadı")
+        )
+        self.update_buttons()
+    
+    def selected_snapshot(self):
+        rows = self.table.selectionModel().selectedRows()
+        return self.snapshots[rows[0].row()] if rows else None
+    
+    def update_buttons(self):
+        busy = self.worker is not None
+        selected = self.selected_snapshot() is not None
+        self.backup_btn.setEnabled(not busy)
+        self.restore_btn.setEnabled(not busy and selected)
+        self.delete_btn.setEnabled(not busy and selected)
+    
+    def set_busy(self, busy: bool):
+        self.progress_bar.setVisible(busy)
+        self.progress_bar.setValue(0)
+        if not busy:
+            self.worker = None
+            self.cancel_btn.setVisible(False)
+        self.update_buttons()
+    
+    def on_progress(self, percent: int, message: str):
+        self.progress_bar.setValue(percent)
+        self.status_label.setText(message)
+    
+    # ---------- Yedekleme ----------
+    
+    def start_backup(self):
+        self.cancel_event = threading.Event()
+        self.worker = BackupThread(
+            backup.create_snapshot,
+            include_covers=self.covers_check.isChecked(),
+            cancel=self.cancel_event,
+        )
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_backup_finished)
+        self.worker.error.connect(self.on_error)
+        self.set_busy(True)
+        self.cancel_btn.setVisible(True)
+        self.worker.start()
+    
+    def cancel_backup(self):
+        if self.cancel_event:
+            self.cancel_event.set()
+    
+    def on_backup_finished(self, manifest: dict):
+        self.set_busy(False)
+        self.status_label.setText(f"✅ Yedek alındı: {Path(manifest['path']).name}")
+        self.load_snapshots()
+    
+    def on_error(self, message: str):
+        self.set_busy(False)
+        self.status_label.setText(f"❌ {message}")
+    
+    # ---------- Geri yükleme ----------
+    
+    def start_restore(self):
+        manifest = self.selected_snapshot()
+        if not manifest:
+            return
+        
+        created = datetime.fromisoformat(manifest["created_at"]).strftime("%d.%m.%Y %H:%M")
+        reply = QMessageBox.question(
+            self, "Geri Yükle",
+            f"{created} tarihli yedek ({manifest.get('books')} kitap) geri yüklenecek.\n"
+            "Mevcut kitaplığın yedeği önce otomatik olarak alınır.\n\nDevam edilsin mi?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        self.worker = BackupThread(backup.restore_snapshot, manifest)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_restore_finished)
+        self.worker.error.connect(self.on_error)
+        self.set_busy(True)
+        self.worker.start()
+    
+    def on_restore_finished(self, result: dict):
+        self.set_busy(False)
+        self.status_label.setText(f"✅ Geri yüklendi: {result['books']} kitap")
+        self.load_snapshots()
+        self.restored.emit()
+    
+    def delete_snapshot(self):
+        manifest = self.selected_snapshot()
+        if not manifest:
+            return
+        reply = QMessageBox.question(
+            self, "Sil", "Seçili yedek silinsin mi?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            backup.delete_snapshot(manifest)
+            self.load_snapshots()
+    
+    def reject(self):
+        """Yedekleme sürerken kapatılmasın (Esc dahil)."""
+        if self.worker is None:
+            super().reject()
+    
+    def accept(self):
+        if self.worker is None:
+            super().accept()
@@ -234,8 +234,7 @@ class SearchBookDialog(QDialog):
             return
         
         if self.selected_book.cover_url:
-            identifier = self.selected_book.isbn or self.selected_book.title[:20].replace(" ", "_")
-            self.cover_path = download_cover(self.selected_book.cover_url, identifier)
+            self.cover_path = download_cover(self.selected_book.cover_url)
         
         self.accept()
     
@@ -793,22 +792,15 @@ class ManualBookDialog(QDialog):
         )
         
         if file_path:
-            # Kapağı assets/covers klasörüne kopyala
-            import shutil
-            from pathlib import Path
+            # Kapağı kapak deposuna kaydet (aynı görsel tekrar kopyalanmaz)
+            from services.cover_store import store_cover_file
             
-            covers_dir = Path(__file__).parent.parent / "assets" / "covers"
-            covers_dir.mkdir(parents=True, exist_ok=True)
+            cover_path = store_cover_file(file_path)
+            if not cover_path:
+                QMessageBox.warning(self, "Uyarı", "Seçilen dosya geçerli bir görsel değil!")
+                return
             
-            # Benzersiz dosya adı
-            import hashlib
-            file_hash = hashlib.md5(file_path.encode()).hexdigest()[:12]
-            ext = Path(file_path).suffix or ".jpg"
-            dest_path = covers_dir / f"{file_hash}{ext}"
-            
-            shutil.copy2(file_path, dest_path)
-            
-            self.cover_path = str(dest_path)
+            self.cover_path = cover_path
             self.show_cover(self.cover_path)
     
     def remove_cover(self):
@@ -1021,10 +1013,8 @@ class CoverSearchDialog(QDialog):
         
         # Kapağı indir
         from services.book_api import download_cover
-        import hashlib
         
-        identifier = book_info.get("isbn") or hashlib.md5(cover_url.encode()).hexdigest()[:12]
-        cover_path = download_cover(cover_url, identifier)
+        cover_path = download_cover(cover_url)
         
         if cover_path:
             self.selected_cover_path = cover_path
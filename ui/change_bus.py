@@ -0,0 +1,45 @@
+"""
+Kitaplık Uygulaması - Değişiklik Veri Yolu
+==========================================
+database.py'nin değişiklik bildirimlerini Qt sinyaline çevirir.
+
+Bildirimler yazma işlemini yapan thread'den gelir (örn. arka plan bilgi
+tamamlayıcısı). Sinyal ana thread'deki alıcılara Qt tarafından sıraya
+alınarak iletilir, böylece widget'lar güvenle güncellenebilir.
+
+Kullanım:
+    from ui.change_bus import change_bus
+    change_bus.changed.connect(self.on_data_changed)
+    
+    def on_data_changed(self, table, op, ids, columns): ...
+"""
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+
+
+class ChangeBus(QObject):
+    """
+    Veritabanı değişikliklerini yayınlayan nesne.
+    
+    Signals:
+        changed(str, str, list, object): (tablo, işlem, id'ler, sütunlar)
+            sütunlar None ise tüm satır değişmiş kabul edilir
+    """
+    
+    changed = pyqtSignal(str, str, list, object)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        db.subscribe(self._on_change)
+    
+    def _on_change(self, table, op, ids, columns):
+        self.changed.emit(table, op, ids, columns)
+
+
+# Uygulama genelinde tek örnek
+change_bus = ChangeBus()
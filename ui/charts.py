@@ -0,0 +1,567 @@
+"""
+Kitaplık Uygulaması - Grafikler
+===============================
+İstatistik penceresindeki grafik widget'ları.
+
+- Yerleşim (çubuk, dilim, hücre koordinatları) veri veya boyut değişince
+  bir kez hesaplanır; paintEvent sadece hazır görüntüyü kopyalar
+- Çizilen görüntü (QImage) boyut, piksel oranı ve temaya göre önbelleklenir
+- Çok noktalı grafikler (günlük ısı haritası, çok yıllık seriler) arka plan
+  thread'inde QImage'e çizilir; hazır olana kadar önceki görüntü gösterilir
+- Yazar/kategori listeleri satır başına widget yerine tek widget'ta çizilir,
+  sadece görünen satırlar boyanır
+
+Kullanım:
+    chart = BarChart(theme="dark")
+    chart.set_data([("Oca", 3), ("Şub", 5)])
+    heatmap = HeatmapChart(unit="sayfa")
+    heatmap.set_data({"2024-05-01": 40}, date(2024, 1, 1), date(2024, 12, 31))
+"""
+
+import math
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from PyQt6.QtWidgets import QWidget, QToolTip, QSizePolicy
+from PyQt6.QtCore import Qt, QRectF, QEvent, QThread, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor, QPen, QImage
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from ui.themes import COLORS
+
+
+# Pasta grafik ve renkli liste satırları için renkler
+PALETTE = [
+    "#0078D4", "#00B294", "#FFB900", "#E81123", "#8764B8",
+    "#00BCF2", "#107C10", "#FF8C00", "#5C2D91", "#038387"
+]
+
+# Grafik başına saklanan çizim sayısı (boyut/tema değişip geri dönünce yeniden çizilmez)
+IMAGE_CACHE_SIZE = 4
+
+# Etiket genişliği tahmini için ortalama karakter genişliği (piksel)
+CHAR_WIDTH = 7
+
+MONTH_NAMES = ["Oca", "Şub", "Mar", "Nis", "May", "Haz",
+               "Tem", "Ağu", "Eyl", "Eki", "Kas", "Ara"]
+
+# Arka planda çizilen grafiklerin thread'leri (bitene kadar referans tutulur)
+_threads = set()
+
+
+def theme_colors(theme: str) -> dict:
+    return dict(COLORS.get(theme, COLORS["dark"]))
+
+
+def mix_colors(start: str, end: str, ratio: float) -> QColor:
+    """İki renk arasında doğrusal geçiş (ratio 0 → start, 1 → end)."""
+    a, b = QColor(start), QColor(end)
+    return QColor(
+        round(a.red() + (b.red() - a.red()) * ratio),
+        round(a.green() + (b.green() - a.green()) * ratio),
+        round(a.blue() + (b.blue() - a.blue()) * ratio),
+    )
+
+
+def render_chart(chart_cls, data, width: int, height: int, ratio: float, colors: dict) -> tuple:
+    """
+    Grafiği QImage'e çizer: (layout, image).
+    Widget'a dokunmaz; arka plan thread'inde de çağrılabilir.
+    """
+    layout = chart_cls.build_layout(data, width, height)
+    image = QImage(max(1, round(width * ratio)), max(1, round(height * ratio)),
+                   QImage.Format.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(ratio)
+    image.fill(Qt.GlobalColor.transparent)
+    
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    chart_cls.draw(painter, layout, colors)
+    painter.end()
+    return layout, image
+
+
+def wait_for_renders():
+    """Süren arka plan çizimlerini bekler (pencere kapanırken)."""
+    for thread in list(_threads):
+        thread.wait()
+
+
+class ChartThread(QThread):
+    """Grafiği arka planda çizer; sonuç istendiği anahtarla döner."""
+    
+    rendered = pyqtSignal(object, object)
+    error = pyqtSignal(str)
+    
+    def __init__(self, key, func, *args):
+        super().__init__()
+        self.key = key
+        self.func = func
+        self.args = args
+    
+    def run(self):
+        try:
+            self.rendered.emit(self.key, self.func(*self.args))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class Chart(QWidget):
+    """
+    Önbellekli grafik tabanı.
+    
+    Alt sınıflar build_layout() (veri + boyut → yerleşim) ve draw() (yerleşim → çizim)
+    yazar; ikisi de statik olduğundan arka plan thread'inde çalışabilir.
+    hit_test() yerleşimden ipucu metni bulur.
+    """
+    
+    # Bu kadar noktadan büyük veri arka planda çizilir
+    ASYNC_POINTS = 2000
+    
+    def __init__(self, parent=None, theme: str = "dark"):
+        super().__init__(parent)
+        self.data = []
+        self.theme = theme
+        self._version = 0
+        self._images = OrderedDict()  # anahtar -> (layout, image)
+        self._shown = None            # (anahtar, layout, image) son gösterilen
+        self._rendering = None        # arka planda çizilen anahtar
+    
+    def set_data(self, data):
+        self.data = data
+        self.invalidate()
+    
+    def set_theme(self, theme: str):
+        """Tema anahtarın parçası; eski temanın çizimi önbellekte kalır."""
+        self.theme = theme
+        self.update()
+    
+    def invalidate(self):
+        """Veri değişti: önbellek boşalır, sürmekte olan çizimin sonucu kullanılmaz."""
+        self._version += 1
+        self._images.clear()
+        self.update()
+    
+    def point_count(self) -> int:
+        return len(self.data)
+    
+    def colors(self) -> dict:
+        return theme_colors(self.theme)
+    
+    def cache_key(self) -> tuple:
+        return (self._version, self.width(), self.height(), self.devicePixelRatioF(), self.theme)
+    
+    @staticmethod
+    def build_layout(data, width: int, height: int) -> dict:
+        """Varsayılan: boş yerleşim (alt sınıflar doldurur)."""
+        return {}
+    
+    @staticmethod
+    def draw(painter: QPainter, layout: dict, colors: dict):
+        """Varsayılan: hiçbir şey çizmez."""
+    
+    def hit_test(self, layout: dict, x: float, y: float) -> str | None:
+        return None
+    
+    def paintEvent(self, event):
+        if not self.data or self.width() <= 0 or self.height() <= 0:
+            return
+        
+        key = self.cache_key()
+        if key in self._images:
+            self._images.move_to_end(key)
+            self._shown = (key, *self._images[key])
+        elif self.point_count() > self.ASYNC_POINTS:
+            self.start_render(key)
+        else:
+            self.store(key, self.render_now())
+        
+        painter = QPainter(self)
+        if self._shown is None:
+            painter.setPen(QPen(QColor(self.colors()["text_secondary"])))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "⏳")
+            return
+        # Boyut değiştiyse yeni çizim gelene kadar eski görüntü ölçeklenir
+        painter.drawImage(QRectF(self.rect()), self._shown[2])
+    
+    def render_now(self) -> tuple:
+        """Eşzamanlı çizim (az noktalı grafikler)."""
+        return render_chart(type(self), self.data, self.width(), self.height(),
+                            self.devicePixelRatioF(), self.colors())
+    
+    def store(self, key: tuple, result: tuple):
+        self._images[key] = result
+        while len(self._images) > IMAGE_CACHE_SIZE:
+            self._images.popitem(last=False)
+        self._shown = (key, *result)
+    
+    def start_render(self, key: tuple):
+        """Arka planda çizer; bir çizim sürerken yenisi başlamaz (bitince güncel boyutla tekrar bakılır)."""
+        if self._rendering is not None:
+            return
+        self._rendering = key
+        
+        thread = ChartThread(key, render_chart, type(self), self.data, self.width(), self.height(),
+                             self.devicePixelRatioF(), self.colors())
+        thread.rendered.connect(self.on_rendered)
+        thread.error.connect(self.on_render_error)
+        thread.finished.connect(lambda: (thread.wait(), _threads.discard(thread)))
+        _threads.add(thread)
+        thread.start()
+    
+    def on_rendered(self, key: tuple, result: tuple):
+        self._rendering = None
+        if key[0] == self._version:
+            self.store(key, result)
+        self.update()
+    
+    def on_render_error(self, message: str):
+        self._rendering = None
+        print(f"Grafik çizilemedi: {message}")
+    
+    def event(self, event):
+        if event.type() == QEvent.Type.ToolTip:
+            text = None
+            if self._shown is not None and self._shown[0] == self.cache_key():
+                text = self.hit_test(self._shown[1], event.pos().x(), event.pos().y())
+            if text:
+                QToolTip.showText(event.globalPos(), text, self)
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().event(event)
+
+
+class BarChart(Chart):
+    """
+    Çubuk grafik: [(label, value), ...].
+    Genişliğe sığmayan seriler piksel sütunlarına gruplanır (grup içi en büyük değer);
+    etiketler ve değerler sığdığı kadar gösterilir.
+    """
+    
+    # Çubuk başına en az genişlik (piksel); altında gruplanır
+    MIN_SLOT = 2
+    
+    def __init__(self, parent=None, theme: str = "dark", color: str = "#0078D4"):
+        super().__init__(parent, theme)
+        self.bar_color = color
+        self.setMinimumHeight(200)
+    
+    def colors(self) -> dict:
+        return dict(super().colors(), bar=self.bar_color)
+    
+    @staticmethod
+    def build_layout(data, width: int, height: int) -> dict:
+        plot = QRectF(10, 20, width - 20, height - 50)  # üstte değer, altta etiket için boşluk
+        
+        # Piksel sütunlarına gruplama
+        group = max(1, math.ceil(len(data) / max(1, plot.width() // BarChart.MIN_SLOT)))
+        columns = []
+        for i in range(0, len(data), group):
+            chunk = data[i:i + group]
+            label = str(chunk[0][0]) if len(chunk) == 1 else f"{chunk[0][0]} – {chunk[-1][0]}"
+            columns.append((label, str(chunk[0][0]), max(value for _, value in chunk)))
+        
+        top = max((value for _, _, value in columns), default=0) or 1
+        slot = plot.width() / max(1, len(columns))
+        bar_width = max(1.0, min(50.0, slot * 0.75))
+        label_width = max((len(short) for _, short, _ in columns), default=1) * CHAR_WIDTH + 6
+        label_step = max(1, math.ceil(label_width / slot))
+        
+        bars, labels, values = [], [], []
+        for i, (label, short, value) in enumerate(columns):
+            center = plot.left() + slot * (i + 0.5)
+            bar_height = value / top * plot.height()
+            rect = QRectF(center - bar_width / 2, plot.bottom() - bar_height, bar_width, bar_height)
+            bars.append((rect, f"{label}: {value:g}"))
+            
+            if value > 0 and len(f"{value:g}") * CHAR_WIDTH <= slot:
+                values.append((QRectF(center - slot / 2, rect.top() - 18, slot, 16), f"{value:g}"))
+            if i % label_step == 0:
+                span = slot * label_step
+                labels.append((QRectF(center - span / 2, plot.bottom() + 5, span, 20), short))
+        
+        return {"left": plot.left(), "slot": slot, "bars": bars, "labels": labels, "values": values}
+    
+    @staticmethod
+    def draw(painter: QPainter, layout: dict, colors: dict):
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(colors["bar"]))
+        for rect, _ in layout["bars"]:
+            if rect.width() >= 6:
+                painter.drawRoundedRect(rect, 3, 3)
+            else:
+                painter.drawRect(rect)
+        
+        painter.setPen(QPen(QColor(colors["text"])))
+        for rect, text in layout["values"]:
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        
+        painter.setPen(QPen(QColor(colors["text_secondary"])))
+        for rect, text in layout["labels"]:
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+    
+    def hit_test(self, layout: dict, x: float, y: float) -> str | None:
+        index = math.floor((x - layout["left"]) / layout["slot"])
+        if 0 <= index < len(layout["bars"]):
+            return layout["bars"][index][1]
+        return None
+
+
+class PieChart(Chart):
+    """Pasta grafik: [(label, value), ...] (en fazla 10 dilim)."""
+    
+    COLORS = PALETTE
+    
+    def __init__(self, parent=None, theme: str = "dark"):
+        super().__init__(parent, theme)
+        self.setMinimumSize(200, 200)
+    
+    def set_data(self, data: list):
+        super().set_data(data[:len(PALETTE)])
+    
+    @staticmethod
+    def build_layout(data, width: int, height: int) -> dict:
+        size = max(0, min(width, height) - 20)
+        rect = QRectF((width - size) / 2, 10, size, size)
+        total = sum(value for _, value in data)
+        
+        slices = []
+        start = 90 * 16  # saat 12 yönünden başla
+        for i, (label, value) in enumerate(data):
+            span = round(value / total * 360 * 16) if total else 0
+            slices.append((start, span, PALETTE[i % len(PALETTE)], f"{label}: {value} ({value / total:.0%})" if total else label))
+            start += span
+        return {"rect": rect, "slices": slices}
+    
+    @staticmethod
+    def draw(painter: QPainter, layout: dict, colors: dict):
+        painter.setPen(QPen(QColor(colors["bg"]), 2))
+        for start, span, color, _ in layout["slices"]:
+            painter.setBrush(QColor(color))
+            painter.drawPie(layout["rect"], start, span)
+    
+    def hit_test(self, layout: dict, x: float, y: float) -> str | None:
+        rect = layout["rect"]
+        dx, dy = x - rect.center().x(), rect.center().y() - y
+        if math.hypot(dx, dy) > rect.width() / 2:
+            return None
+        # Qt açıları saat 3 yönünden saat yönünün tersine, 1/16 derece
+        angle = math.degrees(math.atan2(dy, dx)) * 16
+        for start, span, _, text in layout["slices"]:
+            if span and (angle - start) % (360 * 16) < span:
+                return text
+        return None
+
+
+class HeatmapChart(Chart):
+    """
+    Günlük ısı haritası (takvim): sütunlar hafta, satırlar gün (Pazartesi üstte).
+    Aralık birden fazla yıla yayılıyorsa her yıl ayrı bir şerittir; hücreler
+    alana sığdırılır. Her zaman arka planda çizilir.
+    """
+    
+    ASYNC_POINTS = 0
+    
+    # Renk basamakları (0 = boş gün)
+    LEVELS = 4
+    
+    # Yıl şeritleri arasındaki boşluk (piksel)
+    BAND_GAP = 6
+    
+    def __init__(self, parent=None, theme: str = "dark", unit: str = ""):
+        super().__init__(parent, theme)
+        self.unit = unit
+        self.setMinimumHeight(120)
+    
+    def set_data(self, values: dict, start: date, end: date):
+        """values: {"YYYY-MM-DD": değer}; start..end arası çizilir."""
+        super().set_data({"values": values, "start": start, "end": end})
+    
+    def point_count(self) -> int:
+        return (self.data["end"] - self.data["start"]).days + 1 if self.data else 0
+    
+    @staticmethod
+    def band_first(year: int) -> date:
+        """Yıl şeridinin ilk sütununun pazartesisi (şeritler hafta hafta hizalı)."""
+        first = date(year, 1, 1)
+        return first - timedelta(days=first.weekday())
+    
+    @staticmethod
+    def build_layout(data, width: int, height: int) -> dict:
+        start, end, values = data["start"], data["end"], data["values"]
+        years = list(range(start.year, end.year + 1))
+        weeks = 53 if len(years) > 1 else (end - HeatmapChart.band_first(start.year)).days // 7 + 1
+        
+        left, top = 34, 18  # gün/yıl ve ay etiketleri için
+        gap = HeatmapChart.BAND_GAP
+        cell = max(2.0, min(
+            (width - left - 5) / weeks,
+            (height - top - 5 - gap * (len(years) - 1)) / (7 * len(years)),
+        ))
+        band_height = 7 * cell + gap
+        inner = 1 if cell >= 5 else 0
+        top_value = max(values.values(), default=0) or 1
+        
+        cells = []
+        day = start
+        while day <= end:
+            band = day.year - start.year
+            offset = (day - HeatmapChart.band_first(day.year)).days
+            rect = QRectF(left + offset // 7 * cell, top + band * band_height + offset % 7 * cell,
+                          cell - inner, cell - inner)
+            value = values.get(day.isoformat(), 0)
+            cells.append((rect, math.ceil(value / top_value * HeatmapChart.LEVELS) if value > 0 else 0))
+            day += timedelta(days=1)
+        
+        # Ay etiketleri ilk şeridin yılına göre (diğer şeritler en fazla bir hafta kayar)
+        months = []
+        for month in range(1, 13):
+            x = left + (date(start.year, month, 1) - HeatmapChart.band_first(start.year)).days // 7 * cell
+            if x < left + weeks * cell and (not months or x - months[-1][0] >= 3 * CHAR_WIDTH + 4):
+                months.append((x, MONTH_NAMES[month - 1]))
+        
+        # Solda: tek yılda gün adları, çok yılda yıllar
+        if len(years) > 1:
+            side = [(top + i * band_height, 7 * cell, str(year)) for i, year in enumerate(years)]
+        elif cell >= 9:
+            side = [(top + row * cell, cell, name) for row, name in ((0, "Pzt"), (2, "Çar"), (4, "Cum"))]
+        else:
+            side = []
+        
+        return {
+            "start": start, "end": end, "values": values,
+            "left": left, "top": top, "cell": cell, "band_height": band_height,
+            "cells": cells, "months": months, "side": side,
+        }
+    
+    @staticmethod
+    def draw(painter: QPainter, layout: dict, colors: dict):
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        shades = [QColor(colors["bg_tertiary"])] + [
+            mix_colors(colors["bg_tertiary"], colors["success"], level / HeatmapChart.LEVELS)
+            for level in range(1, HeatmapChart.LEVELS + 1)
+        ]
+        for rect, level in layout["cells"]:
+            painter.fillRect(rect, shades[level])
+        
+        painter.setPen(QPen(QColor(colors["text_secondary"])))
+        for x, text in layout["months"]:
+            painter.drawText(QRectF(x, 0, 60, layout["top"] - 2),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignBottom, text)
+        for y, span, text in layout["side"]:
+            painter.drawText(QRectF(0, y, layout["left"] - 4, span),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, text)
+    
+    def hit_test(self, layout: dict, x: float, y: float) -> str | None:
+        band, band_y = divmod(y - layout["top"], layout["band_height"])
+        column = math.floor((x - layout["left"]) / layout["cell"])
+        row = math.floor(band_y / layout["cell"])
+        if band < 0 or column < 0 or row >= 7:
+            return None
+        year = layout["start"].year + int(band)
+        day = self.band_first(year) + timedelta(days=column * 7 + row)
+        if day.year != year or not layout["start"] <= day <= layout["end"]:
+            return None
+        value = layout["values"].get(day.isoformat(), 0)
+        return f"{day.strftime('%d.%m.%Y')}: {value:g} {self.unit}".rstrip()
+
+
+class BarList(QWidget):
+    """
+    Yatay çubuk listesi (yazar/kategori sıralamaları): tek widget, satırlar çizilir.
+    Kaydırma alanına konur; sadece görünen satırlar boyanır, binlerce satırda da akıcıdır.
+    """
+    
+    ROW_HEIGHT = 26
+    LABEL_WIDTH = 180
+    
+    def __init__(self, parent=None, theme: str = "dark", placeholder: str = ""):
+        super().__init__(parent)
+        self.theme = theme
+        self.placeholder = placeholder
+        self.rows = []
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.setFixedHeight(self.ROW_HEIGHT)
+    
+    def set_rows(self, rows: list):
+        """rows: [(label, value, extra, color | None), ...] (değere göre sıralı)."""
+        top = max((row[1] for row in rows), default=0) or 1
+        self.rows = [
+            {"label": label, "value": f"{value:g}", "ratio": value / top, "extra": extra, "color": color}
+            for label, value, extra, color in rows
+        ]
+        self.setFixedHeight(max(1, len(self.rows)) * self.ROW_HEIGHT)
+        self.update()
+    
+    def row_at(self, y: float) -> dict | None:
+        index = int(y // self.ROW_HEIGHT)
+        return self.rows[index] if 0 <= index < len(self.rows) else None
+    
+    def paintEvent(self, event):
+        colors = theme_colors(self.theme)
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        if not self.rows:
+            painter.setPen(QPen(QColor(colors["text_secondary"])))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, self.placeholder)
+            return
+        
+        metrics = painter.fontMetrics()
+        normal = painter.font()
+        bold = painter.font()
+        bold.setBold(True)
+        value_width = 50
+        extra_width = 60 if any(row["extra"] for row in self.rows) else 0
+        bar_left = self.LABEL_WIDTH + 10
+        bar_width = max(10, self.width() - bar_left - value_width - extra_width - 10)
+        
+        first = max(0, event.rect().top() // self.ROW_HEIGHT)
+        last = min(len(self.rows), event.rect().bottom() // self.ROW_HEIGHT + 1)
+        for i in range(first, last):
+            row = self.rows[i]
+            y = i * self.ROW_HEIGHT
+            label_left = 5
+            
+            if row["color"]:
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(QColor(row["color"]))
+                painter.drawRoundedRect(QRectF(5, y + 8, 10, 10), 2, 2)
+                label_left = 20
+            
+            painter.setPen(QPen(QColor(colors["text"])))
+            label = metrics.elidedText(row["label"], Qt.TextElideMode.ElideRight, self.LABEL_WIDTH - label_left)
+            painter.drawText(QRectF(label_left, y, self.LABEL_WIDTH - label_left, self.ROW_HEIGHT),
+                             Qt.AlignmentFlag.AlignVCenter, label)
+            
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(colors["bg_tertiary"]))
+            painter.drawRoundedRect(QRectF(bar_left, y + 5, bar_width, 16), 3, 3)
+            painter.setBrush(QColor(colors["accent"]))
+            painter.drawRoundedRect(QRectF(bar_left, y + 5, max(2, bar_width * row["ratio"]), 16), 3, 3)
+            
+            painter.setFont(bold)
+            painter.setPen(QPen(QColor(colors["text"])))
+            painter.drawText(QRectF(bar_left + bar_width, y, value_width, self.ROW_HEIGHT),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, row["value"])
+            painter.setFont(normal)
+            
+            if row["extra"]:
+                painter.setPen(QPen(QColor(colors["text_secondary"])))
+                painter.drawText(QRectF(bar_left + bar_width + value_width + 8, y, extra_width, self.ROW_HEIGHT),
+                                 Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, row["extra"])
+    
+    def event(self, event):
+        if event.type() == QEvent.Type.ToolTip:
+            row = self.row_at(event.pos().y())
+            if row:
+                QToolTip.showText(event.globalPos(), f"{row['label']}: {row['value']} {row['extra']}".rstrip(), self)
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().event(event)
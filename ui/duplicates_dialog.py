@@ -0,0 +1,232 @@
+"""
+Kitaplık Uygulaması - Kopya Kitaplar Dialog
+===========================================
+Kopya bulucunun (services/dedupe.py) önerdiği kümeleri gösterir.
+Her kümede kalacak kitap seçilir, diğerleri onunla birleştirilir
+(raflar, alıntılar ve okuma verisi taşınır) veya küme "kopya değil" olarak işaretlenir.
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
+    QTableWidget,
+    QTableWidgetItem,
+    QPushButton,
+    QSplitter,
+    QWidget,
+    QHeaderView,
+    QAbstractItemView,
+    QMessageBox,
+)
+from PyQt6.QtCore import Qt
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+from services.dedupe import groups
+
+
+# Tabloda gösterilen alanlar: (sütun, başlık)
+COLUMNS = [
+    ("title", "Başlık"),
+    ("author", "Yazar"),
+    ("isbn", "ISBN"),
+    ("publisher", "Yayınevi"),
+    ("publish_year", "Yıl"),
+    ("status", "Durum"),
+    ("rating", "Puan"),
+    ("created_at", "Eklenme"),
+]
+
+STATUS_LABELS = {
+    "unread": "📕 Okunmadı",
+    "to_read": "📋 Okuyacağım",
+    "reading": "📖 Okunuyor",
+    "read": "✅ Okundu",
+    "wont_read": "⏭️ Okumayacağım",
+}
+
+REASON_LABELS = {
+    "isbn": "aynı ISBN",
+    "title+author": "başlık ve yazar",
+    "title": "başlık",
+}
+
+
+class DuplicatesDialog(QDialog):
+    """Olası kopyaları inceleme ve birleştirme dialog'u."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.groups = []
+        self.reasons = {}  # (book_a, book_b) -> neden
+        
+        self.setWindowTitle("🧬 Kopya Kitaplar")
+        self.setMinimumSize(900, 520)
+        self.setModal(True)
+        
+        self.setup_ui()
+        self.load_groups()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        self.info_label = QLabel("")
+        self.info_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(self.info_label)
+        
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        
+        self.group_list = QListWidget()
+        self.group_list.currentRowChanged.connect(self.show_group)
+        splitter.addWidget(self.group_list)
+        
+        right_widget = QWidget()
+        right = QVBoxLayout(right_widget)
+        right.setContentsMargins(0, 0, 0, 0)
+        
+        self.book_table = QTableWidget()
+        self.book_table.setColumnCount(len(COLUMNS))
+        self.book_table.setHorizontalHeaderLabels([label for _, label in COLUMNS])
+        self.book_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.book_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.book_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.book_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.book_table.itemSelectionChanged.connect(self.update_buttons)
+        right.addWidget(self.book_table)
+        
+        self.reason_label = QLabel("")
+        self.reason_label.setStyleSheet("color: #808080;")
+        right.addWidget(self.reason_label)
+        
+        hint = QLabel("Kalacak kitabı seçin; diğerlerinin rafları, alıntıları ve okuma bilgileri ona taşınır.")
+        hint.setWordWrap(True)
+        right.addWidget(hint)
+        
+        splitter.addWidget(right_widget)
+        splitter.setSizes([280, 620])
+        layout.addWidget(splitter)
+        
+        btn_layout = QHBoxLayout()
+        
+        self.dismiss_btn = QPushButton("✋ Kopya Değil")
+        self.dismiss_btn.setToolTip("Bu küme bir daha önerilmez")
+        self.dismiss_btn.clicked.connect(self.dismiss_group)
+        btn_layout.addWidget(self.dismiss_btn)
+        
+        btn_layout.addStretch()
+        
+        self.merge_btn = QPushButton("🔗 Seçileni Koru, Diğerlerini Birleştir")
+        self.merge_btn.clicked.connect(self.merge_group)
+        btn_layout.addWidget(self.merge_btn)
+        
+        close_btn = QPushButton("Kapat")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        
+        layout.addLayout(btn_layout)
+    
+    def load_groups(self):
+        """Bekleyen çiftleri okuyup kümeler."""
+        pairs = db.get_duplicate_candidates()
+        self.reasons = {(row["book_a"], row["book_b"]): row["reason"] for row in pairs}
+        self.groups = groups(pairs)
+        
+        # Liste için sadece kümelerin ilk kitabının başlığı okunur
+        first_ids = [book_ids[0] for book_ids, _ in self.groups]
+        titles = {book["id"]: book for book in db.get_book_rows(["id", "title", "author"], first_ids)}
+        
+        self.group_list.clear()
+        for book_ids, score in self.groups:
+            book = titles.get(book_ids[0])
+            text = f"{book['title']} ({book['author'] or '?'})" if book else f"#{book_ids[0]}"
+            item = QListWidgetItem(f"{text}\n   {len(book_ids)} kayıt · benzerlik %{round(score * 100)}")
+            self.group_list.addItem(item)
+        
+        self.info_label.setText(
+            f"🧬 {len(self.groups)} olası kopya kümesi" if self.groups else "✅ Olası kopya bulunamadı"
+        )
+        if self.groups:
+            self.group_list.setCurrentRow(0)
+        else:
+            self.book_table.setRowCount(0)
+            self.reason_label.clear()
+        self.update_buttons()
+    
+    def current_group(self) -> list:
+        row = self.group_list.currentRow()
+        return self.groups[row][0] if 0 <= row < len(self.groups) else []
+    
+    def show_group(self, row: int):
+        """Kümenin kitaplarını tabloda gösterir (en eski kayıt seçili gelir)."""
+        book_ids = self.current_group()
+        books = db.get_book_rows(["id"] + [field for field, _ in COLUMNS], book_ids)
+        
+        self.book_table.setRowCount(len(books))
+        for i, book in enumerate(books):
+            for j, (field, _) in enumerate(COLUMNS):
+                value = book[field]
+                if field == "status":
+                    value = STATUS_LABELS.get(value, value)
+                elif field == "rating":
+                    value = "⭐" * int(value) if value else ""
+                elif field == "created_at":
+                    value = (value or "")[:10]
+                item = QTableWidgetItem("" if value is None else str(value))
+                item.setData(Qt.ItemDataRole.UserRole, book["id"])
+                self.book_table.setItem(i, j, item)
+        if books:
+            self.book_table.selectRow(0)
+        
+        reasons = sorted({
+            REASON_LABELS.get(reason, reason) for (a, b), reason in self.reasons.items()
+            if a in book_ids and b in book_ids
+        })
+        self.reason_label.setText("Eşleşme: " + ", ".join(reasons) if reasons else "")
+        self.update_buttons()
+    
+    def selected_book_id(self):
+        items = self.book_table.selectedItems()
+        return items[0].data(Qt.ItemDataRole.UserRole) if items else None
+    
+    def update_buttons(self):
+        has_group = bool(self.current_group())
+        self.dismiss_btn.setEnabled(has_group)
+        self.merge_btn.setEnabled(has_group and self.selected_book_id() is not None)
+    
+    def merge_group(self):
+        survivor_id = self.selected_book_id()
+        book_ids = self.current_group()
+        if survivor_id is None or not book_ids:
+            return
+        
+        others = [book_id for book_id in book_ids if book_id != survivor_id]
+        reply = QMessageBox.question(
+            self, "Birleştir",
+            f"{len(others)} kopya seçili kitapla birleştirilip silinecek.\nDevam edilsin mi?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        if not db.merge_books(survivor_id, others):
+            QMessageBox.warning(self, "Hata", "Kitaplar birleştirilemedi (biri silinmiş olabilir).")
+        self.reload_keeping_position()
+    
+    def dismiss_group(self):
+        book_ids = self.current_group()
+        for a, b in list(self.reasons):
+            if a in book_ids and b in book_ids:
+                db.dismiss_duplicate(a, b)
+        self.reload_keeping_position()
+    
+    def reload_keeping_position(self):
+        row = self.group_list.currentRow()
+        self.load_groups()
+        if self.groups:
+            self.group_list.setCurrentRow(min(max(row, 0), len(self.groups) - 1))
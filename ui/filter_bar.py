@@ -11,12 +11,13 @@ from PyQt6.QtWidgets import (
     QComboBox,
     QPushButton,
 )
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal
 
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 import database as db
+from ui.change_bus import change_bus
 
 
 class FilterBar(QWidget):
@@ -33,6 +34,9 @@ class FilterBar(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setup_ui()
+        
+        # Yıl listesi sadece yayın yılını etkileyen değişikliklerde güncellenir
+        change_bus.changed.connect(self.on_data_changed, Qt.ConnectionType.QueuedConnection)
     
     def setup_ui(self):
         """Arayüzü oluşturur."""
@@ -103,6 +107,49 @@ class FilterBar(QWidget):
         
         self.year_combo.blockSignals(False)
     
+    def on_data_changed(self, table: str, op: str, ids: list, columns):
+        """Kitap eklenip silindiğinde veya yayın yılı değiştiğinde yılları günceller."""
+        if table != "books":
+            return
+        if op == "update" and columns and "publish_year" not in columns:
+            return
+        self.sync_years()
+    
+    def sync_years(self):
+        """
+        Yıl listesini veritabanıyla eşitler.
+        refresh_years'tan farkı: listeyi baştan kurmaz, sadece eksik yılları
+        ekleyip artık kullanılmayanları çıkarır (seçim ve açık liste bozulmaz).
+        """
+        years = db.get_distinct_years()
+        current = [self.year_combo.itemData(i) for i in range(1, self.year_combo.count())]
+        if years == current:
+            return
+        
+        self.year_combo.blockSignals(True)
+        
+        # Artık kullanılmayanlar (seçili olan da silinirse "Tümü"ye düşer)
+        selected_removed = False
+        year_set = set(years)
+        for i in range(self.year_combo.count() - 1, 0, -1):
+            if self.year_combo.itemData(i) not in year_set:
+                selected_removed |= i == self.year_combo.currentIndex()
+                self.year_combo.removeItem(i)
+        
+        # Yeni yıllar, azalan sıradaki yerlerine
+        for index, year in enumerate(years, start=1):
+            if self.year_combo.itemData(index) != year:
+                self.year_combo.insertItem(index, str(year), year)
+        
+        if selected_removed:
+            self.year_combo.setCurrentIndex(0)
+        
+        self.year_combo.blockSignals(False)
+        
+        # Seçili yıl kalmadıysa filtre değişmiş olur
+        if selected_removed:
+            self.on_filter_changed()
+    
     def on_filter_changed(self):
         """Filtre değiştiğinde sinyal gönderir."""
         filters = self.get_filters()
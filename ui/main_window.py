@@ -34,12 +34,19 @@ from PyQt6.QtWidgets import (
     QSpinBox,          # Sayı girişi
     QTextEdit,         # Çok satırlı metin
     QFormLayout,       # Form yerleşimi
+    QApplication,      # Uygulama nesnesi (olay filtresi için)
+    QInputDialog,      # Metin girişi (toplu etiket)
+    QStyledItemDelegate, # Liste öğesi çizimi (vurgulu arama sonuçları)
+    QStyle,            # Öğe arka planı çizimi
 )
-from PyQt6.QtCore import Qt, QSize, QThread, pyqtSignal  # Hizalama sabitleri vs.
-from PyQt6.QtGui import QFont, QAction, QPixmap  # Font ayarları, menü aksiyonları, görsel
+from PyQt6.QtCore import Qt, QSize, QObject, QEvent, QTimer, pyqtSignal  # Hizalama sabitleri vs.
+from PyQt6.QtGui import QFont, QAction, QPixmap, QTextDocument, QTextCursor  # Font ayarları, menü aksiyonları, görsel
 
 # Kendi modüllerimiz - bir üst klasörden import
+import html
+import itertools
 import sys
+import threading
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 import database as db
@@ -48,6 +55,63 @@ from ui.themes import get_stylesheet, THEME_NAMES
 from ui.shelf_panel import ShelfPanel
 from ui.stats_dialog import StatsDialog
 from ui.filter_bar import FilterBar
+from ui.change_bus import change_bus
+
+
+# Tablo kapak küçük resmi yüksekliği
+THUMB_HEIGHT = 50
+
+# Grid kart boyutları
+GRID_COVER_WIDTH = 130
+GRID_COVER_HEIGHT = 190
+GRID_CARD_WIDTH = GRID_COVER_WIDTH + 20
+
+# Durum değerlerinin tabloda görünen metinleri
+STATUS_TEXTS = {
+    "unread": "📕 Okunmadı",
+    "to_read": "📋 Okuyacağım",
+    "reading": "📖 Okunuyor",
+    "read": "📗 Okundu",
+    "wont_read": "🚫 Okumayacağım"
+}
+
+# Tablo/grid'de gösterilen veya filtrelemede kullanılan alanlar
+# (sadece bunlardan biri değişirse satır güncellenir)
+VIEW_COLUMNS = {"title", "author", "page_count", "status", "rating", "cover_path", "publish_year", "series_name"}
+
+# Bundan fazla kitap aynı anda değişirse tek tek güncellemek yerine yeniden yükle
+FULL_RELOAD_THRESHOLD = 200
+
+# Tablo ve grid'e bir seferde eklenen kitap sayısı
+# (kalanlar kaydırma sona yaklaştıkça eklenir)
+PAGE_SIZE = 100
+
+# Kaydırma çubuğu bu orana gelince sonraki sayfa eklenir
+SCROLL_PRELOAD_RATIO = 0.8
+
+# Okuma listesi adayları ve tüm alıntılar listesinde sayfa boyutu
+CANDIDATES_PAGE_SIZE = 50
+QUOTES_PAGE_SIZE = 50
+
+# Alıntı araması yazma durunca çalışır (milisaniye)
+QUOTE_SEARCH_DELAY = 250
+
+# Sağ tık "Benzer Kitaplar" menüsünde gösterilen kitap sayısı
+SIMILAR_BOOKS_LIMIT = 8
+
+# Okuma oturumu veya okunmuş kitap yokken tahminlerde kullanılan hız
+DEFAULT_PAGES_PER_DAY = 30
+DEFAULT_MINUTES_PER_PAGE = 2
+
+PACE_SOURCE_LABELS = {
+    "sessions": f"Son {db.SPEED_WINDOW_DAYS} günün okuma oturumlarından ölçüldü",
+    "books": "Okunan kitapların başlama/bitiş tarihlerinden ölçüldü (oturum kaydı yok)",
+    None: "Henüz ölçüm yok, varsayılan hız kullanılıyor. Okuma oturumu kaydedin.",
+}
+
+# Otomatik yedeğin zamanı geldi mi diye bakılma aralığı ve açılıştan sonraki ilk kontrol (milisaniye)
+BACKUP_CHECK_INTERVAL_MS = 30 * 60 * 1000
+BACKUP_FIRST_CHECK_MS = 60 * 1000
 
 
 class MainWindow(QMainWindow):
@@ -78,6 +142,7 @@ class MainWindow(QMainWindow):
         # Grid seçim durumu
         self.selected_grid_cards = set()
         self.grid_cards = {}
+        self._pending_books = {}  # Henüz çizilmemiş kitaplar: id -> kitap, sırayla (sayfa sayfa eklenir)
         
         # Pencere ayarları
         self.setWindowTitle("Kitaplığım")
@@ -93,10 +158,127 @@ class MainWindow(QMainWindow):
         self.apply_theme(self.current_theme)
         
         # Kitapları yükle
+        # Liste için gereken kısa alanlar bellekte tutulur; raf/filtre/arama
+        # değişimleri veritabanına gitmeden bu görüntüden yapılır
+        from services.library_snapshot import LibrarySnapshot
+        self.snapshot = LibrarySnapshot()
+        self.snapshot.load()
+        
+        # Akıllı rafların üyeliği kitaplar değiştikçe güncellenir
+        from services.smart_shelves import SmartShelfEvaluator
+        self.smart_shelves = SmartShelfEvaluator()
+        self.smart_shelves.load()
+        
+        self.series_view = None
+        self.live_updates_paused = False
         self.load_books()
         
+        # Sonraki değişikliklerde sadece etkilenen satırlar güncellenir
+        # (kuyruklu bağlantı: düzenlenen hücrenin kendi sinyali içinde
+        # satırı yeniden yazmamak ve arka plan thread'lerinden gelmek için)
+        change_bus.changed.connect(self.on_data_changed, Qt.ConnectionType.QueuedConnection)
+        
         # Görünüm butonlarını güncelle
         self.set_view_mode(self.view_mode)
+        
+        # Kapak deposu bakımı: ilk açılışta eski kapakları taşır,
+        # kullanılmayan kapak dosyalarını siler
+        from services.cover_store import maintain as maintain_covers
+        threading.Thread(target=maintain_covers, daemon=True).start()
+        
+        # Benzer kitaplar ve temaya göre arama için gömme index'i
+        # (eksik vektörler arka planda üretilir)
+        from services.embeddings import get_index
+        self.embedding_index = get_index()
+        threading.Thread(target=self.embedding_index.load, daemon=True).start()
+        
+        # Kopya kitap bulucu (ilk açılışta tüm kitaplığı bir kez tarar)
+        from services.dedupe import get_finder
+        self.duplicate_finder = get_finder()
+        threading.Thread(target=self.duplicate_finder.load, daemon=True).start()
+        
+        # Otomatik yedekleme: zamanı geldiyse arka planda yedek alınır
+        self.backup_timer = QTimer(self)
+        self.backup_timer.timeout.connect(self.run_scheduled_backup)
+        self.backup_timer.start(BACKUP_CHECK_INTERVAL_MS)
+        QTimer.singleShot(BACKUP_FIRST_CHECK_MS, self.run_scheduled_backup)
+        
+        # Eksik kitap bilgilerini arka planda tamamla
+        self.metadata_refresher = None
+        QApplication.instance().installEventFilter(self)
+        if db.get_setting("metadata_refresh", "1") == "1":
+            self.start_metadata_refresh()
+    
+    def start_metadata_refresh(self):
+        """Arka plan bilgi tamamlayıcısını başlatır."""
+        from services.metadata_refresh import MetadataRefresher
+        
+        if self.metadata_refresher is None:
+            self.metadata_refresher = MetadataRefresher()
+            self.metadata_refresher.start()
+    
+    def stop_metadata_refresh(self):
+        """Arka plan bilgi tamamlayıcısını durdurur."""
+        if self.metadata_refresher is not None:
+            self.metadata_refresher.stop()
+            self.metadata_refresher = None
+    
+    def toggle_metadata_refresh(self, enabled: bool):
+        """Menüden arka plan bilgi tamamlamayı açar/kapatır."""
+        db.set_setting("metadata_refresh", "1" if enabled else "0")
+        if enabled:
+            self.start_metadata_refresh()
+        else:
+            self.stop_metadata_refresh()
+    
+    def run_scheduled_backup(self):
+        """Otomatik yedeğin zamanı geldiyse arka planda alır (arayüz beklemez)."""
+        from services import backup
+        
+        if not backup.backup_due():
+            return
+        
+        def run():
+            try:
+                include_covers = db.get_setting(backup.COVERS_KEY, "1") == "1"
+                backup.create_snapshot(include_covers=include_covers, reason="auto")
+            except backup.BackupError as e:
+                print(f"Otomatik yedek alınamadı: {e}")
+        
+        threading.Thread(target=run, daemon=True).start()
+    
+    def show_backup_dialog(self):
+        """Yedekleme dialog'unu açar."""
+        from ui.backup_dialog import BackupDialog
+        
+        dialog = BackupDialog(self)
+        dialog.restored.connect(self.reload_after_restore)
+        dialog.exec()
+    
+    def reload_after_restore(self):
+        """Yedekten dönülünce bellekteki görüntüleri ve index'leri yeniden kurar."""
+        self.snapshot.load()
+        self.smart_shelves.load()
+        self.load_books()
+        self.shelf_panel.refresh()
+        self.filter_bar.refresh_years()
+        threading.Thread(target=self.embedding_index.load, daemon=True).start()
+        threading.Thread(target=self.duplicate_finder.load, kwargs={"force": True}, daemon=True).start()
+    
+    def eventFilter(self, obj, event):
+        """Kullanıcı etkileşimini arka plan işlerine bildirir (işlerken beklesinler)."""
+        if self.metadata_refresher is not None and event.type() in (
+            QEvent.Type.KeyPress, QEvent.Type.MouseButtonPress, QEvent.Type.Wheel
+        ):
+            self.metadata_refresher.notify_activity()
+        return False
+    
+    def closeEvent(self, event):
+        """Pencere kapanırken arka plan işlerini durdurur."""
+        self.stop_metadata_refresh()
+        self.embedding_index.close()
+        self.duplicate_finder.close()
+        super().closeEvent(event)
     
     def setup_menu(self):
         """
@@ -137,6 +319,10 @@ class MainWindow(QMainWindow):
         fetch_covers_action.triggered.connect(self.fetch_missing_covers)
         file_menu.addAction(fetch_covers_action)
         
+        backup_action = QAction("💾 Yedekleme...", self)
+        backup_action.triggered.connect(self.show_backup_dialog)
+        file_menu.addAction(backup_action)
+        
         file_menu.addSeparator()
         
         exit_action = QAction("Çıkış", self)
@@ -152,6 +338,11 @@ class MainWindow(QMainWindow):
         reading_list_action.triggered.connect(self.show_reading_list)
         library_menu.addAction(reading_list_action)
         
+        session_action = QAction("⏱️ Okuma Oturumu", self)
+        session_action.setShortcut("Ctrl+R")
+        session_action.triggered.connect(lambda: self.show_reading_session())
+        library_menu.addAction(session_action)
+        
         series_action = QAction("📚 Seriler", self)
         series_action.triggered.connect(self.show_series_dialog)
         library_menu.addAction(series_action)
@@ -160,6 +351,10 @@ class MainWindow(QMainWindow):
         quotes_action.triggered.connect(self.show_all_quotes)
         library_menu.addAction(quotes_action)
         
+        duplicates_action = QAction("🧬 Kopya Kitaplar", self)
+        duplicates_action.triggered.connect(self.show_duplicates)
+        library_menu.addAction(duplicates_action)
+        
         library_menu.addSeparator()
         
         stats_action = QAction("📊 İstatistikler", self)
@@ -178,6 +373,14 @@ class MainWindow(QMainWindow):
         ai_action.triggered.connect(self.show_ai_assistant)
         library_menu.addAction(ai_action)
         
+        library_menu.addSeparator()
+        
+        refresh_action = QAction("🔄 Eksik Bilgileri Arka Planda Tamamla", self)
+        refresh_action.setCheckable(True)
+        refresh_action.setChecked(db.get_setting("metadata_refresh", "1") == "1")
+        refresh_action.triggered.connect(self.toggle_metadata_refresh)
+        library_menu.addAction(refresh_action)
+        
         # === Görünüm Menüsü ===
         view_menu = menubar.addMenu("Görünüm")
         
@@ -287,6 +490,13 @@ class MainWindow(QMainWindow):
         dialog = ReadingListDialog(self)
         dialog.exec()
     
+    def show_reading_session(self, book_id: int = None):
+        """Okuma oturumu dialog'unu açar (kitap verildiyse o seçili gelir)."""
+        from ui.reading_session_dialog import ReadingSessionDialog
+        
+        dialog = ReadingSessionDialog(self, book_id)
+        dialog.exec()
+    
     def show_all_quotes(self):
         """Tüm alıntılar dialog'unu açar."""
         dialog = AllQuotesDialog(self)
@@ -308,6 +518,7 @@ class MainWindow(QMainWindow):
             self.shelf_panel.shelf_list.setCurrentRow(0)
             self.search_input.clear()
             self.load_books(books)
+            self.series_view = series_name
             self.setWindowTitle(f"Kitaplığım - 📚 {series_name}")
     
     def show_ai_assistant(self):
@@ -441,6 +652,7 @@ class MainWindow(QMainWindow):
         self.books_table.cellChanged.connect(self.on_cell_changed)
         self.books_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.books_table.customContextMenuRequested.connect(self.show_book_context_menu)
+        self.books_table.verticalScrollBar().valueChanged.connect(self.on_view_scrolled)
         
         self.view_stack.addWidget(self.books_table)
         
@@ -448,6 +660,7 @@ class MainWindow(QMainWindow):
         self.grid_scroll = QScrollArea()
         self.grid_scroll.setWidgetResizable(True)
         self.grid_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.grid_scroll.verticalScrollBar().valueChanged.connect(self.on_view_scrolled)
         
         self.grid_container = QWidget()
         self.grid_layout = QGridLayout(self.grid_container)
@@ -506,101 +719,103 @@ class MainWindow(QMainWindow):
         """
         Kitapları tabloya yükler.
         
-        books parametresi verilmezse mevcut raf ve filtrelere göre kitapları çeker.
+        books parametresi verilmezse mevcut raf ve filtrelere göre kitapları
+        bellek görüntüsünden (self.snapshot) alır, veritabanına gidilmez.
         Arama sonuçlarını göstermek için parametre kullanılır.
+        
+        Tek kitap değiştiğinde bu fonksiyon çağrılmaz; on_data_changed
+        sadece ilgili satırı günceller.
         """
         if books is None:
-            # Önce raf filtresi
-            if self.current_shelf_id is None:
-                # Filtre çubuğu varsa filtreleri uygula
-                if hasattr(self, 'filter_bar') and self.filter_bar.has_active_filters():
-                    filters = self.filter_bar.get_filters()
-                    books = db.get_filtered_books(
-                        status=filters["status"],
-                        rating=filters["rating"],
-                        year=filters["year"]
-                    )
-                else:
-                    books = db.get_all_books()
-            else:
-                # Raf seçiliyse, raftan kitapları al
-                books = db.get_books_in_shelf(self.current_shelf_id)
-        
-        # cellChanged sinyalini geçici olarak kapat (yükleme sırasında tetiklenmesin)
-        self.books_table.blockSignals(True)
+            self.series_view = None
+            books = self.snapshot.query(**self._view_conditions(), **self._view_order())
         
-        # Tabloyu temizle
+        # Tabloyu ve grid'i temizle
         self.books_table.setRowCount(0)
+        self.book_items = {}  # book_id -> başlık hücresi (satırı bulmak için)
+        self.load_grid_view([])
         
-        # Thumbnail boyutu
-        THUMB_HEIGHT = 50
+        # Sadece ilk sayfa çizilir, gerisi kaydırdıkça (bkz. on_view_scrolled)
+        self._pending_books = {book["id"]: book for book in books}
+        self.load_more_books()
+    
+    def load_more_books(self):
+        """Bekleyen kitaplardan bir sayfayı tabloya ve grid'e ekler."""
+        page = [self._pending_books.pop(book_id)
+                for book_id in list(itertools.islice(self._pending_books, PAGE_SIZE))]
         
-        # Her kitap için bir satır ekle
-        for book in books:
+        # cellChanged sinyalini geçici olarak kapat (yükleme sırasında tetiklenmesin)
+        self.books_table.blockSignals(True)
+        for book in page:
             row = self.books_table.rowCount()
             self.books_table.insertRow(row)
-            
-            # Satır yüksekliğini ayarla
-            self.books_table.setRowHeight(row, THUMB_HEIGHT + 10)
-            
-            # === KAPAK GÖRSELİ (düzenlenemez) ===
-            cover_label = QLabel()
-            cover_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            
-            if book["cover_path"]:
-                pixmap = QPixmap(book["cover_path"])
-                if not pixmap.isNull():
-                    scaled = pixmap.scaledToHeight(
-                        THUMB_HEIGHT, 
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    cover_label.setPixmap(scaled)
-                else:
-                    cover_label.setText("📖")
+            self._set_table_row(row, book)
+        self.books_table.blockSignals(False)
+        
+        start = len(self._grid_books)
+        for book in page:
+            self.grid_cards[book["id"]] = self._create_grid_card(book)
+        self._grid_books.extend(page)
+        self._reindex_grid(start)
+        self._layout_grid_cards(start)
+    
+    def on_view_scrolled(self, value: int):
+        """Tablo veya grid sona yaklaşınca sonraki sayfayı ekler."""
+        bar = self.sender()
+        if self._pending_books and value >= bar.maximum() * SCROLL_PRELOAD_RATIO:
+            self.load_more_books()
+    
+    def _set_table_row(self, row: int, book):
+        """Bir tablo satırını kitap bilgileriyle doldurur."""
+        # Satır yüksekliğini ayarla
+        self.books_table.setRowHeight(row, THUMB_HEIGHT + 10)
+        
+        # === KAPAK GÖRSELİ (düzenlenemez) ===
+        cover_label = QLabel()
+        cover_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        if book["cover_path"]:
+            pixmap = QPixmap(book["cover_path"])
+            if not pixmap.isNull():
+                scaled = pixmap.scaledToHeight(
+                    THUMB_HEIGHT, 
+                    Qt.TransformationMode.SmoothTransformation
+                )
+                cover_label.setPixmap(scaled)
             else:
                 cover_label.setText("📖")
-            
-            self.books_table.setCellWidget(row, 0, cover_label)
-            
-            # === DÜZENLENEBİLİR SÜTUNLAR ===
-            # Başlık
-            title_item = QTableWidgetItem(book["title"] or "")
-            title_item.setData(Qt.ItemDataRole.UserRole, book["id"])  # ID'yi sakla
-            self.books_table.setItem(row, 1, title_item)
-            
-            # Yazar
-            self.books_table.setItem(row, 2, QTableWidgetItem(book["author"] or ""))
-            
-            # Sayfa sayısı
-            self.books_table.setItem(row, 3, QTableWidgetItem(
-                str(book["page_count"]) if book["page_count"] else ""
-            ))
-            
-            # Durum (düzenlenebilir - metin olarak)
-            status_map = {
-                "unread": "📕 Okunmadı",
-                "to_read": "📋 Okuyacağım",
-                "reading": "📖 Okunuyor",
-                "read": "📗 Okundu",
-                "wont_read": "🚫 Okumayacağım"
-            }
-            status_text = status_map.get(book["status"], book["status"])
-            status_item = QTableWidgetItem(status_text)
-            status_item.setData(Qt.ItemDataRole.UserRole + 1, book["status"])  # Orijinal değeri sakla
-            self.books_table.setItem(row, 4, status_item)
-            
-            # Puan (düzenlenebilir - metin olarak)
-            rating = book["rating"]
-            rating_text = "⭐" * rating if rating else ""
-            rating_item = QTableWidgetItem(rating_text)
-            rating_item.setData(Qt.ItemDataRole.UserRole + 1, rating)  # Orijinal değeri sakla
-            self.books_table.setItem(row, 5, rating_item)
-        
-        # Sinyalleri tekrar aç
-        self.books_table.blockSignals(False)
+        else:
+            cover_label.setText("📖")
+        
+        self.books_table.setCellWidget(row, 0, cover_label)
         
-        # Grid görünümünü güncelle
-        self.load_grid_view(books)
+        # === DÜZENLENEBİLİR SÜTUNLAR ===
+        # Başlık
+        title_item = QTableWidgetItem(book["title"] or "")
+        title_item.setData(Qt.ItemDataRole.UserRole, book["id"])  # ID'yi sakla
+        self.books_table.setItem(row, 1, title_item)
+        self.book_items[book["id"]] = title_item
+        
+        # Yazar
+        self.books_table.setItem(row, 2, QTableWidgetItem(book["author"] or ""))
+        
+        # Sayfa sayısı
+        self.books_table.setItem(row, 3, QTableWidgetItem(
+            str(book["page_count"]) if book["page_count"] else ""
+        ))
+        
+        # Durum (düzenlenebilir - metin olarak)
+        status_text = STATUS_TEXTS.get(book["status"], book["status"])
+        status_item = QTableWidgetItem(status_text)
+        status_item.setData(Qt.ItemDataRole.UserRole + 1, book["status"])  # Orijinal değeri sakla
+        self.books_table.setItem(row, 4, status_item)
+        
+        # Puan (düzenlenebilir - metin olarak)
+        rating = book["rating"]
+        rating_text = "⭐" * rating if rating else ""
+        rating_item = QTableWidgetItem(rating_text)
+        rating_item.setData(Qt.ItemDataRole.UserRole + 1, rating)  # Orijinal değeri sakla
+        self.books_table.setItem(row, 5, rating_item)
     
     def load_grid_view(self, books):
         """Grid görünümünü yükler (kapak görselleri)."""
@@ -613,110 +828,299 @@ class MainWindow(QMainWindow):
             if item.widget():
                 item.widget().deleteLater()
         
-        if not books:
-            empty_label = QLabel("Kitap bulunamadı")
-            empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.grid_layout.addWidget(empty_label, 0, 0)
-            return
+        # Kartları oluştur ve sakla
+        self.grid_cards = {}
+        for book in books:
+            self.grid_cards[book["id"]] = self._create_grid_card(book)
         
-        # Grid boyutları
-        COVER_WIDTH = 130
-        COVER_HEIGHT = 190
-        CARD_WIDTH = COVER_WIDTH + 20
+        # Kitap listesini ve sıralarını sakla (resize ve tek kitap güncellemeleri için)
+        self._grid_books = list(books)
+        self._grid_index = {}  # book_id -> _grid_books'taki sıra
+        self._grid_cols = None
         
+        self._reindex_grid(0)
+        self._layout_grid_cards()
+    
+    def _reindex_grid(self, start: int):
+        """_grid_index'i start'tan sonraki kartlar için yeniler."""
+        for i in range(start, len(self._grid_books)):
+            self._grid_index[self._grid_books[i]["id"]] = i
+    
+    def _layout_grid_cards(self, start: int = 0):
+        """
+        Mevcut kartları grid'e yerleştirir.
+        Kartlar yeniden oluşturulmaz, sadece konumları değişir.
+        start verilirse (sayfa eklenirken, kitap eklenip çıkarılınca) önceki
+        kartlara dokunulmaz, sadece start'tan sonrakiler yeniden dizilir.
+        """
         # Dinamik sütun sayısı - mevcut genişliğe göre
         available_width = self.grid_scroll.viewport().width() - 40
-        cols = max(2, available_width // (CARD_WIDTH + 20))
+        cols = max(2, available_width // (GRID_CARD_WIDTH + 20))
+        
+        if start and cols == self._grid_cols:
+            # Layout'taki sıra kartların sırasıyla aynı: start'tan sonrakiler
+            # sondan çıkarılır, alttaki esnek boşluk yeni yerine taşınır
+            while self.grid_layout.count() > start:
+                self.grid_layout.takeAt(self.grid_layout.count() - 1)
+            self.grid_layout.setRowStretch(self._grid_stretch_row, 0)
+        else:
+            start = 0
+            self._clear_grid_layout()
         
-        # Kartları sakla
-        self.grid_cards = {}
+        if not self._grid_books:
+            empty_label = QLabel("Kitap bulunamadı")
+            empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.grid_layout.addWidget(empty_label, 0, 0)
+            return
         
         # Grid'e kitapları ekle
-        for i, book in enumerate(books):
+        for i, book in enumerate(self._grid_books[start:], start):
             row = i // cols
             col = i % cols
+            card = self.grid_cards[book["id"]]
+            self.grid_layout.addWidget(card, row, col, alignment=Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
+        
+        # Sağa ve aşağıya esnek boşluk
+        self.grid_layout.setColumnStretch(cols, 1)
+        self._grid_stretch_row = (len(self._grid_books) - 1) // cols + 1
+        self.grid_layout.setRowStretch(self._grid_stretch_row, 1)
+        
+        self._grid_cols = cols
+    
+    def _clear_grid_layout(self):
+        """Grid'deki kartları layout'tan çıkarır (kartlar silinmez)."""
+        while self.grid_layout.count():
+            item = self.grid_layout.takeAt(0)
+            if item.widget() and item.widget() not in self.grid_cards.values():
+                item.widget().deleteLater()
+        for i in range(self.grid_layout.columnCount()):
+            self.grid_layout.setColumnStretch(i, 0)
+        for i in range(self.grid_layout.rowCount()):
+            self.grid_layout.setRowStretch(i, 0)
+    
+    def _create_grid_card(self, book):
+        """Grid için kitap kartı oluşturur."""
+        card = QFrame()
+        card.setObjectName("bookCard")
+        card.setFixedSize(GRID_CARD_WIDTH, GRID_COVER_HEIGHT + 50)
+        card.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.update_card_selection(card, False)
+        
+        card_layout = QVBoxLayout(card)
+        card_layout.setContentsMargins(5, 5, 5, 5)
+        card_layout.setSpacing(6)
+        
+        # Kapak görseli
+        card.cover_label = QLabel()
+        card.cover_label.setFixedSize(GRID_COVER_WIDTH, GRID_COVER_HEIGHT)
+        card.cover_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        card_layout.addWidget(card.cover_label, alignment=Qt.AlignmentFlag.AlignCenter)
+        
+        # Kitap başlığı
+        card.title_label = QLabel()
+        card.title_label.setWordWrap(True)
+        card.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        card.title_label.setMaximumWidth(GRID_COVER_WIDTH)
+        card.title_label.setMaximumHeight(36)
+        card.title_label.setStyleSheet("font-size: 11px;")
+        card_layout.addWidget(card.title_label)
+        
+        self._update_grid_card(card, book)
+        
+        # Kitap ID'sini sakla
+        card.setProperty("book_id", book["id"])
+        
+        # Tıklama olayları
+        card.mousePressEvent = lambda event, bid=book["id"], c=card: self.on_grid_card_clicked(event, bid, c)
+        card.mouseDoubleClickEvent = lambda event, bid=book["id"]: self.on_grid_card_double_clicked(event, bid)
+        
+        return card
+    
+    def _update_grid_card(self, card, book):
+        """Kartın kapağını ve başlığını kitap bilgileriyle günceller."""
+        cover_label = card.cover_label
+        cover_label.setStyleSheet("""
+            background-color: #2D2D2D;
+            border-radius: 4px;
+        """)
+        
+        pixmap = QPixmap(book["cover_path"]) if book["cover_path"] else QPixmap()
+        if not pixmap.isNull():
+            scaled = pixmap.scaled(
+                GRID_COVER_WIDTH, GRID_COVER_HEIGHT,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            cover_label.setPixmap(scaled)
+        else:
+            cover_label.setPixmap(QPixmap())
+            cover_label.setText("📖")
+            cover_label.setStyleSheet(cover_label.styleSheet() + "font-size: 48px;")
+        
+        card.title_label.setText(book["title"] or "")
+    
+    # ==================== TEK SATIR GÜNCELLEMELERİ ====================
+    
+    def on_data_changed(self, table: str, op: str, ids: list, columns):
+        """
+        Veritabanı değişikliğinde sadece etkilenen satırları günceller
+        (bkz. database.notify_change).
+        """
+        # Toplu işlemler (içe aktarma) bitince tek seferde yeniden yüklenir
+        if self.live_updates_paused:
+            return
+        
+        if table == "books":
+            # Görünümde yer almayan bir alan değiştiyse yapacak bir şey yok
+            if op == "update" and columns and not set(columns) & VIEW_COLUMNS:
+                return
             
-            # Kitap kartı
-            card = QFrame()
-            card.setObjectName("bookCard")
-            card.setFixedSize(CARD_WIDTH, COVER_HEIGHT + 50)
-            card.setCursor(Qt.CursorShape.PointingHandCursor)
-            card.setStyleSheet("""
-                QFrame#bookCard {
-                    background-color: transparent;
-                    border-radius: 8px;
-                    border: 2px solid transparent;
-                }
-                QFrame#bookCard:hover {
-                    background-color: rgba(255, 255, 255, 0.05);
-                }
-            """)
-            
-            card_layout = QVBoxLayout(card)
-            card_layout.setContentsMargins(5, 5, 5, 5)
-            card_layout.setSpacing(6)
-            
-            # Kapak görseli
-            cover_label = QLabel()
-            cover_label.setFixedSize(COVER_WIDTH, COVER_HEIGHT)
-            cover_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            cover_label.setStyleSheet("""
-                background-color: #2D2D2D;
-                border-radius: 4px;
-            """)
+            # Çok sayıda kitap değiştiyse tek tek uğraşmak yerine yeniden yükle
+            if len(ids) > FULL_RELOAD_THRESHOLD:
+                self.load_books()
+                return
             
-            if book["cover_path"]:
-                pixmap = QPixmap(book["cover_path"])
-                if not pixmap.isNull():
-                    scaled = pixmap.scaled(
-                        COVER_WIDTH, COVER_HEIGHT,
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    cover_label.setPixmap(scaled)
+            # Bellek görüntüsü değişikliği yazma anında almış olur
+            conditions = self._view_conditions()
+            upserts, removed = [], []
+            for book_id in ids:
+                if op != "delete" and self.snapshot.matches(book_id, **conditions):
+                    upserts.append(self.snapshot.get(book_id))
                 else:
-                    cover_label.setText("📖")
-                    cover_label.setStyleSheet(cover_label.styleSheet() + "font-size: 48px;")
+                    removed.append(book_id)
+            self._apply_row_changes(upserts, removed)
+        
+        elif table == "book_shelves" and self.current_shelf_id is not None:
+            # Açık raftaki kitaplar değişti
+            if self.search_input.text().strip():
+                return
+            book_ids = [book_id for book_id, shelf_id in ids if shelf_id == self.current_shelf_id]
+            if op == "insert":
+                books = [self.snapshot.get(book_id) for book_id in book_ids]
+                self._apply_row_changes([book for book in books if book], [])
             else:
-                cover_label.setText("📖")
-                cover_label.setStyleSheet(cover_label.styleSheet() + "font-size: 48px;")
-            
-            card_layout.addWidget(cover_label, alignment=Qt.AlignmentFlag.AlignCenter)
-            
-            # Kitap başlığı
-            title_label = QLabel(book["title"] or "")
-            title_label.setWordWrap(True)
-            title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            title_label.setMaximumWidth(COVER_WIDTH)
-            title_label.setMaximumHeight(36)
-            title_label.setStyleSheet("font-size: 11px;")
-            card_layout.addWidget(title_label)
-            
-            # Kitap ID'sini sakla
-            card.setProperty("book_id", book["id"])
-            self.grid_cards[book["id"]] = card
+                self._apply_row_changes([], book_ids)
+        
+        elif table == "shelves" and op == "delete" and self.current_shelf_id in ids:
+            # Açık raf silindi (raf paneli "Tüm Kitaplar"a döner)
+            self.current_shelf_id = None
+            self.load_books()
+    
+    def _view_conditions(self) -> dict:
+        """Mevcut seri/arama/raf/filtre görünümünün koşulları (LibrarySnapshot.mask)."""
+        if self.series_view:
+            return {"series": self.series_view}
+        
+        search_text = self.search_input.text().strip()
+        if search_text:
+            return {"text": search_text}
+        
+        if self.current_shelf_id is not None:
+            return {"shelf_id": self.current_shelf_id}
+        
+        if hasattr(self, 'filter_bar') and self.filter_bar.has_active_filters():
+            filters = self.filter_bar.get_filters()
+            return {
+                "status": filters["status"],
+                "rating": filters["rating"],
+                "year": filters["year"],
+            }
+        
+        return {}
+    
+    def _view_order(self) -> dict:
+        """Raf ve arama en yeni eklenenleri üstte, diğerleri eklenme sırasıyla gösterir."""
+        if self._newest_first():
+            return {"sort": "created_at", "descending": True}
+        return {"sort": "id"}
+    
+    def _newest_first(self) -> bool:
+        return self.current_shelf_id is not None or bool(self.search_input.text().strip())
+    
+    def restore_book_row(self, book_id: int):
+        """Geçersiz hücre düzenlemesinde satırı veritabanındaki haline döndürür."""
+        book = self.snapshot.get(book_id)
+        if book:
+            self._apply_row_changes([book], [])
+    
+    def _apply_row_changes(self, upserts: list, removed_ids: list):
+        """
+        Kitapların satırlarını ve kartlarını günceller, ekler veya kaldırır.
+        Güncellenen kart yerinde değişir; ekleme/çıkarmada grid bir bildirim
+        için tek sefer ve sadece ilk değişen konumdan itibaren yeniden dizilir.
+        """
+        first = len(self._grid_books)  # Yeniden dizilmeye başlanacak konum
+        self.books_table.blockSignals(True)
+        
+        # Görünümdekiler yerinde güncellenir, yeniler ayrılır
+        new_books = []
+        for book in upserts:
+            book_id = book["id"]
+            if book_id in self.book_items:
+                self._set_table_row(self.book_items[book_id].row(), book)
+                if book_id in self.grid_cards:
+                    self._grid_books[self._grid_index[book_id]] = book
+                    self._update_grid_card(self.grid_cards[book_id], book)
+            elif book_id in self._pending_books:
+                # Henüz çizilmemiş sayfada: sadece bekleyen kayıt güncellenir
+                self._pending_books[book_id] = book
+            else:
+                new_books.append(book)
+        
+        # Kaldırılanlar (kartlar aşağıdaki yeniden dizmede layout'tan çıkar)
+        removed = set()
+        for book_id in removed_ids:
+            self._pending_books.pop(book_id, None)
             
-            # Tıklama olayları
-            card.mousePressEvent = lambda event, bid=book["id"], c=card: self.on_grid_card_clicked(event, bid, c)
-            card.mouseDoubleClickEvent = lambda event, bid=book["id"]: self.on_grid_card_double_clicked(event, bid)
+            item = self.book_items.pop(book_id, None)
+            if item is not None:
+                self.books_table.removeRow(item.row())
             
-            self.grid_layout.addWidget(card, row, col, alignment=Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
+            card = self.grid_cards.pop(book_id, None)
+            if card is not None:
+                self.selected_grid_cards.discard(book_id)
+                card.deleteLater()
+                removed.add(book_id)
+                first = min(first, self._grid_index.pop(book_id))
+        if removed:
+            self._grid_books = [book for book in self._grid_books if book["id"] not in removed]
+        
+        # Yeni satırlar: raf ve arama en yeniyi üstte, diğerleri altta gösterir
+        # (altta çizilmemiş sayfalar varsa onların sonuna)
+        newest_first = self._newest_first()
+        if new_books and not newest_first and self._pending_books:
+            self._pending_books.update((book["id"], book) for book in new_books)
+            new_books = []
+        
+        for book in new_books:
+            row = 0 if newest_first else self.books_table.rowCount()
+            self.books_table.insertRow(row)
+            self._set_table_row(row, book)
+            self.grid_cards[book["id"]] = self._create_grid_card(book)
+        self.books_table.blockSignals(False)
         
-        # Sağa ve aşağıya esnek boşluk
-        self.grid_layout.setColumnStretch(cols, 1)
-        self.grid_layout.setRowStretch(row + 1, 1)
+        if new_books:
+            if newest_first:
+                self._grid_books[:0] = reversed(new_books)
+                first = 0
+            else:
+                first = min(first, len(self._grid_books))
+                self._grid_books.extend(new_books)
         
-        # Kitap listesini sakla (resize için)
-        self._grid_books = books
+        if removed or new_books:
+            self._reindex_grid(first)
+            self._layout_grid_cards(first)
     
     def resizeEvent(self, event):
-        """Pencere boyutu değiştiğinde grid'i yeniden çiz."""
+        """Pencere boyutu değiştiğinde grid'i yeniden yerleştir."""
         super().resizeEvent(event)
         
-        # Grid görünümündeyse ve kitaplar varsa
+        # Grid görünümündeyse ve sütun sayısı değiştiyse kartları yeniden diz
         if hasattr(self, '_grid_books') and self._grid_books:
             if self.view_mode == "grid":
-                self.load_grid_view(self._grid_books)
+                available_width = self.grid_scroll.viewport().width() - 40
+                if max(2, available_width // (GRID_CARD_WIDTH + 20)) != self._grid_cols:
+                    self._layout_grid_cards()
     
     def on_grid_card_clicked(self, event, book_id, card):
         """Grid'de bir kitap kartına tek tıklandığında - seçim."""
@@ -807,11 +1211,18 @@ class MainWindow(QMainWindow):
         quotes_action = menu.addAction("💬 Alıntılar")
         quotes_action.triggered.connect(lambda: self.show_quotes_dialog(book_id))
         
+        # Okuma oturumu
+        session_action = menu.addAction("⏱️ Okuma Oturumu Kaydet")
+        session_action.triggered.connect(lambda: self.show_reading_session(book_id))
+        
+        # Benzer kitaplar
+        menu.addMenu(self.create_similar_books_menu(book_id))
+        
         menu.addSeparator()
         
         # Rafa ekle
         add_to_shelf_menu = QMenu("📚 Rafa Ekle", self)
-        shelves = db.get_all_shelves()
+        shelves = db.get_all_shelves(include_smart=False)
         book_shelf_ids = [s["id"] for s in db.get_shelves_for_book(book_id)]
         
         for shelf in shelves:
@@ -840,6 +1251,39 @@ class MainWindow(QMainWindow):
         
         menu.exec(position)
     
+    def create_similar_books_menu(self, book_id: int) -> QMenu:
+        """
+        "Benzer Kitaplar" alt menüsü.
+        Öneriler menü açılınca gömme index'inden hesaplanır.
+        """
+        similar_menu = QMenu("🔗 Benzer Kitaplar", self)
+        
+        def fill():
+            similar_menu.clear()
+            if not self.embedding_index.ready:
+                similar_menu.addAction("⏳ Hazırlanıyor...").setEnabled(False)
+                return
+            
+            books = []
+            for similar_id, score in self.embedding_index.similar(book_id, k=SIMILAR_BOOKS_LIMIT):
+                book = self.snapshot.get(similar_id)
+                if book:
+                    books.append((book, score))
+            if not books:
+                similar_menu.addAction("Benzer kitap bulunamadı").setEnabled(False)
+                return
+            
+            for book, score in books:
+                action = similar_menu.addAction(
+                    f"{book['title']} - {book['author'] or '?'}  (%{max(score, 0) * 100:.0f})"
+                )
+                action.triggered.connect(
+                    lambda checked, bid=book["id"]: self.open_edit_dialog(bid)
+                )
+        
+        similar_menu.aboutToShow.connect(fill)
+        return similar_menu
+    
     def show_grid_multi_select_menu(self, position):
         """Grid çoklu seçim için sağ tık menüsü."""
         book_ids = list(self.selected_grid_cards)
@@ -854,7 +1298,7 @@ class MainWindow(QMainWindow):
         
         # Rafa ekle alt menüsü
         add_to_shelf_menu = QMenu("📚 Rafa Ekle", self)
-        shelves = db.get_all_shelves()
+        shelves = db.get_all_shelves(include_smart=False)
         
         for shelf in shelves:
             action = add_to_shelf_menu.addAction(f"{shelf['icon']} {shelf['name']}")
@@ -865,6 +1309,8 @@ class MainWindow(QMainWindow):
         
         menu.addMenu(add_to_shelf_menu)
         
+        self.add_bulk_menu_actions(menu, book_ids, shelves)
+        
         menu.addSeparator()
         
         # Toplu silme
@@ -975,11 +1421,10 @@ class MainWindow(QMainWindow):
         """
         Arama kutusuna yazıldığında çalışır.
         """
-        if text.strip():
-            books = db.search_books(text)
-        else:
-            books = db.get_all_books()
+        self.series_view = None
         
+        # Arama raf ve filtrelerden bağımsız tüm kitaplıkta yapılır
+        books = self.snapshot.query(**self._view_conditions(), **self._view_order())
         self.load_books(books)
     
     def on_cell_changed(self, row, column):
@@ -1008,7 +1453,7 @@ class MainWindow(QMainWindow):
             if new_value:  # Başlık boş olamaz
                 db.update_book(book_id, title=new_value)
             else:
-                self.load_books()  # Boşsa geri yükle
+                self.restore_book_row(book_id)  # Boşsa geri yükle
                 
         elif column == 2:  # Yazar
             db.update_book(book_id, author=new_value or None)
@@ -1018,7 +1463,7 @@ class MainWindow(QMainWindow):
                 page_count = int(new_value) if new_value else None
                 db.update_book(book_id, page_count=page_count)
             except ValueError:
-                self.load_books()  # Geçersiz sayı, geri yükle
+                self.restore_book_row(book_id)  # Geçersiz sayı, geri yükle
                 
         elif column == 4:  # Durum
             # Emoji veya metin olarak girilmiş olabilir
@@ -1029,7 +1474,9 @@ class MainWindow(QMainWindow):
                 db.update_book(book_id, status="reading")
             elif "okundu" in status_input or "read" in status_input or "📗" in new_value:
                 db.update_book(book_id, status="read")
-            self.load_books()  # Durumu düzgün göstermek için yenile
+            else:
+                self.restore_book_row(book_id)  # Tanınmadı, eski durumu göster
+            # Tanınan durumlar değişiklik bildirimiyle düzgün gösterilir
             
         elif column == 5:  # Puan
             # Yıldız sayısını say veya sayı olarak al
@@ -1044,7 +1491,7 @@ class MainWindow(QMainWindow):
                 except ValueError:
                     rating = None
             db.update_book(book_id, rating=rating)
-            self.load_books()  # Puanı yıldız olarak göstermek için yenile
+            # Puan, değişiklik bildirimiyle yıldız olarak gösterilir
 
     def on_search_add_clicked(self):
         """
@@ -1073,10 +1520,7 @@ class MainWindow(QMainWindow):
                 categories=data.get("categories"),
             )
             
-            # Tabloyu yenile
-            self.load_books()
-            self.shelf_panel.refresh()
-            self.filter_bar.refresh_years()
+            # Tablo, raf paneli ve yıl filtresi değişiklik bildirimiyle güncellenir
     
     def on_manual_add_clicked(self):
         """
@@ -1133,10 +1577,7 @@ class MainWindow(QMainWindow):
                 borrowed_date=data.get("borrowed_date"),
             )
             
-            # Tabloyu yenile
-            self.load_books()
-            self.shelf_panel.refresh()
-            self.filter_bar.refresh_years()
+            # Tablo, raf paneli ve yıl filtresi değişiklik bildirimiyle güncellenir
     
     def on_delete_book_clicked(self):
         """
@@ -1216,13 +1657,20 @@ class MainWindow(QMainWindow):
         quotes_action = menu.addAction("💬 Alıntılar")
         quotes_action.triggered.connect(lambda: self.show_quotes_dialog(book_id))
         
+        # Okuma oturumu
+        session_action = menu.addAction("⏱️ Okuma Oturumu Kaydet")
+        session_action.triggered.connect(lambda: self.show_reading_session(book_id))
+        
+        # Benzer kitaplar
+        menu.addMenu(self.create_similar_books_menu(book_id))
+        
         menu.addSeparator()
         
         # Rafa ekle alt menüsü
         add_to_shelf_menu = QMenu("📚 Rafa Ekle", self)
         
         # Mevcut rafları listele
-        shelves = db.get_all_shelves()
+        shelves = db.get_all_shelves(include_smart=False)
         book_shelf_ids = [s["id"] for s in db.get_shelves_for_book(book_id)]
         
         for shelf in shelves:
@@ -1287,7 +1735,7 @@ class MainWindow(QMainWindow):
         
         # Rafa ekle alt menüsü
         add_to_shelf_menu = QMenu("📚 Rafa Ekle", self)
-        shelves = db.get_all_shelves()
+        shelves = db.get_all_shelves(include_smart=False)
         
         for shelf in shelves:
             action = add_to_shelf_menu.addAction(f"{shelf['icon']} {shelf['name']}")
@@ -1298,6 +1746,8 @@ class MainWindow(QMainWindow):
         
         menu.addMenu(add_to_shelf_menu)
         
+        self.add_bulk_menu_actions(menu, book_ids, shelves)
+        
         menu.addSeparator()
         
         # Toplu silme
@@ -1306,6 +1756,32 @@ class MainWindow(QMainWindow):
         
         menu.exec(self.books_table.mapToGlobal(position))
     
+    def add_bulk_menu_actions(self, menu, book_ids: list, shelves):
+        """Çoklu seçim menülerine (tablo ve grid) raftan çıkarma, durum ve etiket işlemlerini ekler."""
+        # Raftan çıkar alt menüsü
+        remove_from_shelf_menu = QMenu("📤 Raftan Çıkar", self)
+        for shelf in shelves:
+            action = remove_from_shelf_menu.addAction(f"{shelf['icon']} {shelf['name']}")
+            action.triggered.connect(
+                lambda checked, sid=shelf["id"]: self.bulk_remove_from_shelf(book_ids, sid)
+            )
+        menu.addMenu(remove_from_shelf_menu)
+        
+        # Durum alt menüsü (okunuyor/okundu tarihleri boşsa bugün yazılır)
+        status_menu = QMenu("📖 Durumu Değiştir", self)
+        for status, text in STATUS_TEXTS.items():
+            action = status_menu.addAction(text)
+            action.triggered.connect(
+                lambda checked, st=status: db.bulk_set_status(book_ids, st)
+            )
+        menu.addMenu(status_menu)
+        
+        # Etiketler
+        add_tag_action = menu.addAction("🏷️ Etiket Ekle...")
+        add_tag_action.triggered.connect(lambda: self.bulk_edit_tag(book_ids, add=True))
+        remove_tag_action = menu.addAction("🏷️ Etiket Çıkar...")
+        remove_tag_action.triggered.connect(lambda: self.bulk_edit_tag(book_ids, add=False))
+    
     def open_edit_dialog(self, book_id: int):
         """Düzenleme formunu açar."""
         book = db.get_book_by_id(book_id)
@@ -1362,19 +1838,24 @@ class MainWindow(QMainWindow):
                     # Etiketler
                     tags=data.get("tags"),
                 )
-                
-                self.load_books()
     
     def copy_book(self, book_id: int):
         """Kitabı kopyalar."""
         new_id = db.copy_book(book_id)
         if new_id:
             QMessageBox.information(self, "Başarılı", "Kitap kopyalandı!")
-            self.load_books()
-            self.shelf_panel.refresh()
         else:
             QMessageBox.warning(self, "Hata", "Kitap kopyalanamadı!")
     
+    def show_duplicates(self):
+        """Olası kopya kitapları inceleme dialog'unu açar."""
+        from ui.duplicates_dialog import DuplicatesDialog
+        
+        if not self.duplicate_finder.ready:
+            QMessageBox.information(self, "Kopya Kitaplar", "🧬 Kopya taraması sürüyor, biraz sonra tekrar deneyin.")
+            return
+        DuplicatesDialog(self).exec()
+    
     def show_quotes_dialog(self, book_id: int):
         """Alıntılar dialog'unu açar."""
         book = db.get_book_by_id(book_id)
@@ -1385,9 +1866,7 @@ class MainWindow(QMainWindow):
     def show_bulk_edit_dialog(self, book_ids: list):
         """Toplu düzenleme dialog'unu açar."""
         dialog = BulkEditDialog(book_ids, self)
-        if dialog.exec():
-            self.load_books()
-            self.shelf_panel.refresh()
+        dialog.exec()
     
     def bulk_delete_books(self, book_ids: list):
         """Birden fazla kitabı siler."""
@@ -1401,16 +1880,34 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             deleted = db.bulk_delete_books(book_ids)
             QMessageBox.information(self, "Silindi", f"{deleted} kitap silindi.")
-            self.load_books()
-            self.shelf_panel.refresh()
     
     def bulk_add_to_shelf(self, book_ids: list, shelf_id: int):
         """Birden fazla kitabı rafa ekler."""
         added = db.bulk_add_to_shelf(book_ids, shelf_id)
         if added > 0:
-            self.shelf_panel.refresh()
             QMessageBox.information(self, "Eklendi", f"{added} kitap rafa eklendi.")
     
+    def bulk_remove_from_shelf(self, book_ids: list, shelf_id: int):
+        """Birden fazla kitabı raftan çıkarır."""
+        removed = db.bulk_remove_from_shelf(book_ids, shelf_id)
+        QMessageBox.information(self, "Çıkarıldı", f"{removed} kitap raftan çıkarıldı.")
+    
+    def bulk_edit_tag(self, book_ids: list, add: bool):
+        """Seçili kitaplara etiket ekler veya çıkarır."""
+        tag, ok = QInputDialog.getText(
+            self,
+            "Etiket Ekle" if add else "Etiket Çıkar",
+            "Etiket:"
+        )
+        if not ok or not tag.strip():
+            return
+        
+        if add:
+            changed = db.bulk_add_tag(book_ids, tag)
+        else:
+            changed = db.bulk_remove_tag(book_ids, tag)
+        QMessageBox.information(self, "Etiketler", f"{changed} kitabın etiketleri güncellendi.")
+    
     def delete_book(self, book_id: int, book_title: str):
         """Kitabı siler (onay ile)."""
         reply = QMessageBox.question(
@@ -1422,22 +1919,15 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             db.delete_book(book_id)
-            self.load_books()
-            self.shelf_panel.refresh()
     
     def add_to_shelf(self, book_id: int, shelf_id: int):
         """Kitabı rafa ekler."""
         db.add_book_to_shelf(book_id, shelf_id)
-        self.shelf_panel.refresh()
         
     def remove_from_shelf(self, book_id: int, shelf_id: int):
         """Kitabı raftan çıkarır."""
         db.remove_book_from_shelf(book_id, shelf_id)
-        self.shelf_panel.refresh()
-        
-        # Eğer o raftaysak, listeyi güncelle
-        if self.current_shelf_id == shelf_id:
-            self.load_books()
+        # O raftaysak satır, değişiklik bildirimiyle kaldırılır
     
     def export_books(self, format: str):
         """
@@ -1460,7 +1950,7 @@ class MainWindow(QMainWindow):
         from services.book_api import search_books, download_cover, cover_exists
         
         # Kapağı olmayan kitapları bul (dosya gerçekten var mı kontrol et)
-        books = db.get_all_books()
+        books = db.get_all_books(db.LIST_COLUMNS)
         books_without_cover = [b for b in books if not cover_exists(b["cover_path"])]
         
         if not books_without_cover:
@@ -1504,10 +1994,7 @@ class MainWindow(QMainWindow):
             try:
                 results = search_books(search_query, "title")
                 if results and results[0].cover_url:
-                    cover_path = download_cover(
-                        results[0].cover_url, 
-                        results[0].isbn or str(book["id"])
-                    )
+                    cover_path = download_cover(results[0].cover_url)
                     if cover_path:
                         db.update_book(book["id"], cover_path=cover_path)
                         downloaded += 1
@@ -1526,8 +2013,6 @@ class MainWindow(QMainWindow):
             "Tamamlandı",
             f"✅ {downloaded} kapak indirildi\n❌ {failed} kitap için kapak bulunamadı"
         )
-        
-        self.load_books()
     
     def export_books(self, format: str):
         """Kitapları dışa aktar."""
@@ -1696,13 +2181,26 @@ class MainWindow(QMainWindow):
                 return
             
             # İçe aktarma dialog'unu aç
+            # (yüzlerce satır eklenebilir, tek tek güncelleme yerine sonda yeniden yüklenir)
             dialog = ImportDialog(rows, self)
-            if dialog.exec():
+            self.live_updates_paused = True
+            try:
+                accepted = dialog.exec()
+            finally:
+                self.live_updates_paused = False
+            
+            if accepted:
                 imported = dialog.imported_count
+                message = f"{imported} kitap başarıyla içe aktarıldı."
+                if dialog.skipped_duplicates:
+                    message += f"\n\n🧬 Kitaplıkta zaten olan {len(dialog.skipped_duplicates)} kitap atlandı."
+                if dialog.flagged_duplicates:
+                    message += (f"\n\n🧬 {dialog.flagged_duplicates} kitap mevcut bir kitabın kopyası olabilir "
+                                f"(Kitaplık → Kopya Kitaplar).")
                 QMessageBox.information(
                     self, 
                     "Başarılı", 
-                    f"{imported} kitap başarıyla içe aktarıldı."
+                    message
                 )
                 self.load_books()
                 self.shelf_panel.refresh()
@@ -1719,6 +2217,8 @@ class ImportDialog(QDialog):
         super().__init__(parent)
         self.rows = rows
         self.imported_count = 0
+        self.skipped_duplicates = []  # Kopya olduğu için eklenmeyen satırların başlıkları
+        self.flagged_duplicates = 0   # Kopya olabileceği halde eklenenler
         self.column_mappings = {}
         
         self.setWindowTitle("📥 İçe Aktar")
@@ -1804,6 +2304,16 @@ class ImportDialog(QDialog):
         self.search_online = QCheckBox("📡 Online arama ile bilgileri tamamla (yavaş)")
         layout.addWidget(self.search_online)
         
+        # Kitaplıkta zaten olan (veya dosyada tekrar eden) kitaplar
+        duplicate_layout = QHBoxLayout()
+        duplicate_layout.addWidget(QLabel("🧬 Olası kopyalar:"))
+        self.duplicate_mode = QComboBox()
+        self.duplicate_mode.addItem("Ekle ve incelemek için işaretle", "flag")
+        self.duplicate_mode.addItem("Atla", "skip")
+        duplicate_layout.addWidget(self.duplicate_mode)
+        duplicate_layout.addStretch()
+        layout.addLayout(duplicate_layout)
+        
         # Butonlar
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
@@ -1863,7 +2373,13 @@ class ImportDialog(QDialog):
         
         # API import
         if do_online_search:
-            from services.book_api import search_books
+            from services.book_api import search_books, fetch_books_by_isbns, normalize_isbn
+        
+        # Kopya kontrolü: eklenen her satır index'e hemen girer,
+        # dosyada iki kez geçen kitap da yakalanır
+        from services.dedupe import get_finder
+        finder = get_finder()
+        skip_duplicates = self.duplicate_mode.currentData() == "skip"
         
         # İlerleme dialog'u
         progress = QProgressDialog("İçe aktarılıyor...", "İptal", 0, len(self.rows), self)
@@ -1871,6 +2387,19 @@ class ImportDialog(QDialog):
         progress.setMinimumDuration(0)
         progress.show()
         
+        # ISBN'i olan satırlar tek seferde toplu sorgulanır
+        isbn_results = {}
+        isbn_columns = [col for col, field in mappings.items() if field == "isbn"]
+        if do_online_search and isbn_columns:
+            progress.setLabelText("ISBN'ler sorgulanıyor...")
+            QCoreApplication.processEvents()
+            
+            isbns = [str(row.get(col) or "") for row in self.rows for col in isbn_columns]
+            try:
+                isbn_results = fetch_books_by_isbns(isbns)
+            except Exception as e:
+                print(f"API hatası: {e}")
+        
         imported = 0
         shelf_cache = {}  # Raf adı -> id
         
@@ -1929,6 +2458,13 @@ class ImportDialog(QDialog):
             progress.setLabelText(f"({i+1}/{len(self.rows)}) {book_data.get('title', '')[:40]}...")
             QCoreApplication.processEvents()
             
+            # Olası kopya (online aramadan önce: atlanacaksa boşuna sorgulanmasın)
+            if finder.find(book_data):
+                if skip_duplicates:
+                    self.skipped_duplicates.append(book_data["title"])
+                    continue
+                self.flagged_duplicates += 1
+            
             # Online arama
             if do_online_search:
                 search_query = book_data.get("title", "")
@@ -1936,7 +2472,9 @@ class ImportDialog(QDialog):
                     search_query += " " + book_data["author"]
                 
                 try:
-                    results = search_books(search_query, "title")
+                    # ISBN ile bulunduysa başlık aramasına gerek yok
+                    isbn_match = isbn_results.get(normalize_isbn(book_data.get("isbn", "")))
+                    results = [isbn_match] if isbn_match else search_books(search_query, "title")
                     if results:
                         # En iyi eşleşmeyi bul
                         best = results[0]
@@ -1953,7 +2491,7 @@ class ImportDialog(QDialog):
                         if best.cover_url:
                             # Kapağı indir
                             from services.book_api import download_cover
-                            cover_path = download_cover(best.cover_url, best.isbn or book_data.get("title", "book"))
+                            cover_path = download_cover(best.cover_url)
                             if cover_path:
                                 book_data["cover_path"] = cover_path
                         if best.description:
@@ -2244,8 +2782,6 @@ class BulkEditDialog(QDialog):
         updates = {}
         
         status = self.status_combo.currentData()
-        if status:
-            updates["status"] = status
         
         rating = self.rating_combo.currentData()
         if rating:
@@ -2263,11 +2799,16 @@ class BulkEditDialog(QDialog):
         if tags:
             updates["tags"] = tags
         
-        if not updates:
+        if not updates and not status:
             QMessageBox.warning(self, "Uyarı", "Hiçbir alan değiştirilmedi!")
             return
         
-        updated = db.bulk_update_books(self.book_ids, **updates)
+        # Durum ayrıca işlenir: okunuyor/okundu tarihleri ve okuma listesi sırası
+        updated = 0
+        if status:
+            updated = db.bulk_set_status(self.book_ids, status)
+        if updates:
+            updated = max(updated, db.bulk_update_books(self.book_ids, **updates))
         QMessageBox.information(self, "Başarılı", f"{updated} kitap güncellendi.")
         self.accept()
 
@@ -2339,6 +2880,8 @@ class ReadingGoalDialog(QDialog):
             progress_bar = f"[{'█' * int(goal['progress'] / 10)}{'░' * (10 - int(goal['progress'] / 10))}]"
             
             text = f"{goal['year']}: {goal['completed']}/{goal['target_books']} kitap ({goal['progress']}%) {progress_bar}"
+            if goal["pace_source"] and goal["remaining"]:
+                text += f"\n   📈 Tahmin: ~{goal['projected']} kitap • ayda {goal['needed_per_month']:g} kitap gerekli"
             
             item = QListWidgetItem(text)
             item.setData(Qt.ItemDataRole.UserRole, goal["year"])
@@ -2363,6 +2906,58 @@ class ReadingGoalDialog(QDialog):
 # TÜM ALINTILAR DIALOG'U
 # ============================================================
 
+class QuoteItemDelegate(QStyledItemDelegate):
+    """
+    Arama sonuçlarını vurgulu (HTML) çizen liste öğesi çizicisi.
+    HTML, öğenin UserRole + 3 verisindedir; yoksa öğe normal çizilir.
+    """
+    
+    HTML_ROLE = Qt.ItemDataRole.UserRole + 3
+    
+    def _document(self, option, html_text: str) -> QTextDocument:
+        doc = QTextDocument()
+        doc.setDefaultFont(option.font)
+        doc.setDefaultStyleSheet(f"body {{ color: {option.palette.text().color().name()}; }}")
+        doc.setHtml(f"<body>{html_text}</body>")
+        width = option.rect.width() or self.parent().viewport().width()
+        doc.setTextWidth(max(100, width))
+        return doc
+    
+    def paint(self, painter, option, index):
+        html_text = index.data(self.HTML_ROLE)
+        if not html_text:
+            super().paint(painter, option, index)
+            return
+        
+        # Arka plan (seçim, alternatif satır rengi) normal çizilir, metin HTML olarak
+        self.initStyleOption(option, index)
+        option.text = ""
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget)
+        
+        painter.save()
+        painter.translate(option.rect.topLeft())
+        self._document(option, html_text).drawContents(painter)
+        painter.restore()
+    
+    def sizeHint(self, option, index):
+        html_text = index.data(self.HTML_ROLE)
+        if not html_text:
+            return super().sizeHint(option, index)
+        
+        doc = self._document(option, html_text)
+        return QSize(int(doc.idealWidth()), int(doc.size().height()))
+
+
+def _snippet_html(snippet: str) -> str:
+    """snippet() çıktısını HTML'e çevirir: metin kaçırılır, eşleşmeler vurgulanır."""
+    return (
+        html.escape(snippet)
+        .replace(db.SNIPPET_START, '<span style="background-color: #CCA700; color: #1E1E1E;">')
+        .replace(db.SNIPPET_END, "</span>")
+    )
+
+
 class AllQuotesDialog(QDialog):
     """Tüm kitaplardan alıntıları gösteren dialog."""
     
@@ -2373,6 +2968,12 @@ class AllQuotesDialog(QDialog):
         self.setMinimumSize(700, 500)
         self.setModal(True)
         
+        # Arama her tuşta değil, yazma durunca yapılır
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(QUOTE_SEARCH_DELAY)
+        self.search_timer.timeout.connect(self.load_quotes)
+        
         self.setup_ui()
         self.load_quotes()
     
@@ -2385,8 +2986,8 @@ class AllQuotesDialog(QDialog):
         filter_layout.addWidget(QLabel("🔍"))
         
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Alıntılarda ara...")
-        self.search_input.textChanged.connect(self.filter_quotes)
+        self.search_input.setPlaceholderText("Alıntılarda, notlarda, kitap adı veya yazarında ara...")
+        self.search_input.textChanged.connect(self.search_timer.start)
         filter_layout.addWidget(self.search_input)
         
         self.fav_only = QCheckBox("Sadece Favoriler")
@@ -2399,7 +3000,10 @@ class AllQuotesDialog(QDialog):
         self.quotes_list = QListWidget()
         self.quotes_list.setAlternatingRowColors(True)
         self.quotes_list.setWordWrap(True)
+        self.quotes_list.setItemDelegate(QuoteItemDelegate(self.quotes_list))
         self.quotes_list.itemDoubleClicked.connect(self.show_full_quote)
+        # Alıntılar sayfa sayfa yüklenir, sona yaklaşınca devamı gelir
+        self.quotes_list.verticalScrollBar().valueChanged.connect(self.on_quotes_scrolled)
         layout.addWidget(self.quotes_list, stretch=1)
         
         # Kapat
@@ -2408,25 +3012,32 @@ class AllQuotesDialog(QDialog):
         layout.addWidget(close_btn)
     
     def load_quotes(self):
-        """Alıntıları yükler."""
+        """
+        Alıntıları yükler (arama ve favori filtresi veritabanında uygulanır).
+        Arama varsa sonuçlar tam metin index'inden, en ilgiliden başlayarak gelir.
+        """
         self.quotes_list.clear()
-        
-        quotes = db.get_all_quotes()
+        self.quotes_cursor = None
+        self.load_more_quotes()
+    
+    def load_more_quotes(self):
+        """Sonraki alıntı sayfasını listeye ekler."""
+        quotes, self.quotes_cursor = db.get_quotes_page(
+            QUOTES_PAGE_SIZE, self.quotes_cursor,
+            favorites_only=self.fav_only.isChecked(),
+            text=self.search_input.text()
+        )
         
         for quote in quotes:
-            # Favori filtresi
-            if self.fav_only.isChecked() and not quote["is_favorite"]:
-                continue
-            
             text = quote["text"]
             if len(text) > 150:
                 text = text[:150] + "..."
             
-            display = f'"{text}"\n📖 {quote["book_title"]} - {quote["book_author"] or "Bilinmeyen"}'
-            
+            source = f'📖 {quote["book_title"]} - {quote["book_author"] or "Bilinmeyen"}'
             if quote["page_number"]:
-                display += f" (s.{quote['page_number']})"
+                source += f" (s.{quote['page_number']})"
             
+            display = f'"{text}"\n{source}'
             if quote["is_favorite"]:
                 display = "⭐ " + display
             
@@ -2434,19 +3045,20 @@ class AllQuotesDialog(QDialog):
             item.setData(Qt.ItemDataRole.UserRole, quote["id"])
             item.setData(Qt.ItemDataRole.UserRole + 1, quote["text"])
             item.setData(Qt.ItemDataRole.UserRole + 2, quote["book_title"])
+            
+            # Arama sonucu: eşleşen kelimeler vurgulu snippet olarak gösterilir
+            if "snippet" in quote.keys():
+                snippet = _snippet_html(quote["snippet"] or text)
+                star = "⭐ " if quote["is_favorite"] else ""
+                item.setData(QuoteItemDelegate.HTML_ROLE, f"{star}“{snippet}”<br>{html.escape(source)}")
+            
             self.quotes_list.addItem(item)
     
-    def filter_quotes(self, text: str):
-        """Alıntıları filtreler."""
-        text = text.lower()
-        
-        for i in range(self.quotes_list.count()):
-            item = self.quotes_list.item(i)
-            full_text = item.data(Qt.ItemDataRole.UserRole + 1).lower()
-            book_title = item.data(Qt.ItemDataRole.UserRole + 2).lower()
-            
-            visible = text in full_text or text in book_title
-            item.setHidden(not visible)
+    def on_quotes_scrolled(self, value: int):
+        """Liste sona yaklaşınca sonraki sayfayı ekler."""
+        bar = self.quotes_list.verticalScrollBar()
+        if self.quotes_cursor and value >= bar.maximum() * SCROLL_PRELOAD_RATIO:
+            self.load_more_quotes()
     
     def show_full_quote(self, item):
         """Tam alıntıyı gösterir."""
@@ -2470,10 +3082,17 @@ class ReadingListDialog(QDialog):
         self.setMinimumSize(800, 600)
         self.setModal(True)
         
-        # Okuma hızı ayarları
-        self.pages_per_day = 30  # Günlük sayfa
+        # Okuma hızı: okuma oturumlarından (yoksa okunan kitaplardan) ölçülür
+        self.pages_per_day = DEFAULT_PAGES_PER_DAY
+        self.minutes_per_page = DEFAULT_MINUTES_PER_PAGE
+        self.pace_source = None
+        self.load_pace()
+        
+        # Gösterilen liste (varsayılan: "Okuyacağım" durumundaki kitaplar)
+        self.list_id = db.DEFAULT_READING_LIST_ID
         
         self.setup_ui()
+        self.load_lists()
         self.load_reading_list()
     
     def setup_ui(self):
@@ -2483,7 +3102,24 @@ class ReadingListDialog(QDialog):
         # Sol: Okuma listesi
         left_layout = QVBoxLayout()
         
-        left_layout.addWidget(QLabel("📋 Okuma Sıram:"))
+        # Liste seçimi
+        list_layout = QHBoxLayout()
+        list_layout.addWidget(QLabel("📋 Liste:"))
+        
+        self.list_combo = QComboBox()
+        self.list_combo.currentIndexChanged.connect(self.on_list_changed)
+        list_layout.addWidget(self.list_combo, stretch=1)
+        
+        new_list_btn = QPushButton("➕ Yeni Liste")
+        new_list_btn.clicked.connect(self.new_list)
+        list_layout.addWidget(new_list_btn)
+        
+        self.delete_list_btn = QPushButton("🗑️")
+        self.delete_list_btn.setToolTip("Listeyi sil")
+        self.delete_list_btn.clicked.connect(self.delete_list)
+        list_layout.addWidget(self.delete_list_btn)
+        
+        left_layout.addLayout(list_layout)
         
         self.reading_list = QListWidget()
         self.reading_list.setAlternatingRowColors(True)
@@ -2514,22 +3150,25 @@ class ReadingListDialog(QDialog):
         # Sağ: Detaylar ve ayarlar
         right_layout = QVBoxLayout()
         
-        # Okuma hızı ayarları
-        speed_group = QGroupBox("⏱️ Okuma Hızı Ayarları")
+        # Ölçülen okuma hızı
+        speed_group = QGroupBox("⏱️ Okuma Hızı")
         speed_layout = QFormLayout(speed_group)
         speed_layout.setSpacing(10)
         
-        self.pages_per_day_input = QSpinBox()
-        self.pages_per_day_input.setRange(1, 500)
-        self.pages_per_day_input.setValue(self.pages_per_day)
-        self.pages_per_day_input.valueChanged.connect(self.on_speed_changed)
-        speed_layout.addRow("Günlük sayfa:", self.pages_per_day_input)
+        self.pages_per_day_label = QLabel("")
+        speed_layout.addRow("Günlük sayfa:", self.pages_per_day_label)
         
-        self.minutes_per_page = QSpinBox()
-        self.minutes_per_page.setRange(1, 30)
-        self.minutes_per_page.setValue(2)
-        self.minutes_per_page.valueChanged.connect(self.on_speed_changed)
-        speed_layout.addRow("Sayfa başı dakika:", self.minutes_per_page)
+        self.minutes_per_page_label = QLabel("")
+        speed_layout.addRow("Sayfa başı dakika:", self.minutes_per_page_label)
+        
+        self.pace_source_label = QLabel("")
+        self.pace_source_label.setStyleSheet("color: #888;")
+        self.pace_source_label.setWordWrap(True)
+        speed_layout.addRow(self.pace_source_label)
+        
+        log_session_btn = QPushButton("⏱️ Okuma Oturumu Kaydet")
+        log_session_btn.clicked.connect(self.log_session)
+        speed_layout.addRow(log_session_btn)
         
         right_layout.addWidget(speed_group)
         
@@ -2581,6 +3220,9 @@ class ReadingListDialog(QDialog):
         
         self.candidates_combo = QComboBox()
         self.candidates_combo.setPlaceholderText("Okunmamış kitaplardan seç...")
+        self.candidates_combo.setMaxVisibleItems(15)
+        # Adaylar sayfa sayfa yüklenir, liste sona kaydırılınca devamı gelir
+        self.candidates_combo.view().verticalScrollBar().valueChanged.connect(self.on_candidates_scrolled)
         add_layout.addWidget(self.candidates_combo)
         
         add_btn = QPushButton("➕ Listeye Ekle")
@@ -2598,11 +3240,69 @@ class ReadingListDialog(QDialog):
         
         layout.addLayout(right_layout, stretch=1)
     
+    def load_lists(self):
+        """Liste seçicisini doldurur."""
+        self.list_combo.blockSignals(True)
+        self.list_combo.clear()
+        for reading_list in db.get_reading_lists():
+            self.list_combo.addItem(
+                f"{reading_list['name']} ({reading_list['book_count']})", reading_list["id"]
+            )
+        index = self.list_combo.findData(self.list_id)
+        if index < 0:
+            self.list_id = db.DEFAULT_READING_LIST_ID
+            index = self.list_combo.findData(self.list_id)
+        self.list_combo.setCurrentIndex(index)
+        self.list_combo.blockSignals(False)
+        
+        self.delete_list_btn.setEnabled(self.list_id != db.DEFAULT_READING_LIST_ID)
+    
+    def on_list_changed(self, index: int):
+        """Başka bir liste seçildiğinde."""
+        list_id = self.list_combo.itemData(index)
+        if list_id is None:
+            return
+        self.list_id = list_id
+        self.delete_list_btn.setEnabled(list_id != db.DEFAULT_READING_LIST_ID)
+        self.load_reading_list()
+    
+    def new_list(self):
+        """Yeni okuma listesi oluşturur."""
+        name, ok = QInputDialog.getText(self, "Yeni Liste", "Liste adı:")
+        if not ok or not name.strip():
+            return
+        
+        list_id = db.add_reading_list(name)
+        if not list_id:
+            QMessageBox.warning(self, "Uyarı", f"'{name.strip()}' adında bir liste zaten var.")
+            return
+        
+        self.list_id = list_id
+        self.load_lists()
+        self.load_reading_list()
+    
+    def delete_list(self):
+        """Seçili listeyi siler (kitaplar silinmez)."""
+        if self.list_id == db.DEFAULT_READING_LIST_ID:
+            return
+        
+        reply = QMessageBox.question(
+            self, "Listeyi Sil",
+            f"'{self.list_combo.currentText()}' listesi silinsin mi?\n(Kitaplar kitaplıkta kalır.)"
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        db.delete_reading_list(self.list_id)
+        self.list_id = db.DEFAULT_READING_LIST_ID
+        self.load_lists()
+        self.load_reading_list()
+    
     def load_reading_list(self):
         """Okuma listesini yükler."""
         self.reading_list.clear()
         
-        books = db.get_reading_list()
+        books = db.get_reading_list(self.list_id)
         
         for i, book in enumerate(books, start=1):
             pages = book["page_count"] or 0
@@ -2622,6 +3322,7 @@ class ReadingListDialog(QDialog):
         self.load_candidates()
         
         # İstatistikleri güncelle
+        self.show_pace()
         self.update_stats()
     
     def load_candidates(self):
@@ -2629,7 +3330,14 @@ class ReadingListDialog(QDialog):
         self.candidates_combo.clear()
         self.candidates_combo.addItem("Okunmamış kitaplardan seç...", None)
         
-        books = db.get_books_to_read_candidates()
+        self.candidates_cursor = None
+        self.load_more_candidates()
+    
+    def load_more_candidates(self):
+        """Sonraki aday sayfasını listeye ekler."""
+        books, self.candidates_cursor = db.get_candidates_page(
+            CANDIDATES_PAGE_SIZE, self.candidates_cursor, list_id=self.list_id
+        )
         
         for book in books:
             text = book["title"]
@@ -2637,6 +3345,12 @@ class ReadingListDialog(QDialog):
                 text += f" - {book['author']}"
             self.candidates_combo.addItem(text, book["id"])
     
+    def on_candidates_scrolled(self, value: int):
+        """Aday listesi sona kaydırılınca sonraki sayfayı ekler."""
+        bar = self.candidates_combo.view().verticalScrollBar()
+        if self.candidates_cursor and value >= bar.maximum():
+            self.load_more_candidates()
+    
     def calculate_days(self, pages: int) -> int:
         """Sayfa sayısından gün hesaplar."""
         if pages <= 0 or self.pages_per_day <= 0:
@@ -2645,9 +3359,21 @@ class ReadingListDialog(QDialog):
     
     def calculate_hours(self, pages: int) -> float:
         """Sayfa sayısından saat hesaplar."""
-        minutes = pages * self.minutes_per_page.value()
+        minutes = pages * self.minutes_per_page
         return round(minutes / 60, 1)
     
+    def load_pace(self):
+        """Ölçülen okuma hızını okur (ölçüm yoksa varsayılanlar kalır)."""
+        pace = db.get_reading_pace()
+        self.pages_per_day = pace["pages_per_day"] or DEFAULT_PAGES_PER_DAY
+        self.minutes_per_page = pace["minutes_per_page"] or DEFAULT_MINUTES_PER_PAGE
+        self.pace_source = pace["source"]
+    
+    def show_pace(self):
+        self.pages_per_day_label.setText(f"{self.pages_per_day:g}")
+        self.minutes_per_page_label.setText(f"{self.minutes_per_page:g}")
+        self.pace_source_label.setText(PACE_SOURCE_LABELS[self.pace_source])
+    
     def on_book_selected(self, current, previous):
         """Kitap seçildiğinde detayları göster."""
         if not current:
@@ -2667,19 +3393,28 @@ class ReadingListDialog(QDialog):
         hours = self.calculate_hours(pages)
         self.book_estimate_label.setText(f"⏱️ ~{days} gün ({hours} saat)")
     
-    def on_speed_changed(self):
-        """Okuma hızı değiştiğinde."""
-        self.pages_per_day = self.pages_per_day_input.value()
+    def log_session(self):
+        """Okuma oturumu kaydeder; ölçülen hız ve tahminler yenilenir."""
+        from ui.reading_session_dialog import ReadingSessionDialog
+        
+        ReadingSessionDialog(self).exec()
+        self.load_pace()
         self.load_reading_list()
     
-    def on_list_reordered(self):
-        """Liste sürükle-bırak ile yeniden sıralandığında."""
-        book_ids = []
-        for i in range(self.reading_list.count()):
-            item = self.reading_list.item(i)
-            book_ids.append(item.data(Qt.ItemDataRole.UserRole))
+    def on_list_reordered(self, parent, start: int, end: int, destination, row: int):
+        """
+        Liste sürükle-bırak ile yeniden sıralandığında.
+        Sadece taşınan kitabın sırası yazılır: yeni yerinin altındaki kitabın önüne.
+        """
+        # row taşımadan önceki satır numarasıdır
+        new_row = row if row < start else row - (end - start + 1)
+        
+        for offset in range(end - start + 1):
+            item = self.reading_list.item(new_row + offset)
+            below = self.reading_list.item(new_row + end - start + 1)
+            before_id = below.data(Qt.ItemDataRole.UserRole) if below else None
+            db.move_reading_list_item(item.data(Qt.ItemDataRole.UserRole), before_id, self.list_id)
         
-        db.reorder_reading_list(book_ids)
         self.load_reading_list()
     
     def move_book(self, direction: str):
@@ -2689,7 +3424,7 @@ class ReadingListDialog(QDialog):
             return
         
         book_id = current.data(Qt.ItemDataRole.UserRole)
-        db.move_in_reading_list(book_id, direction)
+        db.move_in_reading_list(book_id, direction, self.list_id)
         self.load_reading_list()
     
     def add_to_list(self):
@@ -2698,7 +3433,8 @@ class ReadingListDialog(QDialog):
         if not book_id:
             return
         
-        db.add_to_reading_list(book_id)
+        db.add_to_reading_list(book_id, self.list_id)
+        self.load_lists()
         self.load_reading_list()
     
     def remove_from_list(self):
@@ -2708,12 +3444,13 @@ class ReadingListDialog(QDialog):
             return
         
         book_id = current.data(Qt.ItemDataRole.UserRole)
-        db.remove_from_reading_list(book_id)
+        db.remove_from_reading_list(book_id, self.list_id)
+        self.load_lists()
         self.load_reading_list()
     
     def update_stats(self):
         """Toplam istatistikleri günceller."""
-        books = db.get_reading_list()
+        books = db.get_reading_list(self.list_id)
         
         total_books = len(books)
         total_pages = sum(b["page_count"] or 0 for b in books)
@@ -2928,26 +3665,66 @@ class SeriesDialog(QDialog):
 # AI ASISTAN DIALOG'U
 # ============================================================
 
-class AIWorkerThread(QThread):
-    """AI yanıtını arka planda alır."""
+class AIRequest(QObject):
+    """
+    AI istek kuyruğundaki (services/ai_queue.py) bir isteğin Qt tarafı.
+    
+    Kuyruk thread'inden gelen bildirimleri sinyallere çevirir; sinyaller
+    alıcılara ana thread'de ulaşır. func'a on_token ve cancel parametreleri
+    eklenir; cancel() isteği bırakır (iptalde sinyal gelmez).
+    """
+    position = pyqtSignal(int)
+    token = pyqtSignal(str)
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
     
-    def __init__(self, func, *args, **kwargs):
+    def __init__(self, func, *args, priority: int = None, use_cache: bool = True, **kwargs):
         super().__init__()
         self.func = func
         self.args = args
         self.kwargs = kwargs
+        self.priority = priority
+        self.use_cache = use_cache
+        self.job = None
+        self.cancelled = False
+        self.done = False
     
-    def run(self):
-        try:
-            result = self.func(*self.args, **self.kwargs)
-            if result:
-                self.finished.emit(result)
-            else:
-                self.error.emit("Yanıt alınamadı. Ollama çalışıyor mu?")
-        except Exception as e:
-            self.error.emit(str(e))
+    def start(self):
+        """İsteği kuyruğa ekler (sinyaller bağlandıktan sonra çağrılmalı)."""
+        from services.ai_queue import get_queue, PRIORITY_NORMAL
+        
+        self.job = get_queue().submit(
+            self.func, *self.args,
+            listener=self,
+            priority=PRIORITY_NORMAL if self.priority is None else self.priority,
+            use_cache=self.use_cache,
+            **self.kwargs
+        )
+    
+    def cancel(self):
+        """İsteği bırakır; başka bekleyen yoksa üretim durur."""
+        self.cancelled = True
+        if self.job:
+            self.job.detach(self)
+    
+    def is_active(self) -> bool:
+        return self.job is not None and not self.done and not self.cancelled
+    
+    # Kuyruk dinleyicisi (kuyruk thread'inden çağrılır)
+    
+    def on_position(self, position: int):
+        self.position.emit(position)
+    
+    def on_token(self, text: str):
+        self.token.emit(text)
+    
+    def on_finished(self, result: str):
+        self.done = True
+        self.finished.emit(result)
+    
+    def on_error(self, message: str):
+        self.done = True
+        self.error.emit(message)
 
 
 class AIAssistantDialog(QDialog):
@@ -2961,7 +3738,10 @@ class AIAssistantDialog(QDialog):
         self.setModal(True)
         
         self.worker = None
+        self.last_request = None  # "Yeniden Üret" için (func, args, kwargs)
         self.model = None
+        self.streaming = False  # Yanıtın ilk parçası geldi mi?
+        self.ollama_available = False
         
         self.setup_ui()
         self.check_ollama()
@@ -3028,6 +3808,12 @@ class AIAssistantDialog(QDialog):
         self.ask_btn.setEnabled(False)
         question_layout.addWidget(self.ask_btn)
         
+        # Temaya göre arama model gerektirmez (Ollama yoksa yerel vektörler)
+        self.theme_btn = QPushButton("🔎 Temaya Göre Bul")
+        self.theme_btn.setToolTip("Yazdığın konuya en yakın kitapları kitaplığında bulur")
+        self.theme_btn.clicked.connect(self.find_by_theme)
+        question_layout.addWidget(self.theme_btn)
+        
         layout.addLayout(question_layout)
         
         # Yanıt alanı
@@ -3054,18 +3840,39 @@ class AIAssistantDialog(QDialog):
         info_label.setWordWrap(True)
         layout.addWidget(info_label)
         
-        # Kapat butonu
+        # Durdur / Kapat butonları
+        bottom_layout = QHBoxLayout()
+        
+        self.stop_btn = QPushButton("⏹ Durdur")
+        self.stop_btn.clicked.connect(self.stop_generation)
+        self.stop_btn.setVisible(False)
+        bottom_layout.addWidget(self.stop_btn)
+        
+        # Önbellekteki yanıt yerine yenisini üret
+        self.regenerate_btn = QPushButton("♻️ Yeniden Üret")
+        self.regenerate_btn.setToolTip("Son isteği önbelleği kullanmadan tekrar çalıştırır")
+        self.regenerate_btn.clicked.connect(self.regenerate)
+        self.regenerate_btn.setEnabled(False)
+        bottom_layout.addWidget(self.regenerate_btn)
+        
+        clear_cache_btn = QPushButton("🗑️ Önbelleği Temizle")
+        clear_cache_btn.clicked.connect(self.clear_cache)
+        bottom_layout.addWidget(clear_cache_btn)
+        
         close_btn = QPushButton("Kapat")
         close_btn.clicked.connect(self.accept)
-        layout.addWidget(close_btn)
+        bottom_layout.addWidget(close_btn, stretch=1)
+        
+        layout.addLayout(bottom_layout)
     
     def check_ollama(self):
-        """Ollama durumunu kontrol eder."""
+        """Ollama durumunu kontrol eder (model listesi önbellekten gelir)."""
         try:
             from services.ai_service import check_ollama_status
             
             status = check_ollama_status()
             
+            self.ollama_available = status["available"]
             if status["available"]:
                 self.status_icon.setText("✅")
                 self.status_label.setText(f"Ollama hazır!")
@@ -3093,6 +3900,7 @@ class AIAssistantDialog(QDialog):
             else:
                 self.status_icon.setText("❌")
                 self.status_label.setText(status.get("error", "Ollama bulunamadı"))
+                self.question_input.setEnabled(True)
                 
         except ImportError:
             self.status_icon.setText("❌")
@@ -3107,75 +3915,141 @@ class AIAssistantDialog(QDialog):
     
     def set_loading(self, loading: bool):
         """Yükleniyor durumunu ayarlar."""
-        self.recommend_btn.setEnabled(not loading)
-        self.analyze_btn.setEnabled(not loading)
-        self.plan_btn.setEnabled(not loading)
-        self.ask_btn.setEnabled(not loading)
+        # Model gerektiren eylemler sadece Ollama çalışıyorsa açılır
+        model_ready = not loading and self.ollama_available
+        self.recommend_btn.setEnabled(model_ready)
+        self.analyze_btn.setEnabled(model_ready)
+        self.plan_btn.setEnabled(model_ready)
+        self.ask_btn.setEnabled(model_ready)
+        self.theme_btn.setEnabled(not loading)
         self.question_input.setEnabled(not loading)
+        self.stop_btn.setVisible(loading)
+        self.regenerate_btn.setEnabled(not loading and self.last_request is not None)
         
         if loading:
             self.response_text.setPlainText("⏳ Düşünüyorum...")
+            self.streaming = False
             self.status_icon.setText("⏳")
         else:
-            self.status_icon.setText("✅")
+            self.status_icon.setText("✅" if self.ollama_available else "❌")
+    
+    def start_worker(self, func, *args, use_cache: bool = True, **kwargs):
+        """
+        AI isteğini kuyruğa ekler (bu dialog'un önceki isteği bırakılır).
+        Aynı istek önbellekteyse yanıt hemen gelir.
+        """
+        self.stop_generation(show_message=False)
+        self.last_request = (func, args, kwargs)
+        self.set_loading(True)
+        
+        self.worker = AIRequest(func, *args, use_cache=use_cache, **kwargs)
+        self.worker.position.connect(self.on_position)
+        self.worker.token.connect(self.on_token)
+        self.worker.finished.connect(self.on_response)
+        self.worker.error.connect(self.on_error)
+        self.worker.start()
+    
+    def regenerate(self):
+        """Son isteği önbelleği atlayarak yeniden çalıştırır."""
+        if self.last_request:
+            func, args, kwargs = self.last_request
+            self.start_worker(func, *args, use_cache=False, **kwargs)
+    
+    def clear_cache(self):
+        """Tüm önbelleğe alınmış AI yanıtlarını siler."""
+        from services.ai_service import clear_cache
+        
+        count = clear_cache()
+        self.status_label.setText(f"🗑️ Önbellekten {count} yanıt silindi")
+    
+    def on_position(self, position: int):
+        """Kuyruktaki yer değiştiğinde (0: çalışıyor)."""
+        if self.sender() is not self.worker or not self.worker.is_active() or self.streaming:
+            return
+        if position > 0:
+            self.response_text.setPlainText(f"⏳ Sırada bekliyor ({position}. sırada)...")
+        else:
+            self.response_text.setPlainText("⏳ Düşünüyorum...")
+    
+    def stop_generation(self, show_message: bool = True):
+        """Süren üretimi iptal eder; gelen kısım ekranda kalır."""
+        if not self.worker or not self.worker.is_active():
+            return
+        
+        self.worker.cancel()
+        self.set_loading(False)
+        if show_message:
+            if not self.streaming:
+                self.response_text.clear()
+            self.response_text.moveCursor(QTextCursor.MoveOperation.End)
+            self.response_text.insertPlainText("\n\n⏹ Durduruldu.")
+    
+    def on_token(self, token: str):
+        """Yanıttan yeni parça geldiğinde sona ekler."""
+        if self.sender() is not self.worker or self.worker.cancelled:
+            return  # Durdurulmuş isteğin geç gelen parçaları
+        
+        if not self.streaming:
+            self.response_text.clear()
+            self.streaming = True
+        self.response_text.moveCursor(QTextCursor.MoveOperation.End)
+        self.response_text.insertPlainText(token)
     
     def on_response(self, response: str):
-        """AI yanıtı geldiğinde."""
+        """AI yanıtı tamamlandığında."""
+        if self.sender() is not self.worker:
+            return
         self.set_loading(False)
         self.response_text.setPlainText(response)
     
     def on_error(self, error: str):
         """Hata olduğunda."""
+        if self.sender() is not self.worker:
+            return
         self.set_loading(False)
         self.response_text.setPlainText(f"❌ Hata: {error}")
     
+    def done(self, result):
+        """Dialog kapanırken süren üretimi bırakır."""
+        self.stop_generation(show_message=False)
+        super().done(result)
+    
+    def library_is_empty(self) -> bool:
+        """Kitaplık boşsa uyarı gösterir (özet ve bağlam arka planda hazırlanır)."""
+        if db.BookQuery(["id"]).limit(1).fetch():
+            return False
+        self.response_text.setPlainText("Kitaplığınız boş. Önce kitap ekleyin!")
+        return True
+    
     def get_recommendations(self):
         """Kitap önerisi al."""
         from services.ai_service import get_book_recommendation
         
-        books = db.get_all_books()
-        if not books:
-            self.response_text.setPlainText("Kitaplığınız boş. Önce kitap ekleyin!")
+        if self.library_is_empty():
             return
         
-        self.set_loading(True)
-        
-        self.worker = AIWorkerThread(
+        self.start_worker(
             get_book_recommendation,
-            [dict(b) for b in books],
             model=self.model
         )
-        self.worker.finished.connect(self.on_response)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
     
     def analyze_habits(self):
         """Okuma alışkanlıklarını analiz et."""
         from services.ai_service import analyze_reading_habits
         
-        books = db.get_all_books()
-        if not books:
-            self.response_text.setPlainText("Kitaplığınız boş. Önce kitap ekleyin!")
+        if self.library_is_empty():
             return
         
-        self.set_loading(True)
-        
-        self.worker = AIWorkerThread(
+        self.start_worker(
             analyze_reading_habits,
-            [dict(b) for b in books],
             model=self.model
         )
-        self.worker.finished.connect(self.on_response)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
     
     def get_reading_plan(self):
         """Okuma planı oluştur."""
         from services.ai_service import get_reading_plan
         
-        books = db.get_all_books()
-        if not books:
-            self.response_text.setPlainText("Kitaplığınız boş. Önce kitap ekleyin!")
+        if self.library_is_empty():
             return
         
         # Hedefi al
@@ -3183,48 +4057,42 @@ class AIAssistantDialog(QDialog):
         goal_data = db.get_reading_goal(datetime.now().year)
         goal = goal_data["target_books"] if goal_data else None
         
-        self.set_loading(True)
-        
-        self.worker = AIWorkerThread(
+        self.start_worker(
             get_reading_plan,
-            [dict(b) for b in books],
             goal=goal,
             model=self.model
         )
-        self.worker.finished.connect(self.on_response)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
     
     def ask_question(self):
         """Serbest soru sor."""
-        from services.ai_service import generate_response, create_book_summary
+        from services.ai_service import ask_library
+        from services.ai_queue import PRIORITY_INTERACTIVE
         
         question = self.question_input.text().strip()
         if not question:
             return
         
-        books = db.get_all_books()
-        context = create_book_summary([dict(b) for b in books]) if books else "Kitaplık boş."
-        
-        prompt = f"""Sen bir kitap uzmanısın. Kullanıcının kitaplığı hakkında bilgin var.
-
-{context}
-
-Kullanıcının sorusu: {question}
-
-Türkçe ve yardımcı bir şekilde yanıtla."""
-        
-        self.set_loading(True)
         self.question_input.clear()
         
-        self.worker = AIWorkerThread(
-            generate_response,
-            prompt,
-            model=self.model
+        # Bağlam (özet + soruyla ilgili kitaplar) arka planda hazırlanır
+        self.start_worker(
+            ask_library,
+            question,
+            model=self.model,
+            priority=PRIORITY_INTERACTIVE
         )
-        self.worker.finished.connect(self.on_response)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
+    
+    def find_by_theme(self):
+        """Soru kutusundaki temaya en yakın kitapları bul."""
+        from services.ai_service import find_books_by_theme
+        from services.ai_queue import PRIORITY_INTERACTIVE
+        
+        theme = self.question_input.text().strip()
+        if not theme:
+            self.response_text.setPlainText("Önce bir tema yaz (örn: 'savaş sonrası yalnızlık').")
+            return
+        
+        self.start_worker(find_books_by_theme, theme, priority=PRIORITY_INTERACTIVE)
 
 
 # ============================================================
@@ -3387,6 +4255,7 @@ class HelpDialog(QDialog):
         <h3>📋 Görünüm</h3>
         <table width="100%" cellpadding="8">
             <tr><td width="40%"><code>Ctrl+L</code></td><td>Okuma listesi</td></tr>
+            <tr><td><code>Ctrl+R</code></td><td>Okuma oturumu kaydet</td></tr>
             <tr><td><code>Ctrl+I</code></td><td>İstatistikler</td></tr>
             <tr><td><code>Ctrl+B</code></td><td>Kenar çubuğunu aç/kapat</td></tr>
             <tr><td><code>Ctrl+Shift+A</code></td><td>AI Asistan</td></tr>
@@ -0,0 +1,239 @@
+"""
+Kitaplık Uygulaması - Okuma Oturumu Dialog
+==========================================
+Okuma oturumu kaydeder (kitap, tarih, başlangıç/bitiş sayfası, süre)
+ve seçili kitabın son oturumlarını, okuma serisini ve ölçülen hızı gösterir.
+Günlük/haftalık/aylık toplamları veritabanı tetikleyicileri günceller.
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QFormLayout,
+    QLabel,
+    QComboBox,
+    QSpinBox,
+    QDateEdit,
+    QTableWidget,
+    QTableWidgetItem,
+    QPushButton,
+    QHeaderView,
+    QAbstractItemView,
+    QMessageBox,
+)
+from PyQt6.QtCore import Qt, QDate, QTime, QDateTime
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+
+
+# Seçili kitabın tabloda gösterilen son oturum sayısı
+RECENT_SESSIONS = 20
+
+
+class ReadingSessionDialog(QDialog):
+    """Okuma oturumu kaydetme dialog'u."""
+    
+    def __init__(self, parent=None, book_id: int = None):
+        super().__init__(parent)
+        self.sessions = []
+        
+        self.setWindowTitle("⏱️ Okuma Oturumu")
+        self.setMinimumSize(640, 520)
+        self.setModal(True)
+        
+        self.setup_ui()
+        self.load_books(book_id)
+        self.load_summary()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet("font-weight: bold;")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+        
+        form = QFormLayout()
+        
+        self.book_combo = QComboBox()
+        self.book_combo.currentIndexChanged.connect(self.on_book_changed)
+        form.addRow("Kitap:", self.book_combo)
+        
+        self.date_input = QDateEdit()
+        self.date_input.setCalendarPopup(True)
+        self.date_input.setDate(QDate.currentDate())
+        self.date_input.setMaximumDate(QDate.currentDate())
+        form.addRow("Tarih:", self.date_input)
+        
+        pages_layout = QHBoxLayout()
+        self.start_page_input = QSpinBox()
+        self.start_page_input.setRange(0, 99999)
+        pages_layout.addWidget(self.start_page_input)
+        pages_layout.addWidget(QLabel("→"))
+        self.end_page_input = QSpinBox()
+        self.end_page_input.setRange(0, 99999)
+        pages_layout.addWidget(self.end_page_input)
+        pages_layout.addStretch()
+        form.addRow("Sayfa:", pages_layout)
+        
+        self.minutes_input = QSpinBox()
+        self.minutes_input.setRange(0, 24 * 60)
+        self.minutes_input.setSpecialValueText("-")
+        self.minutes_input.setSuffix(" dk")
+        form.addRow("Süre:", self.minutes_input)
+        
+        layout.addLayout(form)
+        
+        save_btn = QPushButton("➕ Oturumu Kaydet")
+        save_btn.clicked.connect(self.save_session)
+        layout.addWidget(save_btn)
+        
+        # Son oturumlar
+        layout.addWidget(QLabel("📜 Son oturumlar"))
+        
+        self.table = QTableWidget()
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(["Tarih", "Sayfalar", "Okunan", "Süre"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+        
+        self.velocity_label = QLabel("")
+        self.velocity_label.setStyleSheet("color: #808080;")
+        layout.addWidget(self.velocity_label)
+        
+        btn_layout = QHBoxLayout()
+        
+        delete_btn = QPushButton("🗑️ Oturumu Sil")
+        delete_btn.clicked.connect(self.delete_session)
+        btn_layout.addWidget(delete_btn)
+        
+        btn_layout.addStretch()
+        
+        close_btn = QPushButton("Kapat")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        
+        layout.addLayout(btn_layout)
+    
+    def load_books(self, book_id: int = None):
+        """Okunan kitapları (ve verildiyse o kitabı) listeler."""
+        columns = ["id", "title", "author", "current_page", "page_count"]
+        books = db.BookQuery(columns).status("reading").order_by("title").fetch()
+        if book_id is not None and all(book["id"] != book_id for book in books):
+            books = db.BookQuery(columns).ids([book_id]).fetch() + books
+        
+        self.book_combo.blockSignals(True)
+        self.book_combo.clear()
+        for book in books:
+            text = book["title"]
+            if book["author"]:
+                text += f" - {book['author']}"
+            self.book_combo.addItem(text, dict(book))
+            if book["id"] == book_id:
+                self.book_combo.setCurrentIndex(self.book_combo.count() - 1)
+        self.book_combo.blockSignals(False)
+        self.on_book_changed()
+    
+    def current_book(self) -> dict | None:
+        return self.book_combo.currentData()
+    
+    def on_book_changed(self):
+        """Sayfa alanlarını kitabın kaldığı yerden başlatır."""
+        book = self.current_book()
+        current = (book or {}).get("current_page") or 0
+        self.end_page_input.setMaximum(max((book or {}).get("page_count") or 99999, current))
+        self.start_page_input.setValue(current)
+        self.end_page_input.setValue(current)
+        self.load_sessions()
+    
+    def load_sessions(self):
+        book = self.current_book()
+        self.sessions = db.get_reading_sessions(book["id"], RECENT_SESSIONS) if book else []
+        
+        self.table.setRowCount(len(self.sessions))
+        for i, session in enumerate(self.sessions):
+            cells = [
+                session["read_at"][:16].replace("T", " "),
+                f"{session['start_page']} → {session['end_page']}",
+                f"{session['pages']} sayfa",
+                f"{session['minutes']} dk" if session["minutes"] else "-",
+            ]
+            for j, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.ItemDataRole.UserRole, session["id"])
+                self.table.setItem(i, j, item)
+        
+        velocity = db.get_book_velocity(limit=1, book_id=book["id"]) if book else []
+        if velocity:
+            velocity = velocity[0]
+            text = f"Bu kitap: {velocity['pages']} sayfa, {velocity['active_days']} gün · {velocity['pages_per_day']} sayfa/gün"
+            if velocity["pages_per_hour"]:
+                text += f" · {velocity['pages_per_hour']} sayfa/saat"
+            self.velocity_label.setText(text)
+        else:
+            self.velocity_label.setText("")
+    
+    def load_summary(self):
+        """Okuma serisi ve son günlerin ortalaması."""
+        activity = db.get_reading_activity()
+        if not activity["longest_streak"]:
+            self.summary_label.setText("Henüz oturum yok. Okuduğun sayfaları kaydet, hızın ölçülsün.")
+            return
+        
+        last = activity["daily"][-1] if activity["daily"] else {"avg_7": 0}
+        text = (
+            f"🔥 Seri: {activity['current_streak']} gün (en uzun {activity['longest_streak']}) · "
+            f"📈 7 gün ort.: {last['avg_7']} sayfa/gün"
+        )
+        if activity["pages_per_day"]:
+            text += f" · ⚡ Son {db.SPEED_WINDOW_DAYS} gün: {activity['pages_per_day']} sayfa/gün"
+        self.summary_label.setText(text)
+    
+    def save_session(self):
+        book = self.current_book()
+        if not book:
+            QMessageBox.warning(self, "Uyarı", "Önce bir kitap seçin.")
+            return
+        
+        start_page = self.start_page_input.value()
+        end_page = self.end_page_input.value()
+        if end_page <= start_page:
+            QMessageBox.warning(self, "Uyarı", "Bitiş sayfası başlangıçtan büyük olmalı.")
+            return
+        
+        # Bugünse şimdiki saat, geçmiş bir günse gün ortası yazılır
+        date = self.date_input.date()
+        time = QTime.currentTime() if date == QDate.currentDate() else QTime(12, 0)
+        read_at = QDateTime(date, time).toString("yyyy-MM-dd'T'HH:mm:ss")
+        
+        session_id = db.add_reading_session(
+            book["id"], end_page, start_page=start_page,
+            minutes=self.minutes_input.value() or None, read_at=read_at,
+        )
+        if session_id is None:
+            QMessageBox.warning(self, "Hata", "Oturum kaydedilemedi.")
+            return
+        
+        self.minutes_input.setValue(0)
+        self.load_books(book["id"])
+        self.load_summary()
+    
+    def delete_session(self):
+        items = self.table.selectedItems()
+        if not items:
+            return
+        reply = QMessageBox.question(
+            self, "Sil", "Seçili oturum silinsin mi?\n(Kitabın sayfası değişmez.)",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            db.delete_reading_session(items[0].data(Qt.ItemDataRole.UserRole))
+            self.load_sessions()
+            self.load_summary()
@@ -19,10 +19,13 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
+import json
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 import database as db
+from ui.change_bus import change_bus
+from services.smart_shelves import describe_rule
 
 
 class ShelfPanel(QWidget):
@@ -40,8 +43,13 @@ class ShelfPanel(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.shelf_items = {}   # shelf_id -> liste öğesi
         self.setup_ui()
         self.load_shelves()
+        
+        # Raf eklenince/silinince ve kitap rafa girip çıkınca
+        # sadece ilgili öğe güncellenir
+        change_bus.changed.connect(self.on_data_changed, Qt.ConnectionType.QueuedConnection)
     
     def setup_ui(self):
         """Arayüzü oluşturur."""
@@ -69,14 +77,20 @@ class ShelfPanel(QWidget):
         
         layout.addWidget(self.shelf_list)
         
-        # === YENİ RAF BUTONU ===
+        # === YENİ RAF BUTONLARI ===
         add_btn = QPushButton("➕ Yeni Raf")
         add_btn.clicked.connect(self.on_add_shelf)
         layout.addWidget(add_btn)
+        
+        smart_btn = QPushButton("🧠 Akıllı Raf")
+        smart_btn.setToolTip("Kurala göre kendiliğinden dolan raf")
+        smart_btn.clicked.connect(self.on_add_smart_shelf)
+        layout.addWidget(smart_btn)
     
     def load_shelves(self):
         """Rafları yükler."""
         self.shelf_list.clear()
+        self.shelf_items = {}
         
         # "Tüm Kitaplar" öğesi (özel, id = -1)
         all_item = QListWidgetItem("📖 Tüm Kitaplar")
@@ -88,19 +102,58 @@ class ShelfPanel(QWidget):
         separator.setFlags(Qt.ItemFlag.NoItemFlags)  # Seçilemez
         self.shelf_list.addItem(separator)
         
-        # Rafları ekle
-        shelves = db.get_all_shelves()
-        for shelf in shelves:
-            count = db.get_shelf_book_count(shelf["id"])
-            text = f"{shelf['icon']} {shelf['name']} ({count})"
-            
-            item = QListWidgetItem(text)
-            item.setData(Qt.ItemDataRole.UserRole, shelf["id"])
-            self.shelf_list.addItem(item)
+        # Rafları sayılarıyla birlikte tek sorguda ekle
+        for shelf in db.get_shelves_with_counts():
+            self._add_shelf_item(shelf)
         
         # İlk öğeyi seç (Tüm Kitaplar)
         self.shelf_list.setCurrentRow(0)
     
+    def _add_shelf_item(self, shelf):
+        """Listenin sonuna bir raf öğesi ekler."""
+        item = QListWidgetItem()
+        item.setData(Qt.ItemDataRole.UserRole, shelf["id"])
+        self.shelf_list.addItem(item)
+        self.shelf_items[shelf["id"]] = item
+        self._set_shelf_text(item, shelf)
+    
+    def _set_shelf_text(self, item, shelf):
+        """Öğe metnini rafın adı, simgesi ve kitap sayısıyla ayarlar."""
+        item.setText(f"{shelf['icon']} {shelf['name']} ({shelf['book_count']})")
+        
+        # Akıllı raflarda kural ipucu olarak gösterilir
+        item.setData(Qt.ItemDataRole.UserRole + 1, bool(shelf["rule"]))
+        if shelf["rule"]:
+            try:
+                item.setToolTip("🧠 " + describe_rule(json.loads(shelf["rule"])))
+            except ValueError:
+                item.setToolTip("")
+    
+    def on_data_changed(self, table: str, op: str, ids: list, columns):
+        """Veritabanı değişikliğinde sadece ilgili raf öğelerini günceller."""
+        if table == "shelves" and op == "delete":
+            for shelf_id in ids:
+                item = self.shelf_items.pop(shelf_id, None)
+                if item is not None:
+                    self.shelf_list.takeItem(self.shelf_list.row(item))
+            return
+        
+        if table == "shelves":
+            shelf_ids = ids
+        elif table == "book_shelves":
+            # ids: (book_id, shelf_id) çiftleri
+            shelf_ids = {shelf_id for _, shelf_id in ids}
+        else:
+            return
+        
+        # Etkilenen rafların güncel sayıları (book_count) tek sorguda okunur
+        for shelf in db.get_shelves_with_counts(shelf_ids):
+            item = self.shelf_items.get(shelf["id"])
+            if item is None:
+                self._add_shelf_item(shelf)
+            else:
+                self._set_shelf_text(item, shelf)
+    
     def on_shelf_clicked(self, item):
         """Bir raf tıklandığında."""
         shelf_id = item.data(Qt.ItemDataRole.UserRole)
@@ -144,15 +197,43 @@ class ShelfPanel(QWidget):
         # Ekle
         shelf_id = db.add_shelf(name.strip(), icon)
         
-        if shelf_id:
-            self.load_shelves()
-        else:
+        # Başarılıysa öğe değişiklik bildirimiyle eklenir
+        if not shelf_id:
             QMessageBox.warning(
                 self,
                 "Hata",
                 f'"{name}" adında bir raf zaten var!'
             )
     
+    def on_add_smart_shelf(self):
+        """Kurala göre dolan yeni raf ekler."""
+        from ui.smart_shelf_dialog import SmartShelfDialog
+        
+        dialog = SmartShelfDialog(self)
+        if dialog.exec() != SmartShelfDialog.DialogCode.Accepted:
+            return
+        
+        # Üyeleri akıllı raf değerlendiricisi raf eklenince hesaplar
+        shelf_id = db.add_shelf(dialog.name, dialog.icon, rule=dialog.rule())
+        if not shelf_id:
+            QMessageBox.warning(
+                self,
+                "Hata",
+                f'"{dialog.name}" adında bir raf zaten var!'
+            )
+    
+    def edit_smart_shelf(self, shelf_id):
+        """Akıllı rafın adını, ikonunu ve kuralını düzenler."""
+        from ui.smart_shelf_dialog import SmartShelfDialog
+        
+        shelves = db.get_smart_shelves([shelf_id])
+        if not shelves:
+            return
+        
+        dialog = SmartShelfDialog(self, shelves[0])
+        if dialog.exec() == SmartShelfDialog.DialogCode.Accepted:
+            db.update_shelf(shelf_id, name=dialog.name, icon=dialog.icon, rule=dialog.rule())
+    
     def show_context_menu(self, position):
         """Sağ tık menüsünü gösterir."""
         item = self.shelf_list.itemAt(position)
@@ -167,6 +248,11 @@ class ShelfPanel(QWidget):
         
         menu = QMenu(self)
         
+        # Akıllı rafın kuralı
+        if item.data(Qt.ItemDataRole.UserRole + 1):
+            rule_action = menu.addAction("🧠 Kuralı Düzenle")
+            rule_action.triggered.connect(lambda: self.edit_smart_shelf(shelf_id))
+        
         # Yeniden adlandır
         rename_action = menu.addAction("✏️ Yeniden Adlandır")
         rename_action.triggered.connect(lambda: self.rename_shelf(shelf_id))
@@ -187,7 +273,6 @@ class ShelfPanel(QWidget):
         
         if ok and name.strip():
             db.update_shelf(shelf_id, name=name.strip())
-            self.load_shelves()
     
     def delete_shelf(self, shelf_id):
         """Rafı siler."""
@@ -201,8 +286,8 @@ class ShelfPanel(QWidget):
         
         if reply == QMessageBox.StandardButton.Yes:
             db.delete_shelf(shelf_id)
-            self.load_shelves()
-            # Tüm kitaplara dön
+            # Öğe değişiklik bildirimiyle kaldırılır; tüm kitaplara dön
+            self.shelf_list.setCurrentRow(0)
             self.all_books_selected.emit()
     
     def refresh(self):
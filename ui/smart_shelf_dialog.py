@@ -0,0 +1,240 @@
+"""
+Kitaplık Uygulaması - Akıllı Raf Dialog
+=======================================
+Akıllı rafın adını, ikonunu ve kuralını (koşul listesi) düzenler.
+Koşullar değiştikçe eşleşen kitap sayısı önizlenir.
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QFormLayout,
+    QLabel,
+    QLineEdit,
+    QComboBox,
+    QPushButton,
+    QWidget,
+    QDialogButtonBox,
+    QMessageBox,
+)
+from PyQt6.QtCore import Qt, QTimer
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+import database as db
+from services.smart_shelves import SMART_FIELDS, OPERATORS, UNARY_OPERATORS, compile_rule
+
+
+# Durum alanı için seçenekler (değer kutusu yerine)
+STATUS_CHOICES = [
+    ("unread", "📕 Okunmadı"),
+    ("to_read", "📋 Okuyacağım"),
+    ("reading", "📖 Okunuyor"),
+    ("read", "✅ Okundu"),
+    ("wont_read", "⏭️ Okumayacağım"),
+]
+
+SMART_ICONS = ["🧠", "⭐", "❤️", "🔥", "🎯", "💡", "🌟", "📚"]
+
+
+class ConditionRow(QWidget):
+    """Tek koşul satırı: alan, operatör, değer, sil."""
+    
+    def __init__(self, condition: dict = None, parent=None):
+        super().__init__(parent)
+        condition = condition or {}
+        
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.field_combo = QComboBox()
+        for field, (label, _) in SMART_FIELDS.items():
+            self.field_combo.addItem(label, field)
+        layout.addWidget(self.field_combo, stretch=2)
+        
+        self.op_combo = QComboBox()
+        for op, label in OPERATORS.items():
+            self.op_combo.addItem(label, op)
+        layout.addWidget(self.op_combo, stretch=2)
+        
+        self.value_input = QLineEdit()
+        layout.addWidget(self.value_input, stretch=3)
+        
+        self.status_combo = QComboBox()
+        for status, label in STATUS_CHOICES:
+            self.status_combo.addItem(label, status)
+        layout.addWidget(self.status_combo, stretch=3)
+        
+        self.remove_btn = QPushButton("✕")
+        self.remove_btn.setFixedWidth(30)
+        layout.addWidget(self.remove_btn)
+        
+        # Mevcut koşulu yükle
+        self.field_combo.setCurrentIndex(max(0, self.field_combo.findData(condition.get("field", "status"))))
+        self.op_combo.setCurrentIndex(max(0, self.op_combo.findData(condition.get("op", "="))))
+        value = condition.get("value")
+        if condition.get("field", "status") == "status":
+            self.status_combo.setCurrentIndex(max(0, self.status_combo.findData(value)))
+        elif value is not None:
+            self.value_input.setText(str(value))
+        
+        self.field_combo.currentIndexChanged.connect(self.update_inputs)
+        self.op_combo.currentIndexChanged.connect(self.update_inputs)
+        self.update_inputs()
+    
+    def update_inputs(self):
+        """Alan/operatöre göre uygun değer girişini gösterir."""
+        is_status = self.field_combo.currentData() == "status"
+        needs_value = self.op_combo.currentData() not in UNARY_OPERATORS
+        self.status_combo.setVisible(is_status and needs_value)
+        self.value_input.setVisible(not is_status and needs_value)
+    
+    def condition(self) -> dict:
+        field = self.field_combo.currentData()
+        op = self.op_combo.currentData()
+        condition = {"field": field, "op": op}
+        
+        if op in UNARY_OPERATORS:
+            return condition
+        if field == "status":
+            condition["value"] = self.status_combo.currentData()
+        elif SMART_FIELDS[field][1] == "number":
+            text = self.value_input.text().strip().replace(",", ".")
+            try:
+                number = float(text)
+                condition["value"] = int(number) if number.is_integer() else number
+            except ValueError:
+                condition["value"] = text
+        else:
+            condition["value"] = self.value_input.text().strip()
+        return condition
+
+
+class SmartShelfDialog(QDialog):
+    """
+    Akıllı raf oluşturma/düzenleme dialog'u.
+    
+    Kabul edilince name, icon ve rule() okunur.
+    """
+    
+    def __init__(self, parent=None, shelf: dict = None):
+        super().__init__(parent)
+        self.shelf = shelf
+        self.rows = []
+        
+        self.setWindowTitle("🧠 Akıllı Raf" if not shelf else f"🧠 {shelf['name']}")
+        self.setMinimumWidth(620)
+        self.setModal(True)
+        
+        # Önizleme her tuşta değil, yazma bitince hesaplanır
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(300)
+        self.preview_timer.timeout.connect(self.update_preview)
+        
+        self.setup_ui()
+        
+        rule = (shelf or {}).get("rule") or {"match": "all", "conditions": [{}]}
+        self.match_combo.setCurrentIndex(1 if rule.get("match") == "any" else 0)
+        for condition in rule.get("conditions") or [{}]:
+            self.add_condition(condition)
+        self.update_preview()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        form = QFormLayout()
+        
+        self.name_input = QLineEdit((self.shelf or {}).get("name", ""))
+        self.name_input.setPlaceholderText("Örn: Sevdiğim bilim kitapları")
+        form.addRow("Ad:", self.name_input)
+        
+        self.icon_combo = QComboBox()
+        self.icon_combo.addItems(SMART_ICONS)
+        if self.shelf and self.shelf.get("icon") in SMART_ICONS:
+            self.icon_combo.setCurrentText(self.shelf["icon"])
+        form.addRow("İkon:", self.icon_combo)
+        
+        self.match_combo = QComboBox()
+        self.match_combo.addItem("Tüm koşullar sağlansın", "all")
+        self.match_combo.addItem("Herhangi bir koşul sağlansın", "any")
+        self.match_combo.currentIndexChanged.connect(self.preview_timer.start)
+        form.addRow("Eşleşme:", self.match_combo)
+        
+        layout.addLayout(form)
+        
+        layout.addWidget(QLabel("Koşullar:"))
+        self.conditions_layout = QVBoxLayout()
+        layout.addLayout(self.conditions_layout)
+        
+        add_btn = QPushButton("➕ Koşul Ekle")
+        add_btn.clicked.connect(lambda: self.add_condition())
+        layout.addWidget(add_btn, alignment=Qt.AlignmentFlag.AlignLeft)
+        
+        self.preview_label = QLabel("")
+        self.preview_label.setStyleSheet("color: #4EC9B0; padding: 6px 0;")
+        layout.addWidget(self.preview_label)
+        
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.on_save)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+    
+    def add_condition(self, condition: dict = None):
+        row = ConditionRow(condition, self)
+        row.remove_btn.clicked.connect(lambda: self.remove_condition(row))
+        row.field_combo.currentIndexChanged.connect(self.preview_timer.start)
+        row.op_combo.currentIndexChanged.connect(self.preview_timer.start)
+        row.status_combo.currentIndexChanged.connect(self.preview_timer.start)
+        row.value_input.textChanged.connect(self.preview_timer.start)
+        self.conditions_layout.addWidget(row)
+        self.rows.append(row)
+        self.preview_timer.start()
+    
+    def remove_condition(self, row):
+        if len(self.rows) <= 1:
+            return
+        self.rows.remove(row)
+        row.deleteLater()
+        self.preview_timer.start()
+    
+    def rule(self) -> dict:
+        return {
+            "match": self.match_combo.currentData(),
+            "conditions": [row.condition() for row in self.rows],
+        }
+    
+    @property
+    def name(self) -> str:
+        return self.name_input.text().strip()
+    
+    @property
+    def icon(self) -> str:
+        return self.icon_combo.currentText()
+    
+    def update_preview(self):
+        """Kurala uyan kitap sayısını gösterir."""
+        try:
+            predicate, fields = compile_rule(self.rule())
+        except ValueError as e:
+            self.preview_label.setText(f"⚠️ {e}")
+            return
+        
+        books = db.get_book_rows(["id"] + fields)
+        count = sum(1 for book in books if predicate(book))
+        self.preview_label.setText(f"📚 Eşleşen kitap: {count}")
+    
+    def on_save(self):
+        if not self.name:
+            QMessageBox.warning(self, "Uyarı", "Raf adı boş olamaz.")
+            return
+        try:
+            compile_rule(self.rule())
+        except ValueError as e:
+            QMessageBox.warning(self, "Geçersiz Kural", str(e))
+            return
+        self.accept()
@@ -1,12 +1,15 @@
 """
 Kitaplık Uygulaması - Gelişmiş İstatistik Dialog
 ================================================
-- Okuma grafikleri (aylık/yıllık trend)
+- Okuma grafikleri (aylık/yıllık trend, günlük okuma ısı haritası)
 - Yazar istatistikleri
 - Kategori dağılımı (pasta grafik)
 - Okuma hızı
 - Hedef takibi
 - Yıllık özet raporu
+
+Sekmeler ilk açıldıklarında arka planda yüklenir (services/library_stats.py,
+kitaplık değişene kadar önbellekli); boşta kalınca komşu sekmeler hazırlanır.
 """
 
 from PyQt6.QtWidgets import (
@@ -19,20 +22,36 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QProgressBar,
     QTabWidget,
+    QStackedWidget,
     QWidget,
     QSpinBox,
     QComboBox,
     QScrollArea,
     QSizePolicy,
+    QFileDialog,
+    QMessageBox,
 )
-from PyQt6.QtCore import Qt, QRectF
-from PyQt6.QtGui import QFont, QPainter, QColor, QPen, QBrush
+from PyQt6.QtCore import Qt, QRectF, QThread, QTimer, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor, QImage, QPixmap
 
 import sys
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, date
 sys.path.append(str(Path(__file__).parent.parent))
 import database as db
+from services import year_review, library_stats
+from ui.charts import BarChart, PieChart, HeatmapChart, BarList, PALETTE, wait_for_renders
+
+
+# Yıllık özette gösterilen kapak sayısı ve boyutu
+COLLAGE_SHOWN = 24
+COLLAGE_COVER_SIZE = (60, 90)
+
+# Sekmeler (sırası arayüzdekiyle aynı); veriler ilk açılışta arka planda yüklenir
+TABS = ["overview", "charts", "authors", "categories", "speed", "goal", "summary"]
+
+# Boşta kalınca komşu sekmeleri hazırlamadan önce beklenen süre (ms)
+PREFETCH_DELAY_MS = 400
 
 
 # ============================================================
@@ -69,157 +88,59 @@ class StatCard(QFrame):
         layout.addWidget(label_label)
 
 
-class BarChart(QWidget):
-    """Basit çubuk grafik widget'ı."""
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.data = []  # [(label, value), ...]
-        self.max_value = 0
-        self.bar_color = QColor("#0078D4")
-        self.setMinimumHeight(200)
+class SkeletonWidget(QWidget):
+    """Sekme verisi hazırlanırken içeriğin yerinde gösterilen gri bloklar."""
     
-    def set_data(self, data: list):
-        """Veriyi ayarla: [(label, value), ...]"""
-        self.data = data
-        self.max_value = max((v for _, v in data), default=1)
-        self.update()
+    # Blok genişlikleri (alan genişliğine oranla)
+    BLOCKS = [0.35, 0.9, 0.8, 0.6, 0.85, 0.7, 0.5]
     
     def paintEvent(self, event):
-        if not self.data:
-            return
-        
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(128, 128, 128, 50))
         
-        width = self.width()
-        height = self.height() - 30  # Alt etiket için boşluk
-        bar_width = max(20, min(50, (width - 40) // len(self.data) - 10))
-        spacing = (width - len(self.data) * bar_width) // (len(self.data) + 1)
-        
-        x = spacing
-        for label, value in self.data:
-            # Çubuk yüksekliği
-            bar_height = int((value / self.max_value) * (height - 20)) if self.max_value > 0 else 0
-            y = height - bar_height
-            
-            # Çubuk çiz
-            painter.setBrush(QBrush(self.bar_color))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(x, y, bar_width, bar_height, 3, 3)
-            
-            # Değer
-            if value > 0:
-                painter.setPen(QPen(QColor("#FFFFFF")))
-                painter.drawText(x, y - 5, bar_width, 20, Qt.AlignmentFlag.AlignCenter, str(value))
-            
-            # Etiket
-            painter.setPen(QPen(QColor("#858585")))
-            painter.drawText(x - 5, height + 5, bar_width + 10, 20, Qt.AlignmentFlag.AlignCenter, str(label))
-            
-            x += bar_width + spacing
+        width = self.width() - 20
+        for i, ratio in enumerate(self.BLOCKS):
+            painter.drawRoundedRect(QRectF(10, 10 + i * 34, width * ratio, 20), 4, 4)
 
 
-class PieChart(QWidget):
-    """Basit pasta grafik widget'ı."""
-    
-    COLORS = [
-        "#0078D4", "#00B294", "#FFB900", "#E81123", "#8764B8",
-        "#00BCF2", "#107C10", "#FF8C00", "#5C2D91", "#038387"
-    ]
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.data = []  # [(label, value), ...]
-        self.setMinimumSize(200, 200)
-    
-    def set_data(self, data: list):
-        """Veriyi ayarla: [(label, value), ...]"""
-        self.data = data[:10]  # En fazla 10
-        self.update()
-    
-    def paintEvent(self, event):
-        if not self.data:
-            return
-        
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Pasta boyutu
-        size = min(self.width(), self.height()) - 20
-        x = (self.width() - size) // 2
-        y = 10
-        rect = QRectF(x, y, size, size)
-        
-        total = sum(v for _, v in self.data)
-        if total == 0:
-            return
-        
-        start_angle = 90 * 16  # 12 o'clock pozisyonundan başla
-        
-        for i, (label, value) in enumerate(self.data):
-            span_angle = int((value / total) * 360 * 16)
-            
-            color = QColor(self.COLORS[i % len(self.COLORS)])
-            painter.setBrush(QBrush(color))
-            painter.setPen(QPen(QColor("#1E1E1E"), 2))
-            
-            painter.drawPie(rect, start_angle, span_angle)
-            start_angle += span_angle
+# ============================================================
+# ANA İSTATİSTİK DIALOG
+# ============================================================
 
+def load_year_review(year: int, force: bool = False) -> dict:
+    """Yıllık özeti ve kolaj kapaklarını (küçültülmüş QImage) hazırlar; arka planda çalışır."""
+    review = year_review.get_review(year, force)
+    images = []
+    for item in review["collage"][:COLLAGE_SHOWN]:
+        image = QImage(item["cover_path"])
+        if not image.isNull():
+            images.append((item["title"], image.scaled(
+                *COLLAGE_COVER_SIZE,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )))
+    return dict(review, images=images)
 
-class HorizontalBarItem(QFrame):
-    """Yatay çubuk öğesi (yazar/kategori listesi için)."""
-    
-    def __init__(self, label: str, value: int, max_value: int, extra: str = "", parent=None):
-        super().__init__(parent)
-        
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(5, 3, 5, 3)
-        layout.setSpacing(10)
-        
-        # Etiket
-        label_lbl = QLabel(label)
-        label_lbl.setMinimumWidth(150)
-        label_lbl.setMaximumWidth(200)
-        layout.addWidget(label_lbl)
-        
-        # Çubuk
-        bar = QProgressBar()
-        bar.setMinimum(0)
-        bar.setMaximum(max_value)
-        bar.setValue(value)
-        bar.setTextVisible(False)
-        bar.setMaximumHeight(16)
-        bar.setStyleSheet("""
-            QProgressBar {
-                border: none;
-                background-color: #2D2D2D;
-                border-radius: 3px;
-            }
-            QProgressBar::chunk {
-                background-color: #0078D4;
-                border-radius: 3px;
-            }
-        """)
-        layout.addWidget(bar, stretch=1)
-        
-        # Değer
-        value_lbl = QLabel(f"{value}")
-        value_lbl.setStyleSheet("font-weight: bold; min-width: 30px;")
-        value_lbl.setAlignment(Qt.AlignmentFlag.AlignRight)
-        layout.addWidget(value_lbl)
-        
-        # Ekstra (ör: puan)
-        if extra:
-            extra_lbl = QLabel(extra)
-            extra_lbl.setStyleSheet("color: #858585;")
-            layout.addWidget(extra_lbl)
 
+class StatsThread(QThread):
+    """İstatistik işlerini (sekme verileri, yıllık özet, dışa aktarma) arka planda çalıştırır."""
+    
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+    
+    def run(self):
+        try:
+            self.finished.emit(self.func(*self.args))
+        except Exception as e:
+            self.error.emit(str(e))
 
-# ============================================================
-# ANA İSTATİSTİK DIALOG
-# ============================================================
 
 class StatsDialog(QDialog):
     """Gelişmiş istatistik penceresi."""
@@ -229,8 +150,22 @@ class StatsDialog(QDialog):
         self.setWindowTitle("📊 Kütüphane İstatistikleri")
         self.setMinimumSize(750, 600)
         self.current_year = datetime.now().year
+        self.theme = db.get_setting("theme", "dark")
+        self.review = None
+        self.summary_started = False
+        self.threads = []
+        self.stacks = {}      # sekme sırası -> QStackedWidget (iskelet / içerik)
+        self.loaded = {}      # sekme sırası -> gösterilen verinin argümanları
+        self.pending = set()  # arka planda yüklenen (sekme, argümanlar)
+        
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self.prefetch)
+        
         self.setup_ui()
-        self.load_all_stats()
+        self.tabs.currentChanged.connect(self.load_tab)
+        self.load_tab(self.tabs.currentIndex())
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -241,22 +176,22 @@ class StatsDialog(QDialog):
         self.tabs = QTabWidget()
         
         # === TAB 1: GENEL BAKIŞ ===
-        self.tabs.addTab(self.create_overview_tab(), "📊 Genel Bakış")
+        self.tabs.addTab(self.lazy_tab("overview", self.create_overview_tab()), "📊 Genel Bakış")
         
         # === TAB 2: OKUMA GRAFİKLERİ ===
-        self.tabs.addTab(self.create_charts_tab(), "📈 Grafikler")
+        self.tabs.addTab(self.lazy_tab("charts", self.create_charts_tab()), "📈 Grafikler")
         
         # === TAB 3: YAZARLAR ===
-        self.tabs.addTab(self.create_authors_tab(), "✍️ Yazarlar")
+        self.tabs.addTab(self.lazy_tab("authors", self.create_authors_tab()), "✍️ Yazarlar")
         
         # === TAB 4: KATEGORİLER ===
-        self.tabs.addTab(self.create_categories_tab(), "📁 Kategoriler")
+        self.tabs.addTab(self.lazy_tab("categories", self.create_categories_tab()), "📁 Kategoriler")
         
         # === TAB 5: OKUMA HIZI ===
-        self.tabs.addTab(self.create_speed_tab(), "⚡ Okuma Hızı")
+        self.tabs.addTab(self.lazy_tab("speed", self.create_speed_tab()), "⚡ Okuma Hızı")
         
         # === TAB 6: HEDEF ===
-        self.tabs.addTab(self.create_goal_tab(), "🎯 Hedef")
+        self.tabs.addTab(self.lazy_tab("goal", self.create_goal_tab()), "🎯 Hedef")
         
         # === TAB 7: YILLIK ÖZET ===
         self.tabs.addTab(self.create_summary_tab(), "📅 Yıllık Özet")
@@ -268,6 +203,14 @@ class StatsDialog(QDialog):
         close_btn.clicked.connect(self.close)
         layout.addWidget(close_btn)
     
+    def lazy_tab(self, name: str, content: QWidget) -> QWidget:
+        """Sekme içeriğini, veri gelene kadar iskelet gösteren bir yığına koyar."""
+        stack = QStackedWidget()
+        stack.addWidget(SkeletonWidget())
+        stack.addWidget(content)
+        self.stacks[TABS.index(name)] = stack
+        return stack
+    
     def create_overview_tab(self) -> QWidget:
         """Genel bakış tab'ı."""
         widget = QWidget()
@@ -339,20 +282,26 @@ class StatsDialog(QDialog):
         current_year = datetime.now().year
         for y in range(current_year, current_year - 5, -1):
             self.chart_year_combo.addItem(str(y), y)
-        self.chart_year_combo.currentIndexChanged.connect(self.load_charts)
+        self.chart_year_combo.currentIndexChanged.connect(lambda: self.load_tab(TABS.index("charts")))
         year_row.addWidget(self.chart_year_combo)
         year_row.addStretch()
         layout.addLayout(year_row)
         
         # Aylık grafik
         layout.addWidget(QLabel("📅 Aylık Okuma Trendi"))
-        self.monthly_chart = BarChart()
+        self.monthly_chart = BarChart(theme=self.theme)
+        self.monthly_chart.setMinimumHeight(160)
         layout.addWidget(self.monthly_chart)
         
+        # Günlük okuma (oturumlardan)
+        layout.addWidget(QLabel("🗓️ Günlük Okuma (sayfa)"))
+        self.daily_heatmap = HeatmapChart(theme=self.theme, unit="sayfa")
+        layout.addWidget(self.daily_heatmap)
+        
         # Yıllık grafik
         layout.addWidget(QLabel("📊 Yıllık Karşılaştırma"))
-        self.yearly_chart = BarChart()
-        self.yearly_chart.bar_color = QColor("#00B294")
+        self.yearly_chart = BarChart(theme=self.theme, color="#00B294")
+        self.yearly_chart.setMinimumHeight(160)
         layout.addWidget(self.yearly_chart)
         
         return widget
@@ -367,13 +316,10 @@ class StatsDialog(QDialog):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.Shape.NoFrame)
+        scroll.setAlignment(Qt.AlignmentFlag.AlignTop)
         
-        self.authors_container = QWidget()
-        self.authors_layout = QVBoxLayout(self.authors_container)
-        self.authors_layout.setSpacing(5)
-        self.authors_layout.addStretch()
-        
-        scroll.setWidget(self.authors_container)
+        self.authors_list = BarList(theme=self.theme, placeholder="Henüz yazar verisi yok")
+        scroll.setWidget(self.authors_list)
         layout.addWidget(scroll)
         
         return widget
@@ -386,7 +332,7 @@ class StatsDialog(QDialog):
         # Sol: Pasta grafik
         left = QVBoxLayout()
         left.addWidget(QLabel("📁 Kategori Dağılımı"))
-        self.category_chart = PieChart()
+        self.category_chart = PieChart(theme=self.theme)
         self.category_chart.setMinimumSize(250, 250)
         left.addWidget(self.category_chart)
         left.addStretch()
@@ -399,13 +345,10 @@ class StatsDialog(QDialog):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.Shape.NoFrame)
+        scroll.setAlignment(Qt.AlignmentFlag.AlignTop)
         
-        self.categories_container = QWidget()
-        self.categories_layout = QVBoxLayout(self.categories_container)
-        self.categories_layout.setSpacing(3)
-        self.categories_layout.addStretch()
-        
-        scroll.setWidget(self.categories_container)
+        self.categories_list = BarList(theme=self.theme, placeholder="Henüz kategori verisi yok")
+        scroll.setWidget(self.categories_list)
         right.addWidget(scroll)
         layout.addLayout(right)
         
@@ -433,6 +376,25 @@ class StatsDialog(QDialog):
         cards.addStretch()
         layout.addLayout(cards)
         
+        # Okuma oturumlarından
+        session_cards = QHBoxLayout()
+        
+        self.speed_streak = StatCard("🔥", "-", "Okuma Serisi (Gün)")
+        session_cards.addWidget(self.speed_streak)
+        
+        self.speed_longest_streak = StatCard("🏅", "-", "En Uzun Seri")
+        session_cards.addWidget(self.speed_longest_streak)
+        
+        self.speed_avg_7 = StatCard("📈", "-", "7 Gün Ort. Sayfa")
+        session_cards.addWidget(self.speed_avg_7)
+        
+        session_cards.addStretch()
+        layout.addLayout(session_cards)
+        
+        self.velocity_label = QLabel("")
+        self.velocity_label.setWordWrap(True)
+        layout.addWidget(self.velocity_label)
+        
         # En hızlı / en yavaş
         self.fastest_label = QLabel("")
         self.fastest_label.setStyleSheet("padding: 10px; background-color: #1E3A1E; border-radius: 5px;")
@@ -513,9 +475,18 @@ class StatsDialog(QDialog):
         current_year = datetime.now().year
         for y in range(current_year, current_year - 10, -1):
             self.summary_year_combo.addItem(str(y), y)
-        self.summary_year_combo.currentIndexChanged.connect(self.load_summary)
+        self.summary_year_combo.currentIndexChanged.connect(lambda: self.load_summary())
         year_row.addWidget(self.summary_year_combo)
         year_row.addStretch()
+        
+        refresh_btn = QPushButton("🔄 Yeniden Hesapla")
+        refresh_btn.clicked.connect(lambda: self.load_summary(force=True))
+        year_row.addWidget(refresh_btn)
+        
+        self.export_summary_btn = QPushButton("📤 HTML Olarak Kaydet")
+        self.export_summary_btn.setEnabled(False)
+        self.export_summary_btn.clicked.connect(self.export_summary)
+        year_row.addWidget(self.export_summary_btn)
         layout.addLayout(year_row)
         
         # Özet içerik
@@ -535,20 +506,72 @@ class StatsDialog(QDialog):
     # VERİ YÜKLEME
     # ============================================================
     
-    def load_all_stats(self):
-        """Tüm istatistikleri yükler."""
-        self.load_overview()
-        self.load_charts()
-        self.load_authors()
-        self.load_categories()
-        self.load_speed()
-        self.load_goal()
-        self.load_summary()
+    def tab_args(self, name: str) -> tuple:
+        """Sekme verisinin bağlı olduğu seçimler (önbellek anahtarının parçası)."""
+        if name == "charts":
+            return (self.chart_year_combo.currentData(),)
+        if name == "goal":
+            return (self.current_year,)
+        return ()
+    
+    def load_tab(self, index: int, force: bool = False, prefetch: bool = False):
+        """
+        Sekmeyi ilk açılışında yükler: veri önbellekteyse hemen gösterilir,
+        değilse iskelet gösterilip arka planda hesaplanır.
+        prefetch=True: görünmeyen komşu sekme hazırlanıyor (iskelete geçilmez).
+        """
+        name = TABS[index]
+        if name == "summary":
+            if not self.summary_started:
+                self.load_summary()
+            return
+        
+        args = self.tab_args(name)
+        cached = None if force else library_stats.peek(name, args)
+        if cached is not None:
+            if self.loaded.get(index) != args:
+                self.show_tab(index, args, cached)
+            return
+        
+        if (name, args) in self.pending:
+            return
+        # Aynı seçimin yenilenmesinde (ör. hedef kaydı) eski içerik yeni veri gelene kadar kalır
+        if not prefetch and self.loaded.get(index) != args:
+            self.stacks[index].setCurrentIndex(0)
+        self.pending.add((name, args))
+        self.run_task(
+            library_stats.get_tab, name, args, force,
+            on_finished=lambda data: self.on_tab_loaded(index, args, data),
+            on_error=lambda _: self.pending.discard((name, args)),
+        )
+    
+    def on_tab_loaded(self, index: int, args: tuple, data):
+        """Arka planda hazırlanan veriyi gösterir (bu arada seçim değiştiyse atlanır)."""
+        name = TABS[index]
+        self.pending.discard((name, args))
+        if args == self.tab_args(name):
+            self.show_tab(index, args, data)
     
-    def load_overview(self):
-        """Genel bakış verilerini yükler."""
-        stats = db.get_statistics()
+    def show_tab(self, index: int, args: tuple, data):
+        getattr(self, f"show_{TABS[index]}")(data)
+        self.stacks[index].setCurrentIndex(1)
+        self.loaded[index] = args
+        self.prefetch_timer.start()
+    
+    def prefetch(self):
+        """Boştayken açık sekmenin komşularını sırayla hazırlar (yıllık özet hariç)."""
+        if self.threads:
+            self.prefetch_timer.start()
+            return
         
+        current = self.tabs.currentIndex()
+        for index in (current + 1, current - 1):
+            if 0 <= index < len(TABS) and TABS[index] != "summary" and index not in self.loaded:
+                self.load_tab(index, prefetch=True)
+                return
+    
+    def show_overview(self, stats: dict):
+        """Genel bakış verilerini gösterir."""
         self.total_card.value_label.setText(str(stats["total_books"]))
         self.read_card.value_label.setText(str(stats["read_books"]))
         self.reading_card.value_label.setText(str(stats["reading_books"]))
@@ -560,9 +583,7 @@ class StatsDialog(QDialog):
         if stats["average_rating"] > 0:
             self.rating_card.value_label.setText(f"{stats['average_rating']}")
         
-        # Yazar sayısı
-        authors = db.get_author_stats(100)
-        self.authors_card.value_label.setText(str(len(authors)))
+        self.authors_card.value_label.setText(str(stats["total_authors"]))
         
         self.shelves_card.value_label.setText(str(stats["total_shelves"]))
         
@@ -578,12 +599,12 @@ class StatsDialog(QDialog):
             self.progress_bar.setValue(0)
             self.progress_bar.setFormat("Henüz kitap yok")
     
-    def load_charts(self):
-        """Grafikleri yükler."""
+    def show_charts(self, data: dict):
+        """Grafikleri gösterir."""
         year = self.chart_year_combo.currentData()
         
         # Aylık
-        monthly = db.get_monthly_reading_stats(year)
+        monthly = data["monthly"]
         month_names = ["Oca", "Şub", "Mar", "Nis", "May", "Haz", 
                        "Tem", "Ağu", "Eyl", "Eki", "Kas", "Ara"]
         
@@ -591,82 +612,35 @@ class StatsDialog(QDialog):
         chart_data = [(month_names[i], monthly_data.get(i+1, 0)) for i in range(12)]
         self.monthly_chart.set_data(chart_data)
         
-        # Yıllık
-        yearly = db.get_yearly_reading_stats()
-        yearly_data = [(str(y["year"]), y["count"]) for y in yearly[:5]]
+        # Günlük (tetikleyicilerle tutulan gün toplamlarından)
+        self.daily_heatmap.set_data(data["daily"], date(year, 1, 1), date(year, 12, 31))
+        
+        # Yıllık (tüm yıllar; çok yıllık seriler gerekirse gruplanır)
+        yearly = data["yearly"]
+        yearly_data = [(str(y["year"]), y["count"]) for y in yearly if y["year"]]
         yearly_data.reverse()
         self.yearly_chart.set_data(yearly_data)
     
-    def load_authors(self):
-        """Yazar istatistiklerini yükler."""
-        # Mevcut öğeleri temizle
-        while self.authors_layout.count() > 1:
-            item = self.authors_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        authors = db.get_author_stats(15)
-        if not authors:
-            self.authors_layout.insertWidget(0, QLabel("Henüz yazar verisi yok"))
-            return
-        
-        max_count = authors[0]["count"] if authors else 1
-        
-        for author in authors:
-            rating_str = f"⭐ {author['avg_rating']}" if author['avg_rating'] else ""
-            item = HorizontalBarItem(
-                author["author"] or "Bilinmiyor",
-                author["count"],
-                max_count,
-                rating_str
-            )
-            self.authors_layout.insertWidget(self.authors_layout.count() - 1, item)
+    def show_authors(self, authors: list):
+        """Yazar istatistiklerini gösterir."""
+        self.authors_list.set_rows([
+            (author["author"] or "Bilinmiyor", author["count"],
+             f"⭐ {author['avg_rating']}" if author["avg_rating"] else "", None)
+            for author in authors
+        ])
     
-    def load_categories(self):
-        """Kategori verilerini yükler."""
-        # Mevcut öğeleri temizle
-        while self.categories_layout.count() > 1:
-            item = self.categories_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        categories = db.get_category_stats()
-        if not categories:
-            self.categories_layout.insertWidget(0, QLabel("Henüz kategori verisi yok"))
-            return
-        
-        # Pasta grafik
-        chart_data = [(c["category"], c["count"]) for c in categories[:10]]
-        self.category_chart.set_data(chart_data)
-        
-        # Liste
-        max_count = categories[0]["count"] if categories else 1
-        colors = PieChart.COLORS
-        
-        for i, cat in enumerate(categories):
-            row = QHBoxLayout()
-            
-            # Renk kutusu
-            color_box = QLabel("■")
-            color_box.setStyleSheet(f"color: {colors[i % len(colors)]}; font-size: 16px;")
-            row.addWidget(color_box)
-            
-            # İsim
-            name = QLabel(cat["category"])
-            row.addWidget(name, stretch=1)
-            
-            # Sayı
-            count = QLabel(str(cat["count"]))
-            count.setStyleSheet("font-weight: bold;")
-            row.addWidget(count)
-            
-            container = QWidget()
-            container.setLayout(row)
-            self.categories_layout.insertWidget(self.categories_layout.count() - 1, container)
+    def show_categories(self, categories: list):
+        """Kategori verilerini gösterir."""
+        # Pasta grafik (ilk 10) ve liste; renk kutusu pastadaki dilimle aynı
+        self.category_chart.set_data([(c["category"], c["count"]) for c in categories[:len(PALETTE)]])
+        self.categories_list.set_rows([
+            (cat["category"], cat["count"], "", PALETTE[i] if i < len(PALETTE) else None)
+            for i, cat in enumerate(categories)
+        ])
     
-    def load_speed(self):
-        """Okuma hızı verilerini yükler."""
-        speed = db.get_reading_speed_stats()
+    def show_speed(self, data: dict):
+        """Okuma hızı verilerini gösterir."""
+        speed = data["speed"]
         
         self.speed_avg_days.value_label.setText(
             f"{speed['avg_days_per_book']}" if speed['avg_days_per_book'] else "-"
@@ -695,11 +669,26 @@ class StatsDialog(QDialog):
             )
         else:
             self.slowest_label.setText("En yavaş kitap verisi yok")
-    
-    def load_goal(self):
-        """Hedef verilerini yükler."""
-        goal_data = db.get_reading_goal(self.current_year)
         
+        activity = data["activity"]
+        last_day = activity["daily"][-1] if activity["daily"] else None
+        self.speed_streak.value_label.setText(str(activity["current_streak"]))
+        self.speed_longest_streak.value_label.setText(str(activity["longest_streak"]) if activity["longest_streak"] else "-")
+        self.speed_avg_7.value_label.setText(f"{last_day['avg_7']:g}" if last_day and last_day["avg_7"] else "-")
+        
+        velocity = data["velocity"]
+        if velocity:
+            lines = [
+                f"• {book['title']}: {book['pages_per_day']} sayfa/gün"
+                + (f", {book['pages_per_hour']} sayfa/saat" if book["pages_per_hour"] else "")
+                for book in velocity
+            ]
+            self.velocity_label.setText("📖 Son okunan kitaplarda hız:\n" + "\n".join(lines))
+        else:
+            self.velocity_label.setText("Okuma oturumu kaydettikçe kitap başına hız burada görünür")
+    
+    def show_goal(self, goal_data: dict | None):
+        """Hedef verilerini gösterir."""
         # Hedef yoksa varsayılan değerler
         if goal_data is None:
             self.goal_spinbox.setValue(0)
@@ -723,21 +712,27 @@ class StatsDialog(QDialog):
                 f"{read} / {goal} kitap ({percentage}%)"
             )
             
-            # Hedefte mi kontrolü
-            import datetime
-            day_of_year = datetime.datetime.now().timetuple().tm_yday
-            expected = (goal * day_of_year) / 365
-            on_track = read >= expected
-            remaining = max(0, goal - read)
+            # Hedefte mi: bugüne kadar beklenen kitap sayısına göre (db tahmini)
+            remaining = goal_data["remaining"]
             
-            if on_track:
+            if goal_data["on_track"]:
                 self.goal_status.setText("✅ Hedefte gidiyorsun!")
                 self.goal_status.setStyleSheet("color: #00B294; font-size: 14px; padding: 10px;")
             else:
-                self.goal_status.setText("⚠️ Biraz geride kaldın")
+                self.goal_status.setText(
+                    f"⚠️ Biraz geride kaldın (bugüne kadar ~{goal_data['expected']:g} kitap bekleniyordu)"
+                )
                 self.goal_status.setStyleSheet("color: #FFB900; font-size: 14px; padding: 10px;")
             
-            self.goal_detail.setText(f"{remaining} kitap daha okumalısın")
+            detail = [f"{remaining} kitap daha okumalısın" if remaining else "🎉 Hedef tamamlandı"]
+            if goal_data["pace_source"]:
+                detail.append(f"📈 Bu hızla yıl sonunda ~{goal_data['projected']} kitap")
+            if remaining and goal_data["needed_per_month"]:
+                needed = f"🎯 Hedef için ayda {goal_data['needed_per_month']:g} kitap"
+                if goal_data["needed_pages_per_day"]:
+                    needed += f" (günde ~{goal_data['needed_pages_per_day']:g} sayfa)"
+                detail.append(needed)
+            self.goal_detail.setText("\n".join(detail))
         else:
             self.goal_progress.setFormat("Hedef belirlenmedi")
             self.goal_status.setText("Yukarıdan hedef belirle")
@@ -748,22 +743,56 @@ class StatsDialog(QDialog):
         """Hedefi kaydeder."""
         goal = self.goal_spinbox.value()
         db.set_reading_goal(self.current_year, goal)
-        self.load_goal()
+        self.load_tab(TABS.index("goal"))
     
-    def load_summary(self):
-        """Yıllık özeti yükler."""
-        # Mevcut içeriği temizle
+    def run_task(self, func, *args, on_finished, on_error=None):
+        """İşi arka planda başlatır (bitince thread listeden çıkar; hata uyarı olarak gösterilir)."""
+        thread = StatsThread(func, *args)
+        thread.finished.connect(on_finished)
+        if on_error:
+            thread.error.connect(on_error)
+        thread.error.connect(lambda message: QMessageBox.warning(self, "Hata", message))
+        thread.finished.connect(lambda _: self.threads.remove(thread))
+        thread.error.connect(lambda _: self.threads.remove(thread))
+        self.threads.append(thread)
+        thread.start()
+    
+    def clear_summary(self):
         while self.summary_layout.count():
             item = self.summary_layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
-        
+            elif item.layout():
+                while item.layout().count():
+                    child = item.layout().takeAt(0)
+                    if child.widget():
+                        child.widget().deleteLater()
+    
+    def load_summary(self, force: bool = False):
+        """Yıllık özeti arka planda hazırlatır (kayıtlı özet güncelse dosyadan gelir)."""
         year = self.summary_year_combo.currentData()
-        summary = db.get_year_summary(year)
+        self.summary_started = True
+        self.review = None
+        self.export_summary_btn.setEnabled(False)
+        self.clear_summary()
+        self.summary_layout.addWidget(QLabel(f"⏳ {year} özeti hazırlanıyor..."))
+        self.summary_layout.addStretch()
+        self.run_task(load_year_review, year, force, on_finished=self.show_summary)
+    
+    def show_summary(self, review: dict):
+        """Hazırlanan özeti gösterir (bu arada başka yıl seçildiyse atlanır)."""
+        year = review["year"]
+        if year != self.summary_year_combo.currentData():
+            return
         
-        if summary["total_books"] == 0:
+        self.review = review
+        self.clear_summary()
+        
+        if review["total_books"] == 0:
             self.summary_layout.addWidget(QLabel(f"{year} yılında okunan kitap yok"))
+            self.summary_layout.addStretch()
             return
+        self.export_summary_btn.setEnabled(True)
         
         # Başlık
         title = QLabel(f"📚 {year} Yılı Okuma Özeti")
@@ -772,50 +801,90 @@ class StatsDialog(QDialog):
         
         # Temel istatistikler
         stats_text = f"""
-        📖 Toplam {summary['total_books']} kitap okundu
-        📄 Toplam {summary['total_pages']:,} sayfa
-        📊 Ortalama {summary['avg_pages_per_book']} sayfa/kitap
-        ⭐ Ortalama puan: {summary['avg_rating'] or 'N/A'}
+        📖 Toplam {review['total_books']} kitap okundu
+        📄 Toplam {review['total_pages']:,} sayfa
+        📊 Ortalama {review['avg_pages_per_book']} sayfa/kitap
+        ⭐ Ortalama puan: {review['avg_rating'] or 'N/A'}
         """.replace(",", ".")
+        if review["session_pages"]:
+            stats_text += f"⏱️ Oturumlarda {review['session_pages']} sayfa, {round(review['session_minutes'] / 60, 1)} saat\n"
         
         stats_label = QLabel(stats_text)
         stats_label.setStyleSheet("padding: 10px; background-color: #252526; border-radius: 5px;")
         self.summary_layout.addWidget(stats_label)
         
-        # En çok okunan yazarlar
-        if summary["top_authors"]:
-            authors_title = QLabel("✍️ En Çok Okunan Yazarlar")
-            authors_title.setStyleSheet("font-weight: bold; margin-top: 10px;")
-            self.summary_layout.addWidget(authors_title)
-            
-            for a in summary["top_authors"]:
-                lbl = QLabel(f"  • {a['author']}: {a['count']} kitap")
-                self.summary_layout.addWidget(lbl)
-        
-        # En beğenilen kitaplar
-        if summary["top_rated_books"]:
-            rated_title = QLabel("⭐ En Yüksek Puanlı Kitaplar")
-            rated_title.setStyleSheet("font-weight: bold; margin-top: 10px;")
-            self.summary_layout.addWidget(rated_title)
-            
-            for b in summary["top_rated_books"]:
-                stars = "⭐" * (b['rating'] or 0)
-                lbl = QLabel(f"  • {b['title']} {stars}")
+        # Aylık dağılım
+        self.add_summary_title("📅 Aylık Dağılım")
+        monthly_chart = BarChart(theme=self.theme)
+        monthly_chart.set_data([
+            (year_review.MONTH_NAMES[m["month"] - 1], m["books"]) for m in review["monthly"]
+        ])
+        self.summary_layout.addWidget(monthly_chart)
+        
+        if review["session_pages"]:
+            self.add_summary_title("⏱️ Haftalık Okuma (sayfa)")
+            weekly_chart = BarChart(theme=self.theme, color="#00B294")
+            weekly_chart.set_data([(w["week"], w["pages"]) for w in review["weekly"]])
+            self.summary_layout.addWidget(weekly_chart)
+        
+        # Sıralamalar
+        lists = [
+            ("✍️ En Çok Okunan Yazarlar", review["top_authors"], lambda a: f"{a['author']}: {a['count']} kitap"),
+            ("🏷️ Kategoriler", review["top_categories"], lambda c: f"{c['category']}: {c['count']} kitap"),
+            ("📦 Formatlar", review["formats"], lambda f: f"{f['format']}: {f['count']} kitap"),
+            ("⭐ En Yüksek Puanlı Kitaplar", review["top_rated"], lambda b: f"{b['title']} {'⭐' * b['rating']}"),
+            ("🐢 En Uzun Okumalar", review["longest_reads"], lambda b: f"{b['title']} ({b['days']} gün)"),
+            ("⚡ En Kısa Okumalar", review["shortest_reads"], lambda b: f"{b['title']} ({b['days']} gün)"),
+            ("💬 Yılın Alıntıları", review["quotes"], lambda q: f"“{q['text']}” — {q['title']}"),
+        ]
+        for heading, rows, text in lists:
+            if not rows:
+                continue
+            self.add_summary_title(heading)
+            for row in rows:
+                lbl = QLabel(f"  • {text(row)}")
+                lbl.setWordWrap(True)
                 self.summary_layout.addWidget(lbl)
         
-        # Aylık dağılım
-        monthly_title = QLabel("📅 Aylık Dağılım")
-        monthly_title.setStyleSheet("font-weight: bold; margin-top: 10px;")
-        self.summary_layout.addWidget(monthly_title)
+        # Kapak kolajı
+        if review["images"]:
+            self.add_summary_title("🖼️ Kapaklar")
+            collage = QGridLayout()
+            collage.setSpacing(4)
+            columns = 8
+            for i, (book_title, image) in enumerate(review["images"]):
+                cover = QLabel()
+                cover.setPixmap(QPixmap.fromImage(image))
+                cover.setToolTip(book_title)
+                collage.addWidget(cover, i // columns, i % columns)
+            self.summary_layout.addLayout(collage)
         
-        month_names = ["Oca", "Şub", "Mar", "Nis", "May", "Haz", 
-                       "Tem", "Ağu", "Eyl", "Eki", "Kas", "Ara"]
-        monthly_text = "  "
-        for m in summary["monthly_breakdown"]:
-            if m["count"] > 0:
-                monthly_text += f"{month_names[m['month']-1]}:{m['count']}  "
+        self.summary_layout.addStretch()
+    
+    def add_summary_title(self, text: str):
+        label = QLabel(text)
+        label.setStyleSheet("font-weight: bold; margin-top: 10px;")
+        self.summary_layout.addWidget(label)
+    
+    def export_summary(self):
+        """Gösterilen özeti HTML olarak kaydeder."""
+        if not self.review:
+            return
         
-        monthly_label = QLabel(monthly_text if monthly_text.strip() else "  Veri yok")
-        self.summary_layout.addWidget(monthly_label)
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Yıllık Özeti Kaydet", f"{self.review['year']}-okuma-ozeti.html", "HTML (*.html)"
+        )
+        if not path:
+            return
         
-        self.summary_layout.addStretch()
+        self.run_task(
+            year_review.export_html, self.review, path,
+            on_finished=lambda saved: QMessageBox.information(self, "Kaydedildi", f"Özet kaydedildi:\n{saved}")
+        )
+    
+    def done(self, result: int):
+        """Arka plan işleri bitmeden dialog yok edilmesin."""
+        for thread in list(self.threads):
+            thread.wait()
+        wait_for_renders()
+        super().done(result)